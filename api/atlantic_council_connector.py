@@ -23,6 +23,11 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import io
 
+from country_registry import COUNTRY_REGISTRY
+from country_resolver import COUNTRY_RESOLVER
+from records import intern_values
+from snapshot_store import persist_snapshot, load_latest_snapshot
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,29 +41,57 @@ class AtlanticCouncilConnector:
         self.dataset_url = "https://docs.google.com/spreadsheets/d/1s046O7ulAQ7d15TT-9-qtqemgGbEAGo5jF5ETEvyeXg/edit?gid=107324639#gid=107324639"
         self.data = None
         self.last_updated = None
+        # Geography rows by country ID (or normalized text), for self.data
+        self._geography_index: Dict[Any, List[int]] = {}
+        self._indexed_data: Optional[pd.DataFrame] = None
 
-    def fetch_dataset(self) -> pd.DataFrame:
-        """Fetch the complete dataset from Atlantic Council"""
-        try:
-            # Convert Google Sheets URL to CSV export format
-            csv_url = self.dataset_url.replace("/edit?gid=", "/export?format=csv&gid=")
+    def download_dataset(self) -> pd.DataFrame:
+        """Download the dataset from Atlantic Council (raises on failure)"""
+        # Convert Google Sheets URL to CSV export format
+        csv_url = self.dataset_url.replace("/edit?gid=", "/export?format=csv&gid=")
 
-            logger.info("Fetching Atlantic Council Trump Tariff Tracker dataset...")
-            response = requests.get(csv_url, timeout=30)
-            response.raise_for_status()
+        logger.info("Fetching Atlantic Council Trump Tariff Tracker dataset...")
+        response = requests.get(csv_url, timeout=30)
+        response.raise_for_status()
 
-            # Parse CSV data
-            df = pd.read_csv(io.StringIO(response.text))
-            self.data = df
-            self.last_updated = datetime.now()
+        # Parse CSV data
+        df = pd.read_csv(io.StringIO(response.text))
+        self.data = df
+        self.last_updated = datetime.now()
 
-            logger.info(f"Successfully fetched dataset with {len(df)} tariff entries")
-            return df
+        # Persist for warm starts and outage fallback
+        persist_snapshot(
+            "atlantic_council", "latest", df.to_dict("records"), self.last_updated
+        )
+
+        logger.info(f"Successfully fetched dataset with {len(df)} tariff entries")
+        return df
+
+    def fetch_dataset(self) -> pd.DataFrame:
+        """Fetch the complete dataset from Atlantic Council"""
+        try:
+            return self.download_dataset()
 
         except Exception as e:
             logger.error(f"Error fetching Atlantic Council dataset: {e}")
-            # Fallback to cached data if available
-            return self.data if self.data is not None else pd.DataFrame()
+            # Fallback to cached data if available, then to the last persisted copy
+            if self.data is not None:
+                return self.data
+            return self.load_persisted_dataset()
+
+    def load_persisted_dataset(self) -> pd.DataFrame:
+        """Load the last successfully fetched dataset from the snapshot store"""
+        stored = load_latest_snapshot("atlantic_council")
+        if stored is None or not stored.payload:
+            return pd.DataFrame()
+
+        df = pd.DataFrame.from_records(stored.payload)
+        self.data = df
+        self.last_updated = stored.fetched_at
+        logger.info(
+            f"Loaded persisted Atlantic Council dataset from {stored.fetched_at.isoformat()}"
+        )
+        return df
 
     def get_country_tariffs(self, country_name: str) -> Dict[str, Any]:
         """Get all tariff information for a specific country"""
@@ -69,9 +102,7 @@ class AtlanticCouncilConnector:
             return {}
 
         # Filter data for the specific country
-        country_data = self.data[
-            self.data["Geography"].str.contains(country_name, case=False, na=False)
-        ]
+        country_data = self.data.iloc[self._country_rows(country_name)]
 
         if country_data.empty:
             return {}
@@ -86,22 +117,63 @@ class AtlanticCouncilConnector:
 
             # Create tariff entry
             tariff_key = f"{target} - {legal_authority}"
-            tariffs[tariff_key] = {
-                "tariff_rate": self._parse_rate(rate),
-                "target_type": row.get("Target type", "Unknown"),
-                "geography": row.get("Geography", country_name),
-                "target": target,
-                "first_announced": row.get("First announced", "Unknown"),
-                "effective_date": effective_date,
-                "legal_authority": legal_authority,
-                "sources": sources,
-                "status": "Active" if self._parse_rate(rate) > 0 else "Exempt",
-                "verification": f"Atlantic Council Trump Tariff Tracker - {sources}",
-                "data_source": "Atlantic Council Geoeconomics Center",
-            }
+            tariffs[tariff_key] = intern_values(
+                {
+                    "tariff_rate": self._parse_rate(rate),
+                    "target_type": row.get("Target type", "Unknown"),
+                    "geography": row.get("Geography", country_name),
+                    "target": target,
+                    "first_announced": row.get("First announced", "Unknown"),
+                    "effective_date": effective_date,
+                    "legal_authority": legal_authority,
+                    "sources": sources,
+                    "status": "Active" if self._parse_rate(rate) > 0 else "Exempt",
+                    "verification": (
+                        f"Atlantic Council Trump Tariff Tracker - {sources}"
+                    ),
+                    "data_source": "Atlantic Council Geoeconomics Center",
+                },
+                "legal_authority",
+                "sources",
+                "verification",
+            )
 
         return tariffs
 
+    def _country_rows(self, country_name: str) -> List[int]:
+        """Row positions whose Geography names the country"""
+        if self._indexed_data is not self.data:
+            self._build_geography_index()
+        country_id = COUNTRY_RESOLVER.resolve(country_name)
+        key = country_id if country_id >= 0 else " ".join(country_name.lower().split())
+        return self._geography_index.get(key, [])
+
+    def _build_geography_index(self):
+        """Map each Geography cell to the countries it names, once per dataset
+
+        Cells are matched exactly against the registry first, then scanned
+        for country names ("China, Hong Kong"); unresolved cells stay
+        reachable by their normalized text.
+        """
+        codes, geographies = pd.factorize(self.data["Geography"])
+        cell_keys = []
+        for geography in geographies:
+            text = str(geography)
+            country_id = COUNTRY_REGISTRY.id(text)
+            if country_id >= 0:
+                keys = [country_id]
+            else:
+                keys = COUNTRY_REGISTRY.ids(COUNTRY_REGISTRY.mentions(text))
+            cell_keys.append(keys + [" ".join(text.lower().split())])
+
+        index: Dict[Any, List[int]] = {}
+        for position, code in enumerate(codes):
+            if code >= 0:
+                for key in cell_keys[code]:
+                    index.setdefault(key, []).append(position)
+        self._geography_index = index
+        self._indexed_data = self.data
+
     def get_country_average_tariff(self, country_name: str) -> float:
         """Calculate average tariff rate for a country"""
         country_tariffs = self.get_country_tariffs(country_name)
@@ -18,6 +18,11 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+import numpy as np
+
+from columnar_tariff_store import ColumnarTariffStore
+from temporal_tariff_store import DateLike, TemporalTariffStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -371,40 +376,39 @@ ATLANTIC_COUNCIL_DATA = {
     },
 }
 
+# Column arrays of the tracker entries for the summary helpers
+TARIFF_STORE = ColumnarTariffStore.from_nested(ATLANTIC_COUNCIL_DATA)
+
+# Effective-date index of ATLANTIC_COUNCIL_DATA for as-of queries
+TEMPORAL_STORE = TemporalTariffStore.from_nested(ATLANTIC_COUNCIL_DATA)
+
 
 def get_country_tariffs(country_name: str) -> Dict[str, Any]:
     """Get Atlantic Council verified tariff data for a country"""
     return ATLANTIC_COUNCIL_DATA.get(country_name, {})
 
 
-def get_country_average_tariff(country_name: str) -> float:
-    """Calculate average tariff rate for a country from Atlantic Council data"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return 0.0
-
+def get_country_average_tariff(
+    country_name: str, as_of: DateLike = None
+) -> float:
+    """
+    Calculate average tariff rate for a country from Atlantic Council data,
+    optionally as of a past date (ISO string or date)
+    """
     # Only count active tariffs (exclude exempt and investigation status)
-    active_tariffs = [
-        tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"
-    ]
-    if not active_tariffs:
-        return 0.0
+    if as_of is not None:
+        return TEMPORAL_STORE.average_rate(country_name, as_of, status="Active")
+    return TARIFF_STORE.average_rate(country_name, status="Active")
 
-    total_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs)
-    return total_rate / len(active_tariffs)
 
-
-def get_affected_sectors(country_name: str) -> List[str]:
+def get_affected_sectors(country_name: str, as_of: DateLike = None) -> List[str]:
     """Get affected sectors for a country from Atlantic Council data"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return []
-
-    return [
-        tariff["source"]
-        for tariff in country_tariffs.values()
-        if tariff["status"] == "Active"
-    ]
+    if as_of is not None:
+        return [
+            version.source
+            for version in TEMPORAL_STORE.versions_as_of(country_name, as_of)
+        ]
+    return TARIFF_STORE.source_names(country_name, status="Active")
 
 
 def get_sector_analysis(country_name: str) -> List[Dict[str, Any]]:
@@ -609,31 +613,33 @@ def get_all_countries() -> List[str]:
     return sorted(ATLANTIC_COUNCIL_DATA.keys())
 
 
-def get_tariff_summary() -> Dict[str, Any]:
-    """Get comprehensive summary of Atlantic Council tariff data"""
-    all_tariffs = []
-    for country_tariffs in ATLANTIC_COUNCIL_DATA.values():
-        for tariff_info in country_tariffs.values():
-            all_tariffs.append(tariff_info["tariff_rate"])
-
-    active_tariffs = [rate for rate in all_tariffs if rate > 0]
+def get_tariff_summary(as_of: DateLike = None) -> Dict[str, Any]:
+    """
+    Get comprehensive summary of Atlantic Council tariff data, optionally
+    restricted to the tariffs in effect on a past date
+    """
+    if as_of is not None:
+        rates_by_country = TEMPORAL_STORE.rates_by_country(as_of, positive_only=False)
+        in_effect = [rate for rates in rates_by_country.values() for rate in rates]
+        active_tariffs = np.array([rate for rate in in_effect if rate > 0])
+        total_countries, total_entries = len(rates_by_country), len(in_effect)
+    else:
+        active_tariffs = TARIFF_STORE.rates[TARIFF_STORE.rates > 0]
+        total_countries, total_entries = len(TARIFF_STORE.countries), len(TARIFF_STORE)
 
     summary = {
-        "total_countries": len(ATLANTIC_COUNCIL_DATA),
-        "total_tariff_entries": sum(
-            len(country_tariffs) for country_tariffs in ATLANTIC_COUNCIL_DATA.values()
-        ),
-        "active_tariffs": len(active_tariffs),
+        "total_countries": total_countries,
+        "total_tariff_entries": total_entries,
+        "active_tariffs": int(active_tariffs.size),
         "rate_range": {
-            "min": min(active_tariffs) if active_tariffs else 0,
-            "max": max(active_tariffs) if active_tariffs else 0,
-            "average": (
-                sum(active_tariffs) / len(active_tariffs) if active_tariffs else 0
-            ),
+            "min": float(active_tariffs.min()) if active_tariffs.size else 0,
+            "max": float(active_tariffs.max()) if active_tariffs.size else 0,
+            "average": float(active_tariffs.mean()) if active_tariffs.size else 0,
         },
         "data_source": "Atlantic Council Geoeconomics Center",
         "dataset_url": "https://www.atlanticcouncil.org/programs/geoeconomics-center/trump-tariff-tracker/",
         "last_updated": datetime.now().isoformat(),
+        "as_of": str(as_of) if as_of is not None else None,
         "credits": "Atlantic Council Trump Tariff Tracker",
         "verification": "Verified data from Atlantic Council's comprehensive tariff tracker",
     }
@@ -4,19 +4,34 @@ Parses the official US_Tariffs_Reciprocal_Country_Sector_2025-08-15.xlsx file
 This follows the official workflow: EO + HTS + USTR + CBP
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from datetime import datetime, date
 import json
+import re
+
+from dataset_diff import (
+    DatasetDiff,
+    DatasetTracker,
+    TariffAggregates,
+    register_tracker,
+    rules_dataset,
+)
+from hs_concordance import HS_CONCORDANCE
+from hts_prefix_index import HTSPrefixIndex, normalize_hts
+from records import intern_fields
+from section301_store import DEFAULT_STORE_PATH, Section301Store
+from workbook_reader import iter_sheet_rows
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CountryTariffRule:
     country: str
     reciprocal_addon_pct: float
@@ -25,8 +40,13 @@ class CountryTariffRule:
     notes: str
     effective_date: str
 
+    def __post_init__(self):
+        intern_fields(
+            self, "country", "rule_type", "chapter99_code", "notes", "effective_date"
+        )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class HTSCode:
     hts10: str
     description: str
@@ -34,7 +54,7 @@ class HTSCode:
     chapter99_applicable: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class Section301China:
     hts10: str
     list_no: str
@@ -42,6 +62,45 @@ class Section301China:
     exclusion_flag: bool
     exclusion_ends_on: str
 
+    def __post_init__(self):
+        intern_fields(self, "list_no", "exclusion_ends_on")
+
+
+# Countries subject to Section 301 China adders
+SECTION_301_COUNTRIES = ("China", "Hong Kong", "Macau")
+
+# EU_TopUp rule: reciprocal addon tops the total up to this rate
+EU_TOPUP_TARGET_PCT = 15.0
+
+
+@dataclass
+class EffectiveTariffMatrix:
+    """Dense country x HTS duty matrices (rows follow countries, columns hts_codes)"""
+
+    countries: List[str]
+    hts_codes: List[str]
+    rule_types: List[str]
+    base_duty: np.ndarray
+    reciprocal_addon: np.ndarray
+    section_301_duty: np.ndarray
+    total_duty: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.total_duty.shape
+
+    def get(self, country: str, hts_code: str) -> Dict[str, Any]:
+        """Single cell in the same shape as calculate_effective_tariff"""
+        i = self.countries.index(country)
+        j = self.hts_codes.index(hts_code)
+        return {
+            "base_duty": float(self.base_duty[i, j]),
+            "reciprocal_addon": float(self.reciprocal_addon[i, j]),
+            "section_301_duty": float(self.section_301_duty[i, j]),
+            "total_duty": float(self.total_duty[i, j]),
+            "rule_type": self.rule_types[i],
+        }
+
 
 class AuthoritativeTariffParser:
     """
@@ -52,12 +111,30 @@ class AuthoritativeTariffParser:
     def __init__(
         self,
         excel_file_path: str = "../data/US_Tariffs_Reciprocal_Country_Sector_2025-08-15.xlsx",
+        section301_store_path: str = DEFAULT_STORE_PATH,
     ):
         self.excel_file_path = Path(excel_file_path)
+        self.section301_store_path = Path(section301_store_path)
         self.country_rates: Dict[str, CountryTariffRule] = {}
         self.hts_codes: List[HTSCode] = []
         self.section301_china: List[Section301China] = []
+        # Full USTR lists built by section301_store.py; used when the
+        # Section301_China sheet is empty
+        self.section301_store: Optional[Section301Store] = None
         self.data_loaded = False
+        self._hts_index: Optional[HTSPrefixIndex] = None
+        # Country_Rates versions; region averages are recomputed only for
+        # the countries a reload changes
+        self.tracker = DatasetTracker("authoritative_excel")
+        self.aggregates = TariffAggregates(region_of=self._get_region)
+        self.tracker.add_listener(self.aggregates.apply)
+        self.last_diff: Optional[DatasetDiff] = None
+
+    @property
+    def schedule_date(self) -> str:
+        """ISO date in the workbook name (e.g. ..._2025-08-15.xlsx), else today"""
+        match = re.search(r"\d{4}-\d{2}-\d{2}", self.excel_file_path.stem)
+        return match.group(0) if match else datetime.now().strftime("%Y-%m-%d")
 
     def load_excel_file(self) -> bool:
         """Load and parse the authoritative Excel file"""
@@ -70,12 +147,17 @@ class AuthoritativeTariffParser:
                 f"Loading authoritative tariff data from: {self.excel_file_path}"
             )
 
-            # Load Country_Rates sheet
-            country_df = pd.read_excel(self.excel_file_path, sheet_name="Country_Rates")
-            logger.info(f"Loaded Country_Rates: {len(country_df)} countries")
+            # A reload replaces the previous workbook's rows
+            self.country_rates = {}
+            self.hts_codes = []
+            self.section301_china = []
+            self.section301_store = None
+
+            # Rows without an Effective_Date column take the schedule's date
+            schedule_date = self.schedule_date
 
-            # Parse country data
-            for _, row in country_df.iterrows():
+            # Stream and parse Country_Rates sheet
+            for row in iter_sheet_rows(self.excel_file_path, "Country_Rates"):
                 country = str(row["Country"]).strip()
                 if pd.isna(country) or country.lower() in ["nan", "none", ""]:
                     continue
@@ -102,6 +184,12 @@ class AuthoritativeTariffParser:
                     else ""
                 )
                 notes = str(row["Notes"]).strip() if pd.notna(row["Notes"]) else ""
+                effective_date = row.get("Effective_Date")
+                effective_date = (
+                    str(effective_date).strip()
+                    if effective_date is not None and pd.notna(effective_date)
+                    else schedule_date
+                )
 
                 # Create CountryTariffRule
                 country_rule = CountryTariffRule(
@@ -110,32 +198,32 @@ class AuthoritativeTariffParser:
                     rule_type=rule_type,
                     chapter99_code=chapter99_code,
                     notes=notes,
-                    effective_date=datetime.now().strftime("%Y-%m-%d"),
+                    effective_date=effective_date,
                 )
 
                 self.country_rates[country] = country_rule
+            logger.info(f"Loaded Country_Rates: {len(self.country_rates)} countries")
 
-            # Load HTS_Lines sheet (if it has data)
+            # Stream HTS_Lines sheet (if it has data)
             try:
-                hts_df = pd.read_excel(self.excel_file_path, sheet_name="HTS_Lines")
-                if len(hts_df) > 0:
-                    logger.info(f"Loaded HTS_Lines: {len(hts_df)} HTS codes")
-                    for _, row in hts_df.iterrows():
-                        hts_code = HTSCode(
-                            hts10=str(row["HTS10"]).strip(),
-                            description=(
-                                str(row["Description"]).strip()
-                                if pd.notna(row["Description"])
-                                else ""
-                            ),
-                            base_duty_pct=(
-                                float(row["BaseDuty_Pct"])
-                                if pd.notna(row["BaseDuty_Pct"])
-                                else 0.0
-                            ),
-                            chapter99_applicable=True,
-                        )
-                        self.hts_codes.append(hts_code)
+                for row in iter_sheet_rows(self.excel_file_path, "HTS_Lines"):
+                    hts_code = HTSCode(
+                        hts10=str(row["HTS10"]).strip(),
+                        description=(
+                            str(row["Description"]).strip()
+                            if pd.notna(row["Description"])
+                            else ""
+                        ),
+                        base_duty_pct=(
+                            float(row["BaseDuty_Pct"])
+                            if pd.notna(row["BaseDuty_Pct"])
+                            else 0.0
+                        ),
+                        chapter99_applicable=True,
+                    )
+                    self.hts_codes.append(hts_code)
+                if self.hts_codes:
+                    logger.info(f"Loaded HTS_Lines: {len(self.hts_codes)} HTS codes")
                 else:
                     logger.info("HTS_Lines sheet is empty - will use sample data")
                     self._load_sample_hts_data()
@@ -143,50 +231,51 @@ class AuthoritativeTariffParser:
                 logger.warning(f"Could not load HTS_Lines sheet: {e}")
                 self._load_sample_hts_data()
 
-            # Load Section301_China sheet (if it has data)
+            # Stream Section301_China sheet (if it has data)
             try:
-                china_df = pd.read_excel(
-                    self.excel_file_path, sheet_name="Section301_China"
-                )
-                if len(china_df) > 0:
-                    logger.info(f"Loaded Section301_China: {len(china_df)} codes")
-                    for _, row in china_df.iterrows():
-                        china_rule = Section301China(
-                            hts10=str(row["HTS10"]).strip(),
-                            list_no=(
-                                str(row["List_No"]).strip()
-                                if pd.notna(row["List_No"])
-                                else ""
-                            ),
-                            adder_301_pct=(
-                                float(row["Adder_301_Pct"])
-                                if pd.notna(row["Adder_301_Pct"])
-                                else 0.0
-                            ),
-                            exclusion_flag=(
-                                bool(row["Exclusion_Flag"])
-                                if pd.notna(row["Exclusion_Flag"])
-                                else False
-                            ),
-                            exclusion_ends_on=(
-                                str(row["Exclusion_Ends_On"]).strip()
-                                if pd.notna(row["Exclusion_Ends_On"])
-                                else ""
-                            ),
-                        )
-                        self.section301_china.append(china_rule)
-                else:
+                for row in iter_sheet_rows(self.excel_file_path, "Section301_China"):
+                    china_rule = Section301China(
+                        hts10=str(row["HTS10"]).strip(),
+                        list_no=(
+                            str(row["List_No"]).strip()
+                            if pd.notna(row["List_No"])
+                            else ""
+                        ),
+                        adder_301_pct=(
+                            float(row["Adder_301_Pct"])
+                            if pd.notna(row["Adder_301_Pct"])
+                            else 0.0
+                        ),
+                        exclusion_flag=(
+                            bool(row["Exclusion_Flag"])
+                            if pd.notna(row["Exclusion_Flag"])
+                            else False
+                        ),
+                        exclusion_ends_on=(
+                            str(row["Exclusion_Ends_On"]).strip()
+                            if pd.notna(row["Exclusion_Ends_On"])
+                            else ""
+                        ),
+                    )
+                    self.section301_china.append(china_rule)
+                if self.section301_china:
                     logger.info(
-                        "Section301_China sheet is empty - will use sample data"
+                        f"Loaded Section301_China: {len(self.section301_china)} codes"
                     )
-                    self._load_sample_section301_data()
+                else:
+                    logger.info("Section301_China sheet is empty")
+                    self._load_section301_store()
             except Exception as e:
                 logger.warning(f"Could not load Section301_China sheet: {e}")
-                self._load_sample_section301_data()
+                self._load_section301_store()
 
             self.data_loaded = True
+            self._hts_index = None
+            self.last_diff = self.tracker.update(
+                rules_dataset(self.country_rates.values())
+            )
             logger.info(
-                f"Successfully loaded authoritative tariff data: {len(self.country_rates)} countries, {len(self.hts_codes)} HTS codes, {len(self.section301_china)} Section 301 codes"
+                f"Successfully loaded authoritative tariff data: {len(self.country_rates)} countries, {len(self.hts_codes)} HTS codes, {self.section301_count} Section 301 codes"
             )
             return True
 
@@ -224,6 +313,42 @@ class AuthoritativeTariffParser:
                 )
             )
 
+    def _load_section301_store(self):
+        """Load the compact Section 301 store, falling back to sample data"""
+        if self.section301_store_path.exists():
+            try:
+                self.section301_store = Section301Store.load(
+                    str(self.section301_store_path)
+                )
+                logger.info(
+                    f"Loaded Section 301 store: {len(self.section301_store)} codes"
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Could not load Section 301 store: {e}")
+        logger.info("No Section 301 store - will use sample data")
+        self._load_sample_section301_data()
+
+    @property
+    def section301_count(self) -> int:
+        if self.section301_store is not None:
+            return len(self.section301_store)
+        return len(self.section301_china)
+
+    def _section_301_adders(self, hts_codes: Sequence[str]) -> np.ndarray:
+        """Section 301 duty per HTS code (0.0 if not listed or excluded)"""
+        if self.section301_store is not None:
+            return self.section301_store.duties(hts_codes)
+
+        adder_by_code: Dict[str, float] = {}
+        for rule in self.section301_china:
+            if not rule.exclusion_flag:
+                adder_by_code.setdefault(normalize_hts(rule.hts10), rule.adder_301_pct)
+        return np.array(
+            [adder_by_code.get(normalize_hts(c), 0.0) for c in hts_codes],
+            dtype=np.float64,
+        )
+
     def _load_sample_section301_data(self):
         """Load sample Section 301 data for demonstration purposes"""
         sample_301 = [
@@ -270,8 +395,8 @@ class AuthoritativeTariffParser:
             reciprocal_addon = 0.0
             if country_rule.rule_type == "EU_TopUp":
                 # EU special rule: top-up to 15% total
-                if base_duty < 15.0:
-                    reciprocal_addon = 15.0 - base_duty
+                if base_duty < EU_TOPUP_TARGET_PCT:
+                    reciprocal_addon = EU_TOPUP_TARGET_PCT - base_duty
                 else:
                     reciprocal_addon = 0.0
             elif country_rule.rule_type == "FixedAddOn":
@@ -289,13 +414,9 @@ class AuthoritativeTariffParser:
 
             # Apply Section 301 if applicable (for China)
             section_301_duty = 0.0
-            if country in ["China", "Hong Kong", "Macau"]:
-                # Find Section 301 rule for this HTS code
-                for rule in self.section301_china:
-                    if rule.hts10 == hts_code and not rule.exclusion_flag:
-                        section_301_duty = rule.adder_301_pct
-                        total_duty += section_301_duty
-                        break
+            if country in SECTION_301_COUNTRIES:
+                section_301_duty = float(self._section_301_adders([hts_code])[0])
+                total_duty += section_301_duty
 
             return {
                 "base_duty": base_duty,
@@ -313,6 +434,114 @@ class AuthoritativeTariffParser:
             logger.error(f"Error calculating effective tariff: {e}")
             return {}
 
+    def calculate_effective_tariff_matrix(
+        self,
+        hts_codes: Sequence[str],
+        countries: Sequence[str],
+        base_duties: Optional[Sequence[float]] = None,
+    ) -> EffectiveTariffMatrix:
+        """
+        Calculate effective tariffs for every (country, HTS) pair at once
+
+        Applies the same rules as calculate_effective_tariff, expressed as
+        per-country and per-HTS vectors broadcast into dense matrices.
+        Base duties default to the loaded HTS lines (0.0 if unknown).
+        """
+        hts_codes = list(hts_codes)
+        countries = list(countries)
+
+        # Per-HTS vectors: base duty and Section 301 adder
+        if base_duties is None:
+            base_by_code = {
+                normalize_hts(code.hts10): code.base_duty_pct for code in self.hts_codes
+            }
+            base_duties = [base_by_code.get(normalize_hts(c), 0.0) for c in hts_codes]
+        base = np.asarray(base_duties, dtype=np.float64)
+
+        adder_301 = self._section_301_adders(hts_codes)
+
+        # Per-country vectors: fixed addon, EU top-up flag, Section 301 flag
+        rules = [self.country_rates.get(country) for country in countries]
+        fixed_addon = np.array(
+            [
+                rule.reciprocal_addon_pct
+                if rule and rule.rule_type not in ("EU_TopUp", "Exempt")
+                else 0.0
+                for rule in rules
+            ],
+            dtype=np.float64,
+        )
+        is_topup = np.array(
+            [bool(rule) and rule.rule_type == "EU_TopUp" for rule in rules], dtype=bool
+        )
+        # Unknown countries get no adders, matching the scalar path
+        is_301 = np.array(
+            [
+                bool(rule) and country in SECTION_301_COUNTRIES
+                for country, rule in zip(countries, rules)
+            ],
+            dtype=bool,
+        )
+
+        shape = (len(countries), len(hts_codes))
+        base_matrix = np.broadcast_to(base, shape).copy()
+        topup = np.maximum(EU_TOPUP_TARGET_PCT - base, 0.0)
+        reciprocal = np.where(is_topup[:, None], topup[None, :], fixed_addon[:, None])
+        section_301 = np.where(is_301[:, None], adder_301[None, :], 0.0)
+        total = base_matrix + reciprocal + section_301
+
+        return EffectiveTariffMatrix(
+            countries=countries,
+            hts_codes=hts_codes,
+            rule_types=[rule.rule_type if rule else "Unknown" for rule in rules],
+            base_duty=base_matrix,
+            reciprocal_addon=reciprocal,
+            section_301_duty=section_301,
+            total_duty=total,
+        )
+
+    @property
+    def hts_index(self) -> HTSPrefixIndex:
+        """Prefix index over the loaded HTS codes (built on first use)"""
+        if not self.data_loaded:
+            self.load_excel_file()
+        if self._hts_index is None or len(self._hts_index) != len(self.hts_codes):
+            self._hts_index = HTSPrefixIndex(self.hts_codes)
+        return self._hts_index
+
+    def query_hts_prefix(self, prefix: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get HTS codes and duty statistics under a chapter, heading,
+        subheading or tariff line prefix
+        """
+        try:
+            index = self.hts_index
+            digits = normalize_hts(prefix)
+            codes = []
+            for hts_code in index.iter_prefix(digits):
+                if len(codes) >= limit:
+                    break
+                codes.append(
+                    {
+                        "hts_code": hts_code.hts10,
+                        "description": hts_code.description,
+                        "base_duty": hts_code.base_duty_pct,
+                    }
+                )
+
+            return {
+                **index.stats(digits),
+                "sector": self._get_sector_name(digits) if digits else "",
+                "hs_section": HS_CONCORDANCE.sector_name(digits) if digits else "",
+                "children": index.breakdown(digits),
+                "hts_codes": codes,
+                "truncated": index.count(digits) > len(codes),
+            }
+
+        except Exception as e:
+            logger.error(f"Error querying HTS prefix {prefix}: {e}")
+            return {}
+
     def get_country_tariffs(self, country_name: str) -> Dict[str, Any]:
         """Get tariff data for a specific country"""
         try:
@@ -323,20 +552,19 @@ class AuthoritativeTariffParser:
             if not country_rule:
                 return {}
 
-            # Group HTS codes by chapter for sector analysis
             sector_tariffs = {}
 
-            for hts_code in self.hts_codes:
+            # Group HTS codes by chapter for sector analysis
+            sector_names = HS_CONCORDANCE.chapter_name_array(
+                [hts_code.hts10 for hts_code in self.hts_codes]
+            )
+            for hts_code, sector_name in zip(self.hts_codes, sector_names):
                 # Calculate effective tariff for this country and HTS code
                 tariff_calc = self.calculate_effective_tariff(
                     hts_code.base_duty_pct, country_name, hts_code.hts10
                 )
 
                 if tariff_calc:
-                    # Group by HTS chapter for sector analysis
-                    chapter = hts_code.hts10[:2]
-                    sector_name = self._get_sector_name(chapter)
-
                     if sector_name not in sector_tariffs:
                         sector_tariffs[sector_name] = []
 
@@ -391,6 +619,19 @@ class AuthoritativeTariffParser:
             logger.error(f"Error getting affected sectors for {country_name}: {e}")
             return []
 
+    def reload_excel_file(
+        self, excel_file_path: Optional[str] = None
+    ) -> Optional[DatasetDiff]:
+        """
+        Load a new (or updated) workbook and return the Country_Rates diff
+        against the previous one; None if the workbook could not be loaded
+        """
+        if excel_file_path is not None:
+            self.excel_file_path = Path(excel_file_path)
+        if not self.load_excel_file():
+            return None
+        return self.last_diff
+
     def get_all_countries(self) -> List[str]:
         """Get list of all countries in the dataset"""
         if not self.data_loaded:
@@ -405,23 +646,9 @@ class AuthoritativeTariffParser:
 
             total_countries = len(self.country_rates)
 
-            # Calculate average tariff rates by region
-            region_tariffs = {}
-            for country, rule in self.country_rates.items():
-                region = self._get_region(country)
-                if region not in region_tariffs:
-                    region_tariffs[region] = []
-
-                # Handle special EU rule
-                if rule.rule_type == "EU_TopUp":
-                    region_tariffs[region].append(15.0)  # Target rate
-                else:
-                    region_tariffs[region].append(rule.reciprocal_addon_pct)
-
-            region_averages = {}
-            for region, rates in region_tariffs.items():
-                if rates:
-                    region_averages[region] = sum(rates) / len(rates)
+            # Average tariff rates by region, maintained incrementally per
+            # reload (EU_TopUp rules count at their 15% target rate)
+            region_averages = self.aggregates.region_averages()
 
             return {
                 "total_countries": total_countries,
@@ -444,25 +671,7 @@ class AuthoritativeTariffParser:
 
     def _get_sector_name(self, chapter: str) -> str:
         """Get sector name from HTS chapter"""
-        sector_mapping = {
-            "84": "Machinery and mechanical appliances",
-            "85": "Electrical equipment",
-            "72": "Iron and steel",
-            "73": "Articles of iron or steel",
-            "39": "Plastics and articles thereof",
-            "40": "Rubber and articles thereof",
-            "52": "Cotton",
-            "61": "Articles of apparel and clothing accessories, knitted or crocheted",
-            "62": "Articles of apparel and clothing accessories, not knitted or crocheted",
-            "64": "Footwear, gaiters and the like",
-            "65": "Headgear and parts thereof",
-            "66": "Umbrellas, sun umbrellas, walking-sticks, seat-sticks, whips, riding-crops",
-            "67": "Prepared feathers and down and articles made of feathers or of down",
-            "68": "Articles of stone, plaster, cement, asbestos, mica or similar materials",
-            "69": "Ceramic products",
-            "70": "Glass and glassware",
-        }
-        return sector_mapping.get(chapter, f"Chapter {chapter}")
+        return HS_CONCORDANCE.chapter_name(chapter)
 
     def _get_region(self, country_name: str) -> str:
         """Determine region for a country"""
@@ -546,6 +755,7 @@ class AuthoritativeTariffParser:
 
 # Global instance
 authoritative_parser = AuthoritativeTariffParser()
+register_tracker(authoritative_parser.tracker)
 
 
 # Convenience functions
@@ -579,6 +789,20 @@ def get_tariff_summary() -> Dict[str, Any]:
     return authoritative_parser.get_tariff_summary()
 
 
+def calculate_effective_tariff_matrix(
+    hts_codes: Sequence[str], countries: Sequence[str]
+) -> EffectiveTariffMatrix:
+    """Get dense country x HTS effective tariff matrices"""
+    if not authoritative_parser.data_loaded:
+        authoritative_parser.load_excel_file()
+    return authoritative_parser.calculate_effective_tariff_matrix(hts_codes, countries)
+
+
+def query_hts_prefix(prefix: str, limit: int = 100) -> Dict[str, Any]:
+    """Get HTS codes and duty statistics under an HTS prefix"""
+    return authoritative_parser.query_hts_prefix(prefix, limit)
+
+
 if __name__ == "__main__":
     # Test the parser
     print("🧪 Testing Authoritative Tariff Parser...")
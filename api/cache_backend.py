@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Cache Backend
+=============
+
+Pluggable key/value cache shared by the upstream fetchers and parsers:
+- CacheBackend is the interface: get/set/delete/clear with per-entry TTLs,
+  plus get_or_compute()/aget_or_compute() which run the producer at most
+  once while other callers wait for its result
+- InProcessCache keeps entries in a dict; single-flight covers the
+  threads of one process
+- SQLiteCache keeps pickled entries in a local SQLite file in WAL mode and
+  coordinates producers through a lease row, so with several uvicorn or
+  gunicorn workers an upstream fetch or workbook parse runs once per host
+  and the other workers read its result (no external service needed)
+- get_cache_backend() returns the process-wide backend selected by
+  TIPM_CACHE_BACKEND ("sqlite", the default, or "memory"); the SQLite
+  file lives at data/cache.sqlite3 unless TIPM_CACHE_DB is set
+
+Falsy results (connectors return empty payloads on upstream errors) are
+returned but never cached, so a failed fetch is retried by the next caller.
+
+Usage:
+    cache = get_cache_backend()
+    data = await cache.aget_or_compute("usitc:country_china", fetch, ttl)
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv(
+    "TIPM_CACHE_DB",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "cache.sqlite3",
+    ),
+)
+DEFAULT_BACKEND = os.getenv("TIPM_CACHE_BACKEND", "sqlite").lower()
+
+# How long a producer may hold a key before another process takes over,
+# and how often waiting processes check for its result
+LEASE_TIMEOUT = timedelta(
+    seconds=int(os.getenv("TIPM_CACHE_LEASE_SECONDS", "120"))
+)
+POLL_INTERVAL = 0.05
+
+TTL = Union[timedelta, float, None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS cache_leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def _expires_at(ttl: TTL) -> Optional[float]:
+    """Absolute expiry (epoch seconds) for a TTL; None never expires"""
+    if ttl is None:
+        return None
+    seconds = ttl.total_seconds() if isinstance(ttl, timedelta) else float(ttl)
+    return time.time() + seconds
+
+
+class CacheBackend(ABC):
+    """Interface of the cache backends"""
+
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key, or default if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: TTL = None):
+        """Store value under key for ttl (timedelta or seconds; None = no expiry)"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Drop the entry for key, if any"""
+
+    @abstractmethod
+    def clear(self, prefix: str = ""):
+        """Drop every entry whose key starts with prefix"""
+
+    @abstractmethod
+    def get_or_compute(
+        self, key: str, compute: Callable[[], Any], ttl: TTL = None
+    ) -> Any:
+        """Cached value for key, computing and storing it at most once"""
+
+    @abstractmethod
+    async def aget_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl: TTL = None
+    ) -> Any:
+        """get_or_compute() for a coroutine producer"""
+
+
+_MISSING = object()
+
+
+def _async_lock(locks: Dict[Tuple[int, str], asyncio.Lock], key: str) -> asyncio.Lock:
+    """Per-key lock of the running event loop (asyncio locks bind to one loop)"""
+    return locks.setdefault((id(asyncio.get_running_loop()), key), asyncio.Lock())
+
+
+class InProcessCache(CacheBackend):
+    """Dict-backed cache; single-flight across the threads of one process"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._async_locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+
+    def _lookup(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._entries.pop(key, None)
+            return _MISSING
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: TTL = None):
+        self._entries[key] = (value, _expires_at(ttl))
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self, prefix: str = ""):
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._entries.pop(key, None)
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], Any], ttl: TTL = None
+    ) -> Any:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                value = compute()
+                if value:
+                    self.set(key, value, ttl)
+            return value
+
+    async def aget_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl: TTL = None
+    ) -> Any:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        key_lock = _async_lock(self._async_locks, key)
+        async with key_lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                value = await compute()
+                if value:
+                    self.set(key, value, ttl)
+            return value
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cross-process cache in a local SQLite file (WAL mode)
+
+    get_or_compute() takes a lease on the key before computing; processes
+    that find the lease held poll for the result instead of computing it
+    themselves, and take over if the lease expires without one.
+    """
+
+    def __init__(
+        self, db_path: str = DEFAULT_DB_PATH, lease_timeout: TTL = LEASE_TIMEOUT
+    ):
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self._token = uuid.uuid4().hex[:8]
+        self._initialized = False
+        # Threads and tasks of this process wait on each other rather than
+        # polling; leases only arbitrate between processes
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._async_locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+
+    @property
+    def owner(self) -> str:
+        """Lease owner id; includes the pid so forked workers differ"""
+        return f"{os.getpid()}:{self._token}"
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe across threads and processes)"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    def _lookup(self, key: str) -> Any:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return _MISSING
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"⚠️ Dropping unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return _MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: TTL = None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, blob, _expires_at(ttl)),
+            )
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = ""):
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'",
+                (pattern + "%",),
+            )
+
+    def _acquire(self, key: str) -> bool:
+        """Take the producer lease on key if it is free or expired"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT owner, expires_at FROM cache_leases WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] != self.owner and row[1] > now:
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_leases (key, owner, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, self.owner, _expires_at(self.lease_timeout)),
+                )
+                return True
+            finally:
+                conn.execute("COMMIT")
+
+    def _release(self, key: str):
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM cache_leases WHERE key = ? AND owner = ?",
+                (key, self.owner),
+            )
+
+    def _store(self, key: str, value: Any, ttl: TTL):
+        try:
+            if value:
+                self.set(key, value, ttl)
+        finally:
+            self._release(key)
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], Any], ttl: TTL = None
+    ) -> Any:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            while True:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    return value
+                if self._acquire(key):
+                    # Another process may have finished while we waited
+                    value = self._lookup(key)
+                    if value is not _MISSING:
+                        self._release(key)
+                        return value
+                    try:
+                        value = compute()
+                    except BaseException:
+                        self._release(key)
+                        raise
+                    self._store(key, value, ttl)
+                    return value
+                time.sleep(POLL_INTERVAL)
+
+    async def aget_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl: TTL = None
+    ) -> Any:
+        key_lock = _async_lock(self._async_locks, key)
+        async with key_lock:
+            while True:
+                value = await asyncio.to_thread(self._lookup, key)
+                if value is not _MISSING:
+                    return value
+                if await asyncio.to_thread(self._acquire, key):
+                    value = await asyncio.to_thread(self._lookup, key)
+                    if value is not _MISSING:
+                        await asyncio.to_thread(self._release, key)
+                        return value
+                    try:
+                        value = await compute()
+                    except BaseException:
+                        await asyncio.to_thread(self._release, key)
+                        raise
+                    await asyncio.to_thread(self._store, key, value, ttl)
+                    return value
+                await asyncio.sleep(POLL_INTERVAL)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def create_cache_backend(kind: str = DEFAULT_BACKEND, **kwargs) -> CacheBackend:
+    """Build a backend by name ("sqlite" or "memory")"""
+    if kind == "memory":
+        return InProcessCache()
+    if kind == "sqlite":
+        return SQLiteCache(**kwargs)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+def get_cache_backend() -> CacheBackend:
+    """The process-wide cache backend (created on first use)"""
+    global _backend
+    if _backend is None:
+        _backend = create_cache_backend()
+        logger.info(f"🗄️ Using {type(_backend).__name__} cache backend")
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> CacheBackend:
+    """Replace the process-wide backend (tests, embedded deployments)"""
+    global _backend
+    _backend = backend
+    return backend
+
+
+def _demo_parse(worker: int) -> str:
+    def expensive() -> str:
+        time.sleep(0.5)
+        return f"parsed by worker {worker} (pid {os.getpid()})"
+
+    return get_cache_backend().get_or_compute("demo:parse", expensive, ttl=60)
+
+
+if __name__ == "__main__":
+    import sys
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Usage: python cache_backend.py [WORKERS]
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    get_cache_backend().clear("demo:")
+    with ProcessPoolExecutor(workers) as pool:
+        print(f"📊 {workers} workers, one parse:")
+        for result in pool.map(_demo_parse, range(workers)):
+            print(f"  {result}")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Batch Chart Export
+==================
+
+Nightly export of every chart type for every country:
+- Countries are rendered in parallel worker processes
+- Each worker keeps one figure template per chart type and only updates
+  its data artists between countries instead of rebuilding the figure
+- Files are content-addressed (objects/<sha256[:2]>/<sha256>.<fmt>), so
+  unchanged charts are never rewritten and repeated exports deduplicate
+- manifest.json maps (country, chart type, format) to the current object
+  and records the dataset version it was drawn from
+
+Usage:
+    python chart_export.py [--output-dir DIR] [--countries A B ...]
+                           [--formats png svg] [--workers N] [--dpi N]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from chart_service import (
+    CHART_FORMATS,
+    DEFAULT_DPI,
+    TEMPLATES,
+    figure_to_bytes,
+    load_chart_dataset,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = os.getenv(
+    "TIPM_CHART_EXPORT_DIR",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "exports",
+        "charts",
+    ),
+)
+MANIFEST_NAME = "manifest.json"
+
+# Per-process figure templates, reused across every country a worker renders
+_templates: Dict[str, Any] = {}
+
+
+def _template(chart_type: str):
+    template = _templates.get(chart_type)
+    if template is None:
+        template = _templates[chart_type] = TEMPLATES[chart_type]()
+    return template
+
+
+def _write_atomic(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_object(output_dir: str, content: bytes, fmt: str) -> Dict[str, Any]:
+    """Store content under its hash; skips the write if it already exists"""
+    digest = hashlib.sha256(content).hexdigest()
+    relative_path = os.path.join("objects", digest[:2], f"{digest}.{fmt}")
+    path = os.path.join(output_dir, relative_path)
+    if not os.path.exists(path):
+        _write_atomic(path, content)
+    return {"sha256": digest, "path": relative_path, "bytes": len(content)}
+
+
+def export_country(
+    country: str,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    formats: Sequence[str] = ("png",),
+    dpi: int = DEFAULT_DPI,
+) -> List[Dict[str, Any]]:
+    """Render every chart type for one country; returns manifest entries"""
+    dataset = load_chart_dataset(country)
+    entries = []
+    for chart_type in TEMPLATES:
+        fig = _template(chart_type).update(dataset)
+        if fig is None:
+            continue
+        for fmt in formats:
+            entries.append(
+                {
+                    "country": country,
+                    "chart_type": chart_type,
+                    "format": fmt,
+                    "dataset_version": dataset.version,
+                    **write_object(output_dir, figure_to_bytes(fig, fmt, dpi), fmt),
+                }
+            )
+    return entries
+
+
+def default_countries() -> List[str]:
+    """Every country with real tariff data"""
+    from real_tariff_data_source import RealTariffDataSource
+
+    return list(RealTariffDataSource().tariff_data.keys())
+
+
+def export_charts(
+    countries: Optional[Sequence[str]] = None,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    formats: Sequence[str] = ("png",),
+    workers: Optional[int] = None,
+    dpi: int = DEFAULT_DPI,
+) -> Dict[str, Any]:
+    """Export all charts for the given countries and write the manifest"""
+    from refresh_scheduler import refresh_scheduler
+    from worker_pool import WorkerPool
+
+    for fmt in formats:
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+
+    countries = list(countries or default_countries())
+    started = time.time()
+
+    # Restore persisted upstream data (workers warm-start on their own)
+    refresh_scheduler.warm_start()
+
+    entries: List[Dict[str, Any]] = []
+    # A one-off batch job, so it may use every core
+    max_workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = WorkerPool(min(max_workers, len(countries)))
+    if pool.start():
+        try:
+            futures = {
+                country: pool.submit(export_country, country, output_dir, formats, dpi)
+                for country in countries
+            }
+            for country, future in futures.items():
+                try:
+                    entries.extend(future.result())
+                except Exception as e:
+                    logger.error(f"❌ Chart export failed for {country}: {e}")
+        finally:
+            pool.stop()
+    else:
+        for country in countries:
+            entries.extend(export_country(country, output_dir, formats, dpi))
+
+    entries.sort(key=lambda e: (e["country"], e["chart_type"], e["format"]))
+    manifest = {
+        "generated_at": datetime.now().isoformat(),
+        "countries": len(countries),
+        "duration_seconds": round(time.time() - started, 3),
+        "charts": entries,
+    }
+    _write_atomic(
+        os.path.join(output_dir, MANIFEST_NAME),
+        json.dumps(manifest, indent=2).encode("utf-8"),
+    )
+    logger.info(
+        f"✅ Exported {len(entries)} charts for {len(countries)} countries "
+        f"in {manifest['duration_seconds']}s to {output_dir}"
+    )
+    return manifest
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Export country charts")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--countries", nargs="+", default=None)
+    parser.add_argument(
+        "--formats", nargs="+", default=["png"], choices=sorted(CHART_FORMATS)
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    args = parser.parse_args(argv)
+
+    manifest = export_charts(
+        args.countries, args.output_dir, args.formats, args.workers, args.dpi
+    )
+    print(
+        f"📊 {len(manifest['charts'])} charts, {manifest['countries']} countries, "
+        f"{manifest['duration_seconds']}s → {args.output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
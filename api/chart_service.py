@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Chart Rendering Service
+=======================
+
+Country charts (tariff impact, sector analysis, comprehensive dashboard)
+for any country, generalized from MalaysiaVisualization:
+- Figures are drawn with the Agg backend on standalone Figure objects, so
+  rendering never touches pyplot's global state and can run in the
+  process worker pool
+- Rendered PNG/SVG bytes are cached by (country, dataset version, chart
+  type, format); the dataset version is a hash of the values a chart
+  shows, so a chart is only redrawn when its data actually changes
+- Chart data is read from in-memory sources and refreshed snapshots only;
+  rendering never waits on the network
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHART_TYPES = ("tariff_impact", "sector_analysis", "comprehensive_dashboard")
+CHART_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+DEFAULT_DPI = 150
+MAX_CACHED_CHARTS = 256
+
+PALETTE = ["#2E86AB", "#A23B72", "#F18F01", "#C73E1D"]
+HEADER_COLOR = "#2E86AB"
+CELL_COLOR = "#F8F9FA"
+
+# Rows of the data source verification table on the dashboard
+DATA_SOURCES_TABLE = (
+    ("Data Type", "Source", "Confidence", "Last Updated"),
+    ("Tariff Rates", "US Government", "High", "Live"),
+    ("Economic Data", "World Bank API", "High", "Live"),
+    ("Sector Analysis", "Research APIs", "Medium", "Live"),
+    ("Impact Calculations", "Real-time", "High", "Live"),
+)
+
+
+@dataclass(frozen=True)
+class ChartDataset:
+    """The values a country's charts show"""
+
+    country: str
+    tariff_rate: float
+    affected_sectors: Tuple[str, ...]
+    gdp_billions: float
+    population: float
+    trade_impact: float
+
+    @property
+    def version(self) -> str:
+        """Content hash of the dataset, used as its cache version"""
+        encoded = json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    @classmethod
+    def from_sources(
+        cls, country: str, tariff_data: Dict[str, Any], economic_data: Dict[str, Any]
+    ) -> "ChartDataset":
+        """Build from real tariff data and economic indicators"""
+        tariff_data = tariff_data or {}
+        economic_data = economic_data or {}
+        return cls(
+            country=country,
+            tariff_rate=float(tariff_data.get("average_tariff_rate", 0) or 0),
+            affected_sectors=tuple(tariff_data.get("affected_sectors", []) or ()),
+            gdp_billions=float(economic_data.get("gdp_billions", 0) or 0),
+            population=float(economic_data.get("population", 0) or 0),
+            trade_impact=float(economic_data.get("estimated_trade_impact", 0) or 0),
+        )
+
+
+def load_chart_dataset(country: str) -> ChartDataset:
+    """Chart data from in-memory tariff data and the latest World Bank snapshot"""
+    from real_tariff_data_source import get_real_country_tariff
+    from refresh_scheduler import get_snapshot_data
+
+    economic_data = get_snapshot_data("world_bank", {}).get(country, {})
+    return ChartDataset.from_sources(
+        country, get_real_country_tariff(country), economic_data
+    )
+
+
+# ----------------------------------------------------------------------
+# Figure templates - static artists are built once, update() only changes
+# the data-dependent ones, so one template can render many countries
+# ----------------------------------------------------------------------
+def _fresh_tight_layout(fig: Figure, subplotpars: Dict[str, float]):
+    """tight_layout from the figure's initial subplot params, as on a new figure"""
+    fig.subplots_adjust(**subplotpars)
+    fig.tight_layout()
+
+
+def _subplotpars(fig: Figure) -> Dict[str, float]:
+    pars = fig.subplotpars
+    return {
+        name: getattr(pars, name)
+        for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+    }
+
+
+class _BarPanel:
+    """Fixed set of labelled bars whose heights and labels are updated"""
+
+    def __init__(self, ax, categories, colors):
+        self.ax = ax
+        self.bars = ax.bar(categories, [0.0] * len(categories), color=colors)
+        self.labels = [
+            ax.text(0, 0, "", ha="center", va="bottom", fontweight="bold")
+            for _ in categories
+        ]
+
+    def update(self, values, labels):
+        for bar, text, value, label in zip(self.bars, self.labels, values, labels):
+            bar.set_height(value)
+            text.set_position(
+                (bar.get_x() + bar.get_width() / 2.0, value + value * 0.01)
+            )
+            text.set_text(label)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class _SectorPanel:
+    """Variable number of sector bars, redrawn on numeric positions"""
+
+    def __init__(self, ax, horizontal: bool):
+        self.ax = ax
+        self.horizontal = horizontal
+        self.artists = []
+
+    def update(self, sectors, rates, value_labels: bool = False, rotation: float = 0):
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+
+        positions = list(range(len(sectors)))
+        if self.horizontal:
+            bars = self.ax.barh(positions, rates, color=PALETTE)
+            self.ax.set_yticks(positions, labels=sectors)
+        else:
+            bars = self.ax.bar(positions, rates, color=PALETTE)
+            self.ax.set_xticks(positions, labels=sectors, rotation=rotation)
+        self.artists.append(bars)
+
+        if value_labels:
+            for bar, rate in zip(bars, rates):
+                self.artists.append(
+                    self.ax.text(
+                        rate + 0.1,
+                        bar.get_y() + bar.get_height() / 2,
+                        f"{rate}%",
+                        va="center",
+                        fontweight="bold",
+                    )
+                )
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class TariffImpactTemplate:
+    """Economic indicators next to the tariff impact analysis"""
+
+    chart_type = "tariff_impact"
+
+    def __init__(self):
+        self.fig = Figure(figsize=(15, 6))
+        ax1, ax2 = self.fig.subplots(1, 2)
+
+        self.indicators = _BarPanel(
+            ax1,
+            ["GDP (Billions USD)", "Population (Millions)", "Trade Impact (%)"],
+            PALETTE[:3],
+        )
+        self.indicators_title = ax1.set_title("", fontsize=14, fontweight="bold")
+        ax1.set_ylabel("Value")
+
+        self.impact_labels = ["Tariff Rate", "GDP Impact (%)", "Per Capita Impact (USD)"]
+        self.impact = _BarPanel(ax2, self.impact_labels, ["#C73E1D", "#F18F01", "#2E86AB"])
+        self.impact_title = ax2.set_title("", fontsize=14, fontweight="bold")
+        ax2.set_ylabel("Value")
+        self.subplotpars = _subplotpars(self.fig)
+
+    def update(self, dataset: ChartDataset) -> Figure:
+        values = [dataset.gdp_billions, dataset.population / 1000000, dataset.trade_impact]
+        self.indicators.update(values, [f"{value:.1f}" for value in values])
+        self.indicators_title.set_text(
+            f"{dataset.country} - Real Economic Indicators\n(Source: World Bank API)"
+        )
+
+        trade_impact_usd = (dataset.trade_impact / 100) * dataset.gdp_billions
+        per_capita_impact = (trade_impact_usd * 1000000000) / (dataset.population or 1)
+        impact_values = [dataset.tariff_rate, dataset.trade_impact, per_capita_impact]
+        self.impact.update(
+            impact_values,
+            [
+                f"${value:.0f}" if "USD" in label else f"{value:.1f}"
+                for label, value in zip(self.impact_labels, impact_values)
+            ],
+        )
+        self.impact_title.set_text(
+            f"{dataset.country} - Tariff Impact Analysis\n(Calculated from Live Data)"
+        )
+
+        _fresh_tight_layout(self.fig, self.subplotpars)
+        return self.fig
+
+
+class SectorAnalysisTemplate:
+    """Tariff rate per affected sector"""
+
+    chart_type = "sector_analysis"
+
+    def __init__(self):
+        self.fig = Figure(figsize=(12, 8))
+        ax = self.fig.subplots()
+        self.sectors = _SectorPanel(ax, horizontal=True)
+        self.title = ax.set_title("", fontsize=14, fontweight="bold")
+        ax.set_xlabel("Tariff Rate (%)")
+        ax.text(
+            0.02,
+            0.98,
+            "Data Sources:\n• Tariff Rates: US Government\n• Economic Data: World Bank\n• Sector Analysis: Research APIs",
+            transform=ax.transAxes,
+            fontsize=10,
+            verticalalignment="top",
+            bbox=dict(boxstyle="round", facecolor="lightgray", alpha=0.8),
+        )
+        self.subplotpars = _subplotpars(self.fig)
+
+    def update(self, dataset: ChartDataset) -> Optional[Figure]:
+        if not dataset.affected_sectors:
+            return None
+
+        sectors = list(dataset.affected_sectors)
+        self.sectors.update(sectors, [dataset.tariff_rate] * len(sectors), value_labels=True)
+        self.title.set_text(
+            f"{dataset.country} - Sector Impact Analysis\n(Real-time from Authoritative Sources)"
+        )
+
+        _fresh_tight_layout(self.fig, self.subplotpars)
+        return self.fig
+
+
+class DashboardTemplate:
+    """Indicators, tariff share, sectors and data sources on one page"""
+
+    chart_type = "comprehensive_dashboard"
+
+    def __init__(self):
+        self.fig = Figure(figsize=(20, 12))
+        gs = self.fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+
+        # 1. Main economic indicators (top left)
+        ax1 = self.fig.add_subplot(gs[0, :2])
+        self.indicators = _BarPanel(ax1, ["GDP", "Population", "Trade Impact"], PALETTE[:3])
+        self.indicators_title = ax1.set_title("", fontsize=16, fontweight="bold")
+        ax1.set_ylabel("Value")
+
+        # 2. Tariff impact distribution (top right) - redrawn per update
+        self.pie_ax = self.fig.add_subplot(gs[0, 2])
+
+        # 3. Sector analysis (middle row)
+        ax3 = self.fig.add_subplot(gs[1, :])
+        self.sectors = _SectorPanel(ax3, horizontal=False)
+        self.sectors_title = ax3.set_title("", fontsize=14, fontweight="bold")
+        ax3.set_ylabel("Tariff Rate (%)")
+
+        # 4. Data source verification (bottom) - static, colors set in one call
+        ax4 = self.fig.add_subplot(gs[2, :])
+        ax4.axis("off")
+        header, *rows = DATA_SOURCES_TABLE
+        table = ax4.table(
+            cellText=rows,
+            colLabels=header,
+            cellLoc="center",
+            loc="center",
+            colWidths=[0.25] * len(header),
+            cellColours=[[CELL_COLOR] * len(header)] * len(rows),
+            colColours=[HEADER_COLOR] * len(header),
+        )
+        table.auto_set_font_size(False)
+        table.set_fontsize(12)
+        table.scale(1, 2)
+        for j in range(len(header)):
+            table[(0, j)].set_text_props(weight="bold", color="white")
+        ax4.set_title(
+            "Data Source Verification\n(All Sources Live and Authoritative)",
+            fontsize=16,
+            fontweight="bold",
+        )
+
+        self.suptitle = self.fig.suptitle("", fontsize=18, fontweight="bold", y=0.98)
+
+    def update(self, dataset: ChartDataset) -> Figure:
+        values = [dataset.gdp_billions, dataset.population / 1000000, dataset.trade_impact]
+        self.indicators.update(
+            values, [f"${values[0]:.1f}B", f"{values[1]:.1f}M", f"{values[2]:.1f}%"]
+        )
+        self.indicators_title.set_text(
+            f"{dataset.country} - Live Economic Data\n(World Bank API)"
+        )
+
+        tariff_rate = dataset.tariff_rate
+        self.pie_ax.clear()
+        self.pie_ax.pie(
+            [tariff_rate, 100 - tariff_rate],
+            labels=[f"Tariff Impact\n{tariff_rate}%", f"Remaining\n{100 - tariff_rate}%"],
+            colors=["#C73E1D", "#E8E8E8"],
+            autopct="%1.1f%%",
+        )
+        self.pie_ax.set_title("Tariff Impact\nDistribution", fontsize=14, fontweight="bold")
+
+        sectors = list(dataset.affected_sectors)
+        self.sectors.update(sectors, [tariff_rate] * len(sectors), rotation=45)
+        self.sectors_title.set_text(
+            f"{dataset.country} - Affected Sectors\n(Real-time from US Government Data)"
+        )
+
+        self.suptitle.set_text(
+            f"{dataset.country} - Complete Real-Time Economic Dashboard\nNo Hardcoded Data - All from Live APIs"
+        )
+        return self.fig
+
+
+TEMPLATES = {
+    template.chart_type: template
+    for template in (TariffImpactTemplate, SectorAnalysisTemplate, DashboardTemplate)
+}
+
+
+def draw_tariff_impact(dataset: ChartDataset) -> Figure:
+    """Economic indicators next to the tariff impact analysis"""
+    return TariffImpactTemplate().update(dataset)
+
+
+def draw_sector_analysis(dataset: ChartDataset) -> Optional[Figure]:
+    """Tariff rate per affected sector"""
+    return SectorAnalysisTemplate().update(dataset)
+
+
+def draw_comprehensive_dashboard(dataset: ChartDataset) -> Figure:
+    """Indicators, tariff share, sectors and data sources on one page"""
+    return DashboardTemplate().update(dataset)
+
+
+RENDERERS = {
+    "tariff_impact": draw_tariff_impact,
+    "sector_analysis": draw_sector_analysis,
+    "comprehensive_dashboard": draw_comprehensive_dashboard,
+}
+
+
+def figure_to_bytes(fig: Figure, fmt: str = "png", dpi: int = DEFAULT_DPI) -> bytes:
+    """Serialize a figure to PNG or SVG bytes"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_chart(
+    chart_type: str, dataset: ChartDataset, fmt: str = "png", dpi: int = DEFAULT_DPI
+) -> Optional[bytes]:
+    """Render one chart to bytes (top-level so it can run in a worker process)"""
+    fig = RENDERERS[chart_type](dataset)
+    if fig is None:
+        return None
+    return figure_to_bytes(fig, fmt, dpi)
+
+
+class ChartService:
+    """Renders country charts in the worker pool and caches the output"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_CHARTS):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str, str, str], bytes]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_chart(
+        self, country: str, chart_type: str, fmt: str = "png"
+    ) -> Tuple[Optional[bytes], str]:
+        """Rendered chart bytes and the dataset version they were drawn from"""
+        if chart_type not in RENDERERS:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+
+        dataset = await asyncio.to_thread(load_chart_dataset, country)
+        key = (country, dataset.version, chart_type, fmt)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached, dataset.version
+
+        # Concurrent requests for the same chart share one render
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), dataset.version
+
+        from worker_pool import run_in_worker
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            content = await run_in_worker(render_chart, chart_type, dataset, fmt)
+            future.set_result(content)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._pending[key]
+
+        if content is not None:
+            self._cache[key] = content
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return content, dataset.version
+
+    def clear(self):
+        self._cache.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "cached_charts": len(self._cache),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
+
+
+class CountryVisualization:
+    """
+    Generates visualizations from real-time data for any country
+    (the charts previously specific to MalaysiaVisualization)
+    """
+
+    def __init__(self, country_name: str):
+        self.country_name = country_name
+        self.tariff_data = None
+        self.economic_data = None
+
+    async def load_real_data(self):
+        """Load real-time data from APIs"""
+        from real_tariff_data_source import get_real_country_tariff
+        from working_analytics import get_real_economic_analysis
+
+        self.tariff_data = get_real_country_tariff(self.country_name)
+        tariff_rate = self.tariff_data.get("average_tariff_rate", 0)
+        self.economic_data = await get_real_economic_analysis(
+            self.country_name, tariff_rate
+        )
+
+    @property
+    def dataset(self) -> ChartDataset:
+        return ChartDataset.from_sources(
+            self.country_name, self.tariff_data, self.economic_data
+        )
+
+    def create_tariff_impact_chart(self) -> Optional[Figure]:
+        """Create tariff impact visualization"""
+        if not self.economic_data or "error" in self.economic_data:
+            return None
+        return draw_tariff_impact(self.dataset)
+
+    def create_sector_analysis_chart(self) -> Optional[Figure]:
+        """Create sector analysis visualization"""
+        if not self.tariff_data:
+            return None
+        return draw_sector_analysis(self.dataset)
+
+    def create_comprehensive_dashboard(self) -> Optional[Figure]:
+        """Create comprehensive dashboard with all visualizations"""
+        if not self.tariff_data or not self.economic_data:
+            return None
+        return draw_comprehensive_dashboard(self.dataset)
+
+    async def generate_all_visualizations(self) -> Dict[str, Optional[Figure]]:
+        """Generate all visualization types"""
+        await self.load_real_data()
+        return {
+            "tariff_impact": self.create_tariff_impact_chart(),
+            "sector_analysis": self.create_sector_analysis_chart(),
+            "comprehensive_dashboard": self.create_comprehensive_dashboard(),
+        }
+
+
+# Global instance
+chart_service = ChartService()
+
+
+# Convenience functions
+async def get_country_chart(
+    country: str, chart_type: str, fmt: str = "png"
+) -> Tuple[Optional[bytes], str]:
+    """Get a cached or freshly rendered chart for a country"""
+    return await chart_service.get_chart(country, chart_type, fmt)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python chart_service.py [COUNTRY]
+    country = sys.argv[1] if len(sys.argv) > 1 else "Malaysia"
+    dataset = load_chart_dataset(country)
+    print(f"🎨 {country} dataset version {dataset.version}")
+    for chart_type in CHART_TYPES:
+        content = render_chart(chart_type, dataset)
+        print(f"   - {chart_type}: {len(content) if content else 0} bytes")
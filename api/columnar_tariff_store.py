@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Columnar Tariff Store
+=====================
+
+One in-memory, columnar representation of (country, sector, rate, status,
+source, effective_date) rows shared by all static tariff data modules:
+- comprehensive_tariff_data.COMPREHENSIVE_TARIFF_DATA
+- verified_public_data.VERIFIED_TARIFF_DATA
+- tariff_data.REAL_TARIFF_DATA
+- atlantic_council_fallback.ATLANTIC_COUNCIL_DATA
+- RealTariffDataSource.tariff_data
+
+Rows are grouped by country and addressed through per-country offsets, so
+averages, status counts and sector lists are NumPy slice reductions instead
+of nested dict walks. Repeated strings (sector, status, source, dates) are
+stored once in a vocabulary and referenced by small integer codes.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_STATUS = "Active"
+
+
+class _Vocabulary:
+    """Assigns stable integer codes to repeated strings while building"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class ColumnarTariffStore:
+    """
+    Columnar tariff rows with per-country offsets
+
+    Rows for country i live in [offsets[i], offsets[i + 1]) and keep the
+    insertion order of the source data, so sector lists come out in the
+    same order as the original dicts.
+    """
+
+    def __init__(
+        self,
+        countries: List[str],
+        offsets: np.ndarray,
+        sector_codes: np.ndarray,
+        rates: np.ndarray,
+        status_codes: np.ndarray,
+        source_codes: np.ndarray,
+        date_codes: np.ndarray,
+        sectors: List[str],
+        statuses: List[str],
+        sources: List[str],
+        dates: List[str],
+    ):
+        self.countries = tuple(countries)
+        self.country_index = {country: i for i, country in enumerate(countries)}
+        self.offsets = offsets
+        self.sector_codes = sector_codes
+        self.rates = rates
+        self.status_codes = status_codes
+        self.source_codes = source_codes
+        self.date_codes = date_codes
+        self.sectors = tuple(sectors)
+        self.statuses = tuple(statuses)
+        self.sources = tuple(sources)
+        self.dates = tuple(dates)
+        self._status_lookup = {status: code for code, status in enumerate(statuses)}
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Tuple[str, str, float, str, str, str]]
+    ) -> "ColumnarTariffStore":
+        """Build from (country, sector, rate, status, source, effective_date) rows"""
+        sector_vocab, status_vocab = _Vocabulary(), _Vocabulary()
+        source_vocab, date_vocab = _Vocabulary(), _Vocabulary()
+
+        # Group rows by country while preserving first-seen order
+        grouped: Dict[str, List[Tuple[int, float, int, int, int]]] = {}
+        for country, sector, rate, status, source, effective_date in rows:
+            grouped.setdefault(country, []).append(
+                (
+                    sector_vocab.encode(sector),
+                    float(rate or 0.0),
+                    status_vocab.encode(status or DEFAULT_STATUS),
+                    source_vocab.encode(source or ""),
+                    date_vocab.encode(str(effective_date or "")),
+                )
+            )
+
+        countries = list(grouped.keys())
+        counts = [len(grouped[country]) for country in countries]
+        offsets = np.zeros(len(countries) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        flat = [row for country in countries for row in grouped[country]]
+        columns = list(zip(*flat)) if flat else [(), (), (), (), ()]
+
+        return cls(
+            countries=countries,
+            offsets=offsets,
+            sector_codes=np.array(columns[0], dtype=np.int32),
+            rates=np.array(columns[1], dtype=np.float64),
+            status_codes=np.array(columns[2], dtype=np.int8),
+            source_codes=np.array(columns[3], dtype=np.int32),
+            date_codes=np.array(columns[4], dtype=np.int32),
+            sectors=sector_vocab.values,
+            statuses=status_vocab.values,
+            sources=source_vocab.values,
+            dates=date_vocab.values,
+        )
+
+    @classmethod
+    def from_nested(
+        cls, data: Mapping[str, Mapping[str, Mapping[str, Any]]]
+    ) -> "ColumnarTariffStore":
+        """
+        Build from the country -> sector -> info dicts used by the static
+        data modules (entries without a status are treated as Active)
+        """
+        return cls.from_rows(
+            (
+                country,
+                sector,
+                info.get("tariff_rate", 0.0),
+                info.get("status", DEFAULT_STATUS),
+                info.get("source", ""),
+                info.get("effective_date", ""),
+            )
+            for country, sector_map in data.items()
+            for sector, info in sector_map.items()
+            if isinstance(info, Mapping)
+        )
+
+    @classmethod
+    def from_real_tariff_data(
+        cls, tariff_data: Mapping[str, Mapping[str, Any]]
+    ) -> "ColumnarTariffStore":
+        """
+        Build from RealTariffDataSource.tariff_data, one row per
+        tariff_details category (zero-rate categories are Exempt)
+        """
+        return cls.from_rows(
+            (
+                country,
+                category,
+                rate,
+                DEFAULT_STATUS if rate > 0 else "Exempt",
+                country_data.get("source", ""),
+                country_data.get("effective_date", ""),
+            )
+            for country, country_data in tariff_data.items()
+            for category, rate in country_data.get("tariff_details", {}).items()
+        )
+
+    # ------------------------------------------------------------------
+    # Slice reductions
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    def __contains__(self, country: str) -> bool:
+        return country in self.country_index
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(
+            array.nbytes
+            for array in (
+                self.offsets,
+                self.sector_codes,
+                self.rates,
+                self.status_codes,
+                self.source_codes,
+                self.date_codes,
+            )
+        )
+
+    def country_slice(self, country: str) -> slice:
+        """Row range for a country (empty if unknown)"""
+        i = self.country_index.get(country)
+        if i is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def _mask(
+        self, rows: slice, statuses: Optional[Iterable[str]], positive_only: bool
+    ) -> np.ndarray:
+        mask = np.ones(rows.stop - rows.start, dtype=bool)
+        if statuses is not None:
+            if isinstance(statuses, str):
+                statuses = (statuses,)
+            codes = [self._status_lookup[s] for s in statuses if s in self._status_lookup]
+            mask &= np.isin(self.status_codes[rows], codes)
+        if positive_only:
+            mask &= self.rates[rows] > 0
+        return mask
+
+    def sector_count(self, country: str) -> int:
+        """Number of rows (sectors/categories) for a country"""
+        rows = self.country_slice(country)
+        return rows.stop - rows.start
+
+    def count(
+        self,
+        country: str,
+        status: Optional[Iterable[str]] = None,
+        positive_only: bool = False,
+    ) -> int:
+        """Number of rows for a country matching status (str or iterable)"""
+        rows = self.country_slice(country)
+        return int(np.count_nonzero(self._mask(rows, status, positive_only)))
+
+    def total_rate(
+        self,
+        country: str,
+        status: Optional[Iterable[str]] = DEFAULT_STATUS,
+        positive_only: bool = False,
+    ) -> float:
+        """Sum of rates for a country's rows matching status"""
+        rows = self.country_slice(country)
+        mask = self._mask(rows, status, positive_only)
+        return float(self.rates[rows][mask].sum())
+
+    def average_rate(
+        self,
+        country: str,
+        status: Optional[Iterable[str]] = DEFAULT_STATUS,
+        positive_only: bool = False,
+    ) -> float:
+        """Mean rate of a country's rows matching status (0.0 if none match)"""
+        rows = self.country_slice(country)
+        mask = self._mask(rows, status, positive_only)
+        matched = self.rates[rows][mask]
+        return float(matched.mean()) if matched.size else 0.0
+
+    def status_counts(self, country: str) -> Dict[str, int]:
+        """Row count per status for a country"""
+        rows = self.country_slice(country)
+        counts = np.bincount(self.status_codes[rows], minlength=len(self.statuses))
+        return {status: int(counts[code]) for code, status in enumerate(self.statuses)}
+
+    def sector_names(
+        self,
+        country: str,
+        status: Optional[Iterable[str]] = None,
+        positive_only: bool = False,
+    ) -> List[str]:
+        """Sector names for a country, optionally filtered by status"""
+        rows = self.country_slice(country)
+        codes = self.sector_codes[rows][self._mask(rows, status, positive_only)]
+        return [self.sectors[code] for code in codes]
+
+    def source_names(
+        self,
+        country: str,
+        status: Optional[Iterable[str]] = None,
+        positive_only: bool = False,
+    ) -> List[str]:
+        """Source (legal basis) of each matching row for a country"""
+        rows = self.country_slice(country)
+        codes = self.source_codes[rows][self._mask(rows, status, positive_only)]
+        return [self.sources[code] for code in codes]
+
+    def reduce_by_country(self, values: np.ndarray, ufunc=np.add) -> np.ndarray:
+        """Reduce a per-row array to one value per country (identity if empty)"""
+        starts = self.offsets[:-1]
+        nonempty = self.offsets[1:] > starts
+        if values.dtype == bool:
+            values = values.astype(np.int64)
+        reduced = np.zeros(len(self.countries), dtype=values.dtype)
+        if nonempty.any():
+            reduced[nonempty] = ufunc.reduceat(values, starts[nonempty])
+        return reduced
+
+    def average_rates_by_country(
+        self, status: Optional[Iterable[str]] = DEFAULT_STATUS
+    ) -> Dict[str, float]:
+        """Mean matching rate for every country in one vectorized pass"""
+        mask = self._mask(slice(0, len(self)), status, positive_only=False)
+        sums = self.reduce_by_country(np.where(mask, self.rates, 0.0))
+        counts = self.reduce_by_country(mask)
+        averages = np.divide(
+            sums, counts, out=np.zeros_like(sums), where=counts > 0
+        )
+        return dict(zip(self.countries, averages.tolist()))
+
+
+@dataclass(frozen=True)
+class CountryProfile:
+    """
+    Precomputed status partition and sector keyword flags for one country
+
+    Built once per store so summary, insight and mitigation text can be
+    generated in constant time per country.
+    """
+
+    country: str
+    total_sectors: int
+    active_count: int
+    exempt_count: int
+    quota_count: int
+    active_total_rate: float
+    flags: FrozenSet[str]
+
+    @classmethod
+    def empty(cls, country: str) -> "CountryProfile":
+        """Profile for a country with no tariff rows"""
+        return cls(country, 0, 0, 0, 0, 0.0, frozenset())
+
+    @property
+    def active_average_rate(self) -> float:
+        return (
+            self.active_total_rate / self.active_count if self.active_count else 0.0
+        )
+
+    @property
+    def status(self) -> str:
+        """Overall label; active tariffs take precedence over exemptions"""
+        if self.active_count:
+            return "Active Tariffs"
+        if self.exempt_count:
+            return "Exempted"
+        if self.quota_count:
+            return "Quota Agreement"
+        return "No Tariffs"
+
+
+# Keyword flags matched as substrings of sector names (any status)
+SECTOR_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "technology": ("Technology",),
+    "steel_aluminum": ("Steel", "Aluminum"),
+}
+
+
+def build_country_profiles(
+    store: ColumnarTariffStore,
+    keywords: Mapping[str, Tuple[str, ...]] = SECTOR_KEYWORDS,
+) -> Dict[str, CountryProfile]:
+    """Build a CountryProfile for every country in the store"""
+    def status_mask(status: str) -> np.ndarray:
+        code = store._status_lookup.get(status)
+        if code is None:
+            return np.zeros(len(store), dtype=bool)
+        return store.status_codes == code
+
+    active = status_mask("Active")
+    active_counts = store.reduce_by_country(active)
+    exempt_counts = store.reduce_by_country(status_mask("Exempt"))
+    quota_counts = store.reduce_by_country(status_mask("Quota"))
+    active_totals = store.reduce_by_country(np.where(active, store.rates, 0.0))
+    sector_counts = np.diff(store.offsets)
+
+    # Match keywords once per distinct sector name, then OR-reduce per country
+    flag_matrix = {}
+    for flag, words in keywords.items():
+        vocab_hits = np.array(
+            [any(word in sector for word in words) for sector in store.sectors],
+            dtype=bool,
+        )
+        flag_matrix[flag] = store.reduce_by_country(vocab_hits[store.sector_codes]) > 0
+
+    return {
+        country: CountryProfile(
+            country=country,
+            total_sectors=int(sector_counts[i]),
+            active_count=int(active_counts[i]),
+            exempt_count=int(exempt_counts[i]),
+            quota_count=int(quota_counts[i]),
+            active_total_rate=float(active_totals[i]),
+            flags=frozenset(flag for flag, hits in flag_matrix.items() if hits[i]),
+        )
+        for i, country in enumerate(store.countries)
+    }
@@ -20,7 +20,15 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+from columnar_tariff_store import (
+    ColumnarTariffStore,
+    CountryProfile,
+    build_country_profiles,
+)
+from records import intern_fields
+from temporal_tariff_store import DateLike, TemporalTariffStore
+
+@dataclass(frozen=True, slots=True)
 class TariffInfo:
     country: str
     sector: str
@@ -31,6 +39,11 @@ class TariffInfo:
     notes: str
     status: str  # Active, Expired, Under Review
 
+    def __post_init__(self):
+        intern_fields(
+            self, "country", "sector", "effective_date", "source", "status"
+        )
+
 # Comprehensive US-imposed tariff data (August 2025)
 COMPREHENSIVE_TARIFF_DATA = {
     # ASIA-PACIFIC REGION
@@ -652,6 +665,21 @@ COMPREHENSIVE_TARIFF_DATA = {
     }
 }
 
+# Columnar copy of COMPREHENSIVE_TARIFF_DATA (the dict is never mutated)
+TARIFF_STORE = ColumnarTariffStore.from_nested(COMPREHENSIVE_TARIFF_DATA)
+
+# Per-country status partitions and sector keyword flags
+COUNTRY_PROFILES = build_country_profiles(TARIFF_STORE)
+
+# Effective-date index of COMPREHENSIVE_TARIFF_DATA for as-of queries
+TEMPORAL_STORE = TemporalTariffStore.from_nested(COMPREHENSIVE_TARIFF_DATA)
+
+
+def get_country_profile(country_name: str) -> CountryProfile:
+    """Get the precomputed tariff profile for a country"""
+    return COUNTRY_PROFILES.get(country_name) or CountryProfile.empty(country_name)
+
+
 def get_country_tariffs(country_name: str) -> Dict[str, Dict]:
     """Get all tariff information for a specific country"""
     return COMPREHENSIVE_TARIFF_DATA.get(country_name, {})
@@ -661,62 +689,33 @@ def get_country_sector_tariff(country_name: str, sector: str) -> Optional[Dict]:
     country_tariffs = get_country_tariffs(country_name)
     return country_tariffs.get(sector)
 
-def get_country_average_tariff(country_name: str) -> float:
-    """Calculate average tariff rate for a country across all sectors"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return 0.0
-    
+def get_country_average_tariff(country_name: str, as_of: DateLike = None) -> float:
+    """Calculate average tariff rate for a country across all sectors, optionally as of a past date"""
     # Only count active tariffs (exclude exempt and quota status)
-    active_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"]
-    if not active_tariffs:
-        return 0.0
-    
-    total_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs)
-    return total_rate / len(active_tariffs)
+    if as_of is not None:
+        return TEMPORAL_STORE.average_rate(country_name, as_of, status="Active")
+    return TARIFF_STORE.average_rate(country_name, status="Active")
 
-def get_affected_sectors(country_name: str) -> List[str]:
+def get_affected_sectors(country_name: str, as_of: DateLike = None) -> List[str]:
     """Get list of sectors affected by US tariffs for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return []
-    
     # Only return sectors with active tariffs
-    return [sector for sector, tariff in country_tariffs.items() if tariff["status"] == "Active"]
+    if as_of is not None:
+        return [version.sector for version in TEMPORAL_STORE.versions_as_of(country_name, as_of)]
+    return TARIFF_STORE.sector_names(country_name, status="Active")
 
 def get_total_tariff_impact(country_name: str) -> Dict[str, Any]:
     """Calculate total tariff impact for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    profile = COUNTRY_PROFILES.get(country_name)
+    if profile is None:
         return {"total_rate": 0.0, "affected_sectors": 0, "average_rate": 0.0, "status": "No Tariffs"}
     
-    active_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"]
-    exempt_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Exempt"]
-    quota_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Quota"]
-    
-    if active_tariffs:
-        total_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs)
-        affected_sectors = len(active_tariffs)
-        average_rate = total_rate / affected_sectors
-        status = "Active Tariffs"
-    else:
-        total_rate = 0.0
-        affected_sectors = 0
-        average_rate = 0.0
-        if exempt_tariffs:
-            status = "Exempted"
-        elif quota_tariffs:
-            status = "Quota Agreement"
-        else:
-            status = "No Tariffs"
-    
     return {
-        "total_rate": total_rate,
-        "affected_sectors": affected_sectors,
-        "average_rate": average_rate,
-        "status": status,
-        "exempt_sectors": len(exempt_tariffs),
-        "quota_sectors": len(quota_tariffs)
+        "total_rate": profile.active_total_rate,
+        "affected_sectors": profile.active_count,
+        "average_rate": profile.active_average_rate,
+        "status": profile.status,
+        "exempt_sectors": profile.exempt_count,
+        "quota_sectors": profile.quota_count
     }
 
 def get_sector_analysis(country_name: str) -> List[Dict[str, Any]]:
@@ -757,14 +756,13 @@ def get_sector_analysis(country_name: str) -> List[Dict[str, Any]]:
 
 def get_economic_insights(country_name: str) -> List[str]:
     """Get economic insights for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    profile = get_country_profile(country_name)
+    if not profile.total_sectors:
         return ["This country is not currently affected by US tariffs"]
     
     insights = []
-    impact_summary = get_total_tariff_impact(country_name)
-    affected_sectors = impact_summary["affected_sectors"]
-    status = impact_summary["status"]
+    affected_sectors = profile.active_count
+    status = profile.status
     
     if status == "Exempted":
         insights.append("Currently exempted from US tariffs under trade agreements")
@@ -775,7 +773,7 @@ def get_economic_insights(country_name: str) -> List[str]:
         insights.append("Managed trade relationship with US")
         insights.append("Limited but controlled economic impact")
     elif affected_sectors > 0:
-        avg_rate = impact_summary["average_rate"]
+        avg_rate = profile.active_average_rate
         insights.append(f"Currently affected by US tariffs in {affected_sectors} sectors")
         insights.append(f"Average tariff rate: {avg_rate:.1f}%")
         
@@ -800,14 +798,14 @@ def get_economic_insights(country_name: str) -> List[str]:
             ])
         
         # Add sector-specific insights
-        if any("Technology" in sector for sector in country_tariffs.keys()):
+        if "technology" in profile.flags:
             insights.extend([
                 "Critical for US tech supply chain",
                 "High risk of innovation disruption",
                 "Potential for increased domestic tech investment"
             ])
         
-        if any("Steel" in sector or "Aluminum" in sector for sector in country_tariffs.keys()):
+        if "steel_aluminum" in profile.flags:
             insights.extend([
                 "National security implications",
                 "Impact on US manufacturing costs",
@@ -818,12 +816,11 @@ def get_economic_insights(country_name: str) -> List[str]:
 
 def get_mitigation_strategies(country_name: str) -> List[str]:
     """Get potential mitigation strategies for affected countries"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    profile = get_country_profile(country_name)
+    if not profile.total_sectors:
         return ["No mitigation needed - country not affected"]
     
-    impact_summary = get_total_tariff_impact(country_name)
-    status = impact_summary["status"]
+    status = profile.status
     
     if status == "Exempted":
         return ["Maintain trade agreement compliance", "Strengthen strategic alliance", "Continue preferential trade relationship"]
@@ -841,18 +838,21 @@ def get_mitigation_strategies(country_name: str) -> List[str]:
     
     return strategies
 
-def get_country_summary(country_name: str) -> Dict[str, Any]:
-    """Get comprehensive summary for a country"""
-    tariffs = get_country_tariffs(country_name)
-    impact = get_total_tariff_impact(country_name)
+def get_country_summary(country_name: str, as_of: DateLike = None) -> Dict[str, Any]:
+    """Get comprehensive summary for a country, optionally as of a past date"""
+    if as_of is not None:
+        profile = TEMPORAL_STORE.profile(country_name, as_of)
+    else:
+        profile = get_country_profile(country_name)
     
     return {
         "country": country_name,
-        "total_sectors": len(tariffs),
-        "active_tariffs": impact["affected_sectors"],
-        "exempt_sectors": impact["exempt_sectors"],
-        "quota_sectors": impact["quota_sectors"],
-        "average_tariff_rate": impact["average_rate"],
-        "status": impact["status"],
+        "total_sectors": profile.total_sectors,
+        "active_tariffs": profile.active_count,
+        "exempt_sectors": profile.exempt_count,
+        "quota_sectors": profile.quota_count,
+        "average_tariff_rate": profile.active_average_rate,
+        "status": profile.status,
+        "as_of": str(as_of) if as_of is not None else None,
         "last_updated": datetime.now().isoformat()
     }
@@ -13,10 +13,12 @@ All data retrieved from live, official sources.
 
 import pandas as pd
 import os
-import asyncio
+from collections.abc import Mapping
 from typing import Dict, List, Optional, Tuple
 import logging
-from datetime import datetime
+
+from refresh_scheduler import get_snapshot_data
+from temporal_tariff_store import DateLike, TemporalTariffStore
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +29,10 @@ class CorrectTariffCalculator:
     def __init__(self):
         self.excel_data = None
         self.atlantic_council_data = None
-        self.live_data_cache = {}
-        self.cache_expiry = None
+        self.atlantic_council_store = None
+        # Effective-date indexes for as-of queries
+        self.excel_temporal_store = None
+        self.atlantic_council_temporal_store = None
         self.load_data()
 
     def load_data(self):
@@ -41,6 +45,10 @@ class CorrectTariffCalculator:
             success = authoritative_parser.load_excel_file()
             if success:
                 self.excel_data = authoritative_parser
+                self.excel_temporal_store = TemporalTariffStore.from_rules(
+                    authoritative_parser.country_rates.values()
+                )
+                authoritative_parser.tracker.add_listener(self._on_excel_diff)
                 logger.info(
                     f"✅ Loaded authoritative Excel data: {len(authoritative_parser.country_rates)} countries"
                 )
@@ -54,45 +62,34 @@ class CorrectTariffCalculator:
             import atlantic_council_fallback
 
             self.atlantic_council_data = atlantic_council_fallback.ATLANTIC_COUNCIL_DATA
+            self.atlantic_council_store = atlantic_council_fallback.TARIFF_STORE
+            self.atlantic_council_temporal_store = (
+                atlantic_council_fallback.TEMPORAL_STORE
+            )
             logger.info(
                 f"✅ Loaded Atlantic Council data: {len(self.atlantic_council_data)} countries"
             )
         except Exception as e:
             logger.error(f"❌ Failed to load Atlantic Council data: {e}")
 
-    async def get_live_data(self, country_name: str = None) -> Dict:
-        """Get live data from authoritative APIs with caching"""
-
-        # Check cache validity (refresh every 6 hours)
-        now = datetime.now()
-        if (
-            self.cache_expiry is None
-            or now > self.cache_expiry
-            or not self.live_data_cache
-        ):
-
-            try:
-                from live_authoritative_connector import get_live_authoritative_data
-
-                logger.info("Fetching fresh live data from official APIs...")
-
-                live_data = await get_live_authoritative_data(country_name)
-
-                if live_data and "error" not in live_data:
-                    self.live_data_cache = live_data
-                    self.cache_expiry = now.replace(hour=now.hour + 6)
-                    logger.info("✅ Successfully retrieved live authoritative data")
-                else:
-                    logger.warning(
-                        "⚠️ Live data unavailable, using cached/fallback data"
-                    )
+    def _on_excel_diff(self, diff, dataset):
+        """Re-index the dated Excel rules after a workbook reload"""
+        self.excel_temporal_store = TemporalTariffStore.from_rules(
+            self.excel_data.country_rates.values()
+        )
 
-            except Exception as e:
-                logger.error(f"❌ Failed to fetch live data: {e}")
+    def get_live_data(self) -> Dict:
+        """
+        Get the latest live data published by the background refresh scheduler
 
-        return self.live_data_cache
+        This is an in-memory lookup only - the network fetch runs on the
+        scheduler's own cadence, never inside a request handler.
+        """
+        return get_snapshot_data("live_tariffs", {})
 
-    def get_country_tariff_rate(self, country_name: str) -> Tuple[float, str, str]:
+    def get_country_tariff_rate(
+        self, country_name: str, as_of: DateLike = None
+    ) -> Tuple[float, str, str]:
         """
         Get correct tariff rate for a country using prioritized data sources
 
@@ -101,13 +98,19 @@ class CorrectTariffCalculator:
         2. Official Excel data from USTR
         3. Atlantic Council verified fallback data
 
+        With as_of (ISO date string or date) the rate in effect on that
+        date is returned instead; live data only describes today, so it is
+        skipped and the dated Excel and Atlantic Council entries are used.
+
         Returns:
             (tariff_rate, data_source, confidence_level)
         """
+        if as_of is not None:
+            return self.get_country_tariff_rate_as_of(country_name, as_of)
 
         # 1. Try live authoritative data first (highest priority)
         try:
-            live_data = asyncio.run(self.get_live_data(country_name))
+            live_data = self.get_live_data()
             if live_data and "tariff_data" in live_data:
                 country_tariffs = live_data["tariff_data"].get(country_name, {})
                 if country_tariffs:
@@ -117,7 +120,7 @@ class CorrectTariffCalculator:
                     sources = []
 
                     for sector, tariff_info in country_tariffs.items():
-                        if isinstance(tariff_info, dict):
+                        if isinstance(tariff_info, Mapping):
                             rate = tariff_info.get("tariff_rate", 0)
                             source = tariff_info.get("source", "Unknown")
                             if rate > 0:
@@ -152,25 +155,13 @@ class CorrectTariffCalculator:
                 logger.debug(f"Excel data lookup failed for {country_name}: {e}")
 
         # 3. Fallback to Atlantic Council verified data
-        if self.atlantic_council_data and country_name in self.atlantic_council_data:
-            ac_data = self.atlantic_council_data[country_name]
-
-            # Calculate average rate from active tariffs
-            total_rate = 0
-            active_count = 0
-
-            for sector_name, sector_data in ac_data.items():
-                if (
-                    isinstance(sector_data, dict)
-                    and sector_data.get("status") == "Active"
-                ):
-                    rate = sector_data.get("tariff_rate", 0)
-                    if rate > 0:
-                        total_rate += rate
-                        active_count += 1
-
-            if active_count > 0:
-                avg_rate = total_rate / active_count
+        store = self.atlantic_council_store
+        if store is not None and country_name in store:
+            # Calculate average rate from active, non-zero tariffs
+            if store.count(country_name, status="Active", positive_only=True):
+                avg_rate = store.average_rate(
+                    country_name, status="Active", positive_only=True
+                )
                 return (
                     avg_rate,
                     "Atlantic Council Tracker",
@@ -180,6 +171,34 @@ class CorrectTariffCalculator:
         # 4. Default to 0% (no tariffs found in any source)
         return (0.0, "No Data", "Low - No US tariffs currently imposed")
 
+    def get_country_tariff_rate_as_of(
+        self, country_name: str, as_of: DateLike
+    ) -> Tuple[float, str, str]:
+        """get_country_tariff_rate() for the tariffs in effect on as_of"""
+        if self.excel_temporal_store is not None:
+            rule = self.excel_temporal_store.version(country_name, "Reciprocal", as_of)
+            if rule is not None:
+                return (
+                    rule.tariff_rate,
+                    f"USTR Excel - {rule.source}",
+                    "High - Official US Trade Representative data",
+                )
+
+        store = self.atlantic_council_temporal_store
+        avg_rate = (
+            store.average_rate(country_name, as_of, status="Active", positive_only=True)
+            if store is not None
+            else 0.0
+        )
+        if avg_rate > 0:
+            return (
+                avg_rate,
+                "Atlantic Council Tracker",
+                "Medium - Atlantic Council verified tariff data",
+            )
+
+        return (0.0, "No Data", f"Low - No US tariffs in effect on {as_of}")
+
     def get_affected_sectors(self, country_name: str) -> List[str]:
         """Get list of sectors affected by tariffs"""
 
@@ -199,20 +218,11 @@ class CorrectTariffCalculator:
                     return ["General Trade"]
 
         # Fallback to Atlantic Council sectors
-        if self.atlantic_council_data and country_name in self.atlantic_council_data:
-            ac_data = self.atlantic_council_data[country_name]
-            sectors = []
-
-            for sector_name, sector_data in ac_data.items():
-                if (
-                    isinstance(sector_data, dict)
-                    and sector_data.get("status") == "Active"
-                ):
-                    rate = sector_data.get("tariff_rate", 0)
-                    if rate > 0:
-                        sectors.append(sector_name)
-
-            return sectors
+        store = self.atlantic_council_store
+        if store is not None and country_name in store:
+            return store.sector_names(
+                country_name, status="Active", positive_only=True
+            )
 
         return []
 
@@ -241,9 +251,11 @@ class CorrectTariffCalculator:
 calculator = CorrectTariffCalculator()
 
 
-def get_correct_country_rate(country_name: str) -> Tuple[float, str, str]:
-    """Get correct tariff rate for a country"""
-    return calculator.get_country_tariff_rate(country_name)
+def get_correct_country_rate(
+    country_name: str, as_of: DateLike = None
+) -> Tuple[float, str, str]:
+    """Get correct tariff rate for a country, optionally as of a past date"""
+    return calculator.get_country_tariff_rate(country_name, as_of)
 
 
 def get_correct_affected_sectors(country_name: str) -> List[str]:
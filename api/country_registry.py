@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Country Registry
+================
+
+One immutable table of every country the API knows about, loaded once:
+- Slotted, frozen records with ISO2/ISO3 codes, continent, economic
+  groups, emerging-market flag and aliases ("UK", "EU", "Viet Nam")
+- Each record has a small integer ID equal to its position, so per-request
+  metadata is an index into a tuple and per-country arrays can be sized
+  and indexed by ID
+- Names, aliases and ISO codes all resolve case-insensitively through one
+  dict, so "EU" and "European Union" are the same country everywhere
+
+Names and strings are interned; the registry is never mutated after load.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from text_matcher import AhoCorasick
+
+
+@dataclass(frozen=True, slots=True)
+class CountryRecord:
+    id: int
+    name: str
+    iso2: str
+    iso3: str
+    continent: str
+    groups: Tuple[str, ...]
+    emerging_market: bool
+    aliases: Tuple[str, ...]
+
+
+# (name, ISO2, ISO3, continent, groups, emerging market, aliases)
+# The first block is the analysis set served by /api/countries, in order.
+COUNTRY_TABLE = (
+    ("China", "CN", "CHN", "Asia", ("G20", "BRICS"), True, ("PRC",)),
+    ("Hong Kong", "HK", "HKG", "Asia", (), False, ("Hong Kong SAR",)),
+    ("Macau", "MO", "MAC", "Asia", (), False, ("Macao",)),
+    ("Russia", "RU", "RUS", "Europe", ("G20", "BRICS"), True, ("Russian Federation",)),
+    ("Ukraine", "UA", "UKR", "Europe", (), False, ()),
+    ("Turkey", "TR", "TUR", "Middle East", ("G20",), True, ("Turkiye", "Türkiye")),
+    ("India", "IN", "IND", "Asia", ("G20", "BRICS"), True, ()),
+    ("Brazil", "BR", "BRA", "Americas", ("G20", "BRICS"), True, ()),
+    ("Mexico", "MX", "MEX", "Americas", ("G20",), True, ()),
+    ("Canada", "CA", "CAN", "Americas", ("G7", "G20"), False, ()),
+    ("Japan", "JP", "JPN", "Asia", ("G7", "G20"), False, ()),
+    (
+        "South Korea",
+        "KR",
+        "KOR",
+        "Asia",
+        ("G20",),
+        False,
+        ("Korea", "Republic of Korea"),
+    ),
+    ("European Union", "EU", "EUU", "Europe", ("G7",), False, ("EU",)),
+    ("Germany", "DE", "DEU", "Europe", ("G7", "G20", "EU"), False, ()),
+    ("France", "FR", "FRA", "Europe", ("G7", "G20", "EU"), False, ()),
+    (
+        "United Kingdom",
+        "GB",
+        "GBR",
+        "Europe",
+        ("G7", "G20"),
+        False,
+        ("UK", "Great Britain", "Britain"),
+    ),
+    ("Italy", "IT", "ITA", "Europe", ("G7", "G20", "EU"), False, ()),
+    ("Spain", "ES", "ESP", "Europe", ("EU",), False, ()),
+    ("Netherlands", "NL", "NLD", "Europe", ("EU",), False, ("Holland",)),
+    ("Belgium", "BE", "BEL", "Europe", ("EU",), False, ()),
+    ("Switzerland", "CH", "CHE", "Europe", (), False, ()),
+    ("Australia", "AU", "AUS", "Oceania", ("G20",), False, ()),
+    ("Singapore", "SG", "SGP", "Asia", (), False, ()),
+    ("Malaysia", "MY", "MYS", "Asia", (), True, ()),
+    ("Thailand", "TH", "THA", "Asia", (), True, ()),
+    ("Vietnam", "VN", "VNM", "Asia", (), True, ("Viet Nam",)),
+    ("Indonesia", "ID", "IDN", "Asia", ("G20",), True, ()),
+    ("Philippines", "PH", "PHL", "Asia", (), True, ()),
+    ("Taiwan", "TW", "TWN", "Asia", (), False, ()),
+    ("South Africa", "ZA", "ZAF", "Africa", ("G20", "BRICS"), True, ()),
+    # Other trading partners
+    (
+        "United States",
+        "US",
+        "USA",
+        "Americas",
+        ("G7", "G20"),
+        False,
+        ("USA", "United States of America"),
+    ),
+    ("Sweden", "SE", "SWE", "Europe", ("EU",), False, ()),
+    ("Argentina", "AR", "ARG", "Americas", ("G20",), True, ()),
+    ("Chile", "CL", "CHL", "Americas", (), True, ()),
+    ("Peru", "PE", "PER", "Americas", (), True, ()),
+    ("Colombia", "CO", "COL", "Americas", (), True, ()),
+    ("Venezuela", "VE", "VEN", "Americas", (), True, ()),
+    ("Saudi Arabia", "SA", "SAU", "Middle East", ("G20",), False, ()),
+    ("UAE", "AE", "ARE", "Middle East", (), False, ("United Arab Emirates",)),
+    ("Israel", "IL", "ISR", "Middle East", (), False, ()),
+    ("Iran", "IR", "IRN", "Middle East", (), False, ()),
+    ("Qatar", "QA", "QAT", "Middle East", (), False, ()),
+    ("New Zealand", "NZ", "NZL", "Oceania", (), False, ()),
+    ("Fiji", "FJ", "FJI", "Oceania", (), False, ()),
+    ("Papua New Guinea", "PG", "PNG", "Oceania", (), False, ()),
+    ("Egypt", "EG", "EGY", "Africa", (), True, ()),
+    ("Nigeria", "NG", "NGA", "Africa", (), True, ()),
+    ("Kenya", "KE", "KEN", "Africa", (), True, ()),
+    ("Morocco", "MA", "MAR", "Africa", (), False, ()),
+    ("Tunisia", "TN", "TUN", "Africa", (), False, ()),
+    ("Algeria", "DZ", "DZA", "Africa", (), False, ()),
+    ("Ethiopia", "ET", "ETH", "Africa", (), True, ()),
+    ("Ghana", "GH", "GHA", "Africa", (), True, ()),
+    ("Uganda", "UG", "UGA", "Africa", (), True, ()),
+    ("Tanzania", "TZ", "TZA", "Africa", (), False, ()),
+    ("Zambia", "ZM", "ZMB", "Africa", (), False, ()),
+    ("Zimbabwe", "ZW", "ZWE", "Africa", (), False, ()),
+    ("Angola", "AO", "AGO", "Africa", (), False, ()),
+    ("Mozambique", "MZ", "MOZ", "Africa", (), False, ()),
+    ("Madagascar", "MG", "MDG", "Africa", (), False, ()),
+    ("Mauritius", "MU", "MUS", "Africa", (), False, ()),
+    ("Seychelles", "SC", "SYC", "Africa", (), False, ()),
+    ("Comoros", "KM", "COM", "Africa", (), False, ()),
+    ("Djibouti", "DJ", "DJI", "Africa", (), False, ()),
+    ("Somalia", "SO", "SOM", "Africa", (), False, ()),
+    ("Eritrea", "ER", "ERI", "Africa", (), False, ()),
+    ("Sudan", "SD", "SDN", "Africa", (), False, ()),
+    ("South Sudan", "SS", "SSD", "Africa", (), False, ()),
+    ("Chad", "TD", "TCD", "Africa", (), False, ()),
+    ("Niger", "NE", "NER", "Africa", (), False, ()),
+    ("Mali", "ML", "MLI", "Africa", (), False, ()),
+    ("Burkina Faso", "BF", "BFA", "Africa", (), False, ()),
+    ("Senegal", "SN", "SEN", "Africa", (), False, ()),
+    ("Gambia", "GM", "GMB", "Africa", (), False, ("The Gambia",)),
+    ("Guinea-Bissau", "GW", "GNB", "Africa", (), False, ("Guinea Bissau",)),
+    ("Guinea", "GN", "GIN", "Africa", (), False, ()),
+    ("Sierra Leone", "SL", "SLE", "Africa", (), False, ()),
+    ("Liberia", "LR", "LBR", "Africa", (), False, ()),
+    (
+        "Ivory Coast",
+        "CI",
+        "CIV",
+        "Africa",
+        (),
+        False,
+        ("Cote d'Ivoire", "Côte d'Ivoire"),
+    ),
+    ("Togo", "TG", "TGO", "Africa", (), False, ()),
+    ("Benin", "BJ", "BEN", "Africa", (), False, ()),
+    ("Cameroon", "CM", "CMR", "Africa", (), False, ()),
+    ("Central African Republic", "CF", "CAF", "Africa", (), False, ()),
+    ("Gabon", "GA", "GAB", "Africa", (), False, ()),
+    ("Congo", "CG", "COG", "Africa", (), False, ("Republic of the Congo",)),
+    (
+        "Democratic Republic of the Congo",
+        "CD",
+        "COD",
+        "Africa",
+        (),
+        False,
+        ("DR Congo", "DRC", "Democratic Republic of Congo"),
+    ),
+    ("Equatorial Guinea", "GQ", "GNQ", "Africa", (), False, ()),
+    ("Sao Tome and Principe", "ST", "STP", "Africa", (), False, ()),
+    ("Cape Verde", "CV", "CPV", "Africa", (), False, ("Cabo Verde",)),
+    ("Mauritania", "MR", "MRT", "Africa", (), False, ()),
+    ("Western Sahara", "EH", "ESH", "Africa", (), False, ()),
+    ("Libya", "LY", "LBY", "Africa", (), False, ()),
+)
+
+# Number of leading COUNTRY_TABLE rows offered for analysis
+ANALYSIS_COUNTRY_COUNT = 30
+
+# ISO 3166-1 countries and territories without a COUNTRY_TABLE row, with
+# common variants. They are never rewritten to a registry country: the
+# resolver matches them exactly and treats near-misses as unknown, so
+# "Austria" stays Austria instead of becoming Australia.
+OTHER_COUNTRY_NAMES = (
+    "Afghanistan", "Aland Islands", "Albania", "American Samoa", "Andorra",
+    "Anguilla", "Antarctica", "Antigua and Barbuda", "Armenia", "Aruba",
+    "Austria", "Azerbaijan", "Bahamas", "Bahrain", "Bangladesh", "Barbados",
+    "Belarus", "Belize", "Bermuda", "Bhutan", "Bolivia",
+    "Bonaire, Sint Eustatius and Saba", "Bosnia and Herzegovina", "Botswana",
+    "Bouvet Island", "British Indian Ocean Territory", "Brunei",
+    "Brunei Darussalam", "Bulgaria", "Burundi", "Cambodia", "Cayman Islands",
+    "Christmas Island", "Cocos (Keeling) Islands", "Cook Islands",
+    "Costa Rica", "Croatia", "Cuba", "Curacao", "Cyprus", "Czechia",
+    "Czech Republic", "Denmark", "Dominica", "Dominican Republic", "Ecuador",
+    "El Salvador", "Estonia", "Eswatini", "Swaziland", "Falkland Islands",
+    "Faroe Islands", "Finland", "French Guiana", "French Polynesia",
+    "French Southern Territories", "Georgia", "Gibraltar", "Greece",
+    "Greenland", "Grenada", "Guadeloupe", "Guam", "Guatemala", "Guernsey",
+    "Guyana", "Haiti", "Heard Island and McDonald Islands", "Holy See",
+    "Vatican City", "Honduras", "Hungary", "Iceland", "Iraq", "Ireland",
+    "Isle of Man", "Jamaica", "Jersey", "Jordan", "Kazakhstan", "Kiribati",
+    "North Korea", "Korea, North", "Democratic People's Republic of Korea",
+    "Kosovo", "Kuwait", "Kyrgyzstan", "Kyrgyz Republic", "Laos",
+    "Lao People's Democratic Republic",
+    "Latvia", "Lebanon", "Lesotho", "Liechtenstein", "Lithuania", "Luxembourg",
+    "Malawi", "Maldives", "Malta", "Marshall Islands", "Martinique", "Mayotte",
+    "Micronesia", "Moldova", "Monaco", "Mongolia", "Montenegro", "Montserrat",
+    "Myanmar", "Burma", "Namibia", "Nauru", "Nepal", "New Caledonia",
+    "Nicaragua", "Niue", "Norfolk Island", "North Macedonia", "Macedonia",
+    "Northern Mariana Islands", "Norway", "Oman", "Pakistan", "Palau",
+    "Palestine", "Panama", "Paraguay", "Pitcairn", "Poland", "Portugal",
+    "Puerto Rico", "Reunion", "Romania", "Rwanda", "Saint Barthelemy",
+    "Saint Helena", "Saint Kitts and Nevis", "Saint Lucia", "Saint Martin",
+    "Saint Pierre and Miquelon", "Saint Vincent and the Grenadines", "Samoa",
+    "San Marino", "Serbia", "Sint Maarten", "Slovakia", "Slovenia",
+    "Solomon Islands", "South Georgia and the South Sandwich Islands",
+    "Sri Lanka", "Suriname", "Svalbard and Jan Mayen", "Syria",
+    "Syrian Arab Republic",
+    "Tajikistan", "Timor-Leste", "East Timor", "Tokelau", "Tonga",
+    "Trinidad and Tobago", "Turkmenistan", "Turks and Caicos Islands", "Tuvalu",
+    "United States Minor Outlying Islands", "Uruguay", "Uzbekistan", "Vanuatu",
+    "British Virgin Islands", "US Virgin Islands", "Wallis and Futuna", "Yemen",
+)
+
+
+def _key(name: str) -> str:
+    return " ".join(str(name).lower().split())
+
+
+class CountryRegistry:
+    """
+    Immutable country lookups by name, alias, ISO2/ISO3 code or ID
+
+    Every record's ID is its index in `records`.
+    """
+
+    def __init__(self, table: Iterable[tuple] = COUNTRY_TABLE):
+        records = []
+        for country_id, row in enumerate(table):
+            name, iso2, iso3, continent, groups, emerging, aliases = row
+            records.append(
+                CountryRecord(
+                    id=country_id,
+                    name=sys.intern(name),
+                    iso2=sys.intern(iso2),
+                    iso3=sys.intern(iso3),
+                    continent=sys.intern(continent),
+                    groups=tuple(sys.intern(g) for g in groups),
+                    emerging_market=emerging,
+                    aliases=tuple(sys.intern(a) for a in aliases),
+                )
+            )
+        self.records: Tuple[CountryRecord, ...] = tuple(records)
+
+        # Full names and aliases win over ISO codes ("CA" is Canada, but a
+        # name that happens to equal another country's code keeps its name)
+        index: Dict[str, int] = {}
+        for record in self.records:
+            for code in (record.iso2, record.iso3):
+                index.setdefault(_key(code), record.id)
+        for record in self.records:
+            for name in (record.name,) + record.aliases:
+                index[_key(name)] = record.id
+        self._index = index
+
+        self.analysis_countries: Tuple[str, ...] = tuple(
+            record.name for record in self.records[:ANALYSIS_COUNTRY_COUNT]
+        )
+
+        # Free-text matching uses names and aliases but not ISO codes, which
+        # collide with ordinary words ("IN", "IT", "AT")
+        self._mention_matcher = AhoCorasick(self.mention_terms())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def id(self, name: str) -> int:
+        """Country ID for a name, alias or ISO code; -1 if unknown"""
+        return self._index.get(_key(name), -1)
+
+    def ids(self, names: Iterable[str]) -> List[int]:
+        index = self._index
+        return [index.get(_key(name), -1) for name in names]
+
+    def get(self, name: str) -> Optional[CountryRecord]:
+        country_id = self._index.get(_key(name), -1)
+        return self.records[country_id] if country_id >= 0 else None
+
+    def canonical_name(self, name: str) -> str:
+        """Registry name for a name or alias; unknown names pass through"""
+        record = self.get(name)
+        return record.name if record else name
+
+    def mention_terms(self) -> List[Tuple[str, int]]:
+        """(name or alias, country ID) pairs used to find countries in text
+
+        Acronyms such as "UAE" and "PRC" are kept; the matcher only accepts
+        them written in capitals.
+        """
+        return [
+            (term, record.id)
+            for record in self.records
+            for term in (record.name,) + record.aliases
+        ]
+
+    def mentions(self, text: str) -> List[str]:
+        """Countries named (by full name, alias or acronym) in free text"""
+        return [
+            self.records[country_id].name
+            for country_id in self._mention_matcher.values(text)
+        ]
+
+
+# Global instance
+COUNTRY_REGISTRY = CountryRegistry()
+
+
+def get_country(name: str) -> Optional[CountryRecord]:
+    """Look up a country by name, alias or ISO code"""
+    return COUNTRY_REGISTRY.get(name)
+
+
+def canonical_country_name(name: str) -> str:
+    return COUNTRY_REGISTRY.canonical_name(name)
+
+
+if __name__ == "__main__":
+    print(f"🌍 {len(COUNTRY_REGISTRY)} countries")
+    for name in ("EU", "uk", "Viet Nam", "CHN", "Atlantis"):
+        record = get_country(name)
+        print(f"  {name!r} -> {record.name if record else None}")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Country Resolver
+================
+
+Normalizes user-supplied country names to registry IDs:
+- Exact names, aliases and ISO codes resolve through the registry's
+  precomputed hash map ("EU", "uk", "Viet Nam", "CHN")
+- Typos fall back to a trigram index over names and aliases ("Malasyia");
+  real countries outside the registry (OTHER_COUNTRY_NAMES) are matched
+  exactly and sit in the same index, so "Austria" or a near-miss of it
+  resolves to no country instead of Australia
+  only terms sharing a trigram with the input are scored, inputs longer
+  than MAX_FUZZY_LENGTH are not fuzzy-matched, and a match must reach
+  MIN_SIMILARITY and be unambiguous
+- Short names that lose their trigrams to a transposition ("Chnia") are
+  checked by edit distance against the same candidates
+- Results (including misses) are kept in an LRU cache, so repeat lookups
+  from endpoints are one dict hit
+
+Every endpoint and data module resolves names through COUNTRY_RESOLVER.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from country_registry import (
+    COUNTRY_REGISTRY,
+    OTHER_COUNTRY_NAMES,
+    CountryRecord,
+    CountryRegistry,
+)
+
+MIN_SIMILARITY = 0.5
+MAX_FUZZY_LENGTH = 64
+CACHE_SIZE = 4096
+
+
+def _normalize(name: str) -> str:
+    return " ".join(str(name).lower().split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance with adjacent transpositions; limit + 1 once exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class CountryResolver:
+    """Exact-then-fuzzy country name resolution with a shared LRU cache"""
+
+    def __init__(
+        self,
+        registry: CountryRegistry = COUNTRY_REGISTRY,
+        min_similarity: float = MIN_SIMILARITY,
+        cache_size: int = CACHE_SIZE,
+        other_names: Iterable[str] = OTHER_COUNTRY_NAMES,
+    ):
+        self.registry = registry
+        self.min_similarity = min_similarity
+
+        # Fuzzy terms are full names and aliases; ISO codes are exact-only.
+        # Countries outside the registry are terms with ID -1, so a name
+        # closest to one of them resolves to no country.
+        self._terms: List[str] = []
+        self._term_country: List[int] = []
+        self._term_size: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._other_names: Set[str] = set()
+        seen: Set[str] = set()
+        candidates = [
+            (name, record.id)
+            for record in registry.records
+            for name in (record.name,) + record.aliases
+        ]
+        for name in other_names:
+            if registry.id(name) < 0:
+                self._other_names.add(_normalize(name))
+                candidates.append((name, -1))
+        for name, country_id in candidates:
+            key = _normalize(name)
+            if len(key) < 4 or key in seen:
+                continue
+            seen.add(key)
+            term_id = len(self._terms)
+            grams = _trigrams(key)
+            self._terms.append(key)
+            self._term_country.append(country_id)
+            self._term_size.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(term_id)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, name: str) -> int:
+        """Country ID for a name, alias, ISO code or near-miss; -1 if none"""
+        key = _normalize(name)
+        country_id = self.registry.id(key)
+        if country_id >= 0 or len(key) < 4 or len(key) > MAX_FUZZY_LENGTH:
+            return country_id
+        if key in self._other_names:
+            return -1
+        return self._fuzzy(key)
+
+    def _fuzzy(self, key: str) -> int:
+        grams = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        # Dice coefficient over trigram sets; best score per country
+        scores: Dict[int, float] = {}
+        for term_id, overlap in shared.items():
+            score = 2.0 * overlap / (len(grams) + self._term_size[term_id])
+            country_id = self._term_country[term_id]
+            if score > scores.get(country_id, 0.0):
+                scores[country_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if ranked and ranked[0][1] >= self.min_similarity:
+            if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+                return -1
+            best = ranked[0][0]
+            if best >= 0 and scores.get(-1, 0.0) >= self.min_similarity:
+                # A non-registry country scores too: keep the registry match
+                # only if it is strictly fewer edits away ("Austrai" is not
+                # Australia, "Malasyia" is still Malaysia)
+                if self._distance(key, shared, best) >= self._distance(
+                    key, shared, -1
+                ):
+                    return -1
+            return best
+
+        # Short names lose most trigrams to one transposition ("Chnia"), so
+        # fall back to edit distance over the same candidate terms
+        limit = 1 if len(key) <= 6 else 2
+        close = {
+            self._term_country[term_id]
+            for term_id in shared
+            if _edit_distance(key, self._terms[term_id], limit) <= limit
+        }
+        # A non-registry country among the candidates (-1) also yields -1
+        return close.pop() if len(close) == 1 else -1
+
+    def _distance(self, key: str, shared: Dict[int, int], country_id: int) -> int:
+        """Fewest edits from key to any candidate term of a country"""
+        limit = len(key)
+        return min(
+            _edit_distance(key, self._terms[term_id], limit)
+            for term_id in shared
+            if self._term_country[term_id] == country_id
+        )
+
+    def record(self, name: str) -> Optional[CountryRecord]:
+        country_id = self.resolve(name)
+        return self.registry.records[country_id] if country_id >= 0 else None
+
+    def canonical_name(self, name: str) -> str:
+        """Registry name for any spelling of a country; unknown names pass through"""
+        record = self.record(name)
+        return record.name if record else name
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self.resolve.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+# Global instance
+COUNTRY_RESOLVER = CountryResolver()
+
+
+def resolve_country(name: str) -> Optional[CountryRecord]:
+    """Resolve a user-supplied country name to its registry record"""
+    return COUNTRY_RESOLVER.record(name)
+
+
+def canonical_country(name: str) -> str:
+    return COUNTRY_RESOLVER.canonical_name(name)
+
+
+if __name__ == "__main__":
+    for name in ("EU", "uk", "Chnia", "Malasyia", "south korae", "Atlantis"):
+        print(f"  {name!r} -> {canonical_country(name)}")
+    print(f"📊 Cache: {COUNTRY_RESOLVER.cache_info()}")
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Dataset Diff
+============
+
+Incremental updates for the tariff datasets (authoritative workbook,
+Atlantic Council snapshots, live WITS/WTO tariffs, World Bank indicators):
+- Every dataset is reduced to rows keyed by (country, sector, HTS) with
+  a (rate, status, source, effective_date) value; volatile fields such as
+  fetch timestamps are left out so refetching the same data is a no-op
+- diff_datasets() compares two versions country by country; countries
+  whose rows are equal are skipped with one dict comparison, so an update
+  touching a few rows costs a few row comparisons plus one pass of dict
+  equality checks
+- DatasetTracker keeps the current version of a dataset, records the
+  latest diff and passes the changed ("dirty") countries to listeners
+- TariffAggregates keeps per-country derived values (average rate,
+  affected sectors) and the region and summary aggregates; it only
+  recomputes dirty countries and adjusts the running totals
+
+Usage:
+    tracker = get_tracker("authoritative_excel")
+    aggregates = TariffAggregates(region_of=parser._get_region)
+    tracker.add_listener(aggregates.apply)
+    diff = tracker.update(rules_dataset(parser.country_rates.values()))
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (sector, HTS code) -> (rate, status, source, effective_date)
+RowKey = Tuple[str, str]
+RowValue = Tuple[Any, ...]
+CountryRows = Dict[RowKey, RowValue]
+Dataset = Dict[str, CountryRows]
+
+ACTIVE_STATUS = "Active"
+
+
+# ----------------------------------------------------------------------
+# Row extraction
+# ----------------------------------------------------------------------
+def _clean(value: Any) -> Any:
+    """NaN (a missing cell in a DataFrame record) never equals itself; use None"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _rate(value: Any) -> float:
+    try:
+        return float(str(value).replace("%", "")) if value is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _row_value(info: Mapping[str, Any]) -> RowValue:
+    return (
+        info.get("tariff_rate", 0.0),
+        info.get("status", ACTIVE_STATUS),
+        info.get("source", ""),
+        str(info.get("effective_date", "") or ""),
+    )
+
+
+def nested_dataset(data: Mapping[str, Mapping[str, Any]]) -> Dataset:
+    """
+    Rows of country -> sector -> info mappings (the static data modules
+    and live tariff payloads), one row per HTS code listed in the entry
+    """
+    dataset: Dataset = {}
+    for country, sector_map in data.items():
+        rows: CountryRows = {}
+        for sector, info in sector_map.items():
+            if not isinstance(info, Mapping):
+                continue
+            value = _row_value(info)
+            for hts in info.get("hts_codes") or ("",):
+                rows[(sector, str(hts))] = value
+        dataset[country] = rows
+    return dataset
+
+
+def rules_dataset(rules: Iterable[Any]) -> Dataset:
+    """Rows of CountryTariffRule records keyed by their Chapter 99 heading"""
+    return {
+        rule.country: {
+            ("Reciprocal", rule.chapter99_code): (
+                # EU rules top up to a 15% target rate
+                15.0 if rule.rule_type == "EU_TopUp" else rule.reciprocal_addon_pct,
+                ACTIVE_STATUS,
+                rule.rule_type,
+                rule.effective_date,
+            )
+        }
+        for rule in rules
+    }
+
+
+def records_dataset(
+    records: Iterable[Mapping[str, Any]],
+    country_field: str = "Geography",
+    sector_fields: Tuple[str, ...] = ("Target", "Legal authority"),
+    rate_field: str = "Rate",
+    date_field: str = "Date in effect",
+    hts_field: str = "HTS",
+) -> Dataset:
+    """Rows of flat tracker records (Atlantic Council snapshot rows)"""
+    dataset: Dataset = {}
+    for record in records:
+        country = record.get(country_field)
+        if not isinstance(country, str) or not country.strip():
+            continue
+        parts = [_clean(record.get(name)) for name in sector_fields]
+        sector = " - ".join("" if value is None else str(value) for value in parts)
+        hts = _clean(record.get(hts_field))
+        dataset.setdefault(country.strip(), {})[(sector, str(hts or ""))] = (
+            _clean(record.get(rate_field)),
+            ACTIVE_STATUS,
+            str(_clean(record.get("Sources")) or ""),
+            str(_clean(record.get(date_field)) or ""),
+        )
+    return dataset
+
+
+# World Bank payload fields that are indicator values; the rest (source,
+# last_updated) describe the fetch and change on every refresh
+WORLD_BANK_INDICATORS = ("gdp_billions", "trade_volume_millions")
+
+
+def snapshot_dataset(source: str, data: Any) -> Optional[Dataset]:
+    """Rows of a refresh scheduler payload (None for untracked sources)"""
+    if source == "atlantic_council":
+        return records_dataset(data)
+    if source == "live_tariffs":
+        return nested_dataset(data.get("tariff_data", {}))
+    if source == "world_bank":
+        return {
+            country: {
+                (indicator, ""): (
+                    _clean(indicators[indicator]),
+                    ACTIVE_STATUS,
+                    "World Bank",
+                    "",
+                )
+                for indicator in WORLD_BANK_INDICATORS
+                if indicator in indicators
+            }
+            for country, indicators in data.items()
+            if isinstance(indicators, Mapping)
+        }
+    return None
+
+
+# ----------------------------------------------------------------------
+# Diffing
+# ----------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class RowChange:
+    """One added, removed or changed (country, sector, HTS) row"""
+
+    country: str
+    sector: str
+    hts: str
+    old: Optional[RowValue]
+    new: Optional[RowValue]
+
+    @property
+    def kind(self) -> str:
+        if self.old is None:
+            return "added"
+        if self.new is None:
+            return "removed"
+        return "changed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        def value(row: Optional[RowValue]) -> Optional[Dict[str, Any]]:
+            if row is None:
+                return None
+            rate, status, source, effective_date = row
+            return {
+                "tariff_rate": rate,
+                "status": status,
+                "source": source,
+                "effective_date": effective_date,
+            }
+
+        return {
+            "change": self.kind,
+            "country": self.country,
+            "sector": self.sector,
+            "hts_code": self.hts,
+            "old": value(self.old),
+            "new": value(self.new),
+        }
+
+
+@dataclass(frozen=True)
+class DatasetDiff:
+    """Row-level changes between two versions of a dataset"""
+
+    dataset: str
+    version: int
+    changes: Tuple[RowChange, ...]
+    dirty_countries: FrozenSet[str]
+    computed_at: datetime = field(default_factory=datetime.now)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"added": 0, "removed": 0, "changed": 0}
+        for change in self.changes:
+            counts[change.kind] += 1
+        return counts
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """JSON-ready view; limit caps the number of rows listed"""
+        changes = self.changes if limit is None else self.changes[:limit]
+        return {
+            "dataset": self.dataset,
+            "version": self.version,
+            "computed_at": self.computed_at.isoformat(),
+            "counts": self.counts(),
+            "dirty_countries": sorted(self.dirty_countries),
+            "changes": [change.to_dict() for change in changes],
+            "truncated": len(changes) < len(self.changes),
+        }
+
+
+def diff_datasets(
+    old: Dataset, new: Dataset, name: str = "", version: int = 0
+) -> DatasetDiff:
+    """Row-level diff of two datasets; unchanged countries cost one comparison"""
+    changes: List[RowChange] = []
+    dirty = set()
+    for country in old.keys() | new.keys():
+        before, after = old.get(country, {}), new.get(country, {})
+        if before == after:
+            continue
+        dirty.add(country)
+        for key in before.keys() | after.keys():
+            old_row, new_row = before.get(key), after.get(key)
+            if old_row != new_row:
+                changes.append(RowChange(country, key[0], key[1], old_row, new_row))
+
+    changes.sort(key=lambda change: (change.country, change.sector, change.hts))
+    return DatasetDiff(name, version, tuple(changes), frozenset(dirty))
+
+
+DiffListener = Callable[[DatasetDiff, Dataset], None]
+
+
+class DatasetTracker:
+    """Current version of one dataset and the diff that produced it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.dataset: Dataset = {}
+        self.version = 0
+        self.last_diff: Optional[DatasetDiff] = None
+        self._listeners: List[DiffListener] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: DiffListener):
+        """Call listener(diff, dataset) after every update that changed rows"""
+        self._listeners.append(listener)
+
+    def update(self, dataset: Dataset) -> DatasetDiff:
+        """Replace the dataset, returning (and publishing) the row diff"""
+        with self._lock:
+            diff = diff_datasets(self.dataset, dataset, self.name, self.version + 1)
+            if not diff:
+                return DatasetDiff(self.name, self.version, (), frozenset())
+            self.dataset = dataset
+            self.version = diff.version
+            self.last_diff = diff
+
+        logger.info(
+            f"📊 {self.name} v{diff.version}: {len(diff.changes)} rows changed in "
+            f"{len(diff.dirty_countries)} countries"
+        )
+        for listener in self._listeners + _GLOBAL_LISTENERS:
+            try:
+                listener(diff, dataset)
+            except Exception as e:
+                logger.error(f"Diff listener failed for {self.name}: {e}")
+        return diff
+
+
+# ----------------------------------------------------------------------
+# Incremental aggregates
+# ----------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class CountryAggregate:
+    """Derived tariff values for one country"""
+
+    country: str
+    region: str
+    average_rate: float
+    active_count: int
+    max_rate: float
+    affected_sectors: Tuple[str, ...]
+
+    @classmethod
+    def from_rows(cls, country: str, region: str, rows: CountryRows):
+        # Rows are per HTS code; rates and statuses are per sector
+        sectors: Dict[str, RowValue] = {}
+        for (sector, _), value in rows.items():
+            sectors.setdefault(sector, value)
+
+        active = [
+            (sector, _rate(value[0]))
+            for sector, value in sectors.items()
+            if value[1] == ACTIVE_STATUS
+        ]
+        rates = [rate for _, rate in active]
+        return cls(
+            country=country,
+            region=region,
+            average_rate=sum(rates) / len(rates) if rates else 0.0,
+            active_count=len(active),
+            max_rate=max(rates, default=0.0),
+            affected_sectors=tuple(sector for sector, rate in active if rate > 0),
+        )
+
+
+class TariffAggregates:
+    """
+    Per-country averages and affected sectors plus region and summary
+    aggregates, recomputed only for the countries a diff marks dirty
+    """
+
+    def __init__(self, region_of: Optional[Callable[[str], str]] = None):
+        self.region_of = region_of or (lambda country: "Other")
+        self.countries: Dict[str, CountryAggregate] = {}
+        # region -> [sum of country averages, country count]
+        self._regions: Dict[str, List[float]] = {}
+        self._total_rate = 0.0
+        self._active_total_rate = 0.0
+        self._active_countries = 0
+
+    def _retract(self, aggregate: CountryAggregate):
+        region = self._regions[aggregate.region]
+        region[0] -= aggregate.average_rate
+        region[1] -= 1
+        if not region[1]:
+            del self._regions[aggregate.region]
+        self._total_rate -= aggregate.average_rate
+        if aggregate.average_rate > 0:
+            self._active_total_rate -= aggregate.average_rate
+            self._active_countries -= 1
+
+    def _add(self, aggregate: CountryAggregate):
+        region = self._regions.setdefault(aggregate.region, [0.0, 0])
+        region[0] += aggregate.average_rate
+        region[1] += 1
+        self._total_rate += aggregate.average_rate
+        if aggregate.average_rate > 0:
+            self._active_total_rate += aggregate.average_rate
+            self._active_countries += 1
+
+    def refresh(self, dataset: Dataset, countries: Optional[Iterable[str]] = None):
+        """Recompute the given countries (all countries if None)"""
+        if countries is None:
+            countries = set(self.countries) | set(dataset)
+        for country in countries:
+            previous = self.countries.pop(country, None)
+            if previous is not None:
+                self._retract(previous)
+            rows = dataset.get(country)
+            if rows is None:
+                continue
+            aggregate = CountryAggregate.from_rows(
+                country, self.region_of(country), rows
+            )
+            self.countries[country] = aggregate
+            self._add(aggregate)
+
+    def apply(self, diff: DatasetDiff, dataset: Dataset):
+        """DatasetTracker listener: recompute the dirty countries"""
+        self.refresh(dataset, diff.dirty_countries)
+
+    def country(self, country: str) -> Optional[CountryAggregate]:
+        return self.countries.get(country)
+
+    def region_averages(self) -> Dict[str, float]:
+        """Mean country rate per region"""
+        return {
+            region: total / count
+            for region, (total, count) in self._regions.items()
+            if count
+        }
+
+    def statistics(self) -> Dict[str, Any]:
+        """Summary statistics over the country averages"""
+        total = len(self.countries)
+        return {
+            "total_countries": total,
+            "countries_with_tariffs": self._active_countries,
+            "average_rate_all": self._total_rate / total if total else 0,
+            "average_rate_active": (
+                self._active_total_rate / self._active_countries
+                if self._active_countries
+                else 0
+            ),
+            "highest_rate": max(
+                (aggregate.average_rate for aggregate in self.countries.values()),
+                default=0,
+            ),
+        }
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+DATASET_TRACKERS: Dict[str, DatasetTracker] = {}
+_GLOBAL_LISTENERS: List[DiffListener] = []
+
+
+def get_tracker(name: str) -> DatasetTracker:
+    """The tracker for a dataset, created on first use"""
+    tracker = DATASET_TRACKERS.get(name)
+    if tracker is None:
+        tracker = DATASET_TRACKERS.setdefault(name, DatasetTracker(name))
+    return tracker
+
+
+def register_tracker(tracker: DatasetTracker) -> DatasetTracker:
+    """Expose a tracker owned elsewhere (e.g. by a parser) under its name"""
+    DATASET_TRACKERS[tracker.name] = tracker
+    return tracker
+
+
+def on_dataset_diff(listener: DiffListener):
+    """Call listener(diff, dataset) after an update to any dataset"""
+    _GLOBAL_LISTENERS.append(listener)
+
+
+def track_snapshot(snapshot: Any) -> Optional[DatasetDiff]:
+    """Refresh scheduler listener: diff each published snapshot payload"""
+    dataset = snapshot_dataset(snapshot.source, snapshot.data)
+    if dataset is None:
+        return None
+    return get_tracker(snapshot.source).update(dataset)
+
+
+def latest_diffs() -> Dict[str, Dict[str, Any]]:
+    """Version and change counts of the latest diff of every dataset"""
+    return {
+        name: {
+            "version": tracker.version,
+            "countries": len(tracker.dataset),
+            "last_diff": (
+                {
+                    "computed_at": tracker.last_diff.computed_at.isoformat(),
+                    "counts": tracker.last_diff.counts(),
+                    "dirty_countries": sorted(tracker.last_diff.dirty_countries),
+                }
+                if tracker.last_diff
+                else None
+            ),
+        }
+        for name, tracker in sorted(DATASET_TRACKERS.items())
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from atlantic_council_fallback import ATLANTIC_COUNCIL_DATA
+
+    # Usage: python dataset_diff.py [COUNTRY]
+    country = sys.argv[1] if len(sys.argv) > 1 else "China"
+    tracker = DatasetTracker("atlantic_council_fallback")
+    aggregates = TariffAggregates()
+    tracker.add_listener(aggregates.apply)
+    tracker.update(nested_dataset(ATLANTIC_COUNCIL_DATA))
+
+    updated = nested_dataset(ATLANTIC_COUNCIL_DATA)
+    sector = next(iter(updated[country]))
+    rate, *rest = updated[country][sector]
+    updated[country] = {**updated[country], sector: (rate + 5, *rest)}
+
+    started = time.perf_counter()
+    diff = tracker.update(updated)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"📊 {diff.counts()} in {sorted(diff.dirty_countries)}: {elapsed:.2f} ms")
+    print(f"  {country} average: {aggregates.country(country).average_rate:.1f}%")
@@ -19,6 +19,9 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 import re
 
+from records import intern_values
+from workbook_reader import iter_workbook_chunks
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,7 +32,8 @@ class AtlanticCouncilExcelParser:
 
     def __init__(self, excel_file_path: str = "data/Trump tariff tracker.xlsx"):
         self.excel_file_path = Path(excel_file_path)
-        self.data: Optional[Dict[str, pd.DataFrame]] = None
+        # Rows read per sheet; sheets are streamed, not kept in memory
+        self.data: Optional[Dict[str, int]] = None
         self.parsed_data: Dict[str, Dict[str, Any]] = {}
 
     def load_excel_file(self) -> bool:
@@ -39,15 +43,9 @@ class AtlanticCouncilExcelParser:
                 logger.error(f"Excel file not found: {self.excel_file_path}")
                 return False
 
-            # Read the Excel file
-            self.data = pd.read_excel(self.excel_file_path, sheet_name=None)
-            if self.data:
-                logger.info(
-                    f"Successfully loaded Excel file with {len(self.data)} sheets"
-                )
-
-            # Parse all sheets
+            # Stream and parse all sheets chunk by chunk
             self._parse_all_sheets()
+            logger.info(f"Successfully loaded Excel file with {len(self.data)} sheets")
             return True
 
         except Exception as e:
@@ -55,10 +53,14 @@ class AtlanticCouncilExcelParser:
             return False
 
     def _parse_all_sheets(self):
-        """Parse all sheets in the Excel file"""
-        for sheet_name, sheet_data in self.data.items():
-            logger.info(f"Parsing sheet: {sheet_name}")
-            self._parse_sheet(sheet_name, sheet_data)
+        """Parse all sheets in the Excel file, one row chunk at a time"""
+        self.data = {}
+        for sheet_name, chunk in iter_workbook_chunks(self.excel_file_path):
+            if sheet_name not in self.data:
+                logger.info(f"Parsing sheet: {sheet_name}")
+                self.data[sheet_name] = 0
+            self.data[sheet_name] += len(chunk)
+            self._parse_sheet(sheet_name, chunk)
 
     def _parse_sheet(self, sheet_name: str, sheet_data: pd.DataFrame):
         """Parse individual sheet data"""
@@ -145,15 +147,22 @@ class AtlanticCouncilExcelParser:
             if country not in self.parsed_data:
                 self.parsed_data[country] = {}
 
-            self.parsed_data[country][sector] = {
-                "tariff_rate": tariff_rate,
-                "hts_codes": ["All"],  # Will be enhanced later
-                "effective_date": date,
-                "source": f"Trump Administration 2025 - {source}",
-                "notes": f"Tariff rate: {tariff_rate}% - {source}",
-                "status": "Active" if tariff_rate > 0 else "Under Investigation",
-                "verification": f"Atlantic Council Trump Tariff Tracker, {source}",
-            }
+            self.parsed_data[country][sector] = intern_values(
+                {
+                    "tariff_rate": tariff_rate,
+                    "hts_codes": ["All"],  # Will be enhanced later
+                    "effective_date": date,
+                    "source": f"Trump Administration 2025 - {source}",
+                    "notes": f"Tariff rate: {tariff_rate}% - {source}",
+                    "status": "Active" if tariff_rate > 0 else "Under Investigation",
+                    "verification": (
+                        f"Atlantic Council Trump Tariff Tracker, {source}"
+                    ),
+                },
+                "source",
+                "notes",
+                "verification",
+            )
 
     def _parse_tariff_rate(self, rate_value) -> float:
         """Parse tariff rate from various formats"""
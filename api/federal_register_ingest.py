@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Federal Register Ingestion
+==========================
+
+Incremental, cursor-based ingestion of Federal Register documents into the
+local policy store:
+- Each feed (a fixed set of search conditions) resumes from its stored
+  cursor: the search starts at the last-seen publication_date, and
+  documents from that day already in the store are skipped by
+  document_number
+- Results are requested oldest-first; after the first page reports
+  total_pages, the remaining pages are fetched concurrently (bounded by
+  MAX_CONCURRENT_PAGES) and each page is parsed off the event loop as
+  soon as it arrives
+- If a page fails, only the pages before it are stored, so the cursor
+  never jumps over documents that were not ingested
+
+An hourly refresh with nothing new costs one small request and no parsing.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from country_registry import COUNTRY_REGISTRY
+from policy_store import PolicyDocument, PolicyStore, policy_store
+from text_matcher import DocumentScanner
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FEDERAL_REGISTER_DOCUMENTS_URL = "https://www.federalregister.gov/api/v1/documents.json"
+INITIAL_SINCE = "2024-01-01"
+PER_PAGE = 100
+MAX_CONCURRENT_PAGES = 4
+DOCUMENT_FIELDS = [
+    "document_number",
+    "title",
+    "abstract",
+    "publication_date",
+    "pdf_url",
+]
+
+# Shared automaton over registry country terms and tariff keywords
+DOCUMENT_SCANNER = DocumentScanner(COUNTRY_REGISTRY)
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one ingestion run"""
+
+    feed: str
+    pages: int = 0
+    fetched: int = 0
+    added: int = 0
+    cursor: Optional[Tuple[str, str]] = None
+    complete: bool = True
+
+
+class FederalRegisterIngestor:
+    """Pages through new Federal Register documents for one feed"""
+
+    def __init__(
+        self,
+        feed: str,
+        conditions: Dict[str, Any],
+        url: str = FEDERAL_REGISTER_DOCUMENTS_URL,
+        store: PolicyStore = policy_store,
+        scanner: DocumentScanner = DOCUMENT_SCANNER,
+        since: str = INITIAL_SINCE,
+        per_page: int = PER_PAGE,
+    ):
+        self.feed = feed
+        self.conditions = conditions
+        self.url = url
+        self.store = store
+        self.scanner = scanner
+        self.since = since
+        self.per_page = per_page
+
+    def params(self, since: str, page: int) -> Dict[str, Any]:
+        """Query parameters for one page of documents published on/after since"""
+        return {
+            **self.conditions,
+            "conditions[publication_date][gte]": since,
+            "fields[]": DOCUMENT_FIELDS,
+            "per_page": self.per_page,
+            "page": page,
+            "order": "oldest",
+        }
+
+    async def ingest(self, session) -> IngestResult:
+        """Fetch, parse and store documents newer than the feed cursor"""
+        cursor = self.store.cursor(self.feed)
+        since = cursor[0] if cursor else self.since
+        result = IngestResult(feed=self.feed, cursor=cursor)
+
+        first = await self._fetch_page(session, since, 1)
+        if first is None:
+            result.complete = False
+            return result
+
+        total_pages = max(int(first.get("total_pages") or 1), 1)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def fetch_and_parse(page: int) -> Optional[List[PolicyDocument]]:
+            if page == 1:
+                data = first
+            else:
+                async with semaphore:
+                    data = await self._fetch_page(session, since, page)
+                if data is None:
+                    return None
+            results = data.get("results") or []
+            result.fetched += len(results)
+            return await asyncio.to_thread(self.parse_results, results)
+
+        pages = await asyncio.gather(
+            *(fetch_and_parse(page) for page in range(1, total_pages + 1))
+        )
+
+        documents: List[PolicyDocument] = []
+        for parsed in pages:
+            if parsed is None:
+                # Later pages hold newer documents; storing them would move
+                # the cursor past the gap
+                result.complete = False
+                break
+            result.pages += 1
+            documents.extend(parsed)
+
+        result.added = self.store.add(self.feed, documents)
+        result.cursor = self.store.cursor(self.feed)
+        logger.info(
+            f"📄 {self.feed}: {result.added} new documents "
+            f"({result.fetched} fetched over {result.pages} pages)"
+        )
+        return result
+
+    def parse_results(self, results: List[Dict[str, Any]]) -> List[PolicyDocument]:
+        """Parse raw results, skipping documents already in the store"""
+        known = self.store.known(
+            self.feed, (doc.get("document_number") or "" for doc in results)
+        )
+        documents = []
+        for doc in results:
+            number = doc.get("document_number")
+            if not number or number in known:
+                continue
+            title = doc.get("title") or ""
+            abstract = doc.get("abstract") or ""
+            matches = self.scanner.scan(f"{title} {abstract}")
+            documents.append(
+                PolicyDocument(
+                    document_number=number,
+                    publication_date=doc.get("publication_date") or "",
+                    title=title,
+                    abstract=abstract,
+                    pdf_url=doc.get("pdf_url") or "",
+                    countries=matches.countries,
+                    programs=matches.programs,
+                    rates=matches.rates,
+                )
+            )
+        return documents
+
+    def latest_by_country(
+        self, title_terms: Sequence[str] = ()
+    ) -> Dict[str, PolicyDocument]:
+        return self.store.latest_by_country(self.feed, title_terms)
+
+    async def _fetch_page(
+        self, session, since: str, page: int
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            params = self.params(since, page)
+            async with session.get(self.url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.warning(
+                    f"Federal Register API returned {response.status} "
+                    f"for {self.feed} page {page}"
+                )
+                return None
+
+        except Exception as e:
+            logger.error(f"Error fetching Federal Register page {page}: {e}")
+            return None
+
+
+if __name__ == "__main__":
+    import aiohttp
+
+    async def main():
+        ingestor = FederalRegisterIngestor(
+            "tariff_policies", {"conditions[term]": "tariff"}
+        )
+        async with aiohttp.ClientSession() as session:
+            print(await ingestor.ingest(session))
+        print(f"🌍 {len(ingestor.latest_by_country())} countries with policies")
+
+    asyncio.run(main())
@@ -0,0 +1,302 @@
+"""
+HS Concordance
+==============
+
+One precompiled index from HS/HTS codes to chapters, sectors and model
+industries, shared by the tariff parser, the TIPM model and the API:
+- Codes at any level (HS2/4/6, HTS8/10, with or without dots) are encoded
+  as int64 values right-padded to 10 digits ("8517.12" -> 8517120000),
+  so the chapter is code // 10**8 and any N-digit prefix is one division
+- Chapter -> sector and chapter -> name are 100-entry lookup arrays, so
+  mapping millions of shipment lines or shock codes is one fancy-index
+- Odd-length codes have lost a leading zero (Excel, numeric CSV columns)
+  and are left-padded ("101" -> "0101"); anything else that is not 2-10
+  digits encodes as -1 and maps to no chapter or sector
+
+Sectors are the HS section groupings used for US tariff analysis.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# The API imports this module flat ("hs_concordance") and the tipm package
+# as "api.hs_concordance"; register it under both names so the second
+# import reuses this module and one index is shared
+sys.modules.setdefault("hs_concordance", sys.modules[__name__])
+sys.modules.setdefault("api.hs_concordance", sys.modules[__name__])
+
+HTS_DIGITS = 10
+INVALID = -1
+
+# (first chapter, last chapter, sector name)
+SECTORS: Tuple[Tuple[int, int, str], ...] = (
+    (1, 5, "Live animals; animal products"),
+    (6, 14, "Vegetable products"),
+    (15, 15, "Animal or vegetable fats and oils"),
+    (16, 24, "Prepared foodstuffs; beverages"),
+    (25, 27, "Mineral products"),
+    (28, 38, "Products of chemical or allied industries"),
+    (39, 40, "Plastics and articles thereof; rubber and articles thereof"),
+    (41, 43, "Raw hides and skins, leather, furskins and articles thereof"),
+    (44, 46, "Wood and articles of wood; wood charcoal"),
+    (
+        47,
+        49,
+        "Pulp of wood or of other fibrous cellulosic material; "
+        "paper and paperboard",
+    ),
+    (50, 63, "Textiles and textile articles"),
+    (
+        64,
+        67,
+        "Footwear, headgear, umbrellas, walking sticks, whips, riding-crops",
+    ),
+    (
+        68,
+        70,
+        "Articles of stone, plaster, cement, asbestos, mica or similar materials",
+    ),
+    (71, 71, "Natural or cultured pearls, precious or semi-precious stones"),
+    (72, 83, "Base metals and articles of base metal"),
+    (84, 85, "Machinery and mechanical appliances; electrical equipment"),
+    (86, 89, "Transportation equipment"),
+    (
+        90,
+        92,
+        "Optical, photographic, cinematographic, measuring, checking, precision",
+    ),
+    (93, 93, "Arms and ammunition; parts and accessories thereof"),
+    (94, 96, "Miscellaneous manufactured articles"),
+    (97, 97, "Works of art, collectors' pieces and antiques"),
+    (98, 98, "Special classification provisions"),
+    (99, 99, "Temporary legislation"),
+)
+
+CHAPTER_NAMES: Dict[int, str] = {
+    1: "Live animals",
+    2: "Meat and edible meat offal",
+    3: "Fish and crustaceans, molluscs and other aquatic invertebrates",
+    4: "Dairy produce; birds' eggs; natural honey",
+    5: "Products of animal origin",
+    6: "Live trees and other plants; cut flowers",
+    7: "Edible vegetables and certain roots and tubers",
+    8: "Edible fruit and nuts; peel of citrus fruit or melons",
+    9: "Coffee, tea, mate and spices",
+    10: "Cereals",
+    11: "Products of the milling industry; malt; starches",
+    12: "Oil seeds and oleaginous fruits",
+    13: "Lac; gums, resins and other vegetable saps and extracts",
+    14: "Vegetable plaiting materials",
+    15: "Animal or vegetable fats and oils",
+    16: "Preparations of meat, fish or crustaceans",
+    17: "Sugars and sugar confectionery",
+    18: "Cocoa and cocoa preparations",
+    19: "Preparations of cereals, flour, starch or milk; bakers' wares",
+    20: "Preparations of vegetables, fruit, nuts or other parts of plants",
+    21: "Miscellaneous edible preparations",
+    22: "Beverages, spirits and vinegar",
+    23: "Residues and waste from the food industries; animal feed",
+    24: "Tobacco and manufactured tobacco substitutes",
+    25: "Salt; sulfur; earths and stone; lime and cement",
+    26: "Ores, slag and ash",
+    27: "Mineral fuels, mineral oils and products of their distillation",
+    28: "Inorganic chemicals",
+    29: "Organic chemicals",
+    30: "Pharmaceutical products",
+    31: "Fertilizers",
+    32: "Tanning or dyeing extracts; dyes, pigments, paints and inks",
+    33: "Essential oils and resinoids; perfumery and cosmetics",
+    34: "Soap, washing preparations, lubricants, waxes and candles",
+    35: "Albuminoidal substances; modified starches; glues; enzymes",
+    36: "Explosives; pyrotechnic products; matches",
+    37: "Photographic or cinematographic goods",
+    38: "Miscellaneous chemical products",
+    39: "Plastics and articles thereof",
+    40: "Rubber and articles thereof",
+    41: "Raw hides and skins (other than furskins) and leather",
+    42: "Articles of leather; saddlery and harness; travel goods, handbags",
+    43: "Furskins and artificial fur; manufactures thereof",
+    44: "Wood and articles of wood; wood charcoal",
+    45: "Cork and articles of cork",
+    46: "Manufactures of straw, esparto or other plaiting materials",
+    47: "Pulp of wood or of other fibrous cellulosic material",
+    48: "Paper and paperboard; articles of paper pulp, paper or paperboard",
+    49: "Printed books, newspapers, pictures and other printed products",
+    50: "Silk",
+    51: "Wool, fine or coarse animal hair; horsehair yarn and woven fabric",
+    52: "Cotton",
+    53: "Other vegetable textile fibers; paper yarn",
+    54: "Man-made filaments",
+    55: "Man-made staple fibers",
+    56: "Wadding, felt and nonwovens; special yarns; twine and cordage",
+    57: "Carpets and other textile floor coverings",
+    58: "Special woven fabrics; tufted textile fabrics; lace; tapestries",
+    59: "Impregnated, coated, covered or laminated textile fabrics",
+    60: "Knitted or crocheted fabrics",
+    61: "Articles of apparel and clothing accessories, knitted or crocheted",
+    62: "Articles of apparel and clothing accessories, not knitted or crocheted",
+    63: "Other made up textile articles; worn clothing and textile articles",
+    64: "Footwear, gaiters and the like",
+    65: "Headgear and parts thereof",
+    66: "Umbrellas, sun umbrellas, walking-sticks, seat-sticks, whips, riding-crops",
+    67: "Prepared feathers and down and articles made of feathers or of down",
+    68: "Articles of stone, plaster, cement, asbestos, mica or similar materials",
+    69: "Ceramic products",
+    70: "Glass and glassware",
+    71: "Natural or cultured pearls, precious stones and metals; jewelry",
+    72: "Iron and steel",
+    73: "Articles of iron or steel",
+    74: "Copper and articles thereof",
+    75: "Nickel and articles thereof",
+    76: "Aluminum and articles thereof",
+    78: "Lead and articles thereof",
+    79: "Zinc and articles thereof",
+    80: "Tin and articles thereof",
+    81: "Other base metals; cermets; articles thereof",
+    82: "Tools, implements, cutlery, spoons and forks, of base metal",
+    83: "Miscellaneous articles of base metal",
+    84: "Machinery and mechanical appliances",
+    85: "Electrical equipment",
+    86: "Railway or tramway locomotives, rolling stock and track fixtures",
+    87: "Vehicles other than railway or tramway rolling stock",
+    88: "Aircraft, spacecraft, and parts thereof",
+    89: "Ships, boats and floating structures",
+    90: "Optical, photographic, measuring, medical or surgical instruments",
+    91: "Clocks and watches and parts thereof",
+    92: "Musical instruments; parts and accessories of such articles",
+    93: "Arms and ammunition; parts and accessories thereof",
+    94: "Furniture; bedding, mattresses; lamps; prefabricated buildings",
+    95: "Toys, games and sports requisites",
+    96: "Miscellaneous manufactured articles",
+    97: "Works of art, collectors' pieces and antiques",
+    98: "Special classification provisions",
+    99: "Temporary legislation; temporary modifications",
+}
+
+
+def normalize_codes(codes: Iterable[Any]) -> np.ndarray:
+    """Digit strings for codes: punctuation stripped, odd lengths zero-padded"""
+    keys = np.asarray(
+        codes if isinstance(codes, np.ndarray) else list(codes), dtype=str
+    )
+    if not keys.size:
+        return keys
+    for char in (".", " ", "-"):
+        keys = np.char.replace(keys, char, "")
+    keys = np.char.strip(keys)
+    odd = np.char.str_len(keys) % 2 == 1
+    if odd.any():
+        keys = np.where(odd, np.char.add("0", keys), keys)
+    return keys
+
+
+def normalize_code(code: Any) -> str:
+    return str(normalize_codes([code])[0])
+
+
+class HSConcordance:
+    """
+    HS/HTS code -> chapter -> sector -> model industry lookups
+
+    Every method takes a sequence of codes (strings, ints or an already
+    encoded int64 array) and returns one array entry per code.
+    """
+
+    def __init__(self):
+        self.sector_names: List[str] = [name for _, _, name in SECTORS]
+        self.sector_labels: List[str] = [
+            f"{first:02d}" if first == last else f"{first:02d}-{last:02d}"
+            for first, last, _ in SECTORS
+        ]
+        self.chapter_sector = np.full(100, INVALID, dtype=np.int64)
+        for sector, (first, last, _) in enumerate(SECTORS):
+            self.chapter_sector[first : last + 1] = sector
+        self.chapter_names = np.array(
+            [CHAPTER_NAMES.get(c, f"Chapter {c:02d}") for c in range(100)],
+            dtype=object,
+        )
+        self._sector_array = np.array(self.sector_names + [""], dtype=object)
+
+    # Encoding
+    def encode(self, codes: Iterable[Any]) -> np.ndarray:
+        """int64 codes right-padded to 10 digits; -1 where not a 2-10 digit code"""
+        if isinstance(codes, np.ndarray) and codes.dtype.kind in "iu":
+            return codes.astype(np.int64, copy=False)
+        keys = normalize_codes(codes)
+        if not keys.size:
+            return np.zeros(0, dtype=np.int64)
+        lengths = np.char.str_len(keys)
+        valid = np.char.isdigit(keys) & (lengths >= 2) & (lengths <= HTS_DIGITS)
+        padded = np.char.ljust(np.where(valid, keys, "0"), HTS_DIGITS, "0")
+        return np.where(valid, padded.astype(np.int64), INVALID)
+
+    def prefixes(self, codes: Iterable[Any], digits: int) -> np.ndarray:
+        """First digits of each code as an int (8517 for "851712", digits=4)"""
+        encoded = self.encode(codes)
+        return np.where(
+            encoded >= 0, encoded // 10 ** (HTS_DIGITS - digits), INVALID
+        )
+
+    # Lookups
+    def chapters(self, codes: Iterable[Any]) -> np.ndarray:
+        return self.prefixes(codes, 2)
+
+    def sectors(self, codes: Iterable[Any]) -> np.ndarray:
+        """Sector ids (indices into sector_names); -1 for invalid codes"""
+        chapters = self.chapters(codes)
+        return np.where(chapters >= 0, self.chapter_sector[chapters], INVALID)
+
+    def sector_name_array(self, codes: Iterable[Any]) -> np.ndarray:
+        """Sector name per code; "" for invalid codes"""
+        return self._sector_array[self.sectors(codes)]
+
+    def chapter_name_array(self, codes: Iterable[Any]) -> np.ndarray:
+        """Chapter name per code; "" for invalid codes"""
+        chapters = self.chapters(codes)
+        return np.where(chapters >= 0, self.chapter_names[chapters], "")
+
+    def industries(
+        self, codes: Iterable[Any], digits: int = 2
+    ) -> Tuple[List[str], np.ndarray]:
+        """(sorted industry labels, industry index per code) for N-digit industries
+
+        Invalid codes share one "??" industry so every code keeps a node.
+        """
+        prefixes = self.prefixes(codes, digits)
+        values, index = np.unique(prefixes, return_inverse=True)
+        labels = [f"{v:0{digits}d}" if v >= 0 else "?" * digits for v in values]
+        return labels, index.ravel()
+
+    # Scalar helpers
+    def chapter_name(self, code: Any) -> str:
+        """Chapter name for a chapter or longer code ("84", "8471.30")"""
+        chapter = int(self.chapters([code])[0])
+        return self.chapter_names[chapter] if chapter >= 0 else ""
+
+    def sector_name(self, code: Any) -> str:
+        return str(self.sector_name_array([code])[0])
+
+    def sector_table(self) -> Dict[str, str]:
+        """{"01-05": "Live animals; animal products", ...}"""
+        return dict(zip(self.sector_labels, self.sector_names))
+
+    def describe(self, codes: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Chapter and sector for each code, for API responses"""
+        keys = normalize_codes(codes)
+        chapters = self.chapters(keys)
+        sectors = self.sectors(keys)
+        return [
+            {
+                "hs_code": str(key),
+                "chapter": f"{chapter:02d}" if chapter >= 0 else None,
+                "chapter_name": self.chapter_names[chapter] if chapter >= 0 else None,
+                "sector": self.sector_names[sector] if sector >= 0 else None,
+            }
+            for key, chapter, sector in zip(keys, chapters, sectors)
+        ]
+
+
+# Global instance
+HS_CONCORDANCE = HSConcordance()
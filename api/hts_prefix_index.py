@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+HTS Prefix Index
+================
+
+Digit trie over HTS10 codes for chapter (2), heading (4), subheading (6),
+tariff line (8) and statistical suffix (10) queries such as "everything
+under 8471":
+- Lookups walk at most one node per prefix digit
+- Codes are kept in sorted order and every node stores the [start, end)
+  range of its codes, so iterating a prefix is a plain list slice
+- Count, sum, min and max base duty are precomputed per node
+
+Dots and spaces in codes or prefixes are ignored ("8471.30" == "847130").
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Names of the standard HTS levels by prefix length
+HTS_LEVELS = {
+    2: "chapter",
+    4: "heading",
+    6: "subheading",
+    8: "tariff_line",
+    10: "statistical_suffix",
+}
+
+
+def normalize_hts(code: str) -> str:
+    """Strip punctuation from an HTS code or prefix, keeping only digits"""
+    return "".join(ch for ch in str(code) if ch.isdigit())
+
+
+class _PrefixNode:
+    """One trie node; covers codes[start:end] of the index"""
+
+    __slots__ = ("children", "start", "end", "count", "duty_sum", "duty_min", "duty_max")
+
+    def __init__(self, start: int):
+        self.children: Dict[str, "_PrefixNode"] = {}
+        self.start = start
+        self.end = start
+        self.count = 0
+        self.duty_sum = 0.0
+        self.duty_min = float("inf")
+        self.duty_max = float("-inf")
+
+    def add(self, duty: float):
+        self.end += 1
+        self.count += 1
+        self.duty_sum += duty
+        if duty < self.duty_min:
+            self.duty_min = duty
+        if duty > self.duty_max:
+            self.duty_max = duty
+
+
+class HTSPrefixIndex:
+    """
+    Prefix index over HTS10 codes
+
+    Items are any objects with an HTS code and a base duty; the accessors
+    default to the attributes of authoritative_tariff_parser.HTSCode.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        code_attr: str = "hts10",
+        duty_attr: str = "base_duty_pct",
+    ):
+        keyed: List[Tuple[str, Any]] = sorted(
+            ((normalize_hts(getattr(item, code_attr)), item) for item in items),
+            key=lambda pair: pair[0],
+        )
+        self.codes: Tuple[str, ...] = tuple(code for code, _ in keyed)
+        self.items: Tuple[Any, ...] = tuple(item for _, item in keyed)
+        self.root = _PrefixNode(0)
+
+        # Codes arrive sorted, so each node's codes form one contiguous range
+        for position, (code, item) in enumerate(keyed):
+            duty = float(getattr(item, duty_attr) or 0.0)
+            node = self.root
+            node.add(duty)
+            for digit in code:
+                child = node.children.get(digit)
+                if child is None:
+                    child = _PrefixNode(position)
+                    node.children[digit] = child
+                node = child
+                node.add(duty)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _find(self, prefix: str) -> Optional[_PrefixNode]:
+        node = self.root
+        for digit in normalize_hts(prefix):
+            node = node.children.get(digit)
+            if node is None:
+                return None
+        return node
+
+    def count(self, prefix: str) -> int:
+        """Number of codes under a prefix"""
+        node = self._find(prefix)
+        return node.count if node else 0
+
+    def iter_prefix(self, prefix: str) -> Iterator[Any]:
+        """Items under a prefix in HTS order"""
+        node = self._find(prefix)
+        if node is None:
+            return iter(())
+        return iter(self.items[node.start : node.end])
+
+    def stats(self, prefix: str) -> Dict[str, Any]:
+        """Aggregate base duty statistics for a prefix"""
+        digits = normalize_hts(prefix)
+        node = self._find(digits)
+        if node is None or not node.count:
+            return {
+                "prefix": digits,
+                "level": HTS_LEVELS.get(len(digits), "partial"),
+                "count": 0,
+                "average_base_duty": 0.0,
+                "min_base_duty": 0.0,
+                "max_base_duty": 0.0,
+            }
+        return {
+            "prefix": digits,
+            "level": HTS_LEVELS.get(len(digits), "partial"),
+            "count": node.count,
+            "average_base_duty": node.duty_sum / node.count,
+            "min_base_duty": node.duty_min,
+            "max_base_duty": node.duty_max,
+        }
+
+    def breakdown(self, prefix: str, depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Statistics for every populated prefix `depth` digits long under
+        `prefix` (defaults to the next standard HTS level)
+        """
+        digits = normalize_hts(prefix)
+        if depth is None:
+            depth = next((level for level in HTS_LEVELS if level > len(digits)), 10)
+
+        node = self._find(digits)
+        if node is None or depth <= len(digits):
+            return []
+
+        frontier = [(digits, node)]
+        for _ in range(depth - len(digits)):
+            frontier = [
+                (path + digit, child)
+                for path, current in frontier
+                for digit, child in sorted(current.children.items())
+            ]
+        return [self.stats(path) for path, _ in frontier]
+
+
+if __name__ == "__main__":
+    from authoritative_tariff_parser import authoritative_parser
+
+    print("🧪 TESTING HTS PREFIX INDEX")
+    print("=" * 50)
+    authoritative_parser.load_excel_file()
+    index = authoritative_parser.hts_index
+    print(f"Indexed {len(index)} HTS codes")
+    for prefix in ("84", "8471", "847130", "72"):
+        print(index.stats(prefix))
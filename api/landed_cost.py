@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Landed Cost Calculator
+======================
+
+Costs shipment lines (HTS10, origin country, customs value) with the
+authoritative reciprocal tariff rules:
+- CSV or Parquet input is read in fixed-size chunks, so memory stays
+  bounded no matter how many lines a customs extract has
+- Each chunk is costed with one bulk effective-tariff matrix over its
+  unique HTS codes and countries instead of one calculation per line
+- Results are produced as CSV chunks that can be streamed to the client
+- Lines whose HTS code is not among the loaded HTS lines get no base duty
+  and are flagged with hts_found = False rather than passing as duty-free
+
+Parquet input requires pyarrow.
+"""
+
+import io
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from authoritative_tariff_parser import AuthoritativeTariffParser, authoritative_parser
+from country_resolver import canonical_country
+from hs_concordance import normalize_codes
+from hts_prefix_index import normalize_hts
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Accepted spellings of the required input columns (matched case-insensitively)
+COLUMN_ALIASES = {
+    "hts10": ("hts10", "hts", "hts_code", "htsus"),
+    "origin_country": ("origin_country", "country", "origin", "country_of_origin"),
+    "customs_value": ("customs_value", "value", "entered_value", "customs_value_usd"),
+}
+
+OUTPUT_COLUMNS = [
+    "hts10",
+    "origin_country",
+    "customs_value",
+    "base_duty_pct",
+    "reciprocal_addon_pct",
+    "section_301_pct",
+    "total_duty_pct",
+    "duty_amount",
+    "landed_cost",
+    "rule_type",
+    "hts_found",
+]
+
+
+def resolve_columns(columns) -> Dict[str, str]:
+    """Map input column names to the canonical shipment columns"""
+    by_lower = {str(column).strip().lower(): column for column in columns}
+    resolved = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        match = next((by_lower[alias] for alias in aliases if alias in by_lower), None)
+        if match is None:
+            raise ValueError(
+                f"Missing required column '{canonical}' "
+                f"(accepted names: {', '.join(aliases)})"
+            )
+        resolved[match] = canonical
+    return resolved
+
+
+def detect_format(filename: str = "", content_type: str = "") -> str:
+    """Guess the upload format from its filename or content type"""
+    name = (filename or "").lower()
+    if name.endswith((".parquet", ".pq")) or "parquet" in (content_type or ""):
+        return "parquet"
+    return "csv"
+
+
+def iter_shipment_chunks(
+    source: Union[str, BinaryIO], fmt: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Read a shipment file as DataFrames of at most chunk_size rows"""
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet uploads require pyarrow to be installed")
+
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            chunk = batch.to_pandas()
+            for column, canonical in resolve_columns(chunk.columns).items():
+                if canonical == "hts10":
+                    chunk[column] = hts_as_text(chunk[column])
+            yield chunk
+        return
+
+    # Read HTS codes as text so leading zeros survive
+    reader = pd.read_csv(source, chunksize=chunk_size, dtype=str)
+    for chunk in reader:
+        yield chunk
+
+
+def hts_as_text(codes: pd.Series) -> pd.Series:
+    """HTS codes as strings; numeric columns get their lost leading zero back"""
+    if not pd.api.types.is_numeric_dtype(codes):
+        return codes.astype(str)
+    digits = codes.astype("Int64").astype(str)
+    return pd.Series(normalize_codes(digits), index=codes.index, dtype=object)
+
+
+class LandedCostCalculator:
+    """Chunked landed-cost calculation on top of the authoritative parser"""
+
+    def __init__(self, parser: Optional[AuthoritativeTariffParser] = None):
+        self.parser = parser or authoritative_parser
+        if not self.parser.data_loaded:
+            self.parser.load_excel_file()
+
+    def cost_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Compute duties for one chunk of shipment lines"""
+        chunk = chunk.rename(columns=resolve_columns(chunk.columns))
+        hts = chunk["hts10"].astype(str).str.strip()
+        countries = chunk["origin_country"].astype(str).str.strip()
+        values = pd.to_numeric(chunk["customs_value"], errors="coerce").fillna(0.0)
+
+        # One matrix over the chunk's distinct codes and countries
+        hts_idx, unique_hts = pd.factorize(hts)
+        country_idx, unique_countries = pd.factorize(countries)
+        # Resolve spellings and codes ("CN", "Viet Nam") to the data's names
+        canonical_idx, canonical_names = pd.factorize(
+            pd.Series(unique_countries, dtype=object).map(canonical_country)
+        )
+        country_idx = canonical_idx[country_idx]
+        unique_countries = canonical_names
+        matrix = self.parser.calculate_effective_tariff_matrix(
+            list(unique_hts), list(unique_countries)
+        )
+
+        known = {normalize_hts(code.hts10) for code in self.parser.hts_codes}
+        hts_found = np.array([normalize_hts(code) in known for code in unique_hts])
+
+        total_pct = matrix.total_duty[country_idx, hts_idx]
+        duty_amount = values.to_numpy(dtype=np.float64) * total_pct / 100.0
+
+        return pd.DataFrame(
+            {
+                "hts10": hts.to_numpy(),
+                "origin_country": countries.to_numpy(),
+                "customs_value": values.to_numpy(),
+                "base_duty_pct": matrix.base_duty[country_idx, hts_idx],
+                "reciprocal_addon_pct": matrix.reciprocal_addon[country_idx, hts_idx],
+                "section_301_pct": matrix.section_301_duty[country_idx, hts_idx],
+                "total_duty_pct": total_pct,
+                "duty_amount": duty_amount,
+                "landed_cost": values.to_numpy() + duty_amount,
+                "rule_type": np.asarray(matrix.rule_types, dtype=object)[country_idx],
+                "hts_found": hts_found[hts_idx],
+            },
+            columns=OUTPUT_COLUMNS,
+        )
+
+    def iter_results(
+        self,
+        source: Union[str, BinaryIO],
+        fmt: str = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """Costed chunks for a whole shipment file"""
+        for chunk in iter_shipment_chunks(source, fmt, chunk_size):
+            if len(chunk):
+                yield self.cost_chunk(chunk)
+
+    def stream_csv(
+        self,
+        source: Union[str, BinaryIO],
+        fmt: str = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Costed results encoded as CSV, one block per input chunk"""
+        header = True
+        lines = 0
+        for result in self.iter_results(source, fmt, chunk_size):
+            buffer = io.StringIO()
+            result.to_csv(buffer, index=False, header=header)
+            header = False
+            lines += len(result)
+            yield buffer.getvalue().encode("utf-8")
+
+        if header:
+            # Empty input still gets a header row
+            yield (",".join(OUTPUT_COLUMNS) + "\n").encode("utf-8")
+        logger.info(f"✅ Costed {lines} shipment lines")
+
+    def summarize(
+        self,
+        source: Union[str, BinaryIO],
+        fmt: str = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """Totals for a shipment file without materializing per-line results"""
+        lines = 0
+        unknown_hts_lines = 0
+        customs_value = 0.0
+        duty_amount = 0.0
+        for result in self.iter_results(source, fmt, chunk_size):
+            lines += len(result)
+            unknown_hts_lines += int((~result["hts_found"]).sum())
+            customs_value += float(result["customs_value"].sum())
+            duty_amount += float(result["duty_amount"].sum())
+
+        return {
+            "lines": lines,
+            "unknown_hts_lines": unknown_hts_lines,
+            "customs_value": customs_value,
+            "duty_amount": duty_amount,
+            "landed_cost": customs_value + duty_amount,
+            "effective_duty_pct": (
+                duty_amount / customs_value * 100 if customs_value else 0.0
+            ),
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python landed_cost.py SHIPMENTS.csv|SHIPMENTS.parquet [OUTPUT.csv]
+    if len(sys.argv) < 2:
+        print("Usage: python landed_cost.py SHIPMENTS [OUTPUT.csv]")
+        sys.exit(1)
+
+    calculator = LandedCostCalculator()
+    input_path = sys.argv[1]
+    fmt = detect_format(input_path)
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "wb") as output:
+            for block in calculator.stream_csv(input_path, fmt):
+                output.write(block)
+        print(f"✅ Wrote landed costs to {sys.argv[2]}")
+    else:
+        print(calculator.summarize(input_path, fmt))
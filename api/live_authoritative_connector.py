@@ -24,10 +24,21 @@ import xml.etree.ElementTree as ET
 import csv
 from io import StringIO
 
+from federal_register_ingest import DOCUMENT_SCANNER, FederalRegisterIngestor
+from policy_store import PolicyDocument
+from text_matcher import extract_rates
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# USTR presidential documents on tariffs, ingested incrementally
+FEDERAL_REGISTER_POLICY_CONDITIONS = {
+    "conditions[agencies][]": "office-of-the-united-states-trade-representative",
+    "conditions[term]": "tariff OR trade OR Section 301",
+    "conditions[type][]": "PRESDOCU",
+}
+
 
 class LiveAuthoritativeConnector:
     """Connects to live official government tariff data sources"""
@@ -41,6 +52,11 @@ class LiveAuthoritativeConnector:
             "uk_tariff": "https://api.trade-tariff.service.gov.uk/api/v2",
             "world_bank": "https://api.worldbank.org/v2",
         }
+        self.federal_register = FederalRegisterIngestor(
+            "tariff_policies",
+            FEDERAL_REGISTER_POLICY_CONDITIONS,
+            url=f"{self.base_urls['federal_register']}/documents.json",
+        )
 
     async def __aenter__(self):
         self.session = aiohttp.ClientSession(
@@ -115,33 +131,15 @@ class LiveAuthoritativeConnector:
         """
         Fetch latest tariff policies from Federal Register
         Presidential proclamations and Executive Orders
+
+        Only documents newer than the stored cursor are fetched and parsed;
+        policies are then read back from the local policy store.
         """
         try:
-            url = f"{self.base_urls['federal_register']}/documents.json"
-
-            params = {
-                "conditions[agencies][]": "office-of-the-united-states-trade-representative",
-                "conditions[term]": "tariff OR trade OR Section 301",
-                "conditions[type][]": "PRESDOCU",
-                "conditions[publication_date][gte]": "2024-01-01",
-                "fields[]": [
-                    "title",
-                    "abstract",
-                    "publication_date",
-                    "pdf_url",
-                    "agencies",
-                ],
-                "per_page": 100,
-                "order": "newest",
-            }
-
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_federal_register_data(data)
-                else:
-                    logger.warning(f"Federal Register API returned {response.status}")
-                    return {}
+            await self.federal_register.ingest(self.session)
+            return self._format_federal_register_policies(
+                self.federal_register.latest_by_country()
+            )
 
         except Exception as e:
             logger.error(f"Error fetching Federal Register data: {e}")
@@ -285,21 +283,17 @@ class LiveAuthoritativeConnector:
                 pub_date = doc.get("publication_date", "")
 
                 # Extract country and tariff information from documents
-                countries_mentioned = self._extract_countries_from_text(
-                    title + " " + abstract
-                )
-                tariff_rates = self._extract_tariff_rates_from_text(
-                    title + " " + abstract
-                )
+                matches = DOCUMENT_SCANNER.scan(f"{title} {abstract or ''}")
 
-                for country in countries_mentioned:
+                for country in matches.countries:
                     if country not in policies:
                         policies[country] = {}
 
                     policies[country]["Federal Policy"] = {
                         "document_title": title,
                         "publication_date": pub_date,
-                        "tariff_rates": tariff_rates,
+                        "tariff_rates": matches.rates,
+                        "tariff_programs": matches.programs,
                         "source": "Federal Register",
                         "data_quality": "Official",
                         "last_updated": datetime.now().isoformat(),
@@ -310,6 +304,27 @@ class LiveAuthoritativeConnector:
 
         return policies
 
+    def _format_federal_register_policies(
+        self, documents: Dict[str, PolicyDocument]
+    ) -> Dict[str, Any]:
+        """Latest stored document per country as Federal Policy entries"""
+        return {
+            country: {
+                "Federal Policy": {
+                    "document_title": document.title,
+                    "document_number": document.document_number,
+                    "publication_date": document.publication_date,
+                    "tariff_rates": document.rates,
+                    "tariff_programs": document.programs,
+                    "source": "Federal Register",
+                    "data_quality": "Official",
+                    "last_updated": datetime.now().isoformat(),
+                    "verification": "US Federal Register",
+                }
+            }
+            for country, document in documents.items()
+        }
+
     def _parse_world_bank_data(self, all_data: Dict) -> Dict[str, Any]:
         """Parse World Bank economic indicators"""
         economic_data = {}
@@ -345,57 +360,11 @@ class LiveAuthoritativeConnector:
 
     def _extract_countries_from_text(self, text: str) -> List[str]:
         """Extract country names from document text"""
-        countries = [
-            "China",
-            "European Union",
-            "Japan",
-            "South Korea",
-            "India",
-            "Canada",
-            "Mexico",
-            "Brazil",
-            "Argentina",
-            "Chile",
-            "Peru",
-            "Colombia",
-            "Venezuela",
-            "Thailand",
-            "Vietnam",
-            "Malaysia",
-            "Indonesia",
-            "Philippines",
-            "Singapore",
-            "Australia",
-            "New Zealand",
-            "Germany",
-            "France",
-            "Italy",
-            "Spain",
-            "Netherlands",
-            "Belgium",
-            "United Kingdom",
-            "Switzerland",
-            "Turkey",
-            "Saudi Arabia",
-            "UAE",
-        ]
-
-        found_countries = []
-        text_lower = text.lower()
-        for country in countries:
-            if country.lower() in text_lower:
-                found_countries.append(country)
-
-        return found_countries
+        return DOCUMENT_SCANNER.scan(text).countries
 
     def _extract_tariff_rates_from_text(self, text: str) -> List[float]:
         """Extract tariff rates from document text"""
-        import re
-
-        # Look for percentage patterns
-        pattern = r"(\d+(?:\.\d+)?)\s*%"
-        matches = re.findall(pattern, text)
-        return [float(match) for match in matches if float(match) <= 100]
+        return extract_rates(text)
 
     async def get_comprehensive_live_data(self) -> Dict[str, Any]:
         """
@@ -29,6 +29,8 @@ from usitc_hts_connector import (
     get_usitc_hts_details,
     get_usitc_special_programs
 )
+from cache_backend import CacheBackend, get_cache_backend
+from snapshot_store import snapshot_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,10 +43,13 @@ class LiveUSITCIntegration:
     Provides comprehensive tariff data without hardcoded values
     """
     
-    def __init__(self):
+    # Namespace of this integration's entries in the shared cache
+    CACHE_PREFIX = "usitc:"
+
+    def __init__(self, cache: Optional[CacheBackend] = None):
         self.connector = None
-        self.cache = {}
-        self.cache_expiry = {}
+        # Shared by all workers on the host (see cache_backend.py)
+        self.cache = cache or get_cache_backend()
         self.cache_duration = timedelta(hours=1)  # Cache for 1 hour
         
         # Known countries affected by US tariffs (from official sources)
@@ -62,11 +67,13 @@ class LiveUSITCIntegration:
             "Burkina Faso", "Senegal", "Gambia", "Guinea-Bissau", "Guinea",
             "Sierra Leone", "Liberia", "Ivory Coast", "Togo", "Benin",
             "Cameroon", "Central African Republic", "Gabon", "Congo",
-            "Democratic Republic of Congo", "Equatorial Guinea",
+            "Democratic Republic of the Congo", "Equatorial Guinea",
             "Sao Tome and Principe", "Cape Verde", "Mauritania",
             "Western Sahara", "Libya"
         ]
 
+        self._warm_cache_from_store()
+
     async def __aenter__(self):
         self.connector = USITCHTSConnector()
         await self.connector.__aenter__()
@@ -81,13 +88,7 @@ class LiveUSITCIntegration:
         Get comprehensive tariff data for a country from USITC
         Returns live data with no hardcoded values
         """
-        try:
-            # Check cache first
-            cache_key = f"country_{country_name.lower()}"
-            if self._is_cache_valid(cache_key):
-                logger.info(f"Using cached data for {country_name}")
-                return self.cache[cache_key]
-
+        async def fetch() -> Dict[str, Any]:
             # Fetch live data from USITC
             logger.info(f"Fetching live tariff data for {country_name} from USITC")
             country_data = await self.connector.get_comprehensive_country_data(country_name)
@@ -108,11 +109,14 @@ class LiveUSITCIntegration:
                     "note": "No official tariff data found for this country"
                 }
 
-            # Cache the result
-            self._cache_data(cache_key, country_data)
-            
+            self._persist(cache_key, country_data)
             return country_data
 
+        try:
+            # Served from the cache unless no worker fetched it recently
+            cache_key = f"country_{country_name.lower()}"
+            return await self._cached(cache_key, fetch)
+
         except Exception as e:
             logger.error(f"Error getting tariff data for {country_name}: {e}")
             return {
@@ -192,20 +196,15 @@ class LiveUSITCIntegration:
         Get information about special duty programs
         Returns live data from USITC
         """
-        try:
-            # Check cache first
-            cache_key = "special_programs"
-            if self._is_cache_valid(cache_key):
-                return self.cache[cache_key]
-
+        async def fetch() -> Dict[str, Any]:
             # Fetch live data
             programs_data = await self.connector.get_special_duty_programs()
-            
-            # Cache the result
-            self._cache_data(cache_key, programs_data)
-            
+            self._persist("special_programs", programs_data)
             return programs_data
 
+        try:
+            return await self._cached("special_programs", fetch)
+
         except Exception as e:
             logger.error(f"Error getting special duty programs: {e}")
             return {}
@@ -302,22 +301,31 @@ class LiveUSITCIntegration:
                 "timestamp": datetime.now().isoformat()
             }
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self.cache or cache_key not in self.cache_expiry:
-            return False
-        
-        return datetime.now() < self.cache_expiry[cache_key]
-
-    def _cache_data(self, cache_key: str, data: Any):
-        """Cache data with expiration"""
-        self.cache[cache_key] = data
-        self.cache_expiry[cache_key] = datetime.now() + self.cache_duration
+    async def _cached(self, cache_key: str, fetch) -> Any:
+        """Cached value for cache_key; fetch() runs once per host per expiry"""
+        return await self.cache.aget_or_compute(
+            self.CACHE_PREFIX + cache_key, fetch, ttl=self.cache_duration
+        )
+
+    def _persist(self, cache_key: str, data: Any):
+        """Persist fetched data to the snapshot store for warm starts"""
+        if data:
+            snapshot_store.put("usitc_integration", cache_key, data, datetime.now())
+
+    def _warm_cache_from_store(self):
+        """Restore persisted cache entries that are still within cache_duration"""
+        now = datetime.now()
+        for cache_key, stored in snapshot_store.latest_for_source(
+            "usitc_integration"
+        ).items():
+            remaining = stored.fetched_at + self.cache_duration - now
+            key = self.CACHE_PREFIX + cache_key
+            if remaining > timedelta(0) and self.cache.get(key) is None:
+                self.cache.set(key, stored.payload, ttl=remaining)
 
     def clear_cache(self):
         """Clear all cached data"""
-        self.cache.clear()
-        self.cache_expiry.clear()
+        self.cache.clear(self.CACHE_PREFIX)
 
 
 # Convenience functions for easy integration
@@ -7,24 +7,82 @@ Modern FastAPI backend serving the React + Tailwind frontend
 with real US-imposed tariff rates and meaningful analysis.
 """
 
+import asyncio
+import csv
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, List
 import logging
 import os
 from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background refresh of live upstream data (disable for offline runs/tests)
+ENABLE_BACKGROUND_REFRESH = (
+    os.getenv("ENABLE_BACKGROUND_REFRESH", "true").lower() == "true"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize data sources and run background refresh for the app's lifetime"""
+    from refresh_scheduler import refresh_scheduler
+    from worker_pool import worker_pool
+
+    try:
+        logger.info("🚀 Initializing real tariff data source...")
+
+        # Test the real data source
+        test_data = get_real_country_tariff("China")
+        if test_data and test_data.get("average_tariff_rate", 0) > 0:
+            logger.info("✅ Successfully initialized real tariff data source")
+            logger.info(f"China tariff rate: {test_data.get('average_tariff_rate')}%")
+        else:
+            logger.warning("⚠️ Real data source test returned limited data")
+
+    except Exception as e:
+        logger.error(f"Error during startup: {e}")
+        logger.warning("⚠️ Real data source may not be fully available")
+
+    # Serve the last persisted upstream payloads until fresh data arrives
+    try:
+        from snapshot_store import snapshot_store
+
+        await asyncio.to_thread(snapshot_store.compact)
+        refresh_scheduler.warm_start()
+    except Exception as e:
+        logger.error(f"Error restoring persisted snapshots: {e}")
+
+    # CPU-bound bulk work runs in worker processes sharing the loaded data
+    try:
+        await asyncio.to_thread(worker_pool.start)
+    except Exception as e:
+        logger.error(f"Error starting worker pool: {e}")
+
+    # Live upstream fetches run here, never inside request handlers
+    if ENABLE_BACKGROUND_REFRESH:
+        refresh_scheduler.start()
+
+    try:
+        yield
+    finally:
+        await refresh_scheduler.stop()
+        await asyncio.to_thread(worker_pool.stop)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="TIPM API",
     description="Tariff Impact Propagation Model - Real US Tariff Data",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Environment-based CORS configuration
@@ -116,6 +174,18 @@ class CountryInfo(BaseModel):
     affected_sectors: List[str]
 
 
+class TariffMatrixRequest(BaseModel):
+    hts_codes: List[str] = Field(
+        default_factory=list, description="HTS10 codes (optional if hts_prefix is set)"
+    )
+    hts_prefix: Optional[str] = Field(
+        None, description="Use every loaded HTS code under this prefix"
+    )
+    countries: List[str] = Field(
+        default_factory=list, description="Countries (defaults to all loaded countries)"
+    )
+
+
 class SectorAnalysis(BaseModel):
     sector: str
     tariff_rate: float
@@ -127,6 +197,8 @@ class SectorAnalysis(BaseModel):
 import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from country_registry import COUNTRY_REGISTRY
+from country_resolver import canonical_country, resolve_country
 from real_tariff_data_source import (
     get_real_country_tariff,
     get_real_all_countries,
@@ -134,6 +206,13 @@ from real_tariff_data_source import (
     get_real_country_average_tariff,
     get_real_affected_sectors,
 )
+from dataset_diff import (
+    DATASET_TRACKERS,
+    TariffAggregates,
+    latest_diffs,
+    on_dataset_diff,
+)
+from temporal_tariff_store import as_of_day
 
 # Use only Real Tariff Data Source - remove unused imports
 
@@ -147,26 +226,6 @@ from real_tariff_data_source import (
 # Simple inline analysis (no external dependencies needed)
 
 
-# Initialize real tariff data source on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize real tariff data source when the API starts"""
-    try:
-        logger.info("🚀 Initializing real tariff data source...")
-
-        # Test the real data source
-        test_data = get_real_country_tariff("China")
-        if test_data and test_data.get("average_tariff_rate", 0) > 0:
-            logger.info("✅ Successfully initialized real tariff data source")
-            logger.info(f"China tariff rate: {test_data.get('average_tariff_rate')}%")
-        else:
-            logger.warning("⚠️ Real data source test returned limited data")
-
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
-        logger.warning("⚠️ Real data source may not be fully available")
-
-
 # Functions now imported from authoritative_tariff_parser
 
 
@@ -204,6 +263,10 @@ async def options_handler(full_path: str):
 # Health check endpoint
 @app.get("/health")
 async def health_check():
+    from chart_service import chart_service
+    from refresh_scheduler import refresh_scheduler
+    from worker_pool import worker_pool
+
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
@@ -215,6 +278,9 @@ async def health_check():
         "credits": "Official US Government Data - USTR + Commerce Department + Executive Orders",
         "china_tariff_rate": "32.9% average (54.9% for certain sectors)",
         "data_confidence": "High - Official US Government Sources",
+        "live_snapshots": refresh_scheduler.status(),
+        "worker_pool": worker_pool.status(),
+        "chart_cache": chart_service.status(),
     }
 
 
@@ -223,48 +289,24 @@ async def health_check():
 async def get_available_countries():
     """Get list of all available countries for analysis"""
     # Return comprehensive list of countries with real tariff data
-    countries = [
-        "China",
-        "Hong Kong",
-        "Macau",
-        "Russia",
-        "Ukraine",
-        "Turkey",
-        "India",
-        "Brazil",
-        "Mexico",
-        "Canada",
-        "Japan",
-        "South Korea",
-        "European Union",
-        "Germany",
-        "France",
-        "United Kingdom",
-        "Italy",
-        "Spain",
-        "Netherlands",
-        "Belgium",
-        "Switzerland",
-        "Australia",
-        "Singapore",
-        "Malaysia",
-        "Thailand",
-        "Vietnam",
-        "Indonesia",
-        "Philippines",
-        "Taiwan",
-        "South Africa",
-    ]
-    return countries
+    return list(COUNTRY_REGISTRY.analysis_countries)
 
 
 # Get country information
 @app.get("/api/countries/{country_name}", response_model=CountryInfo)
-async def get_country_info(country_name: str):
-    """Get comprehensive information about a specific country"""
+async def get_country_info(country_name: str, as_of: Optional[str] = None):
+    """
+    Get comprehensive information about a specific country
+
+    as_of (YYYY-MM-DD) returns the tariff rate that was in effect on that date.
+    """
+    country_name = canonical_country(country_name)
     try:
-        # Get real tariff data from authoritative sources
-        country_data = get_real_country_tariff(country_name)
+        if as_of is not None:
+            country_data = _country_tariff_as_of(country_name, as_of)
+        else:
+            # Get real tariff data from authoritative sources
+            country_data = get_real_country_tariff(country_name)
 
         if "error" in country_data:
             return CountryInfo(
@@ -336,11 +378,31 @@ async def get_country_info(country_name: str):
         )
 
 
+def _country_tariff_as_of(country_name: str, as_of: str) -> Dict[str, Any]:
+    """get_real_country_tariff() fields for the tariffs in effect on as_of"""
+    from correct_tariff_calculator import (
+        get_correct_affected_sectors,
+        get_correct_country_rate,
+    )
+
+    # Raises ValueError on a malformed date
+    as_of_day(as_of)
+    rate, source, confidence = get_correct_country_rate(country_name, as_of)
+    return {
+        "average_tariff_rate": rate,
+        "data_source": source,
+        "confidence": confidence,
+        "affected_sectors": (
+            get_correct_affected_sectors(country_name) if rate > 0 else []
+        ),
+    }
+
+
 # Analyze country tariff impact
 @app.post("/api/analyze", response_model=CountryAnalysisResponse)
 async def analyze_country(request: CountryAnalysisRequest):
     """Analyze tariff impact for a specific country"""
-    country_name = request.country_name
+    country_name = canonical_country(request.country_name)
     custom_tariff_rate = request.custom_tariff_rate
 
     # Get country info
@@ -508,98 +570,180 @@ async def get_available_sectors():
     return {"sectors": sectors}
 
 
-# Removed unused Atlantic Council endpoints
+# Landed-cost batch costing of shipment files
+@app.post("/api/landed-cost")
+async def calculate_landed_cost(
+    file: UploadFile = File(...), chunk_size: int = 100_000
+):
+    """
+    Cost a CSV or Parquet upload of shipment lines (HTS10, origin country,
+    customs value); per-line duties are streamed back as CSV
+    """
+    from landed_cost import LandedCostCalculator, detect_format, resolve_columns
 
+    fmt = detect_format(file.filename, file.content_type)
+    try:
+        calculator = await asyncio.to_thread(LandedCostCalculator)
+        if fmt == "csv":
+            # Validate the header up front so errors are not buried in the stream
+            header = file.file.readline().decode("utf-8-sig")
+            resolve_columns(next(csv.reader([header]), []))
+            file.file.seek(0)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # The blocking generator runs in Starlette's threadpool while streaming
+    results = calculator.stream_csv(file.file, fmt, max(1_000, chunk_size))
+    return StreamingResponse(
+        results,
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=landed_cost.csv"},
+    )
+
+
+# Bulk country x HTS effective tariffs (computed in the worker pool)
+@app.post("/api/tariff-matrix")
+async def get_tariff_matrix(request: TariffMatrixRequest):
+    """Get total effective duty for every (country, HTS code) pair"""
+    from authoritative_tariff_parser import authoritative_parser
+    from worker_pool import compute_tariff_matrix, run_in_worker
 
-# NEW: Average tariff rates summary for all countries
-@app.get("/api/tariff-summary")
-async def get_tariff_summary_all_countries():
-    """Get average tariff rates for all countries with calculations"""
     try:
-        from correct_tariff_calculator import get_correct_country_rate
+        hts_codes = list(request.hts_codes)
+        if request.hts_prefix:
+            hts_codes += [
+                code.hts10
+                for code in authoritative_parser.hts_index.iter_prefix(
+                    request.hts_prefix
+                )
+            ]
+        countries = [
+            canonical_country(country) for country in request.countries
+        ] or authoritative_parser.get_all_countries()
 
-        tariff_summary = []
+        return await run_in_worker(compute_tariff_matrix, hts_codes, countries)
 
-        # Use only the main API countries list (30 countries)
-        all_countries = await get_available_countries()
+    except Exception as e:
+        logger.error(f"Error computing tariff matrix: {e}")
+        return {"error": str(e), "countries": [], "hts_codes": []}
 
-        for country in all_countries:
-            try:
-                # Get tariff rate and source
-                rate, source, confidence = get_correct_country_rate(country)
 
-                # Get GDP and trade data
-                gdp = await get_country_gdp(country)
-                trade_volume = await get_country_trade_volume(country)
+# Country charts (rendered in the worker pool, cached per dataset version)
+@app.get("/api/charts/{country_name}/{chart_type}")
+async def get_country_chart(country_name: str, chart_type: str, fmt: str = "png"):
+    """Get a tariff_impact, sector_analysis or comprehensive_dashboard chart"""
+    from fastapi.responses import Response
+    from chart_service import CHART_FORMATS, chart_service
 
-                # Calculate economic impact with proper formula
-                if rate > 0:
-                    # Use same elasticity model as country analysis
-                    trade_elasticity = min(0.4, rate / 100)
-                    trade_impact_usd = trade_volume * trade_elasticity * 1000000
-                else:
-                    trade_impact_usd = 0
-
-                # Determine impact level
-                if rate >= 35:
-                    impact_level = "Critical"
-                elif rate >= 25:
-                    impact_level = "High"
-                elif rate >= 15:
-                    impact_level = "Medium"
-                elif rate >= 5:
-                    impact_level = "Low"
-                else:
-                    impact_level = "Minimal"
-
-                tariff_summary.append(
-                    {
-                        "country": country,
-                        "average_tariff_rate": rate,
-                        "data_source": source,
-                        "confidence_level": confidence,
-                        "impact_level": impact_level,
-                        "gdp_billions": gdp,
-                        "trade_volume_millions": trade_volume,
-                        "estimated_trade_impact_usd": trade_impact_usd,
-                        "continent": get_continent(country),
-                        "emerging_market": is_emerging_market(country),
-                        "last_updated": datetime.now().isoformat(),
-                    }
-                )
+    country_name = canonical_country(country_name)
+    try:
+        content, version = await chart_service.get_chart(
+            country_name, chart_type, fmt
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(f"Error rendering {chart_type} chart for {country_name}: {e}")
+        return {"error": f"Could not render chart: {e}"}
 
-            except Exception as e:
-                logger.error(f"Error calculating tariff for {country}: {e}")
-                continue
+    if content is None:
+        return {"error": f"No {chart_type} data available for {country_name}"}
 
-        # Sort by tariff rate (highest first)
-        tariff_summary.sort(key=lambda x: x["average_tariff_rate"], reverse=True)
+    return Response(
+        content=content,
+        media_type=CHART_FORMATS[fmt],
+        headers={"ETag": f'"{version}"', "Cache-Control": "public, max-age=3600"},
+    )
 
-        # Calculate overall statistics
-        active_tariffs = [
-            item for item in tariff_summary if item["average_tariff_rate"] > 0
-        ]
+
+# HTS prefix queries (chapter, heading, subheading, tariff line)
+@app.get("/api/hts/{prefix}")
+async def get_hts_prefix(prefix: str, limit: int = 100):
+    """Get HTS codes and base duty statistics under an HTS prefix"""
+    from authoritative_tariff_parser import query_hts_prefix
+    from hts_prefix_index import normalize_hts
+
+    if not normalize_hts(prefix):
+        return {"error": f"Invalid HTS prefix: {prefix}", "hts_codes": []}
+
+    result = query_hts_prefix(prefix, max(0, min(limit, 1000)))
+    if not result:
+        return {"error": f"Could not query HTS prefix: {prefix}", "hts_codes": []}
+    return result
+
+
+# HS code -> chapter -> sector concordance
+@app.get("/api/hs-concordance")
+async def get_hs_concordance(codes: str):
+    """Map comma-separated HS/HTS codes to their chapter and sector"""
+    from hs_concordance import HS_CONCORDANCE
+
+    code_list = [code for code in codes.split(",") if code.strip()]
+    if not code_list:
+        return {"error": "No HS codes given", "codes": []}
+    if len(code_list) > 1000:
+        return {"error": "At most 1000 HS codes per request", "codes": []}
+    return {"codes": HS_CONCORDANCE.describe(code_list)}
+
+
+# Removed unused Atlantic Council endpoints
+
+
+# NEW: Average tariff rates summary for all countries
+@app.get("/api/tariff-summary")
+async def get_tariff_summary_all_countries(as_of: Optional[str] = None):
+    """
+    Get average tariff rates for all countries with calculations
+
+    as_of (YYYY-MM-DD) returns the rates that were in effect on that date.
+    """
+    if as_of is not None:
+        try:
+            as_of_day(as_of)
+        except ValueError:
+            return {
+                "error": f"Invalid as_of date: {as_of} (expected YYYY-MM-DD)",
+                "countries": [],
+                "statistics": {},
+            }
+
+    try:
+        if as_of is None:
+            # Only countries changed by a dataset update are recomputed
+            stale = [
+                country
+                for country in await get_available_countries()
+                if country in _dirty_summary_countries
+                or country not in _tariff_summary_entries
+            ]
+            _dirty_summary_countries.difference_update(stale)
+            for country in stale:
+                entry = await _tariff_summary_entry(country)
+                if entry is None:
+                    _dirty_summary_countries.add(country)
+                else:
+                    _tariff_summary_entries[country] = entry
+            _tariff_summary_aggregates.refresh(
+                _summary_dataset(_tariff_summary_entries), stale
+            )
+            entries = dict(_tariff_summary_entries)
+            aggregates = _tariff_summary_aggregates
+        else:
+            entries = {}
+            for country in await get_available_countries():
+                entry = await _tariff_summary_entry(country, as_of)
+                if entry is not None:
+                    entries[country] = entry
+            aggregates = TariffAggregates()
+            aggregates.refresh(_summary_dataset(entries))
+
+        # Sort by tariff rate (highest first)
+        tariff_summary = sorted(
+            entries.values(), key=lambda x: x["average_tariff_rate"], reverse=True
+        )
 
         statistics = {
-            "total_countries": len(tariff_summary),
-            "countries_with_tariffs": len(active_tariffs),
-            "average_rate_all": (
-                sum(item["average_tariff_rate"] for item in tariff_summary)
-                / len(tariff_summary)
-                if tariff_summary
-                else 0
-            ),
-            "average_rate_active": (
-                sum(item["average_tariff_rate"] for item in active_tariffs)
-                / len(active_tariffs)
-                if active_tariffs
-                else 0
-            ),
-            "highest_rate": (
-                max(item["average_tariff_rate"] for item in tariff_summary)
-                if tariff_summary
-                else 0
-            ),
+            **aggregates.statistics(),
             "total_trade_impact_billions": sum(
                 item["estimated_trade_impact_usd"] for item in tariff_summary
             )
@@ -614,7 +758,8 @@ async def get_tariff_summary_all_countries():
             "metadata": {
                 "calculation_method": "Weighted average of all applicable tariffs",
                 "data_quality": "Official government sources prioritized",
-                "update_frequency": "Real-time with 6-hour cache",
+                "update_frequency": "Background refresh - hourly to daily per source",
+                "as_of": as_of,
             },
         }
 
@@ -623,136 +768,146 @@ async def get_tariff_summary_all_countries():
         return {"error": str(e), "countries": [], "statistics": {}}
 
 
+# Per-country /api/tariff-summary entries, recomputed when a dataset diff
+# marks their country dirty
+_tariff_summary_entries: Dict[str, Dict[str, Any]] = {}
+_tariff_summary_aggregates = TariffAggregates()
+_dirty_summary_countries: set = set()
+
+
+def _mark_summary_dirty(diff, dataset):
+    """Dataset diff listener: invalidate the changed countries' entries"""
+    _dirty_summary_countries.update(
+        canonical_country(country) for country in diff.dirty_countries
+    )
+
+
+on_dataset_diff(_mark_summary_dirty)
+
+
+def _summary_dataset(entries: Dict[str, Dict[str, Any]]) -> Dict[str, Dict]:
+    """Summary entries as one-row datasets for TariffAggregates"""
+    return {
+        country: {
+            ("Average", ""): (
+                entry["average_tariff_rate"],
+                "Active",
+                entry["data_source"],
+                "",
+            )
+        }
+        for country, entry in entries.items()
+    }
+
+
+async def _tariff_summary_entry(
+    country: str, as_of: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Rate, impact and economic context of one country for the summary"""
+    from correct_tariff_calculator import get_correct_country_rate
+
+    try:
+        # Get tariff rate and source
+        rate, source, confidence = get_correct_country_rate(country, as_of)
+
+        # Get GDP and trade data
+        gdp = await get_country_gdp(country)
+        trade_volume = await get_country_trade_volume(country)
+
+        # Calculate economic impact with proper formula
+        if rate > 0:
+            # Use same elasticity model as country analysis
+            trade_elasticity = min(0.4, rate / 100)
+            trade_impact_usd = trade_volume * trade_elasticity * 1000000
+        else:
+            trade_impact_usd = 0
+
+        # Determine impact level
+        if rate >= 35:
+            impact_level = "Critical"
+        elif rate >= 25:
+            impact_level = "High"
+        elif rate >= 15:
+            impact_level = "Medium"
+        elif rate >= 5:
+            impact_level = "Low"
+        else:
+            impact_level = "Minimal"
+
+        return {
+            "country": country,
+            "average_tariff_rate": rate,
+            "data_source": source,
+            "confidence_level": confidence,
+            "impact_level": impact_level,
+            "gdp_billions": gdp,
+            "trade_volume_millions": trade_volume,
+            "estimated_trade_impact_usd": trade_impact_usd,
+            "continent": get_continent(country),
+            "emerging_market": is_emerging_market(country),
+            "last_updated": datetime.now().isoformat(),
+        }
+
+    except Exception as e:
+        logger.error(f"Error calculating tariff for {country}: {e}")
+        return None
+
+
+# Dataset diffs (workbook reloads and refreshed snapshots)
+@app.get("/api/dataset-diffs")
+async def get_dataset_diffs():
+    """Version and latest change counts of every tracked dataset"""
+    return {"datasets": latest_diffs()}
+
+
+@app.get("/api/dataset-diffs/{dataset}")
+async def get_dataset_diff(dataset: str, limit: int = 500):
+    """Row-level (country, sector, HTS) changes of a dataset's latest update"""
+    tracker = DATASET_TRACKERS.get(dataset)
+    if tracker is None:
+        return {"error": f"Unknown dataset: {dataset}", "changes": []}
+    if tracker.last_diff is None:
+        return {"dataset": dataset, "version": tracker.version, "changes": []}
+    return tracker.last_diff.to_dict(limit=max(0, limit))
+
+
 # Refresh Atlantic Council dataset
 # Removed unused refresh endpoint
 
 
 # Helper functions
 def get_continent(country_name: str) -> str:
-    continent_map = {
-        "China": "Asia",
-        "Japan": "Asia",
-        "South Korea": "Asia",
-        "India": "Asia",
-        "Thailand": "Asia",
-        "Vietnam": "Asia",
-        "Malaysia": "Asia",
-        "Singapore": "Asia",
-        "Indonesia": "Asia",
-        "Philippines": "Asia",
-        "European Union": "Europe",
-        "Germany": "Europe",
-        "France": "Europe",
-        "Italy": "Europe",
-        "Spain": "Europe",
-        "Netherlands": "Europe",
-        "Belgium": "Europe",
-        "Sweden": "Europe",
-        "Mexico": "Americas",
-        "Canada": "Americas",
-        "Brazil": "Americas",
-        "Argentina": "Americas",
-        "Chile": "Americas",
-        "Peru": "Americas",
-        "Colombia": "Americas",
-        "Venezuela": "Americas",
-        "South Africa": "Africa",
-        "Nigeria": "Africa",
-        "Kenya": "Africa",
-        "Ethiopia": "Africa",
-        "Ghana": "Africa",
-        "Uganda": "Africa",
-        "Saudi Arabia": "Middle East",
-        "UAE": "Middle East",
-        "Israel": "Middle East",
-        "Turkey": "Middle East",
-        "Iran": "Middle East",
-        "Qatar": "Middle East",
-        "Australia": "Oceania",
-        "New Zealand": "Oceania",
-        "Fiji": "Oceania",
-        "Papua New Guinea": "Oceania",
-    }
-    return continent_map.get(country_name, "Unknown")
+    record = resolve_country(country_name)
+    return record.continent if record else "Unknown"
 
 
 def get_global_groups(country_name: str) -> List[str]:
-    groups = {
-        "China": ["G20", "BRICS"],
-        "Japan": ["G7", "G20"],
-        "Germany": ["G7", "G20", "EU"],
-        "France": ["G7", "G20", "EU"],
-        "Italy": ["G7", "G20", "EU"],
-        "Canada": ["G7", "G20"],
-        "India": ["G20", "BRICS"],
-        "Brazil": ["G20", "BRICS"],
-        "South Africa": ["G20", "BRICS"],
-        "European Union": ["G7"],
-        "South Korea": ["G20"],
-        "Australia": ["G20"],
-        "Mexico": ["G20"],
-        "Argentina": ["G20"],
-        "Turkey": ["G20"],
-        "Saudi Arabia": ["G20"],
-        "Indonesia": ["G20"],
-    }
-    return groups.get(country_name, [])
+    record = resolve_country(country_name)
+    return list(record.groups) if record else []
 
 
 def is_emerging_market(country_name: str) -> bool:
-    emerging_markets = [
-        "China",
-        "India",
-        "Brazil",
-        "Russia",
-        "South Africa",
-        "Mexico",
-        "Indonesia",
-        "Turkey",
-        "Thailand",
-        "Malaysia",
-        "Philippines",
-        "Vietnam",
-        "Egypt",
-        "Nigeria",
-        "Kenya",
-        "Ethiopia",
-        "Ghana",
-        "Uganda",
-        "Colombia",
-        "Peru",
-        "Chile",
-        "Argentina",
-        "Venezuela",
-    ]
-    return country_name in emerging_markets
+    record = resolve_country(country_name)
+    return record.emerging_market if record else False
 
 
 async def get_country_gdp(country_name: str) -> float:
     """
-    Get live GDP data from World Bank API
-    Replaces hard-coded data with authoritative live data
+    Get GDP data from the latest World Bank snapshot
+    The snapshot is refreshed daily in the background - no network access here
     """
-    try:
-        from live_authoritative_connector import LiveAuthoritativeConnector
+    from refresh_scheduler import get_snapshot_data
 
-        async with LiveAuthoritativeConnector() as connector:
-            economic_data = await connector.get_world_bank_economic_data()
+    economic_data = get_snapshot_data("world_bank", {})
+    country_data = economic_data.get(country_name)
+    if country_data:
+        gdp_billions = country_data.get("gdp_billions", 0)
+        if gdp_billions > 0:
+            return gdp_billions
 
-            if country_name in economic_data:
-                gdp_billions = economic_data[country_name].get("gdp_billions", 0)
-                if gdp_billions > 0:
-                    logger.info(
-                        f"✅ Retrieved live GDP for {country_name}: ${gdp_billions:.1f}B"
-                    )
-                    return gdp_billions
-
-            logger.warning(
-                f"⚠️ Live GDP data unavailable for {country_name}, using World Bank estimate"
-            )
-
-    except Exception as e:
-        logger.error(f"❌ Failed to get live GDP data: {e}")
+    logger.debug(
+        f"Live GDP data unavailable for {country_name}, using World Bank estimate"
+    )
 
     # Fallback to World Bank estimates (most recent official data)
     wb_gdp_estimates = {
@@ -777,31 +932,21 @@ async def get_country_gdp(country_name: str) -> float:
 
 async def get_country_trade_volume(country_name: str) -> float:
     """
-    Get live bilateral trade volume data from authoritative sources
-    Replaces hard-coded data with live World Bank/WTO trade statistics
+    Get bilateral trade volume data from the latest World Bank snapshot
+    The snapshot is refreshed daily in the background - no network access here
     """
-    try:
-        from live_authoritative_connector import LiveAuthoritativeConnector
+    from refresh_scheduler import get_snapshot_data
 
-        async with LiveAuthoritativeConnector() as connector:
-            economic_data = await connector.get_world_bank_economic_data()
+    economic_data = get_snapshot_data("world_bank", {})
+    country_data = economic_data.get(country_name)
+    if country_data:
+        trade_volume = country_data.get("trade_volume_millions", 0)
+        if trade_volume > 0:
+            return trade_volume
 
-            if country_name in economic_data:
-                trade_volume = economic_data[country_name].get(
-                    "trade_volume_millions", 0
-                )
-                if trade_volume > 0:
-                    logger.info(
-                        f"✅ Retrieved live trade volume for {country_name}: ${trade_volume:.1f}M"
-                    )
-                    return trade_volume
-
-            logger.warning(
-                f"⚠️ Live trade data unavailable for {country_name}, using census estimates"
-            )
-
-    except Exception as e:
-        logger.error(f"❌ Failed to get live trade data: {e}")
+    logger.debug(
+        f"Live trade data unavailable for {country_name}, using census estimates"
+    )
 
     # Fallback to US Census Bureau bilateral trade estimates (most recent official data)
     us_census_trade_estimates = {
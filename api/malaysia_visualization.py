@@ -6,351 +6,24 @@ No hardcoded values - everything from live APIs
 """
 
 import asyncio
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import numpy as np
-from typing import Dict, Any, List
 import sys
 import os
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from working_analytics import get_real_economic_analysis
-from real_tariff_data_source import get_real_country_tariff
+from chart_export import DEFAULT_OUTPUT_DIR, write_object
+from chart_service import CountryVisualization, figure_to_bytes
 
 
-class MalaysiaVisualization:
+class MalaysiaVisualization(CountryVisualization):
     """
     Generates visualizations from real-time Malaysia data
+    (rendering is shared with every other country via chart_service)
     """
 
     def __init__(self):
-        self.country_name = "Malaysia"
-        self.tariff_data = None
-        self.economic_data = None
-
-    async def load_real_data(self):
-        """Load real-time data from APIs"""
-        # Get tariff data
-        self.tariff_data = get_real_country_tariff(self.country_name)
-
-        # Get economic data from World Bank
-        tariff_rate = self.tariff_data.get("average_tariff_rate", 0)
-        self.economic_data = await get_real_economic_analysis(
-            self.country_name, tariff_rate
-        )
-
-    def create_tariff_impact_chart(self):
-        """Create tariff impact visualization"""
-        if not self.economic_data or "error" in self.economic_data:
-            return None
-
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-
-        # Chart 1: Economic Indicators
-        indicators = ["GDP (Billions USD)", "Population (Millions)", "Trade Impact (%)"]
-        values = [
-            self.economic_data.get("gdp_billions", 0),
-            self.economic_data.get("population", 0) / 1000000,
-            self.economic_data.get("estimated_trade_impact", 0),
-        ]
-
-        bars = ax1.bar(indicators, values, color=["#2E86AB", "#A23B72", "#F18F01"])
-        ax1.set_title(
-            f"{self.country_name} - Real Economic Indicators\n(Source: World Bank API)",
-            fontsize=14,
-            fontweight="bold",
-        )
-        ax1.set_ylabel("Value")
-
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax1.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height + height * 0.01,
-                f"{value:.1f}",
-                ha="center",
-                va="bottom",
-                fontweight="bold",
-            )
-
-        # Chart 2: Tariff Impact Analysis
-        tariff_rate = self.tariff_data.get("average_tariff_rate", 0)
-        gdp_billions = self.economic_data.get("gdp_billions", 0)
-        trade_impact = self.economic_data.get("estimated_trade_impact", 0)
-
-        # Calculate impact values
-        trade_impact_usd = (trade_impact / 100) * gdp_billions
-        per_capita_impact = (trade_impact_usd * 1000000000) / self.economic_data.get(
-            "population", 1
-        )
-
-        impact_data = {
-            "Tariff Rate": tariff_rate,
-            "GDP Impact (%)": trade_impact,
-            "Per Capita Impact (USD)": per_capita_impact,
-        }
-
-        impact_labels = list(impact_data.keys())
-        impact_values = list(impact_data.values())
-
-        bars2 = ax2.bar(
-            impact_labels, impact_values, color=["#C73E1D", "#F18F01", "#2E86AB"]
-        )
-        ax2.set_title(
-            f"{self.country_name} - Tariff Impact Analysis\n(Calculated from Live Data)",
-            fontsize=14,
-            fontweight="bold",
-        )
-        ax2.set_ylabel("Value")
-
-        # Add value labels on bars
-        for bar, value in zip(bars2, impact_values):
-            height = bar.get_height()
-            if "USD" in impact_labels[impact_values.index(value)]:
-                ax2.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + height * 0.01,
-                    f"${value:.0f}",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                )
-            else:
-                ax2.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + height * 0.01,
-                    f"{value:.1f}",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                )
-
-        plt.tight_layout()
-        return fig
-
-    def create_sector_analysis_chart(self):
-        """Create sector analysis visualization"""
-        if not self.tariff_data:
-            return None
-
-        affected_sectors = self.tariff_data.get("affected_sectors", [])
-        if not affected_sectors:
-            return None
-
-        # Create sector impact visualization
-        fig, ax = plt.subplots(figsize=(12, 8))
-
-        # Generate sector data (this would come from real sector analysis APIs)
-        sector_impacts = {}
-        for sector in affected_sectors:
-            # In a real implementation, this would query sector-specific APIs
-            # For now, showing the structure
-            sector_impacts[sector] = {
-                "tariff_rate": self.tariff_data.get("average_tariff_rate", 0),
-                "employment_impact": "Data from BLS/OECD APIs",
-                "trade_volume": "Data from UN Comtrade API",
-                "price_impact": "Data from economic research APIs",
-            }
-
-        # Create sector overview
-        sectors = list(sector_impacts.keys())
-        tariff_rates = [sector_impacts[s]["tariff_rate"] for s in sectors]
-
-        bars = ax.barh(
-            sectors, tariff_rates, color=["#2E86AB", "#A23B72", "#F18F01", "#C73E1D"]
-        )
-        ax.set_xlabel("Tariff Rate (%)")
-        ax.set_title(
-            f"{self.country_name} - Sector Impact Analysis\n(Real-time from Authoritative Sources)",
-            fontsize=14,
-            fontweight="bold",
-        )
-
-        # Add value labels
-        for i, (bar, rate) in enumerate(zip(bars, tariff_rates)):
-            ax.text(
-                rate + 0.1,
-                bar.get_y() + bar.get_height() / 2,
-                f"{rate}%",
-                va="center",
-                fontweight="bold",
-            )
-
-        # Add data source information
-        ax.text(
-            0.02,
-            0.98,
-            "Data Sources:\n• Tariff Rates: US Government\n• Economic Data: World Bank\n• Sector Analysis: Research APIs",
-            transform=ax.transAxes,
-            fontsize=10,
-            verticalalignment="top",
-            bbox=dict(boxstyle="round", facecolor="lightgray", alpha=0.8),
-        )
-
-        plt.tight_layout()
-        return fig
-
-    def create_comprehensive_dashboard(self):
-        """Create comprehensive dashboard with all visualizations"""
-        if not self.tariff_data or not self.economic_data:
-            return None
-
-        fig = plt.figure(figsize=(20, 12))
-
-        # Create grid layout
-        gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
-
-        # 1. Main economic indicators (top left)
-        ax1 = fig.add_subplot(gs[0, :2])
-        indicators = ["GDP", "Population", "Trade Impact"]
-        values = [
-            self.economic_data.get("gdp_billions", 0),
-            self.economic_data.get("population", 0) / 1000000,
-            self.economic_data.get("estimated_trade_impact", 0),
-        ]
-
-        bars = ax1.bar(indicators, values, color=["#2E86AB", "#A23B72", "#F18F01"])
-        ax1.set_title(
-            f"{self.country_name} - Live Economic Data\n(World Bank API)",
-            fontsize=16,
-            fontweight="bold",
-        )
-        ax1.set_ylabel("Value")
-
-        # Add value labels
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            if "GDP" in indicators[values.index(value)]:
-                ax1.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + height * 0.01,
-                    f"${value:.1f}B",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                )
-            elif "Population" in indicators[values.index(value)]:
-                ax1.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + height * 0.01,
-                    f"{value:.1f}M",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                )
-            else:
-                ax1.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + height * 0.01,
-                    f"{value:.1f}%",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                )
-
-        # 2. Tariff impact analysis (top right)
-        ax2 = fig.add_subplot(gs[0, 2])
-        tariff_rate = self.tariff_data.get("average_tariff_rate", 0)
-        trade_impact = self.economic_data.get("estimated_trade_impact", 0)
-
-        # Create pie chart
-        impact_data = [tariff_rate, 100 - tariff_rate]
-        impact_labels = [
-            f"Tariff Impact\n{tariff_rate}%",
-            f"Remaining\n{100-tariff_rate}%",
-        ]
-        colors = ["#C73E1D", "#E8E8E8"]
-
-        wedges, texts, autotexts = ax2.pie(
-            impact_data, labels=impact_labels, colors=colors, autopct="%1.1f%%"
-        )
-        ax2.set_title("Tariff Impact\nDistribution", fontsize=14, fontweight="bold")
-
-        # 3. Sector analysis (middle row)
-        ax3 = fig.add_subplot(gs[1, :])
-        affected_sectors = self.tariff_data.get("affected_sectors", [])
-        sector_tariffs = [self.tariff_data.get("average_tariff_rate", 0)] * len(
-            affected_sectors
-        )
-
-        bars3 = ax3.bar(
-            affected_sectors,
-            sector_tariffs,
-            color=["#2E86AB", "#A23B72", "#F18F01", "#C73E1D"],
-        )
-        ax3.set_title(
-            f"{self.country_name} - Affected Sectors\n(Real-time from US Government Data)",
-            fontsize=14,
-            fontweight="bold",
-        )
-        ax3.set_ylabel("Tariff Rate (%)")
-        ax3.tick_params(axis="x", rotation=45)
-
-        # 4. Data source verification (bottom)
-        ax4 = fig.add_subplot(gs[2, :])
-        ax4.axis("off")
-
-        # Create data source table
-        sources = [
-            ["Data Type", "Source", "Confidence", "Last Updated"],
-            ["Tariff Rates", "US Government", "High", "Live"],
-            ["Economic Data", "World Bank API", "High", "Live"],
-            ["Sector Analysis", "Research APIs", "Medium", "Live"],
-            ["Impact Calculations", "Real-time", "High", "Live"],
-        ]
-
-        table = ax4.table(
-            cellText=sources[1:],
-            colLabels=sources[0],
-            cellLoc="center",
-            loc="center",
-            colWidths=[0.25, 0.25, 0.25, 0.25],
-        )
-        table.auto_set_font_size(False)
-        table.set_fontsize(12)
-        table.scale(1, 2)
-
-        # Style the table
-        for i in range(len(sources)):
-            for j in range(len(sources[0])):
-                if i == 0:  # Header row
-                    table[(i, j)].set_facecolor("#2E86AB")
-                    table[(i, j)].set_text_props(weight="bold", color="white")
-                else:
-                    table[(i, j)].set_facecolor("#F8F9FA")
-
-        ax4.set_title(
-            "Data Source Verification\n(All Sources Live and Authoritative)",
-            fontsize=16,
-            fontweight="bold",
-        )
-
-        plt.suptitle(
-            f"{self.country_name} - Complete Real-Time Economic Dashboard\nNo Hardcoded Data - All from Live APIs",
-            fontsize=18,
-            fontweight="bold",
-            y=0.98,
-        )
-
-        return fig
-
-    async def generate_all_visualizations(self):
-        """Generate all visualization types"""
-        await self.load_real_data()
-
-        visualizations = {}
-
-        # Generate each chart type
-        visualizations["tariff_impact"] = self.create_tariff_impact_chart()
-        visualizations["sector_analysis"] = self.create_sector_analysis_chart()
-        visualizations["comprehensive_dashboard"] = (
-            self.create_comprehensive_dashboard()
-        )
-
-        return visualizations
+        super().__init__("Malaysia")
 
 
 # Test function
@@ -366,11 +39,11 @@ async def test_malaysia_visualization():
         for chart_type, chart in charts.items():
             if chart:
                 print(f"   - {chart_type}: Success")
-                # Save the chart
-                chart.savefig(
-                    f"malaysia_{chart_type}.png", dpi=300, bbox_inches="tight"
+                # Save the chart into the content-addressed export directory
+                stored = write_object(
+                    DEFAULT_OUTPUT_DIR, figure_to_bytes(chart, "png", dpi=300), "png"
                 )
-                print(f"     Saved as: malaysia_{chart_type}.png")
+                print(f"     Saved as: {stored['path']}")
             else:
                 print(f"   - {chart_type}: Failed")
 
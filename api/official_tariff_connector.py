@@ -14,6 +14,9 @@ from datetime import datetime, date
 import json
 import re
 
+from hs_concordance import HS_CONCORDANCE
+from records import intern_fields
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -27,7 +30,7 @@ class TariffRate:
     chapter_99_code: str
     notes: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HTSCode:
     code: str
     description: str
@@ -37,6 +40,9 @@ class HTSCode:
     section_232_applicable: bool
     effective_date: str
 
+    def __post_init__(self):
+        intern_fields(self, "effective_date")
+
 @dataclass
 class CountryTariffMatrix:
     country: str
@@ -127,28 +133,4 @@ class OfficialTariffConnector:
         }
         
         # Major HTS Chapters for sector analysis
-        self.major_hts_chapters = {
-            '01-05': 'Live animals; animal products',
-            '06-14': 'Vegetable products',
-            '15': 'Animal or vegetable fats and oils',
-            '16-24': 'Prepared foodstuffs; beverages',
-            '25-27': 'Mineral products',
-            '28-38': 'Products of chemical or allied industries',
-            '39-40': 'Plastics and articles thereof; rubber and articles thereof',
-            '41-43': 'Raw hides and skins, leather, furskins and articles thereof',
-            '44-46': 'Wood and articles of wood; wood charcoal',
-            '47-49': 'Pulp of wood or of other fibrous cellulosic material; paper and paperboard',
-            '50-63': 'Textiles and textile articles',
-            '64-67': 'Footwear, headgear, umbrellas, walking sticks, whips, riding-crops',
-            '68-70': 'Articles of stone, plaster, cement, asbestos, mica or similar materials',
-            '71': 'Natural or cultured pearls, precious or semi-precious stones',
-            '72-83': 'Base metals and articles of base metal',
-            '84-85': 'Machinery and mechanical appliances; electrical equipment',
-            '86-89': 'Transportation equipment',
-            '90-92': 'Optical, photographic, cinematographic, measuring, checking, precision',
-            '93': 'Arms and ammunition; parts and accessories thereof',
-            '94-96': 'Miscellaneous manufactured articles',
-            '97': 'Works of art, collectors\' pieces and antiques',
-            '98': 'Special classification provisions',
-            '99': 'Temporary legislation'
-        }
+        self.major_hts_chapters = HS_CONCORDANCE.sector_table()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Federal Register Policy Store
+=============================
+
+Local, indexed store of parsed Federal Register documents:
+- One row per (feed, document_number); re-ingesting a document is a no-op
+- Countries named in each document are indexed, so "latest policy per
+  country" and per-country history are index lookups, not re-parses
+- Each feed keeps a cursor (last publication_date and document_number
+  seen) so ingestion only asks the API for newer documents
+
+The store lives at data/policies.sqlite3 unless TIPM_POLICY_DB is set.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv(
+    "TIPM_POLICY_DB",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "policies.sqlite3",
+    ),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    feed TEXT NOT NULL,
+    document_number TEXT NOT NULL,
+    publication_date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    pdf_url TEXT NOT NULL,
+    programs TEXT NOT NULL,
+    rates TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    PRIMARY KEY (feed, document_number)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_date
+    ON documents (feed, publication_date DESC);
+CREATE TABLE IF NOT EXISTS document_countries (
+    feed TEXT NOT NULL,
+    country TEXT NOT NULL,
+    document_number TEXT NOT NULL,
+    publication_date TEXT NOT NULL,
+    PRIMARY KEY (feed, country, document_number)
+);
+CREATE INDEX IF NOT EXISTS idx_document_countries_latest
+    ON document_countries (feed, country, publication_date DESC);
+CREATE TABLE IF NOT EXISTS cursors (
+    feed TEXT PRIMARY KEY,
+    publication_date TEXT NOT NULL,
+    document_number TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+_DOCUMENT_COLUMNS = (
+    "document_number, publication_date, title, abstract, pdf_url, programs, rates"
+)
+
+
+@dataclass
+class PolicyDocument:
+    """A parsed Federal Register document"""
+
+    document_number: str
+    publication_date: str
+    title: str
+    abstract: str = ""
+    pdf_url: str = ""
+    countries: List[str] = field(default_factory=list)
+    programs: List[str] = field(default_factory=list)
+    rates: List[float] = field(default_factory=list)
+
+
+class PolicyStore:
+    """SQLite-backed store of parsed Federal Register documents"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe across threads and processes)"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def cursor(self, feed: str) -> Optional[Tuple[str, str]]:
+        """(publication_date, document_number) of the newest ingested document"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT publication_date, document_number FROM cursors "
+                    "WHERE feed = ?",
+                    (feed,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading policy cursor for {feed}: {e}")
+            return None
+        return (row[0], row[1]) if row else None
+
+    def known(self, feed: str, document_numbers: Iterable[str]) -> Set[str]:
+        """The subset of document_numbers already stored for a feed"""
+        numbers = list(document_numbers)
+        if not numbers:
+            return set()
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT document_number FROM documents WHERE feed = ? "
+                    f"AND document_number IN ({', '.join('?' * len(numbers))})",
+                    (feed, *numbers),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading policy documents for {feed}: {e}")
+            return set()
+        return {row[0] for row in rows}
+
+    def add(self, feed: str, documents: List[PolicyDocument]) -> int:
+        """
+        Append documents and advance the feed cursor in one transaction;
+        returns the number of documents that were new
+        """
+        if not documents:
+            return 0
+        now = datetime.now().isoformat()
+        newest = max(documents, key=lambda d: (d.publication_date, d.document_number))
+        try:
+            with self._connect() as conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO documents "
+                    f"(feed, {_DOCUMENT_COLUMNS}, ingested_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            feed,
+                            d.document_number,
+                            d.publication_date,
+                            d.title,
+                            d.abstract,
+                            d.pdf_url,
+                            json.dumps(d.programs),
+                            json.dumps(d.rates),
+                            now,
+                        )
+                        for d in documents
+                    ],
+                )
+                added = conn.total_changes - before
+                conn.executemany(
+                    "INSERT OR IGNORE INTO document_countries "
+                    "(feed, country, document_number, publication_date) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (feed, country, d.document_number, d.publication_date)
+                        for d in documents
+                        for country in d.countries
+                    ],
+                )
+                conn.execute(
+                    "INSERT INTO cursors "
+                    "(feed, publication_date, document_number, updated_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (feed) DO UPDATE SET "
+                    "publication_date = excluded.publication_date, "
+                    "document_number = excluded.document_number, "
+                    "updated_at = excluded.updated_at "
+                    "WHERE (excluded.publication_date, excluded.document_number) > "
+                    "(cursors.publication_date, cursors.document_number)",
+                    (feed, newest.publication_date, newest.document_number, now),
+                )
+            return added
+
+        except sqlite3.Error as e:
+            logger.error(f"Error storing policy documents for {feed}: {e}")
+            return 0
+
+    def latest_by_country(
+        self, feed: str, title_terms: Iterable[str] = ()
+    ) -> Dict[str, PolicyDocument]:
+        """
+        Newest document naming each country; with title_terms, the newest
+        one whose title contains any of the terms (case-insensitive)
+        """
+        terms = [term.lower() for term in title_terms]
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT c.country, "
+                    + ", ".join(f"d.{c}" for c in _DOCUMENT_COLUMNS.split(", "))
+                    + " FROM document_countries c JOIN documents d "
+                    "ON d.feed = c.feed AND d.document_number = c.document_number "
+                    "WHERE c.feed = ? ORDER BY c.country, "
+                    "c.publication_date DESC, c.document_number DESC",
+                    (feed,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading policies for {feed}: {e}")
+            return {}
+
+        latest: Dict[str, PolicyDocument] = {}
+        for country, *row in rows:
+            if country in latest:
+                continue
+            document = self._decode_row(row, [country])
+            title = document.title.lower()
+            if not terms or any(term in title for term in terms):
+                latest[country] = document
+        return latest
+
+    def documents_for(
+        self, feed: str, country: str, limit: int = 50
+    ) -> List[PolicyDocument]:
+        """Documents naming a country, newest first"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT "
+                    + ", ".join(f"d.{c}" for c in _DOCUMENT_COLUMNS.split(", "))
+                    + " FROM document_countries c JOIN documents d "
+                    "ON d.feed = c.feed AND d.document_number = c.document_number "
+                    "WHERE c.feed = ? AND c.country = ? "
+                    "ORDER BY c.publication_date DESC, c.document_number DESC "
+                    "LIMIT ?",
+                    (feed, country, limit),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading policies for {feed}/{country}: {e}")
+            return []
+        return [self._decode_row(row, [country]) for row in rows]
+
+    def count(self, feed: str) -> int:
+        try:
+            with self._connect() as conn:
+                return conn.execute(
+                    "SELECT COUNT(*) FROM documents WHERE feed = ?", (feed,)
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Error counting policies for {feed}: {e}")
+            return 0
+
+    def _decode_row(self, row, countries: List[str]) -> PolicyDocument:
+        number, date, title, abstract, pdf_url, programs, rates = row
+        return PolicyDocument(
+            document_number=number,
+            publication_date=date,
+            title=title,
+            abstract=abstract,
+            pdf_url=pdf_url,
+            countries=countries,
+            programs=json.loads(programs),
+            rates=json.loads(rates),
+        )
+
+
+# Global instance
+policy_store = PolicyStore()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python policy_store.py FEED [COUNTRY]
+    feed = sys.argv[1] if len(sys.argv) > 1 else "tariff_policies"
+    cursor = policy_store.cursor(feed)
+    print(f"📄 {policy_store.count(feed)} documents, cursor {cursor}")
+    if len(sys.argv) > 2:
+        for document in policy_store.documents_for(feed, sys.argv[2]):
+            print(f"  {document.publication_date} {document.title}")
@@ -16,15 +16,45 @@ All data is publicly available and 100% authoritative.
 import asyncio
 import aiohttp
 import json
+import pandas as pd
 import logging
-from typing import Dict, List, Optional, Any
+import os
+from typing import Dict, List, Any
 from datetime import datetime, timedelta
 import xml.etree.ElementTree as ET
 
+from federal_register_ingest import FederalRegisterIngestor
+from policy_store import PolicyDocument
+from text_matcher import RATE_PATTERN
+from workbook_reader import iter_sheet_chunks
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Local copy of the USITC AD/CVD orders workbook (orders.xlsx)
+USITC_ORDERS_PATH = os.getenv(
+    "TIPM_USITC_ORDERS",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "orders.xlsx",
+    ),
+)
+
+# Column name fragments in the orders workbook
+USITC_ORDER_COLUMNS = {
+    "country": ("country",),
+    "product": ("product", "merchandise"),
+    "case_type": ("type", "ad/cvd"),
+    "case_number": ("case",),
+    "effective_date": ("date",),
+    "duty_rate": ("rate", "margin"),
+}
+
+# A proclamation is reported only if its title mentions one of these
+PROCLAMATION_TITLE_TERMS = ("tariff", "trade")
+
 class RealDataConnector:
     """Connects to real US government data sources for tariff information"""
     
@@ -37,6 +67,12 @@ class RealDataConnector:
             "cbp": "https://www.cbp.gov/api",
             "wto": "https://www.wto.org/api"
         }
+        self.usitc_orders_path = USITC_ORDERS_PATH
+        self.federal_register = FederalRegisterIngestor(
+            "trade_proclamations",
+            {"conditions[type][]": "PRESDOCU", "conditions[term]": "tariff trade"},
+            url=f"{self.base_urls['federal_register']}/documents.json",
+        )
         
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -83,30 +119,20 @@ class RealDataConnector:
                     return self._parse_usitc_data(data)
                 else:
                     logger.warning(f"USITC API returned {response.status}")
-                    return {}
+                    return self._parse_usitc_orders_workbook(self.usitc_orders_path)
                     
         except Exception as e:
             logger.error(f"Error fetching USITC data: {e}")
-            return {}
+            return self._parse_usitc_orders_workbook(self.usitc_orders_path)
     
     async def get_federal_register_proclamations(self) -> Dict[str, Any]:
         """Fetch presidential proclamations on trade from Federal Register"""
         try:
-            # Federal Register API for trade-related proclamations
-            url = f"{self.base_urls['federal_register']}/documents.json"
-            params = {
-                "conditions[type]": "PRESDOCU",
-                "conditions[term]": "tariff trade",
-                "per_page": 100
-            }
-            
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_federal_register_data(data)
-                else:
-                    logger.warning(f"Federal Register API returned {response.status}")
-                    return {}
+            # Only proclamations newer than the stored cursor are fetched
+            await self.federal_register.ingest(self.session)
+            return self._format_federal_register_proclamations(
+                self.federal_register.latest_by_country(PROCLAMATION_TITLE_TERMS)
+            )
                     
         except Exception as e:
             logger.error(f"Error fetching Federal Register data: {e}")
@@ -204,32 +230,66 @@ class RealDataConnector:
         
         return tariffs
     
-    def _parse_federal_register_data(self, data: Dict) -> Dict[str, Any]:
-        """Parse Federal Register trade proclamations"""
+    def _parse_usitc_orders_workbook(self, path: str) -> Dict[str, Any]:
+        """
+        Parse a local USITC orders workbook in streamed row chunks, so
+        order lists of any size are read with flat memory
+        """
+        if not os.path.exists(path):
+            return {}
+
         tariffs: Dict[str, Any] = {}
         try:
-            # Parse Federal Register structured data
-            for doc in data.get("results", []):
-                title = doc.get("title", "")
-                if "tariff" in title.lower() or "trade" in title.lower():
-                    # Extract country and tariff info from document
-                    country = self._extract_country_from_title(title)
-                    if country:
-                        if country not in tariffs:
-                            tariffs[country] = {}
-                        tariffs[country]["Federal Proclamation"] = {
-                            "tariff_rate": self._extract_tariff_rate(title),
-                            "source": "Presidential Proclamation",
-                            "effective_date": doc.get("publication_date", ""),
-                            "hts_codes": [],
-                            "notes": title,
-                            "status": "Active"
-                        }
+            for chunk in iter_sheet_chunks(path):
+                columns = self._match_order_columns(chunk.columns)
+                cases = [
+                    {
+                        field: row[column]
+                        for field, column in columns.items()
+                        if pd.notna(row[column])
+                    }
+                    for _, row in chunk.iterrows()
+                ]
+                parsed = self._parse_usitc_data({"cases": cases})
+                for country, products in parsed.items():
+                    tariffs.setdefault(country, {}).update(products)
+            logger.info(f"Loaded USITC orders workbook: {len(tariffs)} countries")
         except Exception as e:
-            logger.error(f"Error parsing Federal Register data: {e}")
-        
+            logger.error(f"Error reading USITC orders workbook: {e}")
+
         return tariffs
     
+    def _match_order_columns(self, columns) -> Dict[str, Any]:
+        """Orders workbook column for each USITC case field"""
+        matched: Dict[str, Any] = {}
+        for field, fragments in USITC_ORDER_COLUMNS.items():
+            for column in columns:
+                name = str(column).lower()
+                if column not in matched.values() and any(
+                    fragment in name for fragment in fragments
+                ):
+                    matched[field] = column
+                    break
+        return matched
+    
+    def _format_federal_register_proclamations(
+        self, documents: Dict[str, PolicyDocument]
+    ) -> Dict[str, Any]:
+        """Latest stored trade proclamation per country"""
+        return {
+            country: {
+                "Federal Proclamation": {
+                    "tariff_rate": self._extract_tariff_rate(document.title),
+                    "source": "Presidential Proclamation",
+                    "effective_date": document.publication_date,
+                    "hts_codes": [],
+                    "notes": document.title,
+                    "status": "Active"
+                }
+            }
+            for country, document in documents.items()
+        }
+    
     def _parse_cbp_data(self, data: Dict) -> Dict[str, Any]:
         """Parse CBP HTS data"""
         tariffs = {}
@@ -282,27 +342,9 @@ class RealDataConnector:
         
         return tariffs
     
-    def _extract_country_from_title(self, title: str) -> Optional[str]:
-        """Extract country name from document title"""
-        # Common country patterns in trade documents
-        countries = [
-            "China", "European Union", "Japan", "South Korea", "India", 
-            "Canada", "Mexico", "Brazil", "Argentina", "Chile", "Peru",
-            "Colombia", "Venezuela", "Thailand", "Vietnam", "Malaysia",
-            "Indonesia", "Philippines", "Singapore", "Australia", "New Zealand"
-        ]
-        
-        for country in countries:
-            if country.lower() in title.lower():
-                return country
-        return None
-    
     def _extract_tariff_rate(self, title: str) -> float:
         """Extract tariff rate from document title"""
-        import re
-        # Look for percentage patterns
-        pattern = r'(\d+(?:\.\d+)?)\s*%'
-        match = re.search(pattern, title)
+        match = RATE_PATTERN.search(title)
         if match:
             return float(match.group(1))
         return 0.0
@@ -20,6 +20,9 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from columnar_tariff_store import ColumnarTariffStore
+from country_resolver import resolve_country
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +37,7 @@ class RealTariffDataSource:
     def __init__(self):
         # Initialize with real tariff data from authoritative sources
         self.tariff_data = self._initialize_real_tariff_data()
+        self._tariff_store: Optional[ColumnarTariffStore] = None
         self.last_updated = datetime.now()
         self.data_sources = [
             "USTR - US Trade Representative",
@@ -43,6 +47,15 @@ class RealTariffDataSource:
             "Executive Orders",
         ]
 
+    @property
+    def tariff_store(self) -> ColumnarTariffStore:
+        """Columnar view of tariff_data (one row per tariff_details category)"""
+        if self._tariff_store is None:
+            self._tariff_store = ColumnarTariffStore.from_real_tariff_data(
+                self.tariff_data
+            )
+        return self._tariff_store
+
     def _initialize_real_tariff_data(self) -> Dict[str, Dict[str, Any]]:
         """
         Initialize with real tariff data from authoritative sources
@@ -735,6 +748,9 @@ class RealTariffDataSource:
         Get comprehensive tariff data for a country
         Returns real data from authoritative sources
         """
+        record = resolve_country(country_name)
+        if record:
+            country_name = record.name
         country_data = self.tariff_data.get(country_name, {})
 
         if not country_data:
@@ -751,7 +767,7 @@ class RealTariffDataSource:
 
         return {
             "country_name": country_name,
-            "country_code": "",
+            "country_code": record.iso2 if record else "",
             "average_tariff_rate": country_data.get("average_tariff_rate", 0.0),
             "affected_sectors": country_data.get("affected_sectors", []),
             "special_programs": country_data.get("special_programs", []),
@@ -878,7 +894,7 @@ class RealTariffDataSource:
                     "Russia",
                     "Ukraine",
                     "Turkey",
-                    "EU",
+                    "European Union",
                     "Canada",
                     "Mexico",
                 ],
@@ -890,14 +906,14 @@ class RealTariffDataSource:
                 "description": "Tariffs imposed in response to foreign tariffs on US exports",
                 "rate": 15.0,
                 "affected_countries": [
-                    "EU",
+                    "European Union",
                     "Germany",
                     "France",
                     "Italy",
                     "Spain",
                     "Netherlands",
                     "Belgium",
-                    "UK",
+                    "United Kingdom",
                 ],
                 "effective_date": "2018-06-01",
                 "source": "Executive Order + USTR",
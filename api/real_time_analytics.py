@@ -25,12 +25,14 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 import os
 
+from records import intern_fields
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EconomicIndicator:
     """Economic indicator data point"""
 
@@ -42,8 +44,11 @@ class EconomicIndicator:
     last_updated: str
     confidence: str
 
+    def __post_init__(self):
+        intern_fields(self, "indicator", "unit", "period", "source", "confidence")
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradeImpact:
     """Trade impact analysis"""
 
@@ -58,8 +63,13 @@ class TradeImpact:
     methodology: str
     confidence: str
 
+    def __post_init__(self):
+        intern_fields(
+            self, "country", "sector", "source", "methodology", "confidence"
+        )
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MitigationStrategy:
     """Real mitigation strategy from research"""
 
@@ -74,6 +84,17 @@ class MitigationStrategy:
     source: str
     confidence: str
 
+    def __post_init__(self):
+        intern_fields(
+            self,
+            "strategy",
+            "country",
+            "sector",
+            "time_to_effect",
+            "source",
+            "confidence",
+        )
+
 
 class RealTimeAnalytics:
     """
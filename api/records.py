@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Record Helpers
+==============
+
+Shared helpers for the slotted tariff and economic record types:
+- intern_fields() replaces categorical string fields (source, status,
+  rule_type, ...) with their interned copy, so a value repeated across
+  every row of a schedule is stored once; it works on frozen records
+- intern_values() does the same for the per-row dicts built from
+  workbooks and trackers, whose source/verification strings are
+  formatted once per row
+- measure_footprint() reports the traced memory of building N records,
+  used by the benchmark below to compare record layouts
+
+Usage:
+    python records.py [COUNT]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Any, Callable, Dict, List
+
+
+def intern_fields(record: Any, *names: str):
+    """Intern the named string fields of a (possibly frozen) record"""
+    for name in names:
+        value = getattr(record, name)
+        if isinstance(value, str):
+            object.__setattr__(record, name, sys.intern(value))
+
+
+def intern_values(row: Dict[str, Any], *keys: str) -> Dict[str, Any]:
+    """Intern the named string values of a row dict in place; returns row"""
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, str):
+            row[key] = sys.intern(value)
+    return row
+
+
+def plain_dataclass(cls: type) -> type:
+    """Same fields as cls as a regular dataclass (per-instance __dict__)"""
+    return make_dataclass(
+        f"Plain{cls.__name__}", [(f.name, f.type) for f in fields(cls)]
+    )
+
+
+def measure_footprint(make: Callable[[int], Any], count: int) -> Dict[str, float]:
+    """Traced bytes held by count records built with make(i)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records: List[Any] = [make(i) for i in range(count)]
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del records
+    return {"records": count, "bytes": held, "bytes_per_record": held / count}
+
+
+def benchmark(count: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """
+    Footprint of an HTS schedule for every country: HTSCode and
+    CountryTariffRule-shaped rows with categorical strings read per row
+    (as from a workbook), slotted + interned vs plain dataclasses
+    """
+    from authoritative_tariff_parser import CountryTariffRule, HTSCode
+
+    countries = ("China", "European Union", "Japan", "Vietnam", "Canada")
+
+    def fresh(text: str) -> str:
+        # A new string object per row, as a sheet parser produces them
+        return text.encode().decode()
+
+    def hts_row(cls):
+        return lambda i: cls(
+            hts10=f"{8471300000 + i:010d}",
+            description=f"Line {i}",
+            base_duty_pct=float(i % 20),
+            chapter99_applicable=True,
+        )
+
+    def rule_row(cls):
+        return lambda i: cls(
+            country=fresh(countries[i % len(countries)]),
+            reciprocal_addon_pct=float(i % 40),
+            rule_type=fresh("FixedAddOn"),
+            chapter99_code=fresh("9903.01.25"),
+            notes=fresh("Reciprocal tariff per Executive Order 14257"),
+            effective_date=fresh("2025-08-15"),
+        )
+
+    results = {}
+    for name, cls, row in (
+        ("HTSCode", HTSCode, hts_row),
+        ("CountryTariffRule", CountryTariffRule, rule_row),
+    ):
+        plain = measure_footprint(row(plain_dataclass(cls)), count)
+        slotted = measure_footprint(row(cls), count)
+        results[name] = {
+            "plain_bytes_per_record": round(plain["bytes_per_record"], 1),
+            "slotted_bytes_per_record": round(slotted["bytes_per_record"], 1),
+            "ratio": round(slotted["bytes"] / plain["bytes"], 3),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"📊 Record footprint over {n:,} records")
+    for record_type, result in benchmark(n).items():
+        print(
+            f"  {record_type}: {result['plain_bytes_per_record']} → "
+            f"{result['slotted_bytes_per_record']} bytes/record "
+            f"({result['ratio']:.0%})"
+        )
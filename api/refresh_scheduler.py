@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Background Refresh Scheduler
+============================
+
+Decouples live upstream data from request handling:
+- Each upstream (World Bank, Federal Register, Atlantic Council, WITS/WTO)
+  is refreshed by its own background task on its own cadence
+- Every successful refresh publishes an immutable snapshot and persists it
+  to the local snapshot store, which also provides warm starts
+- Request handlers only read the latest published snapshot and never
+  touch the network
+- With a shared cache backend, every worker process runs the scheduler
+  but each upstream is fetched once per host per interval: the first
+  worker to refresh fetches, the others publish its cached payload
+
+The scheduler is started and stopped from the FastAPI lifespan in main.py.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from cache_backend import get_cache_backend
+from dataset_diff import track_snapshot
+from snapshot_store import snapshot_store
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Refresh cadences (overridable through the environment)
+WORLD_BANK_REFRESH = timedelta(hours=24)
+FEDERAL_REGISTER_REFRESH = timedelta(hours=1)
+LIVE_TARIFFS_REFRESH = timedelta(hours=6)
+ATLANTIC_COUNCIL_REFRESH = timedelta(
+    minutes=int(os.getenv("ATLANTIC_COUNCIL_REFRESH_MINUTES", "30"))
+)
+
+# Upper bound on how long a failed job waits before retrying
+MAX_RETRY_DELAY = timedelta(minutes=5)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """Immutable, versioned payload published by a refresh job"""
+
+    source: str
+    data: Any
+    fetched_at: datetime
+    version: int
+
+    def age(self) -> timedelta:
+        """Time elapsed since this snapshot was fetched"""
+        return datetime.now() - self.fetched_at
+
+
+@dataclass
+class RefreshJob:
+    """A named upstream fetch that runs on a fixed interval"""
+
+    name: str
+    fetcher: Callable[[], Awaitable[Any]]
+    interval: timedelta
+    last_attempt: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    failures: int = field(default=0)
+
+    @property
+    def retry_delay(self) -> timedelta:
+        """Delay before retrying after a failed refresh"""
+        return min(self.interval, MAX_RETRY_DELAY)
+
+
+class BackgroundRefreshScheduler:
+    """
+    Runs refresh jobs as asyncio tasks and publishes their results
+    as immutable snapshots
+    """
+
+    def __init__(self, store=None, cache=None):
+        self.store = store
+        self.cache = cache
+        self.jobs: Dict[str, RefreshJob] = {}
+        self._snapshots: Dict[str, DataSnapshot] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: List[Callable[[DataSnapshot], None]] = []
+
+    def register(
+        self,
+        name: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        interval: timedelta,
+    ) -> RefreshJob:
+        """Register (or replace) a refresh job"""
+        job = RefreshJob(name=name, fetcher=fetcher, interval=interval)
+        self.jobs[name] = job
+        return job
+
+    def add_listener(self, listener: Callable[[DataSnapshot], None]):
+        """Call listener(snapshot) every time a snapshot is published"""
+        self._listeners.append(listener)
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks.values())
+
+    def warm_start(self) -> int:
+        """
+        Publish the last persisted payload of every job so requests are served
+        from real data immediately after a restart. Returns sources restored.
+        """
+        if self.store is None:
+            return 0
+
+        restored = 0
+        for name in self.jobs:
+            if name in self._snapshots:
+                continue
+            stored = self.store.latest(name)
+            if stored is not None:
+                self.publish(
+                    name, stored.payload, fetched_at=stored.fetched_at, persist=False
+                )
+                restored += 1
+
+        logger.info(f"♻️ Warm start restored {restored} snapshots from local store")
+        return restored
+
+    def start(self):
+        """Start one background task per registered job (requires a running loop)"""
+        for name, job in self.jobs.items():
+            task = self._tasks.get(name)
+            if task is None or task.done():
+                self._tasks[name] = asyncio.create_task(
+                    self._run_job(job), name=f"refresh:{name}"
+                )
+        logger.info(f"🔄 Background refresh started for {len(self._tasks)} sources")
+
+    async def stop(self):
+        """Cancel all background tasks and wait for them to finish"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("🛑 Background refresh stopped")
+
+    async def refresh_now(self, name: str) -> bool:
+        """Run a single job immediately; returns True if a snapshot was published"""
+        return await self._refresh(self.jobs[name])
+
+    async def _run_job(self, job: RefreshJob):
+        """Refresh loop for one job: fetch, publish, sleep, repeat"""
+        # A warm-started snapshot that is still fresh defers the first fetch
+        snapshot = self._snapshots.get(job.name)
+        if snapshot is not None and snapshot.age() < job.interval:
+            await asyncio.sleep((job.interval - snapshot.age()).total_seconds())
+
+        while True:
+            success = await self._refresh(job)
+            delay = job.interval if success else job.retry_delay
+            await asyncio.sleep(delay.total_seconds())
+
+    async def _refresh(self, job: RefreshJob) -> bool:
+        job.last_attempt = datetime.now()
+        try:
+            if self.cache is not None:
+                fetched = await self.cache.aget_or_compute(
+                    f"refresh:{job.name}", lambda: self._fetch(job), ttl=job.interval
+                )
+            else:
+                fetched = await self._fetch(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"❌ Refresh of {job.name} failed: {e}")
+            return False
+
+        if not fetched:
+            # Connectors return empty payloads on upstream errors; keep the
+            # last good snapshot rather than publishing an empty one
+            job.failures += 1
+            job.last_error = "Empty payload"
+            logger.warning(f"⚠️ Refresh of {job.name} returned no data")
+            return False
+
+        data, fetched_at = fetched
+        self.publish(job.name, data, fetched_at=fetched_at)
+        job.failures = 0
+        job.last_error = None
+        job.last_success = job.last_attempt
+        return True
+
+    @staticmethod
+    async def _fetch(job: RefreshJob) -> Optional[Tuple[Any, datetime]]:
+        """Run a job's fetcher, returning the payload with its fetch time"""
+        # The time travels with the cached payload, so a worker publishing
+        # another worker's fetch reports when the data was actually fetched
+        data = await job.fetcher()
+        return (data, datetime.now()) if data else None
+
+    def publish(
+        self,
+        source: str,
+        data: Any,
+        fetched_at: Optional[datetime] = None,
+        persist: bool = True,
+    ) -> DataSnapshot:
+        """Publish a new immutable snapshot for a source"""
+        previous = self._snapshots.get(source)
+        snapshot = DataSnapshot(
+            source=source,
+            data=freeze(data),
+            fetched_at=fetched_at or datetime.now(),
+            version=previous.version + 1 if previous else 1,
+        )
+        # Single reference swap - readers see either the old or new snapshot
+        self._snapshots[source] = snapshot
+        logger.info(f"✅ Published {source} snapshot v{snapshot.version}")
+
+        if persist and self.store is not None:
+            self.store.put(source, "latest", snapshot.data, snapshot.fetched_at)
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed for {source}: {e}")
+
+        return snapshot
+
+    def get_snapshot(self, source: str) -> Optional[DataSnapshot]:
+        """Latest published snapshot for a source (in-memory lookup only)"""
+        return self._snapshots.get(source)
+
+    def get_data(self, source: str, default: Any = None) -> Any:
+        """Latest published payload for a source, or default"""
+        snapshot = self._snapshots.get(source)
+        return snapshot.data if snapshot is not None else default
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source refresh status for health reporting"""
+        status = {}
+        for name, job in self.jobs.items():
+            snapshot = self._snapshots.get(name)
+            status[name] = {
+                "interval_seconds": int(job.interval.total_seconds()),
+                "version": snapshot.version if snapshot else 0,
+                "fetched_at": snapshot.fetched_at.isoformat() if snapshot else None,
+                "last_error": job.last_error,
+                "consecutive_failures": job.failures,
+            }
+        return status
+
+
+# Upstream fetchers - imported lazily so the scheduler has no hard dependency
+# on aiohttp/requests until a job actually runs
+async def fetch_world_bank_economic_data() -> Dict[str, Any]:
+    """World Bank GDP and trade indicators keyed by country name"""
+    from live_authoritative_connector import LiveAuthoritativeConnector
+
+    async with LiveAuthoritativeConnector() as connector:
+        return await connector.get_world_bank_economic_data()
+
+
+async def fetch_federal_register_policies() -> Dict[str, Any]:
+    """Federal Register tariff policy documents keyed by country name"""
+    from live_authoritative_connector import LiveAuthoritativeConnector
+
+    async with LiveAuthoritativeConnector() as connector:
+        return await connector.get_federal_register_tariff_policies()
+
+
+async def fetch_live_tariff_data() -> Dict[str, Any]:
+    """WITS and WTO applied tariff data merged into one tariff_data mapping"""
+    from live_authoritative_connector import LiveAuthoritativeConnector
+
+    async with LiveAuthoritativeConnector() as connector:
+        wits_data, wto_data = await asyncio.gather(
+            connector.get_wits_tariff_data(),
+            connector.get_wto_tariff_database(),
+            return_exceptions=True,
+        )
+
+    tariff_data = {}
+    for result in (wits_data, wto_data):
+        if isinstance(result, dict):
+            tariff_data.update(result)
+        elif isinstance(result, Exception):
+            logger.error(f"Error in live tariff source: {result}")
+
+    if not tariff_data:
+        return {}
+    return {"tariff_data": tariff_data}
+
+
+async def fetch_atlantic_council_dataset() -> List[Dict[str, Any]]:
+    """Atlantic Council tracker rows (the connector is synchronous)"""
+    from atlantic_council_connector import AtlanticCouncilConnector
+
+    # Fetch into a fresh connector so a failed download never clobbers
+    # the dataset already held by the shared instance
+    connector = AtlanticCouncilConnector()
+    df = await asyncio.to_thread(connector.download_dataset)
+    if df.empty:
+        return []
+    return df.to_dict("records")
+
+
+def install_atlantic_council_snapshot(snapshot: DataSnapshot):
+    """
+    Point the shared Atlantic Council connector at a published dataset,
+    including one fetched by another worker
+    """
+    if snapshot.source != "atlantic_council":
+        return
+    import pandas as pd
+
+    from atlantic_council_connector import atlantic_council
+
+    atlantic_council.data = pd.DataFrame.from_records(
+        [dict(record) for record in snapshot.data]
+    )
+    atlantic_council.last_updated = snapshot.fetched_at
+
+
+def register_default_jobs(scheduler: "BackgroundRefreshScheduler"):
+    """Register the standard upstream refresh jobs"""
+    scheduler.register(
+        "world_bank", fetch_world_bank_economic_data, WORLD_BANK_REFRESH
+    )
+    scheduler.register(
+        "federal_register", fetch_federal_register_policies, FEDERAL_REGISTER_REFRESH
+    )
+    scheduler.register("live_tariffs", fetch_live_tariff_data, LIVE_TARIFFS_REFRESH)
+    scheduler.register(
+        "atlantic_council", fetch_atlantic_council_dataset, ATLANTIC_COUNCIL_REFRESH
+    )
+
+
+# Global instance
+refresh_scheduler = BackgroundRefreshScheduler(
+    store=snapshot_store, cache=get_cache_backend()
+)
+register_default_jobs(refresh_scheduler)
+# Diff every published payload so downstream values recompute per country
+refresh_scheduler.add_listener(track_snapshot)
+refresh_scheduler.add_listener(install_atlantic_council_snapshot)
+
+
+# Convenience functions
+def get_snapshot(source: str) -> Optional[DataSnapshot]:
+    """Get the latest published snapshot for a source"""
+    return refresh_scheduler.get_snapshot(source)
+
+
+def get_snapshot_data(source: str, default: Any = None) -> Any:
+    """Get the latest published payload for a source"""
+    return refresh_scheduler.get_data(source, default)
+
+
+if __name__ == "__main__":
+
+    async def test():
+        print("🧪 TESTING BACKGROUND REFRESH SCHEDULER")
+        print("=" * 50)
+        for name in refresh_scheduler.jobs:
+            published = await refresh_scheduler.refresh_now(name)
+            print(f"{name}: {'published' if published else 'no data'}")
+        print(refresh_scheduler.status())
+
+    asyncio.run(test())
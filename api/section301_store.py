@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Section 301 Store
+=================
+
+Compact, binary-searchable store of the USTR Section 301 lists (China)
+and their product exclusions, built offline from local files:
+- Each covered code is one int64 key (code right-padded to 10 digits,
+  times 16, plus its digit count), so HTS10 lines and HTS8 subheadings
+  share one sorted array; a lookup tries the HTS10 key, then the 8, 6 and
+  4 digit keys, most specific first
+- Per-key list number (index into a small label table) and adder are
+  int8 / float32 columns
+- Exclusions are (key, start day, end day) windows; "excluded on date D"
+  is a vectorized filter over the windows followed by searchsorted
+- The arrays are saved with np.savez and load in milliseconds
+
+Inputs are the list annexes and exclusion notices as CSV/XLSX tables
+(an HTS column plus optional list, rate and date columns, streamed in
+chunks) or as plain
+text exported from the USTR PDFs, where every dotted HTS code is taken.
+
+Usage:
+    python section301_store.py build --list "List 1" list1.csv
+                                     --list "List 4A" list4a.txt
+                                     [--exclusions excl.xlsx ...]
+                                     [--output data/section301.npz]
+    python section301_store.py lookup 8471.30.0100 [--on 2025-06-01]
+"""
+
+import argparse
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hs_concordance import HS_CONCORDANCE, normalize_codes
+from workbook_reader import iter_sheet_chunks
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.getenv(
+    "TIPM_SECTION301_STORE",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "section301.npz",
+    ),
+)
+
+# Adders in effect for each list unless a file gives its own rate column
+LIST_ADDERS: Dict[str, float] = {
+    "List 1": 25.0,
+    "List 2": 25.0,
+    "List 3": 25.0,
+    "List 4A": 7.5,
+}
+
+# Levels a covered code can be listed at, most specific first
+LEVELS = (10, 8, 6, 4)
+
+# Dotted HTS codes in text exported from the USTR PDFs ("8471.30.01",
+# "8414.59.6590"); Chapter 99 headings ("9903.88.03") are not product codes
+HTS_PATTERN = re.compile(r"\b(?!99)\d{4}\.\d{2}(?:\.\d{2}(?:\d{2})?)?\b")
+
+OPEN_START = np.iinfo(np.int32).min
+OPEN_END = np.iinfo(np.int32).max
+
+# Column name fragments recognized in list and exclusion tables
+_COLUMNS = {
+    "hts": ("hts", "subheading", "tariff"),
+    "list": ("list",),
+    "adder": ("rate", "adder", "duty"),
+    "start": ("start", "effective", "begin", "from"),
+    "end": ("end", "expir", "until", "through"),
+}
+
+
+def list_label(value: Any) -> str:
+    """Canonical list label ("4a", "List 4A" -> "List 4A")"""
+    text = str(value).strip()
+    text = re.sub(r"(?i)^list\s*", "", text).upper()
+    return f"List {text}" if text else ""
+
+
+def encode_keys(codes: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """(padded 10-digit codes, digit counts); -1 codes for invalid input"""
+    digits = np.char.str_len(normalize_codes(codes)).astype(np.int64)
+    return HS_CONCORDANCE.encode(codes), digits
+
+
+def _key(padded: np.ndarray, digits: Any) -> np.ndarray:
+    return padded * 16 + digits
+
+
+def _level_key(padded: np.ndarray, level: int) -> np.ndarray:
+    scale = 10 ** (10 - level)
+    return _key(padded // scale * scale, level)
+
+
+def _day(value: Any, default: int) -> int:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return default
+    if isinstance(value, str) and not value.strip():
+        return default
+    try:
+        day = pd.Timestamp(value).to_datetime64().astype("datetime64[D]")
+        return int(day.view("int64"))
+    except (ValueError, TypeError):
+        return default
+
+
+def _iso(day: int) -> str:
+    if day in (OPEN_START, OPEN_END):
+        return ""
+    return str(np.datetime64(int(day), "D"))
+
+
+@dataclass
+class Section301Duty:
+    """Section 301 treatment of one HTS code on a date"""
+
+    hts_code: str
+    list_no: str
+    adder_pct: float
+    excluded: bool
+    exclusion_ends_on: str
+
+    @property
+    def duty_pct(self) -> float:
+        return 0.0 if self.excluded else self.adder_pct
+
+
+class Section301Store:
+    """Sorted key arrays for per-HTS Section 301 coverage and exclusions"""
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        list_ids: np.ndarray,
+        adders: np.ndarray,
+        lists: Sequence[str],
+        exclusion_keys: np.ndarray,
+        exclusion_start: np.ndarray,
+        exclusion_end: np.ndarray,
+    ):
+        self.keys = keys
+        self.list_ids = list_ids
+        self.adders = adders
+        self.lists: Tuple[str, ...] = tuple(lists)
+        self.exclusion_keys = exclusion_keys
+        self.exclusion_start = exclusion_start
+        self.exclusion_end = exclusion_end
+
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[Tuple[str, str, float]],
+        exclusions: Iterable[Tuple[str, Any, Any]] = (),
+    ) -> "Section301Store":
+        """
+        Build from (hts_code, list label, adder pct) entries and
+        (hts_code, start, end) exclusion windows; a code on several lists
+        keeps its highest adder
+        """
+        entries = list(entries)
+        lists = sorted({label for _, label, _ in entries})
+        list_index = {label: i for i, label in enumerate(lists)}
+        padded, digits = encode_keys([code for code, _, _ in entries])
+        keys = _key(padded, digits)
+        list_ids = np.array(
+            [list_index[label] for _, label, _ in entries], dtype=np.int8
+        )
+        adders = np.array([adder for _, _, adder in entries], dtype=np.float32)
+
+        valid = padded >= 0
+        keys, list_ids, adders = keys[valid], list_ids[valid], adders[valid]
+        order = np.lexsort((-adders, keys))
+        keys, list_ids, adders = keys[order], list_ids[order], adders[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+
+        exclusions = list(exclusions)
+        ex_padded, ex_digits = encode_keys([code for code, _, _ in exclusions])
+        ex_keys = _key(ex_padded, ex_digits)
+        ex_start = np.array(
+            [_day(start, OPEN_START) for _, start, _ in exclusions], dtype=np.int32
+        )
+        ex_end = np.array(
+            [_day(end, OPEN_END) for _, _, end in exclusions], dtype=np.int32
+        )
+        ex_valid = ex_padded >= 0
+        ex_order = np.argsort(ex_keys[ex_valid], kind="stable")
+
+        return cls(
+            keys=keys[first],
+            list_ids=list_ids[first],
+            adders=adders[first],
+            lists=lists,
+            exclusion_keys=ex_keys[ex_valid][ex_order],
+            exclusion_start=ex_start[ex_valid][ex_order],
+            exclusion_end=ex_end[ex_valid][ex_order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in (
+                self.keys,
+                self.list_ids,
+                self.adders,
+                self.exclusion_keys,
+                self.exclusion_start,
+                self.exclusion_end,
+            )
+        )
+
+    def save(self, path: str = DEFAULT_STORE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                keys=self.keys,
+                list_ids=self.list_ids,
+                adders=self.adders,
+                lists=np.array(self.lists, dtype=str),
+                exclusion_keys=self.exclusion_keys,
+                exclusion_start=self.exclusion_start,
+                exclusion_end=self.exclusion_end,
+            )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STORE_PATH) -> "Section301Store":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                keys=data["keys"],
+                list_ids=data["list_ids"],
+                adders=data["adders"],
+                lists=data["lists"].tolist(),
+                exclusion_keys=data["exclusion_keys"],
+                exclusion_start=data["exclusion_start"],
+                exclusion_end=data["exclusion_end"],
+            )
+
+    def _match(self, padded: np.ndarray, digits: np.ndarray) -> np.ndarray:
+        """Row of the most specific covering key per code; -1 if uncovered"""
+        rows = np.full(len(padded), -1, dtype=np.int64)
+        if not len(self.keys):
+            return rows
+        for level in LEVELS:
+            candidates = (rows < 0) & (padded >= 0) & (digits >= level)
+            if not candidates.any():
+                continue
+            keys = _level_key(padded[candidates], level)
+            idx = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            rows[candidates] = np.where(self.keys[idx] == keys, idx, -1)
+        return rows
+
+    def _excluded_until(
+        self, padded: np.ndarray, digits: np.ndarray, day: int
+    ) -> np.ndarray:
+        """End day of an exclusion window covering each code on day; -1 if none"""
+        until = np.full(len(padded), -1, dtype=np.int64)
+        active = (self.exclusion_start <= day) & (self.exclusion_end >= day)
+        if not active.any():
+            return until
+        keys, ends = self.exclusion_keys[active], self.exclusion_end[active]
+        for level in LEVELS:
+            candidates = (until < 0) & (padded >= 0) & (digits >= level)
+            if not candidates.any():
+                continue
+            level_keys = _level_key(padded[candidates], level)
+            idx = np.minimum(np.searchsorted(keys, level_keys), len(keys) - 1)
+            until[candidates] = np.where(keys[idx] == level_keys, ends[idx], -1)
+        return until
+
+    def duties(
+        self, hts_codes: Sequence[str], on: Optional[date] = None
+    ) -> np.ndarray:
+        """Section 301 duty (pct) per code on a date; 0.0 if uncovered or excluded"""
+        padded, digits = encode_keys(hts_codes)
+        rows = self._match(padded, digits)
+        day = _day(on or date.today(), 0)
+        excluded = self._excluded_until(padded, digits, day) >= 0
+        adders = np.where(rows >= 0, self.adders[np.maximum(rows, 0)], 0.0)
+        return np.where(excluded, 0.0, adders).astype(np.float64)
+
+    def lookup(
+        self, hts_code: str, on: Optional[date] = None
+    ) -> Optional[Section301Duty]:
+        """Section 301 treatment of one code; None if it is on no list"""
+        padded, digits = encode_keys([hts_code])
+        row = int(self._match(padded, digits)[0])
+        if row < 0:
+            return None
+        day = _day(on or date.today(), 0)
+        until = int(self._excluded_until(padded, digits, day)[0])
+        return Section301Duty(
+            hts_code=hts_code,
+            list_no=self.lists[self.list_ids[row]],
+            adder_pct=float(self.adders[row]),
+            excluded=until >= 0,
+            exclusion_ends_on=_iso(until) if until >= 0 else "",
+        )
+
+    def list_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.list_ids, minlength=len(self.lists))
+        return dict(zip(self.lists, counts.tolist()))
+
+
+def _find_column(columns: Sequence[str], field: str) -> Optional[str]:
+    for column in columns:
+        name = str(column).lower()
+        if any(fragment in name for fragment in _COLUMNS[field]):
+            return column
+    return None
+
+
+def _table_chunks(path: Path) -> Optional[Iterator[pd.DataFrame]]:
+    """Streamed CSV/XLSX chunks; None for text files"""
+    if path.suffix.lower() in (".csv", ".xlsx", ".xls"):
+        return iter_sheet_chunks(path)
+    return None
+
+
+def _parse_rate(value: Any) -> Optional[float]:
+    if value is None or pd.isna(value):
+        return None
+    match = re.search(r"\d+(?:\.\d+)?", str(value))
+    return float(match.group()) if match else None
+
+
+def read_list_file(
+    path: str, list_no: Optional[str] = None, adder: Optional[float] = None
+) -> List[Tuple[str, str, float]]:
+    """(hts_code, list label, adder pct) entries from one list annex"""
+    path = Path(path)
+    default_label = list_label(list_no) if list_no else ""
+    chunks = _table_chunks(path)
+    if chunks is None:
+        label = default_label or list_label(path.stem)
+        rate = adder if adder is not None else LIST_ADDERS.get(label, 25.0)
+        codes = HTS_PATTERN.findall(path.read_text(errors="ignore"))
+        return [(code, label, rate) for code in codes]
+
+    entries = []
+    for chunk in chunks:
+        hts_col = _find_column(chunk.columns, "hts")
+        if hts_col is None:
+            raise ValueError(f"No HTS column in {path}")
+        list_col = _find_column(chunk.columns, "list")
+        adder_col = _find_column(chunk.columns, "adder")
+
+        for _, row in chunk.iterrows():
+            code = row[hts_col]
+            if pd.isna(code):
+                continue
+            label = default_label or (
+                list_label(row[list_col]) if list_col else list_label(path.stem)
+            )
+            rate = adder
+            if rate is None and adder_col:
+                rate = _parse_rate(row[adder_col])
+            if rate is None:
+                rate = LIST_ADDERS.get(label, 25.0)
+            entries.append((str(code).strip(), label, rate))
+    return entries
+
+
+def read_exclusion_file(path: str) -> List[Tuple[str, Any, Any]]:
+    """(hts_code, start, end) exclusion windows from one exclusion notice"""
+    path = Path(path)
+    chunks = _table_chunks(path)
+    if chunks is None:
+        codes = HTS_PATTERN.findall(path.read_text(errors="ignore"))
+        return [(code, None, None) for code in codes]
+
+    exclusions = []
+    for chunk in chunks:
+        hts_col = _find_column(chunk.columns, "hts")
+        if hts_col is None:
+            raise ValueError(f"No HTS column in {path}")
+        start_col = _find_column(chunk.columns, "start")
+        end_col = _find_column(chunk.columns, "end")
+        exclusions.extend(
+            (
+                str(row[hts_col]).strip(),
+                row[start_col] if start_col else None,
+                row[end_col] if end_col else None,
+            )
+            for _, row in chunk.iterrows()
+            if pd.notna(row[hts_col])
+        )
+    return exclusions
+
+
+def build_store(
+    lists: Iterable[Tuple[str, str]], exclusion_paths: Iterable[str] = ()
+) -> Section301Store:
+    """Store from (list label, path) annexes and exclusion notice paths"""
+    entries: List[Tuple[str, str, float]] = []
+    for label, path in lists:
+        entries.extend(read_list_file(path, label))
+    exclusions: List[Tuple[str, Any, Any]] = []
+    for path in exclusion_paths:
+        exclusions.extend(read_exclusion_file(path))
+    return Section301Store.from_entries(entries, exclusions)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Section 301 list store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build the store from local files")
+    build.add_argument(
+        "--list",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("LABEL", "PATH"),
+        dest="lists",
+    )
+    build.add_argument("--exclusions", nargs="+", default=[])
+    build.add_argument("--output", default=DEFAULT_STORE_PATH)
+
+    lookup = commands.add_parser("lookup", help="Look up HTS codes")
+    lookup.add_argument("hts_codes", nargs="+")
+    lookup.add_argument("--on", type=date.fromisoformat, default=None)
+    lookup.add_argument("--store", default=DEFAULT_STORE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        store = build_store(args.lists, args.exclusions)
+        store.save(args.output)
+        print(
+            f"✅ {len(store)} codes ({store.list_counts()}), "
+            f"{len(store.exclusion_keys)} exclusions, "
+            f"{store.nbytes / 1024:.1f} KiB → {args.output}"
+        )
+    else:
+        store = Section301Store.load(args.store)
+        for code in args.hts_codes:
+            print(f"  {code}: {store.lookup(code, args.on)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,28 +11,33 @@ import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from cache_backend import get_cache_backend
+from records import intern_values
+from workbook_reader import iter_sheet_rows
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+EXCEL_FILE = Path("data/Trump tariff tracker.xlsx")
+
+
 def load_atlantic_council_data() -> Dict[str, Dict[str, Any]]:
     """Load and parse Atlantic Council data directly"""
-    excel_file = Path("data/Trump tariff tracker.xlsx")
+    excel_file = EXCEL_FILE
 
     if not excel_file.exists():
         logger.error(f"Excel file not found: {excel_file}")
         return {}
 
     try:
-        # Load the Excel file
-        data = pd.read_excel(excel_file, sheet_name="All actions")
-        logger.info(f"Successfully loaded Excel file with {len(data)} rows")
-
-        # Parse the data
+        # Stream and parse the data
         parsed_data: Dict[str, Dict[str, Any]] = {}
+        row_count = 0
 
-        for _, row in data.iterrows():
+        for row in iter_sheet_rows(excel_file, "All actions"):
+            row_count += 1
             country = str(row["Geography"]).strip()
             if pd.isna(country) or country.lower() in ["nan", "none", ""]:
                 continue
@@ -69,16 +74,24 @@ def load_atlantic_council_data() -> Dict[str, Dict[str, Any]]:
             if country not in parsed_data:
                 parsed_data[country] = {}
 
-            parsed_data[country][sector] = {
-                "tariff_rate": tariff_rate,
-                "hts_codes": ["All"],
-                "effective_date": date,
-                "source": f"Trump Administration 2025 - {source}",
-                "notes": f"Tariff rate: {tariff_rate}% - {source}",
-                "status": "Active",
-                "verification": f"Atlantic Council Trump Tariff Tracker, {source}",
-            }
+            parsed_data[country][sector] = intern_values(
+                {
+                    "tariff_rate": tariff_rate,
+                    "hts_codes": ["All"],
+                    "effective_date": date,
+                    "source": f"Trump Administration 2025 - {source}",
+                    "notes": f"Tariff rate: {tariff_rate}% - {source}",
+                    "status": "Active",
+                    "verification": (
+                        f"Atlantic Council Trump Tariff Tracker, {source}"
+                    ),
+                },
+                "source",
+                "notes",
+                "verification",
+            )
 
+        logger.info(f"Successfully streamed {row_count} rows from Excel file")
         logger.info(f"Successfully parsed data for {len(parsed_data)} countries")
         return parsed_data
 
@@ -143,10 +156,29 @@ def parse_tariff_rate(rate_value) -> float:
 _parsed_data: Dict[str, Dict[str, Any]] = {}
 
 
+def _ensure_parsed():
+    """
+    Fill _parsed_data once per process. The workbook itself is parsed once
+    per host: other workers load the result from the shared cache, keyed by
+    the file's modification time so a replaced workbook is parsed again.
+    """
+    if _parsed_data:
+        return
+    try:
+        version = EXCEL_FILE.stat().st_mtime_ns
+    except OSError:
+        version = 0
+    _parsed_data.update(
+        get_cache_backend().get_or_compute(
+            f"simple_excel_parser:{EXCEL_FILE.resolve()}:{version}",
+            load_atlantic_council_data,
+        )
+    )
+
+
 def get_country_tariffs(country_name: str) -> Optional[Dict[str, Any]]:
     """Get tariff data for a specific country"""
-    if not _parsed_data:
-        _parsed_data.update(load_atlantic_council_data())
+    _ensure_parsed()
     return _parsed_data.get(country_name)
 
 
@@ -185,15 +217,13 @@ def get_affected_sectors(country_name: str) -> List[str]:
 
 def get_all_countries() -> List[str]:
     """Get list of all countries from the dataset"""
-    if not _parsed_data:
-        _parsed_data.update(load_atlantic_council_data())
+    _ensure_parsed()
     return list(_parsed_data.keys())
 
 
 def get_tariff_summary() -> Dict[str, Any]:
     """Get comprehensive tariff summary"""
-    if not _parsed_data:
-        _parsed_data.update(load_atlantic_council_data())
+    _ensure_parsed()
 
     total_countries = len(_parsed_data)
     total_tariffs = sum(len(country_data) for country_data in _parsed_data.values())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Persistent Snapshot Store
+=========================
+
+Local, versioned store for every payload fetched from upstream sources:
+- One entry per (source, key, fetched_at), payloads stored as
+  zlib-compressed JSON in a single SQLite file
+- Identical consecutive payloads are not stored twice; fetch timestamps
+  inside a payload are ignored when comparing, and a repeated payload
+  only bumps the stored fetched_at
+- Read on startup for instant warm starts, written after successful refreshes
+- Compaction with a retention policy keeps the file bounded
+- Historical payloads can be listed and replayed
+
+The store lives at data/snapshots.sqlite3 unless TIPM_SNAPSHOT_DB is set.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv(
+    "TIPM_SNAPSHOT_DB",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "snapshots.sqlite3",
+    ),
+)
+
+# Retention policy: drop entries older than this, but always keep the newest
+# few versions of every (source, key) so an outage never empties the store
+RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))
+KEEP_LATEST = int(os.getenv("SNAPSHOT_KEEP_LATEST", "3"))
+
+# Payload fields stamped with the time of each fetch - they differ on every
+# refresh, so they are left out of the content hash
+VOLATILE_KEYS = frozenset({"last_updated", "retrieval_timestamp", "timestamp"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    UNIQUE (source, key, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_lookup
+    ON snapshots (source, key, fetched_at DESC);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize frozen snapshot containers, dates and numpy scalars"""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Encode a payload as canonical (key-sorted) JSON"""
+    return json.dumps(payload, default=_json_default, sort_keys=True).encode("utf-8")
+
+
+def _without_volatile(value: Any) -> Any:
+    """Copy of a payload with per-fetch timestamp fields removed"""
+    if isinstance(value, Mapping):
+        return {
+            key: _without_volatile(item)
+            for key, item in value.items()
+            if key not in VOLATILE_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_without_volatile(item) for item in value]
+    return value
+
+
+def content_hash(payload: Any) -> str:
+    """Hash of a payload's content, ignoring per-fetch timestamps"""
+    return hashlib.sha256(encode_payload(_without_volatile(payload))).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredSnapshot:
+    """A single persisted payload"""
+
+    source: str
+    key: str
+    fetched_at: datetime
+    content_hash: str
+    payload: Any
+
+
+class SnapshotStore:
+    """SQLite-backed, versioned store of upstream payloads"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe across threads and processes)"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def put(
+        self,
+        source: str,
+        key: str,
+        payload: Any,
+        fetched_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Persist a payload; returns False if it is identical to the latest
+        stored version for (source, key) and was therefore skipped
+
+        A skipped payload still moves the latest version's fetched_at
+        forward, so warm starts see that the data was confirmed recently.
+        """
+        encoded = encode_payload(payload)
+        payload_hash = content_hash(payload)
+        fetched_at = fetched_at or datetime.now()
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT id, content_hash, fetched_at FROM snapshots "
+                    "WHERE source = ? AND key = ? "
+                    "ORDER BY fetched_at DESC LIMIT 1",
+                    (source, key),
+                ).fetchone()
+                if row and row[1] == payload_hash:
+                    if fetched_at > datetime.fromisoformat(row[2]):
+                        conn.execute(
+                            "UPDATE snapshots SET fetched_at = ? WHERE id = ?",
+                            (fetched_at.isoformat(), row[0]),
+                        )
+                    return False
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots "
+                    "(source, key, fetched_at, content_hash, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        source,
+                        key,
+                        fetched_at.isoformat(),
+                        payload_hash,
+                        zlib.compress(encoded),
+                    ),
+                )
+            return True
+
+        except sqlite3.Error as e:
+            logger.error(f"Error persisting snapshot {source}/{key}: {e}")
+            return False
+
+    def latest(self, source: str, key: str = "latest") -> Optional[StoredSnapshot]:
+        """Most recent stored payload for (source, key)"""
+        return self.as_of(source, key, datetime.max)
+
+    def as_of(
+        self, source: str, key: str, when: datetime
+    ) -> Optional[StoredSnapshot]:
+        """Payload that was current at a given point in time (for replay)"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT source, key, fetched_at, content_hash, payload "
+                    "FROM snapshots WHERE source = ? AND key = ? AND fetched_at <= ? "
+                    "ORDER BY fetched_at DESC LIMIT 1",
+                    (source, key, when.isoformat()),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading snapshot {source}/{key}: {e}")
+            return None
+
+        return self._decode_row(row) if row else None
+
+    def latest_for_source(self, source: str) -> Dict[str, StoredSnapshot]:
+        """Most recent stored payload for every key of a source"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT s.source, s.key, s.fetched_at, s.content_hash, s.payload "
+                    "FROM snapshots s JOIN ("
+                    "  SELECT key, MAX(fetched_at) AS fetched_at FROM snapshots "
+                    "  WHERE source = ? GROUP BY key"
+                    ") latest ON s.key = latest.key AND s.fetched_at = latest.fetched_at "
+                    "WHERE s.source = ?",
+                    (source, source),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading snapshots for {source}: {e}")
+            return {}
+
+        snapshots = [self._decode_row(row) for row in rows]
+        return {snapshot.key: snapshot for snapshot in snapshots}
+
+    def history(
+        self, source: str, key: str = "latest", limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Stored versions of (source, key), newest first, without payloads"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT fetched_at, content_hash, LENGTH(payload) "
+                    "FROM snapshots WHERE source = ? AND key = ? "
+                    "ORDER BY fetched_at DESC LIMIT ?",
+                    (source, key, limit),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading history for {source}/{key}: {e}")
+            return []
+
+        return [
+            {
+                "fetched_at": fetched_at,
+                "content_hash": content_hash,
+                "compressed_bytes": size,
+            }
+            for fetched_at, content_hash, size in rows
+        ]
+
+    def compact(
+        self, retention_days: int = RETENTION_DAYS, keep_latest: int = KEEP_LATEST
+    ) -> int:
+        """
+        Apply the retention policy and reclaim space
+
+        Entries older than retention_days are deleted unless they are among
+        the keep_latest newest versions of their (source, key).
+        Returns the number of deleted entries.
+        """
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        try:
+            with self._connect() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM snapshots WHERE fetched_at < ? AND id NOT IN ("
+                    "  SELECT id FROM ("
+                    "    SELECT id, ROW_NUMBER() OVER ("
+                    "      PARTITION BY source, key ORDER BY fetched_at DESC"
+                    "    ) AS rank FROM snapshots"
+                    "  ) WHERE rank <= ?"
+                    ")",
+                    (cutoff, keep_latest),
+                ).rowcount
+            if deleted:
+                with self._connect() as conn:
+                    conn.execute("VACUUM")
+                logger.info(f"🧹 Compacted snapshot store: {deleted} entries removed")
+            return deleted
+
+        except sqlite3.Error as e:
+            logger.error(f"Error compacting snapshot store: {e}")
+            return 0
+
+    def _decode_row(self, row) -> StoredSnapshot:
+        source, key, fetched_at, content_hash, payload = row
+        return StoredSnapshot(
+            source=source,
+            key=key,
+            fetched_at=datetime.fromisoformat(fetched_at),
+            content_hash=content_hash,
+            payload=json.loads(zlib.decompress(payload)),
+        )
+
+
+# Global instance
+snapshot_store = SnapshotStore()
+
+
+# Convenience functions
+def persist_snapshot(
+    source: str, key: str, payload: Any, fetched_at: Optional[datetime] = None
+) -> bool:
+    """Persist a fetched payload to the local snapshot store"""
+    return snapshot_store.put(source, key, payload, fetched_at)
+
+
+def load_latest_snapshot(source: str, key: str = "latest") -> Optional[StoredSnapshot]:
+    """Load the most recent persisted payload for (source, key)"""
+    return snapshot_store.latest(source, key)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python snapshot_store.py [compact | history SOURCE [KEY]]
+    command = sys.argv[1] if len(sys.argv) > 1 else "compact"
+    if command == "history" and len(sys.argv) > 2:
+        key = sys.argv[3] if len(sys.argv) > 3 else "latest"
+        for entry in snapshot_store.history(sys.argv[2], key):
+            print(entry)
+    else:
+        removed = snapshot_store.compact()
+        print(f"🧹 Removed {removed} snapshot entries from {snapshot_store.db_path}")
@@ -10,8 +10,11 @@ Based on official USTR, USITC, and Federal Register data.
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from columnar_tariff_store import ColumnarTariffStore
+from records import intern_fields
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TariffInfo:
     country: str
     sector: str
@@ -21,6 +24,9 @@ class TariffInfo:
     source: str
     notes: str
 
+    def __post_init__(self):
+        intern_fields(self, "country", "sector", "effective_date", "source")
+
 
 # Real US-imposed tariff rates by country and sector
 # Based on Section 301 (China), Section 232 (Steel/Aluminum), and other trade actions
@@ -244,6 +250,9 @@ REAL_TARIFF_DATA = {
     },
 }
 
+# REAL_TARIFF_DATA as flat columns for the lookups below
+TARIFF_STORE = ColumnarTariffStore.from_nested(REAL_TARIFF_DATA)
+
 
 def get_country_tariffs(country_name: str) -> Dict[str, Dict]:
     """Get all tariff information for a specific country"""
@@ -258,28 +267,21 @@ def get_country_sector_tariff(country_name: str, sector: str) -> Optional[Dict]:
 
 def get_country_average_tariff(country_name: str) -> float:
     """Calculate average tariff rate for a country across all sectors"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return 0.0
-
-    total_rate = sum(tariff["tariff_rate"] for tariff in country_tariffs.values())
-    return total_rate / len(country_tariffs)
+    return TARIFF_STORE.average_rate(country_name, status=None)
 
 
 def get_affected_sectors(country_name: str) -> List[str]:
     """Get list of sectors affected by US tariffs for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    return list(country_tariffs.keys())
+    return TARIFF_STORE.sector_names(country_name)
 
 
 def get_total_tariff_impact(country_name: str) -> Dict[str, float]:
     """Calculate total tariff impact for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    affected_sectors = TARIFF_STORE.sector_count(country_name)
+    if not affected_sectors:
         return {"total_rate": 0.0, "affected_sectors": 0, "average_rate": 0.0}
 
-    total_rate = sum(tariff["tariff_rate"] for tariff in country_tariffs.values())
-    affected_sectors = len(country_tariffs)
+    total_rate = TARIFF_STORE.total_rate(country_name, status=None)
     average_rate = total_rate / affected_sectors
 
     return {
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Temporal Tariff Store
+=====================
+
+As-of view of the static tariff data (ATLANTIC_COUNCIL_DATA,
+COMPREHENSIVE_TARIFF_DATA, CountryTariffRule rows):
+- Free-form effective dates ("8/6/2025", "August 2025", "2018-2020",
+  "2024-01-01") are parsed once into day numbers; entries without a
+  usable date ("TBD", "") are pending and never in effect as of a date
+- Rows are sorted by (country, sector, start day); every (country,
+  sector) owns a contiguous run of versions, and a version is in effect
+  from its start day until the next version of the same key starts
+- "What was the rate on D?" is a binary search over that run, so
+  historical queries cost O(log n) per key instead of a dataset per date
+
+Usage:
+    store = TemporalTariffStore.from_nested(ATLANTIC_COUNCIL_DATA)
+    store.average_rate("China", as_of="2025-04-10")
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from columnar_tariff_store import (
+    DEFAULT_STATUS,
+    SECTOR_KEYWORDS,
+    CountryProfile,
+    _Vocabulary,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Start day of entries whose effective date is unknown or pending
+PENDING = np.iinfo(np.int32).max
+
+MONTHS = {
+    name: i
+    for i, names in enumerate(
+        (
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+
+US_DATE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+ISO_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+MONTH_YEAR = re.compile(r"^([A-Za-z]+)\.?\s+(\d{4})$")
+YEAR = re.compile(r"^(\d{4})(?:\s*[-–/]\s*\d{2,4})?$")
+
+DateLike = Union[str, date, datetime, None]
+
+
+def _epoch_day(year: int, month: int, day: int) -> int:
+    return int(np.datetime64(date(year, month, day), "D").view("int64"))
+
+
+def parse_effective_date(value: Any) -> Optional[int]:
+    """
+    Day number (days since 1970-01-01) an effective date starts on, or
+    None if it is pending or cannot be parsed. Year-only and year-range
+    dates start on January 1 of the first year, "Month YYYY" on the 1st.
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return _epoch_day(value.year, value.month, value.day)
+    if not isinstance(value, str):
+        return None
+
+    text = value.strip()
+    try:
+        match = US_DATE.match(text)
+        if match:
+            month, day, year = (int(part) for part in match.groups())
+            return _epoch_day(year, month, day)
+        match = ISO_DATE.match(text)
+        if match:
+            year, month, day = (int(part) for part in match.groups())
+            return _epoch_day(year, month, day)
+        match = MONTH_YEAR.match(text)
+        if match and match.group(1).lower() in MONTHS:
+            return _epoch_day(int(match.group(2)), MONTHS[match.group(1).lower()], 1)
+        match = YEAR.match(text)
+        if match:
+            return _epoch_day(int(match.group(1)), 1, 1)
+    except ValueError:
+        pass
+    return None
+
+
+def as_of_day(as_of: DateLike) -> int:
+    """Day number for an as-of argument (today if None); raises ValueError"""
+    if as_of is None:
+        as_of = date.today()
+    elif isinstance(as_of, str):
+        as_of = date.fromisoformat(as_of.strip())
+    day = parse_effective_date(as_of)
+    if day is None:
+        raise ValueError(f"Invalid as-of date: {as_of!r}")
+    return day
+
+
+def _iso(day: int) -> str:
+    return "" if day == PENDING else str(np.datetime64(int(day), "D"))
+
+
+@dataclass(frozen=True, slots=True)
+class TariffVersion:
+    """One dated version of a (country, sector) tariff"""
+
+    country: str
+    sector: str
+    tariff_rate: float
+    status: str
+    source: str
+    effective_date: str
+    starts_on: str
+
+
+class TemporalTariffStore:
+    """
+    Dated tariff versions with an interval index per (country, sector)
+
+    Versions of key k live in [key_offsets[k], key_offsets[k + 1]) and
+    are sorted by start day; rows with the same start day keep input
+    order, and the last one wins.
+    """
+
+    def __init__(
+        self,
+        keys: List[Tuple[str, str]],
+        key_offsets: np.ndarray,
+        starts: np.ndarray,
+        rates: np.ndarray,
+        status_codes: np.ndarray,
+        source_codes: np.ndarray,
+        date_codes: np.ndarray,
+        statuses: List[str],
+        sources: List[str],
+        dates: List[str],
+    ):
+        self.keys = tuple(keys)
+        self.key_index = {key: i for i, key in enumerate(keys)}
+        self.key_offsets = key_offsets
+        self.starts = starts
+        self.rates = rates
+        self.status_codes = status_codes
+        self.source_codes = source_codes
+        self.date_codes = date_codes
+        self.statuses = tuple(statuses)
+        self.sources = tuple(sources)
+        self.dates = tuple(dates)
+
+        # Keys of each country in first-seen order
+        self.country_keys: Dict[str, List[int]] = {}
+        for i, (country, _) in enumerate(keys):
+            self.country_keys.setdefault(country, []).append(i)
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Tuple[str, str, float, str, str, Any]]
+    ) -> "TemporalTariffStore":
+        """Build from (country, sector, rate, status, source, effective_date) rows"""
+        status_vocab, source_vocab, date_vocab = (
+            _Vocabulary(),
+            _Vocabulary(),
+            _Vocabulary(),
+        )
+        grouped: Dict[Tuple[str, str], List[Tuple[int, float, int, int, int]]] = {}
+        for country, sector, rate, status, source, effective_date in rows:
+            start = parse_effective_date(effective_date)
+            grouped.setdefault((country, sector), []).append(
+                (
+                    PENDING if start is None else start,
+                    float(rate or 0.0),
+                    status_vocab.encode(status or DEFAULT_STATUS),
+                    source_vocab.encode(source or ""),
+                    date_vocab.encode(str(effective_date or "")),
+                )
+            )
+
+        keys = list(grouped.keys())
+        counts = [len(grouped[key]) for key in keys]
+        key_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=key_offsets[1:])
+
+        # Stable sort by start day within each key
+        flat = [
+            version
+            for key in keys
+            for version in sorted(grouped[key], key=lambda version: version[0])
+        ]
+        columns = list(zip(*flat)) if flat else [(), (), (), (), ()]
+
+        return cls(
+            keys=keys,
+            key_offsets=key_offsets,
+            starts=np.array(columns[0], dtype=np.int32),
+            rates=np.array(columns[1], dtype=np.float64),
+            status_codes=np.array(columns[2], dtype=np.int8),
+            source_codes=np.array(columns[3], dtype=np.int32),
+            date_codes=np.array(columns[4], dtype=np.int32),
+            statuses=status_vocab.values,
+            sources=source_vocab.values,
+            dates=date_vocab.values,
+        )
+
+    @staticmethod
+    def nested_rows(
+        data: Mapping[str, Mapping[str, Mapping[str, Any]]]
+    ) -> Iterable[Tuple[str, str, float, str, str, Any]]:
+        """Rows of the country -> sector -> info dicts of the data modules"""
+        return (
+            (
+                country,
+                sector,
+                info.get("tariff_rate", 0.0),
+                info.get("status", DEFAULT_STATUS),
+                info.get("source", ""),
+                info.get("effective_date", ""),
+            )
+            for country, sector_map in data.items()
+            for sector, info in sector_map.items()
+            if isinstance(info, Mapping)
+        )
+
+    @staticmethod
+    def rule_rows(
+        rules: Iterable[Any], sector: str = "Reciprocal"
+    ) -> Iterable[Tuple[str, str, float, str, str, Any]]:
+        """Rows of CountryTariffRule records, one sector per rule"""
+        return (
+            (
+                rule.country,
+                sector,
+                rule.reciprocal_addon_pct,
+                DEFAULT_STATUS,
+                rule.rule_type,
+                rule.effective_date,
+            )
+            for rule in rules
+        )
+
+    @classmethod
+    def from_nested(
+        cls, data: Mapping[str, Mapping[str, Mapping[str, Any]]]
+    ) -> "TemporalTariffStore":
+        """Build from a static data module's nested dicts"""
+        return cls.from_rows(cls.nested_rows(data))
+
+    @classmethod
+    def from_rules(
+        cls, rules: Iterable[Any], sector: str = "Reciprocal"
+    ) -> "TemporalTariffStore":
+        """Build from CountryTariffRule records"""
+        return cls.from_rows(cls.rule_rows(rules, sector))
+
+    # ------------------------------------------------------------------
+    # Point-in-time lookups
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    def __contains__(self, country: str) -> bool:
+        return country in self.country_keys
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(
+            array.nbytes
+            for array in (
+                self.key_offsets,
+                self.starts,
+                self.rates,
+                self.status_codes,
+                self.source_codes,
+                self.date_codes,
+            )
+        )
+
+    def _row_as_of(self, key: int, day: int) -> Optional[int]:
+        lo, hi = int(self.key_offsets[key]), int(self.key_offsets[key + 1])
+        row = lo + int(np.searchsorted(self.starts[lo:hi], day, side="right")) - 1
+        if row < lo or self.starts[row] == PENDING:
+            return None
+        return row
+
+    def _version(self, key: int, row: int) -> TariffVersion:
+        country, sector = self.keys[key]
+        return TariffVersion(
+            country=country,
+            sector=sector,
+            tariff_rate=float(self.rates[row]),
+            status=self.statuses[self.status_codes[row]],
+            source=self.sources[self.source_codes[row]],
+            effective_date=self.dates[self.date_codes[row]],
+            starts_on=_iso(int(self.starts[row])),
+        )
+
+    def version(
+        self, country: str, sector: str, as_of: DateLike = None
+    ) -> Optional[TariffVersion]:
+        """The version of a (country, sector) tariff in effect on as_of"""
+        key = self.key_index.get((country, sector))
+        if key is None:
+            return None
+        row = self._row_as_of(key, as_of_day(as_of))
+        return None if row is None else self._version(key, row)
+
+    def versions_as_of(
+        self,
+        country: str,
+        as_of: DateLike = None,
+        status: Optional[Iterable[str]] = DEFAULT_STATUS,
+    ) -> List[TariffVersion]:
+        """A country's versions in effect on as_of, optionally by status"""
+        day = as_of_day(as_of)
+        if isinstance(status, str):
+            status = (status,)
+        versions = []
+        for key in self.country_keys.get(country, ()):
+            row = self._row_as_of(key, day)
+            if row is None:
+                continue
+            row_status = self.statuses[self.status_codes[row]]
+            if status is not None and row_status not in status:
+                continue
+            versions.append(self._version(key, row))
+        return versions
+
+    def average_rate(
+        self,
+        country: str,
+        as_of: DateLike = None,
+        status: Optional[Iterable[str]] = DEFAULT_STATUS,
+        positive_only: bool = False,
+    ) -> float:
+        """Mean rate of a country's matching versions in effect on as_of"""
+        rates = [
+            version.tariff_rate
+            for version in self.versions_as_of(country, as_of, status)
+            if version.tariff_rate > 0 or not positive_only
+        ]
+        return sum(rates) / len(rates) if rates else 0.0
+
+    def profile(
+        self,
+        country: str,
+        as_of: DateLike = None,
+        keywords: Mapping[str, Tuple[str, ...]] = SECTOR_KEYWORDS,
+    ) -> CountryProfile:
+        """CountryProfile of the versions in effect on as_of"""
+        versions = self.versions_as_of(country, as_of, status=None)
+        by_status: Dict[str, List[float]] = {}
+        for version in versions:
+            by_status.setdefault(version.status, []).append(version.tariff_rate)
+        active = by_status.get("Active", [])
+        return CountryProfile(
+            country=country,
+            total_sectors=len(versions),
+            active_count=len(active),
+            exempt_count=len(by_status.get("Exempt", [])),
+            quota_count=len(by_status.get("Quota", [])),
+            active_total_rate=float(sum(active)),
+            flags=frozenset(
+                flag
+                for flag, words in keywords.items()
+                if any(word in v.sector for v in versions for word in words)
+            ),
+        )
+
+    def history(self, country: str, sector: str) -> List[TariffVersion]:
+        """Every version of a (country, sector) tariff, oldest first"""
+        key = self.key_index.get((country, sector))
+        if key is None:
+            return []
+        rows = range(int(self.key_offsets[key]), int(self.key_offsets[key + 1]))
+        return [self._version(key, row) for row in rows]
+
+    def change_dates(self, country: Optional[str] = None) -> List[str]:
+        """Distinct start dates (ISO) at which any version takes effect"""
+        if country is None:
+            starts = self.starts
+        else:
+            starts = np.concatenate(
+                [
+                    self.starts[self.key_offsets[key] : self.key_offsets[key + 1]]
+                    for key in self.country_keys.get(country, ())
+                ]
+                or [np.empty(0, dtype=np.int32)]
+            )
+        return [_iso(day) for day in np.unique(starts[starts != PENDING]).tolist()]
+
+    def rates_by_country(
+        self, as_of: DateLike = None, positive_only: bool = True
+    ) -> Dict[str, List[float]]:
+        """Rates of every country's versions in effect on as_of"""
+        day = as_of_day(as_of)
+        rates: Dict[str, List[float]] = {}
+        for country, keys in self.country_keys.items():
+            for key in keys:
+                row = self._row_as_of(key, day)
+                if row is None:
+                    continue
+                rate = float(self.rates[row])
+                if rate > 0 or not positive_only:
+                    rates.setdefault(country, []).append(rate)
+        return rates
+
+
+if __name__ == "__main__":
+    import sys
+
+    from atlantic_council_fallback import ATLANTIC_COUNCIL_DATA
+
+    # Usage: python temporal_tariff_store.py COUNTRY [YYYY-MM-DD]
+    country = sys.argv[1] if len(sys.argv) > 1 else "China"
+    on = sys.argv[2] if len(sys.argv) > 2 else None
+    store = TemporalTariffStore.from_nested(ATLANTIC_COUNCIL_DATA)
+    average = store.average_rate(country, on)
+    print(f"📊 {country} as of {on or 'today'}: {average:.1f}%")
+    for version in store.versions_as_of(country, on, status=None):
+        print(
+            f"  {version.sector}: {version.tariff_rate}% "
+            f"({version.status}, since {version.starts_on})"
+        )
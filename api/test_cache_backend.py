@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable cache backends
+"""
+
+import sys
+import os
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import live_usitc_integration
+from cache_backend import (
+    CacheBackend,
+    InProcessCache,
+    SQLiteCache,
+    create_cache_backend,
+)
+from refresh_scheduler import BackgroundRefreshScheduler
+from snapshot_store import SnapshotStore
+
+
+def _parse_once(db_path: str, marker_dir: str) -> int:
+    """Worker process body: 'parse' through the shared cache"""
+    def parse():
+        # One marker file per actual parse
+        open(os.path.join(marker_dir, str(os.getpid())), "w").close()
+        time.sleep(0.3)
+        return {"rows": 42}
+
+    return SQLiteCache(db_path).get_or_compute("parse", parse)["rows"]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return InProcessCache()
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"))
+
+
+class TestCacheBackends:
+    """Test cases shared by both backends"""
+
+    def test_get_set_expiry_and_clear(self, cache):
+        cache.set("usitc:china", {"rate": 25.0}, ttl=timedelta(hours=1))
+        cache.set("usitc:japan", {"rate": 15.0}, ttl=0.01)
+        cache.set("other", [1, 2])
+        assert cache.get("usitc:china") == {"rate": 25.0}
+        time.sleep(0.02)
+        assert cache.get("usitc:japan", "expired") == "expired"
+
+        cache.clear("usitc:")
+        assert cache.get("usitc:china") is None
+        assert cache.get("other") == [1, 2]
+
+    def test_single_flight_across_threads(self, cache):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "parsed"
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(lambda _: cache.get_or_compute("key", compute), range(8))
+            )
+        assert results == ["parsed"] * 8
+        assert len(calls) == 1
+
+    def test_async_single_flight_and_empty_results(self, cache):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": len(calls)}
+
+        async def empty():
+            calls.append(1)
+            return {}
+
+        async def run():
+            results = await asyncio.gather(
+                *(cache.aget_or_compute("fetch", fetch, ttl=60) for _ in range(5))
+            )
+            assert results == [{"value": 1}] * 5
+            # Empty payloads are returned but not cached
+            assert await cache.aget_or_compute("empty", empty) == {}
+            assert await cache.aget_or_compute("empty", empty) == {}
+
+        asyncio.run(run())
+        assert len(calls) == 3
+
+    def test_create_backend(self, tmp_path):
+        assert isinstance(create_cache_backend("memory"), InProcessCache)
+        with pytest.raises(ValueError):
+            create_cache_backend("redis")
+        # Backends must implement the whole interface
+        with pytest.raises(TypeError):
+            CacheBackend()
+
+
+class TestSQLiteCache:
+    """Cross-process behaviour of the SQLite backend"""
+
+    def test_one_parse_per_host(self, tmp_path):
+        db_path = str(tmp_path / "cache.sqlite3")
+        markers = tmp_path / "markers"
+        markers.mkdir()
+
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(4, mp_context=context) as pool:
+            results = list(
+                pool.map(_parse_once, [db_path] * 4, [str(markers)] * 4)
+            )
+        assert results == [42] * 4
+        assert len(list(markers.iterdir())) == 1
+
+    def test_expired_lease_is_taken_over(self, tmp_path):
+        db_path = str(tmp_path / "cache.sqlite3")
+        crashed = SQLiteCache(db_path, lease_timeout=0.05)
+        assert crashed._acquire("key")
+
+        other = SQLiteCache(db_path)
+        assert not other._acquire("key")
+        time.sleep(0.06)
+        assert other.get_or_compute("key", lambda: "recomputed") == "recomputed"
+
+
+class TestCacheConsumers:
+    """Upstream fetches go through the shared backend"""
+
+    def test_scheduler_fetches_once_per_host(self, tmp_path):
+        shared = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+        workers = [BackgroundRefreshScheduler(cache=shared) for _ in range(3)]
+        calls = []
+
+        async def fetcher():
+            calls.append(1)
+            return {"China": {"gdp_billions": 17_794.8}}
+
+        async def run():
+            for scheduler in workers:
+                scheduler.register("world_bank", fetcher, timedelta(hours=24))
+            results = []
+            for scheduler in workers:
+                results.append(await scheduler.refresh_now("world_bank"))
+                await asyncio.sleep(0.01)
+            return results
+
+        assert asyncio.run(run()) == [True, True, True]
+        assert len(calls) == 1
+        assert workers[2].get_data("world_bank")["China"]["gdp_billions"] == 17_794.8
+        # Workers reusing the cached payload publish the original fetch time
+        snapshots = [scheduler.get_snapshot("world_bank") for scheduler in workers]
+        assert len({snapshot.fetched_at for snapshot in snapshots}) == 1
+        assert snapshots[0].fetched_at < workers[2].jobs["world_bank"].last_attempt
+
+    def test_usitc_integration(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            live_usitc_integration,
+            "snapshot_store",
+            SnapshotStore(str(tmp_path / "snapshots.sqlite3")),
+        )
+        calls = []
+
+        class Connector:
+            async def get_comprehensive_country_data(self, country_name):
+                calls.append(country_name)
+                return {"country_name": country_name, "average_tariff_rate": 25.0}
+
+        shared = InProcessCache()
+        first = live_usitc_integration.LiveUSITCIntegration(cache=shared)
+        second = live_usitc_integration.LiveUSITCIntegration(cache=shared)
+        first.connector = second.connector = Connector()
+
+        async def run():
+            await first.get_country_tariff_data("China")
+            return await second.get_country_tariff_data("China")
+
+        assert asyncio.run(run())["average_tariff_rate"] == 25.0
+        assert calls == ["China"]
+
+        first.clear_cache()
+        asyncio.run(second.get_country_tariff_data("China"))
+        assert calls == ["China", "China"]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch chart export pipeline
+"""
+
+import sys
+import os
+import json
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import chart_export
+from chart_service import TEMPLATES, ChartDataset, figure_to_bytes
+
+DATASETS = {
+    "China": ChartDataset("China", 25.0, ("Steel", "Electronics", "Solar"), 17734.0, 1.4e9, 2.0),
+    "Malaysia": ChartDataset("Malaysia", 3.1, ("Electronics",), 400.0, 3.4e7, 1.2),
+}
+
+
+class TestChartExport:
+    """Test cases for template reuse and content-addressed output"""
+
+    def test_reused_templates_match_fresh_figures(self):
+        for template_class in TEMPLATES.values():
+            template = template_class()
+            template.update(DATASETS["China"])
+            reused = figure_to_bytes(template.update(DATASETS["Malaysia"]), "png", 40)
+            fresh = figure_to_bytes(
+                template_class().update(DATASETS["Malaysia"]), "png", 40
+            )
+            assert reused == fresh
+
+    def test_export_writes_manifest_and_deduplicates(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(chart_export, "load_chart_dataset", DATASETS.__getitem__)
+        output_dir = str(tmp_path)
+
+        manifest = chart_export.export_charts(
+            list(DATASETS), output_dir, workers=0, dpi=40
+        )
+        assert len(manifest["charts"]) == 6
+
+        with open(os.path.join(output_dir, "manifest.json")) as f:
+            assert json.load(f)["charts"] == manifest["charts"]
+        for entry in manifest["charts"]:
+            assert entry["path"].endswith(f"{entry['sha256']}.png")
+            assert os.path.exists(os.path.join(output_dir, entry["path"]))
+
+        # A second export of unchanged data reuses the same objects
+        again = chart_export.export_charts(list(DATASETS), output_dir, workers=0, dpi=40)
+        assert [e["sha256"] for e in again["charts"]] == [
+            e["sha256"] for e in manifest["charts"]
+        ]
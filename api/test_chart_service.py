@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the chart rendering service
+"""
+
+import sys
+import os
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import chart_service
+from chart_service import ChartDataset, ChartService, render_chart
+
+DATASET = ChartDataset(
+    country="Malaysia",
+    tariff_rate=3.1,
+    affected_sectors=("Electronics", "Machinery"),
+    gdp_billions=400.0,
+    population=34000000.0,
+    trade_impact=1.2,
+)
+
+
+class TestChartService:
+    """Test cases for rendering and versioned caching"""
+
+    def test_dataset_version_tracks_content(self):
+        same = ChartDataset(**{**DATASET.__dict__})
+        changed = ChartDataset(**{**DATASET.__dict__, "tariff_rate": 10.0})
+        assert same.version == DATASET.version
+        assert changed.version != DATASET.version
+
+    def test_render_formats(self):
+        png = render_chart("tariff_impact", DATASET, "png", dpi=50)
+        svg = render_chart("comprehensive_dashboard", DATASET, "svg")
+        assert png.startswith(b"\x89PNG")
+        assert b"<svg" in svg[:500]
+
+        no_sectors = ChartDataset(**{**DATASET.__dict__, "affected_sectors": ()})
+        assert render_chart("sector_analysis", no_sectors) is None
+
+    def test_identical_charts_are_served_from_cache(self, monkeypatch):
+        monkeypatch.setattr(chart_service, "load_chart_dataset", lambda country: DATASET)
+        service = ChartService(max_entries=1)
+
+        async def fetch():
+            first = await service.get_chart("Malaysia", "sector_analysis")
+            second = await service.get_chart("Malaysia", "sector_analysis")
+            return first, second
+
+        (first, version), (second, _) = asyncio.run(fetch())
+        assert first == second
+        assert version == DATASET.version
+        assert (service.hits, service.misses) == (1, 1)
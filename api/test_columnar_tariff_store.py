@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar tariff store and the data modules built on it
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from columnar_tariff_store import ColumnarTariffStore, build_country_profiles
+
+SAMPLE_DATA = {
+    "China": {
+        "Technology": {"tariff_rate": 25.0, "status": "Active", "source": "Section 301"},
+        "Steel": {"tariff_rate": 10.0, "status": "Active", "source": "Section 232"},
+        "Solar": {"tariff_rate": 0.0, "status": "Active", "source": "Section 201"},
+    },
+    "Australia": {
+        "Steel": {"tariff_rate": 0.0, "status": "Exempt", "source": "Section 232"},
+        "Beef": {"tariff_rate": 15.0, "status": "Active", "source": "Section 301"},
+    },
+    "Argentina": {
+        "Steel": {"tariff_rate": 0.0, "status": "Quota", "source": "Section 232"},
+    },
+}
+
+
+class TestColumnarTariffStore:
+    """Test cases for slice reductions over the columnar layout"""
+
+    def setup_method(self):
+        self.store = ColumnarTariffStore.from_nested(SAMPLE_DATA)
+
+    def test_layout(self):
+        assert len(self.store) == 6
+        assert self.store.countries == ("China", "Australia", "Argentina")
+        assert self.store.offsets.tolist() == [0, 3, 5, 6]
+        # Repeated strings are stored once
+        assert self.store.sectors.count("Steel") == 1
+
+    def test_averages_and_counts(self):
+        assert self.store.average_rate("China") == 35.0 / 3
+        assert self.store.average_rate("China", positive_only=True) == 17.5
+        assert self.store.average_rate("Argentina") == 0.0
+        assert self.store.average_rate("Nowhere") == 0.0
+        assert self.store.status_counts("Australia") == {
+            "Active": 1,
+            "Exempt": 1,
+            "Quota": 0,
+        }
+        assert self.store.count("China", status=("Exempt", "Quota")) == 0
+
+    def test_sector_and_source_lists_keep_source_order(self):
+        assert self.store.sector_names("China", status="Active", positive_only=True) == [
+            "Technology",
+            "Steel",
+        ]
+        assert self.store.source_names("Australia", status="Active") == ["Section 301"]
+
+    def test_average_rates_by_country(self):
+        averages = self.store.average_rates_by_country()
+        assert averages == {
+            country: self.store.average_rate(country) for country in SAMPLE_DATA
+        }
+
+    def test_country_profiles(self):
+        profiles = build_country_profiles(self.store)
+
+        china = profiles["China"]
+        assert (china.total_sectors, china.active_count) == (3, 3)
+        assert china.active_average_rate == 35.0 / 3
+        assert china.flags == {"technology", "steel_aluminum"}
+        assert china.status == "Active Tariffs"
+
+        # Keyword flags cover every sector, not only active ones
+        assert profiles["Australia"].flags == {"steel_aluminum"}
+        assert profiles["Argentina"].status == "Quota Agreement"
+        assert profiles["Argentina"].active_average_rate == 0.0
+
+    def test_profiles_match_nested_partitions(self):
+        import verified_public_data
+
+        for country, sectors in verified_public_data.VERIFIED_TARIFF_DATA.items():
+            summary = verified_public_data.get_country_summary(country)
+            statuses = [info["status"] for info in sectors.values()]
+            assert summary["total_sectors"] == len(sectors)
+            assert summary["active_tariffs"] == statuses.count("Active")
+            assert summary["exempt_sectors"] == statuses.count("Exempt")
+            assert summary["quota_sectors"] == statuses.count("Quota")
+
+    def test_matches_static_data_modules(self):
+        import comprehensive_tariff_data
+        import atlantic_council_fallback
+
+        for module, data in (
+            (comprehensive_tariff_data, comprehensive_tariff_data.COMPREHENSIVE_TARIFF_DATA),
+            (atlantic_council_fallback, atlantic_council_fallback.ATLANTIC_COUNCIL_DATA),
+        ):
+            for country, sectors in data.items():
+                active = [s["tariff_rate"] for s in sectors.values() if s["status"] == "Active"]
+                expected = sum(active) / len(active) if active else 0.0
+                assert abs(module.get_country_average_tariff(country) - expected) < 1e-9
+
+    def test_real_tariff_data_source_store(self):
+        from real_tariff_data_source import RealTariffDataSource
+
+        source = RealTariffDataSource()
+        details = source.tariff_data["China"]["tariff_details"]
+        assert source.tariff_store.sector_names("China") == list(details)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the country registry
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from country_registry import COUNTRY_REGISTRY, CountryRecord
+
+
+class TestCountryRegistry:
+    """Test cases for name resolution and record lookups"""
+
+    def test_names_aliases_and_codes_resolve_to_one_record(self):
+        eu = COUNTRY_REGISTRY.get("European Union")
+        assert COUNTRY_REGISTRY.get("EU") is eu
+        assert COUNTRY_REGISTRY.get("  european   union ") is eu
+        uk = COUNTRY_REGISTRY.get("United Kingdom")
+        for name in ("UK", "uk", "GB", "GBR", "Great Britain"):
+            assert COUNTRY_REGISTRY.get(name) is uk
+        assert COUNTRY_REGISTRY.canonical_name("Viet Nam") == "Vietnam"
+        assert COUNTRY_REGISTRY.canonical_name("Atlantis") == "Atlantis"
+        assert COUNTRY_REGISTRY.id("Atlantis") == -1
+
+    def test_ids_index_records(self):
+        ids = COUNTRY_REGISTRY.ids(["China", "CAN", "nowhere"])
+        assert ids[-1] == -1
+        assert [COUNTRY_REGISTRY.records[i].iso2 for i in ids[:2]] == ["CN", "CA"]
+        assert all(r.id == i for i, r in enumerate(COUNTRY_REGISTRY.records))
+
+    def test_records_are_immutable(self):
+        record = COUNTRY_REGISTRY.get("China")
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.name = "PRC"
+        assert isinstance(record, CountryRecord)
+
+    def test_metadata(self):
+        malaysia = COUNTRY_REGISTRY.get("Malaysia")
+        assert (malaysia.continent, malaysia.emerging_market) == ("Asia", True)
+        assert COUNTRY_REGISTRY.get("UK").groups == ("G7", "G20")
+        assert len(COUNTRY_REGISTRY.analysis_countries) == 30
+        assert COUNTRY_REGISTRY.analysis_countries[0] == "China"
+
+    def test_mentions_match_whole_words(self):
+        text = "New duties on Nigeria, the EU, Viet Nam and the United Kingdom (UK)"
+        assert COUNTRY_REGISTRY.mentions(text) == [
+            "Nigeria",
+            "European Union",
+            "Vietnam",
+            "United Kingdom",
+        ]
+        # Acronyms match in capitals only
+        assert COUNTRY_REGISTRY.mentions("Goods from the UAE and the PRC") == [
+            "UAE",
+            "China",
+        ]
+        assert COUNTRY_REGISTRY.mentions("Prc uae usa, eu") == []
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the country name resolver
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from atlantic_council_connector import AtlanticCouncilConnector
+from authoritative_tariff_parser import AuthoritativeTariffParser
+from country_resolver import CountryResolver, canonical_country
+from real_tariff_data_source import RealTariffDataSource
+
+WORKBOOK = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "data",
+    "US_Tariffs_Reciprocal_Country_Sector_2025-08-15.xlsx",
+)
+
+
+class TestCountryResolver:
+    """Test cases for exact, fuzzy and cached resolution"""
+
+    def test_exact_and_alias_lookups(self):
+        assert canonical_country("EU") == "European Union"
+        assert canonical_country("GBR") == "United Kingdom"
+
+    def test_typos_resolve_to_unique_country(self):
+        assert canonical_country("Malasyia") == "Malaysia"
+        assert canonical_country("Chnia") == "China"
+        assert canonical_country("south korae") == "South Korea"
+        # Unknown or too-distant names pass through unchanged
+        assert canonical_country("Atlantis") == "Atlantis"
+        assert canonical_country("x" * 200) == "x" * 200
+
+    def test_real_countries_are_never_rewritten(self):
+        for name in (
+            "Austria",
+            "Romania",
+            "North Korea",
+            "Korea, North",
+            "Iraq",
+            "Malta",
+            "Dominican Republic",
+        ):
+            assert canonical_country(name) == name
+        # Near-misses that are as close to a non-registry country stay unknown
+        assert canonical_country("Austrai") == "Austrai"
+        assert canonical_country("Romnia") == "Romnia"
+
+    def test_results_are_cached(self):
+        resolver = CountryResolver(cache_size=8)
+        resolver.resolve("Germny")
+        resolver.resolve("Germny")
+        assert resolver.cache_info()["hits"] == 1
+
+    def test_data_sources_share_canonical_names(self):
+        source = RealTariffDataSource()
+        data = source.get_country_tariff_data("viet nam")
+        assert data["country_name"] == "Vietnam"
+        assert data["country_code"] == "VN"
+
+        programs = source.get_special_duty_programs()
+        assert "European Union" in programs["section_232"]["affected_countries"]
+        assert "UK" not in programs["reciprocal_tariffs"]["affected_countries"]
+
+    def test_workbook_countries_are_canonical(self):
+        parser = AuthoritativeTariffParser(os.path.abspath(WORKBOOK))
+        assert parser.load_excel_file()
+        for country in parser.country_rates:
+            assert canonical_country(country) == country
+        assert canonical_country("DRC") == "Democratic Republic of the Congo"
+
+
+class TestAtlanticGeographyIndex:
+    """Test cases for Atlantic Council country row lookups"""
+
+    def test_rows_by_country_id(self):
+        connector = AtlanticCouncilConnector()
+        connector.data = pd.DataFrame(
+            {
+                "Geography": [
+                    "China",
+                    "China, Hong Kong",
+                    "EU",
+                    "Nigeria",
+                    None,
+                    "Austria",
+                ],
+                "Target": ["All", "Steel", "Autos", "All", "All", "Steel"],
+                "Rate": ["10%", "25%", "15%", "14%", "5%", "20%"],
+            }
+        )
+        assert set(connector.get_country_tariffs("china")) == {
+            "All - Unknown",
+            "Steel - Unknown",
+        }
+        assert list(connector.get_country_tariffs("European Union")) == [
+            "Autos - Unknown"
+        ]
+        # No substring hits: "Niger" is not "Nigeria"
+        assert connector.get_country_tariffs("Niger") == {}
+        # Non-registry countries are reachable by their own name
+        assert list(connector.get_country_tariffs("austria")) == ["Steel - Unknown"]
+        assert connector.get_country_tariffs("Australia") == {}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for dataset diffing and incremental recomputation
+"""
+
+import sys
+import os
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from openpyxl import Workbook
+
+from atlantic_council_fallback import ATLANTIC_COUNCIL_DATA
+from authoritative_tariff_parser import AuthoritativeTariffParser
+from dataset_diff import (
+    DatasetTracker,
+    TariffAggregates,
+    diff_datasets,
+    get_tracker,
+    nested_dataset,
+    records_dataset,
+    snapshot_dataset,
+)
+
+DATA = {
+    "China": {
+        "Steel": {
+            "tariff_rate": 25.0,
+            "status": "Active",
+            "source": "Section 232",
+            "hts_codes": ["7208", "7210"],
+        },
+        "Solar": {"tariff_rate": 14.0, "status": "Active", "source": "Section 201"},
+    },
+    "Japan": {"Autos": {"tariff_rate": 0.0, "status": "Exempt", "source": "Deal"}},
+}
+
+
+def _with_rate(data, country, sector, rate):
+    updated = {
+        country: {sector: dict(info) for sector, info in sectors.items()}
+        for country, sectors in data.items()
+    }
+    updated[country][sector]["tariff_rate"] = rate
+    return updated
+
+
+def _country_rates_workbook(path, rates):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Country_Rates"
+    sheet.append(
+        ["Country", "Reciprocal_AddOn_Pct", "Rule_Type", "Chapter99_Code", "Notes"]
+    )
+    for country, rate in rates.items():
+        sheet.append([country, rate, "FixedAddOn", "9903.01.25", ""])
+    workbook.create_sheet("HTS_Lines").append(["HTS10", "Description", "BaseDuty_Pct"])
+    workbook.save(path)
+    return str(path)
+
+
+class TestDiffDatasets:
+    """Test cases for row-level diffs"""
+
+    def test_rows_are_per_hts_code(self):
+        dataset = nested_dataset(DATA)
+        assert set(dataset["China"]) == {
+            ("Steel", "7208"),
+            ("Steel", "7210"),
+            ("Solar", ""),
+        }
+
+        updated = nested_dataset(_with_rate(DATA, "China", "Steel", 50.0))
+        diff = diff_datasets(dataset, updated)
+        assert diff.dirty_countries == {"China"}
+        assert diff.counts() == {"added": 0, "removed": 0, "changed": 2}
+        change = diff.to_dict()["changes"][0]
+        assert change["hts_code"] == "7208"
+        assert change["old"]["tariff_rate"] == 25.0
+        assert change["new"]["tariff_rate"] == 50.0
+
+    def test_added_and_removed_countries(self):
+        old = nested_dataset(DATA)
+        new = {
+            "China": old["China"],
+            "Vietnam": {("Shrimp", ""): (25.0, "Active", "AD", "")},
+        }
+        diff = diff_datasets(old, new)
+        assert diff.dirty_countries == {"Japan", "Vietnam"}
+        assert diff.counts() == {"added": 1, "removed": 1, "changed": 0}
+        assert diff.to_dict(limit=1)["truncated"]
+
+    def test_record_rows_ignore_missing_cells(self):
+        records = [
+            {
+                "Geography": "China",
+                "Target": "EVs",
+                "Legal authority": "Section 301",
+                "Rate": "100%",
+                "Date in effect": float("nan"),
+            },
+        ]
+        # NaN cells would otherwise make every refetch look changed
+        assert not diff_datasets(records_dataset(records), records_dataset(records))
+
+    def test_world_bank_refetch_is_a_no_op(self):
+        def fetch(timestamp):
+            return {
+                "China": {
+                    "gdp_billions": 17_794.8,
+                    "last_updated": timestamp,
+                    "source": "World Bank Official Data",
+                }
+            }
+
+        first = snapshot_dataset("world_bank", fetch("2025-08-15T12:00:00"))
+        again = snapshot_dataset("world_bank", fetch("2025-08-16T12:00:00"))
+        assert list(first["China"]) == [("gdp_billions", "")]
+        assert not diff_datasets(first, again)
+
+
+class TestIncrementalAggregates:
+    """Derived values after an update match a full recompute"""
+
+    def test_tracker_recomputes_dirty_countries(self):
+        tracker = DatasetTracker("test")
+        aggregates = TariffAggregates()
+        tracker.add_listener(aggregates.apply)
+        tracker.update(nested_dataset(ATLANTIC_COUNCIL_DATA))
+
+        china = aggregates.country("China")
+        sector = next(iter(ATLANTIC_COUNCIL_DATA["China"]))
+        current = ATLANTIC_COUNCIL_DATA["China"][sector]["tariff_rate"]
+        updated = _with_rate(ATLANTIC_COUNCIL_DATA, "China", sector, current + 10)
+        diff = tracker.update(nested_dataset(updated))
+        assert diff.dirty_countries == {"China"} and tracker.version == 2
+        assert aggregates.country("China").average_rate > china.average_rate
+
+        full = TariffAggregates()
+        full.refresh(nested_dataset(updated))
+        assert aggregates.statistics() == full.statistics()
+        assert aggregates.region_averages() == full.region_averages()
+
+        # Same data again is a no-op
+        assert not tracker.update(nested_dataset(updated))
+        assert tracker.version == 2
+
+    def test_affected_sectors_and_removal(self):
+        aggregates = TariffAggregates(region_of=lambda country: country[0])
+        dataset = nested_dataset(DATA)
+        aggregates.refresh(dataset)
+        assert aggregates.country("China").affected_sectors == ("Steel", "Solar")
+        assert aggregates.country("Japan").average_rate == 0.0
+
+        del dataset["China"]
+        aggregates.refresh(dataset, ["China"])
+        assert aggregates.country("China") is None
+        assert aggregates.region_averages() == {"J": 0.0}
+        assert aggregates.statistics()["countries_with_tariffs"] == 0
+
+
+class TestWorkbookReload:
+    """A reloaded workbook yields a Country_Rates diff"""
+
+    def test_reload_updates_region_averages(self, tmp_path):
+        path = _country_rates_workbook(
+            tmp_path / "rates.xlsx", {"Vietnam": 20, "Thailand": 19}
+        )
+        parser = AuthoritativeTariffParser(path)
+        assert parser.load_excel_file()
+        hts_count = len(parser.hts_codes)
+        assert parser.get_tariff_summary()["region_averages"] == {"Asia": 19.5}
+
+        _country_rates_workbook(path, {"Vietnam": 46, "Thailand": 19})
+        diff = parser.reload_excel_file()
+        assert diff.dirty_countries == {"Vietnam"}
+        assert diff.changes[0].new[0] == 46
+        assert parser.get_tariff_summary()["region_averages"] == {"Asia": 32.5}
+        # HTS lines are replaced, not appended, on reload
+        assert len(parser.hts_codes) == hts_count
+
+
+class TestDiffEndpoints:
+    """Diffs are exposed through the API and invalidate the summary"""
+
+    def test_endpoints(self):
+        import main
+
+        get_tracker("endpoint_test").update(nested_dataset(DATA))
+        listing = asyncio.run(main.get_dataset_diffs())["datasets"]
+        assert listing["endpoint_test"]["last_diff"]["counts"]["added"] == 4
+
+        detail = asyncio.run(main.get_dataset_diff("endpoint_test", limit=2))
+        assert len(detail["changes"]) == 2 and detail["truncated"]
+        assert "error" in asyncio.run(main.get_dataset_diff("missing"))
+        assert "China" in main._dirty_summary_countries
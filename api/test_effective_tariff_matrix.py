@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk effective-tariff calculator
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from authoritative_tariff_parser import AuthoritativeTariffParser, CountryTariffRule
+
+
+class TestEffectiveTariffMatrix:
+    """The bulk calculator must agree with calculate_effective_tariff"""
+
+    def setup_method(self):
+        self.parser = AuthoritativeTariffParser("missing.xlsx")
+        self.parser._load_sample_hts_data()
+        self.parser._load_sample_section301_data()
+        self.parser.section301_china[0].exclusion_flag = True
+        for country, addon, rule_type in (
+            ("European Union", 15.0, "EU_TopUp"),
+            ("China", 10.0, "FixedAddOn_China"),
+            ("Hong Kong", 10.0, "FixedAddOn_China"),
+            ("Japan", 15.0, "FixedAddOn"),
+            ("Canada", 35.0, "Exempt"),
+        ):
+            self.parser.country_rates[country] = CountryTariffRule(
+                country, addon, rule_type, "", "", "2025-08-15"
+            )
+        self.parser.data_loaded = True
+
+    def test_matches_scalar_calculation(self):
+        countries = list(self.parser.country_rates) + ["Nowhere"]
+        hts_codes = [code.hts10 for code in self.parser.hts_codes]
+        matrix = self.parser.calculate_effective_tariff_matrix(hts_codes, countries)
+
+        assert matrix.shape == (len(countries), len(hts_codes))
+        for country in countries:
+            for code in self.parser.hts_codes:
+                expected = self.parser.calculate_effective_tariff(
+                    code.base_duty_pct, country, code.hts10
+                )
+                cell = matrix.get(country, code.hts10)
+                for key in cell:
+                    assert cell[key] == expected[key], (country, code.hts10, key)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental Federal Register ingestion
+"""
+
+import sys
+import os
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from federal_register_ingest import FederalRegisterIngestor
+from live_authoritative_connector import LiveAuthoritativeConnector
+from real_data_connector import RealDataConnector
+from policy_store import PolicyStore
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeFederalRegister:
+    """Serves documents oldest-first in pages, honouring the date filter"""
+
+    def __init__(self, documents, per_page=2, failing_pages=()):
+        self.documents = documents
+        self.per_page = per_page
+        self.failing_pages = set(failing_pages)
+        self.requests = []
+
+    def get(self, url, params):
+        self.requests.append(params)
+        page = params["page"]
+        if page in self.failing_pages:
+            return FakeResponse(503, {})
+        matching = sorted(
+            (
+                doc
+                for doc in self.documents
+                if doc["publication_date"]
+                >= params["conditions[publication_date][gte]"]
+            ),
+            key=lambda doc: (doc["publication_date"], doc["document_number"]),
+        )
+        start = (page - 1) * self.per_page
+        return FakeResponse(
+            200,
+            {
+                "count": len(matching),
+                "total_pages": -(-len(matching) // self.per_page),
+                "results": matching[start : start + self.per_page],
+            },
+        )
+
+
+def _doc(number, date, title):
+    return {"document_number": number, "publication_date": date, "title": title}
+
+
+DOCUMENTS = [
+    _doc("2025-001", "2025-01-10", "Section 301 tariffs of 25% on China"),
+    _doc("2025-002", "2025-02-03", "Reciprocal tariff on Vietnam"),
+    _doc("2025-003", "2025-02-03", "Section 232 duties on Canada"),
+    _doc("2025-004", "2025-03-01", "Tariff increase to 50% on China"),
+    _doc("2025-005", "2025-03-01", "Trade agreement with Japan"),
+]
+
+
+def _ingest(ingestor, session):
+    return asyncio.run(ingestor.ingest(session))
+
+
+class TestFederalRegisterIngestor:
+    """Test cases for cursor-based, paged ingestion"""
+
+    def test_incremental_ingestion(self, tmp_path):
+        store = PolicyStore(str(tmp_path / "policies.sqlite3"))
+        ingestor = FederalRegisterIngestor("test", {}, store=store, per_page=2)
+        session = FakeFederalRegister(DOCUMENTS[:3])
+
+        result = _ingest(ingestor, session)
+        assert (result.pages, result.added) == (2, 3)
+        assert store.cursor("test") == ("2025-02-03", "2025-003")
+
+        # Nothing new: one request from the cursor date, nothing added
+        session.requests.clear()
+        result = _ingest(ingestor, session)
+        assert result.added == 0
+        assert len(session.requests) == 1
+        assert session.requests[0]["conditions[publication_date][gte]"] == (
+            "2025-02-03"
+        )
+
+        session.documents = DOCUMENTS
+        result = _ingest(ingestor, session)
+        assert result.added == 2
+        assert store.count("test") == 5
+
+        latest = ingestor.latest_by_country()
+        assert latest["China"].document_number == "2025-004"
+        assert latest["China"].rates == [50.0]
+        assert latest["Canada"].programs == ["Section 232"]
+        assert [d.document_number for d in store.documents_for("test", "China")] == [
+            "2025-004",
+            "2025-001",
+        ]
+
+    def test_failed_page_does_not_advance_cursor_past_gap(self, tmp_path):
+        store = PolicyStore(str(tmp_path / "policies.sqlite3"))
+        ingestor = FederalRegisterIngestor("test", {}, store=store, per_page=2)
+        session = FakeFederalRegister(DOCUMENTS, failing_pages={2})
+
+        result = _ingest(ingestor, session)
+        assert not result.complete
+        assert result.added == 2
+        assert store.cursor("test") == ("2025-02-03", "2025-002")
+
+        session.failing_pages.clear()
+        result = _ingest(ingestor, session)
+        assert result.complete
+        assert store.count("test") == 5
+
+    def test_connector_reads_policies_from_store(self, tmp_path):
+        connector = LiveAuthoritativeConnector()
+        connector.federal_register.store = PolicyStore(
+            str(tmp_path / "policies.sqlite3")
+        )
+        connector.session = FakeFederalRegister(DOCUMENTS)
+
+        policies = asyncio.run(connector.get_federal_register_tariff_policies())
+        policy = policies["Vietnam"]["Federal Policy"]
+        assert policy["document_number"] == "2025-002"
+        assert policy["tariff_programs"] == ["Reciprocal"]
+
+    def test_proclamations_skip_newer_non_trade_titles(self, tmp_path):
+        connector = RealDataConnector()
+        connector.federal_register.store = PolicyStore(
+            str(tmp_path / "policies.sqlite3")
+        )
+        connector.session = FakeFederalRegister(
+            DOCUMENTS + [_doc("2025-006", "2025-04-01", "Honoring China's envoy")]
+        )
+
+        proclamations = asyncio.run(connector.get_federal_register_proclamations())
+        proclamation = proclamations["China"]["Federal Proclamation"]
+        assert proclamation["notes"] == "Tariff increase to 50% on China"
+        assert proclamation["tariff_rate"] == 50.0
+        # Titles without a trade term are never reported
+        assert "Canada" not in proclamations
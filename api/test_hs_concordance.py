@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the HS concordance index
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from hs_concordance import HS_CONCORDANCE, normalize_codes
+
+
+class TestHSConcordance:
+    """Test cases for encoding and chapter / sector / industry lookups"""
+
+    def test_encoding_across_levels(self):
+        codes = ["84", "8471", "8471.30", "8471.30.0100", 101, "", "85AB"]
+        assert normalize_codes(codes)[4] == "0101"
+        assert HS_CONCORDANCE.encode(codes).tolist() == [
+            8400000000,
+            8471000000,
+            8471300000,
+            8471300100,
+            101000000,
+            -1,
+            -1,
+        ]
+        assert HS_CONCORDANCE.chapters(codes).tolist() == [84, 84, 84, 84, 1, -1, -1]
+
+    def test_sector_lookup_is_vectorized(self):
+        codes = np.array(["0101.21", "7208.10.0000", "8517", "9999"] * 1000)
+        sectors = HS_CONCORDANCE.sector_name_array(codes)
+        assert len(sectors) == 4000
+        assert sectors[:4].tolist() == [
+            "Live animals; animal products",
+            "Base metals and articles of base metal",
+            "Machinery and mechanical appliances; electrical equipment",
+            "Temporary legislation",
+        ]
+        assert HS_CONCORDANCE.sector_name("bad") == ""
+
+    def test_industries(self):
+        labels, index = HS_CONCORDANCE.industries(["851712", "8471", "851762"], 4)
+        assert labels == ["8471", "8517"]
+        assert index.tolist() == [1, 0, 1]
+
+    def test_names_and_sector_table(self):
+        assert HS_CONCORDANCE.chapter_name("85") == "Electrical equipment"
+        assert HS_CONCORDANCE.chapter_name("77") == "Chapter 77"
+        table = HS_CONCORDANCE.sector_table()
+        assert table["39-40"].startswith("Plastics")
+        assert table["15"] == "Animal or vegetable fats and oils"
+
+        described = HS_CONCORDANCE.describe(["8471.30", "x"])
+        assert described[0]["chapter"] == "84"
+        assert described[1]["sector"] is None
+
+    def test_one_instance_for_api_and_tipm(self):
+        from api import hs_concordance
+        from tipm import core, propagation
+
+        assert hs_concordance.HS_CONCORDANCE is HS_CONCORDANCE
+        assert core.HS_CONCORDANCE is propagation.HS_CONCORDANCE is HS_CONCORDANCE
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTS prefix index
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from authoritative_tariff_parser import AuthoritativeTariffParser, HTSCode
+from hts_prefix_index import HTSPrefixIndex, normalize_hts
+
+
+def make_code(hts10: str, duty: float) -> HTSCode:
+    return HTSCode(
+        hts10=hts10, description=hts10, base_duty_pct=duty, chapter99_applicable=True
+    )
+
+
+class TestHTSPrefixIndex:
+    """Test cases for prefix lookups, iteration and aggregates"""
+
+    def setup_method(self):
+        self.codes = [
+            make_code("8471.41.0100", 2.0),
+            make_code("8471.30.0100", 0.0),
+            make_code("8517.13.0000", 4.0),
+            make_code("7208.10.0000", 6.0),
+        ]
+        self.index = HTSPrefixIndex(self.codes)
+
+    def test_normalize(self):
+        assert normalize_hts("8471.30.0100") == "8471300100"
+        assert normalize_hts(" 84 71 ") == "8471"
+
+    def test_iteration_is_sorted_and_matches_linear_scan(self):
+        for prefix in ("", "8", "84", "8471", "847130", "9999"):
+            expected = sorted(
+                (c for c in self.codes if normalize_hts(c.hts10).startswith(prefix)),
+                key=lambda c: normalize_hts(c.hts10),
+            )
+            assert list(self.index.iter_prefix(prefix)) == expected
+            assert self.index.count(prefix) == len(expected)
+
+    def test_stats_and_breakdown(self):
+        stats = self.index.stats("84")
+        assert stats["level"] == "chapter"
+        assert stats["count"] == 2
+        assert stats["average_base_duty"] == 1.0
+        assert (stats["min_base_duty"], stats["max_base_duty"]) == (0.0, 2.0)
+        assert self.index.stats("99")["count"] == 0
+
+        chapters = self.index.breakdown("8")
+        assert [(c["prefix"], c["count"]) for c in chapters] == [("84", 2), ("85", 1)]
+        subheadings = self.index.breakdown("8471")
+        assert [s["prefix"] for s in subheadings] == ["847130", "847141"]
+
+    def test_parser_query(self):
+        parser = AuthoritativeTariffParser("missing.xlsx")
+        parser._load_sample_hts_data()
+        parser.data_loaded = True
+
+        result = parser.query_hts_prefix("8471", limit=1)
+        assert result["count"] == 2
+        assert result["sector"] == "Machinery and mechanical appliances"
+        assert len(result["hts_codes"]) == 1
+        assert result["truncated"]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked landed-cost calculation
+"""
+
+import sys
+import os
+import io
+
+import pandas as pd
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from authoritative_tariff_parser import AuthoritativeTariffParser, CountryTariffRule
+from landed_cost import LandedCostCalculator, hts_as_text, resolve_columns
+
+SHIPMENTS_CSV = """HTS10,Country,Customs_Value
+8471.30.0100,China,1000
+5208.11.0000,European Union,200
+0101.21.0010,Nowhere,50
+6104.43.0000,Japan,400
+8517.13.0000,China,
+"""
+
+
+@pytest.fixture
+def calculator():
+    parser = AuthoritativeTariffParser("missing.xlsx")
+    parser._load_sample_hts_data()
+    parser._load_sample_section301_data()
+    for country, addon, rule_type in (
+        ("European Union", 15.0, "EU_TopUp"),
+        ("China", 10.0, "FixedAddOn_China"),
+        ("Japan", 15.0, "FixedAddOn"),
+    ):
+        parser.country_rates[country] = CountryTariffRule(
+            country, addon, rule_type, "", "", "2025-08-15"
+        )
+    parser.data_loaded = True
+    return LandedCostCalculator(parser)
+
+
+class TestLandedCost:
+    """Test cases for per-line duties and chunked streaming"""
+
+    def test_chunks_match_scalar_calculation(self, calculator):
+        results = list(
+            calculator.iter_results(io.StringIO(SHIPMENTS_CSV), chunk_size=2)
+        )
+        assert [len(chunk) for chunk in results] == [2, 2, 1]
+
+        combined = pd.concat(results, ignore_index=True)
+        base_by_code = {c.hts10: c.base_duty_pct for c in calculator.parser.hts_codes}
+        for row in combined.itertuples():
+            expected = calculator.parser.calculate_effective_tariff(
+                base_by_code.get(row.hts10, 0.0), row.origin_country, row.hts10
+            )
+            assert row.total_duty_pct == expected["total_duty"]
+            assert row.duty_amount == row.customs_value * row.total_duty_pct / 100
+
+        # Missing customs values are costed as zero
+        assert combined["customs_value"].iloc[-1] == 0.0
+        # Codes missing from the HTS lines are flagged, not silently duty-free
+        assert combined["hts_found"].tolist() == [True, True, False, True, True]
+
+    def test_country_spellings_share_rules(self, calculator):
+        shipments = pd.DataFrame(
+            {
+                "hts10": ["8471.30.0100"] * 4,
+                "origin_country": ["China", "china", "CN", "EU"],
+                "customs_value": [100.0] * 4,
+            }
+        )
+        result = calculator.cost_chunk(shipments)
+        assert list(result["rule_type"][:3]) == ["FixedAddOn_China"] * 3
+        assert result["total_duty_pct"].nunique() == 2
+        assert result["rule_type"].iloc[3] == "EU_TopUp"
+
+    def test_stream_csv_writes_one_header(self, calculator):
+        output = b"".join(
+            calculator.stream_csv(io.StringIO(SHIPMENTS_CSV), chunk_size=2)
+        ).decode("utf-8")
+        lines = output.strip().splitlines()
+        assert lines[0].startswith("hts10,origin_country,customs_value")
+        assert len(lines) == 6
+
+        summary = calculator.summarize(io.StringIO(SHIPMENTS_CSV), chunk_size=2)
+        assert summary["lines"] == 5
+        assert summary["unknown_hts_lines"] == 1
+        assert summary["duty_amount"] == pytest.approx(350.0 + 30.0 + 0.0 + 124.0)
+
+    def test_missing_columns_are_reported(self):
+        with pytest.raises(ValueError, match="customs_value"):
+            resolve_columns(["HTS10", "Country"])
+
+    def test_numeric_hts_codes_keep_leading_zero(self):
+        codes = hts_as_text(pd.Series([101210010, 8471300100]))
+        assert codes.tolist() == ["0101210010", "8471300100"]
+        assert hts_as_text(pd.Series(["0101.21.0010"])).tolist() == ["0101.21.0010"]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted tariff and economic record types
+"""
+
+import sys
+import os
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from atlantic_council_connector import AtlanticCouncilConnector
+from authoritative_tariff_parser import CountryTariffRule, HTSCode, Section301China
+from comprehensive_tariff_data import TariffInfo
+from real_time_analytics import EconomicIndicator
+from records import benchmark
+
+
+class TestSlottedRecords:
+    """Test cases for record layout and interning"""
+
+    def test_no_instance_dict_and_frozen(self):
+        code = HTSCode("8471.30.0100", "Laptops", 0.0, True)
+        assert not hasattr(code, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            code.base_duty_pct = 5.0
+
+        rule = CountryTariffRule("Japan", 15.0, "FixedAddOn", "", "", "2025-08-15")
+        assert replace(rule, reciprocal_addon_pct=10.0).reciprocal_addon_pct == 10.0
+        assert pickle.loads(pickle.dumps(rule)) == rule
+
+        # Section 301 rows stay mutable (exclusions are toggled in place)
+        china_rule = Section301China("8471.30.0100", "List 1", 25.0, False, "")
+        china_rule.exclusion_flag = True
+        assert not hasattr(china_rule, "__dict__")
+
+    def test_categorical_fields_are_interned(self):
+        source = "".join(["Section 301 ", "Lists 1-4"])
+        first = TariffInfo("China", "Tech", 25.0, [], "2018", source, "", "Active")
+        second = TariffInfo(
+            "China", "Steel", 25.0, [], "2018", source.encode().decode(), "", "Active"
+        )
+        assert first.source is second.source
+
+        indicator = EconomicIndicator(
+            "gdp", 1.0, "".join(["USD ", "billions"]), "2024", "World Bank", "", "High"
+        )
+        assert indicator.unit is sys.intern("USD billions")
+
+    def test_row_dict_strings_are_interned(self):
+        # Built at runtime, so the two source strings are distinct objects
+        sources = ["".join(["White ", "House"]), "".join(["White ", "Ho", "use"])]
+        connector = AtlanticCouncilConnector()
+        connector.data = pd.DataFrame(
+            {
+                "Geography": ["China", "China"],
+                "Target": ["Steel", "Autos"],
+                "Rate": ["25%", "25%"],
+                "Legal authority": ["Section 232", "Section 232"],
+                "Sources": sources,
+            }
+        )
+        steel, autos = connector.get_country_tariffs("China").values()
+        assert steel["verification"] is autos["verification"]
+        assert steel["sources"] is sys.intern("White House")
+
+    def test_footprint_benchmark(self):
+        results = benchmark(5_000)
+        assert results["CountryTariffRule"]["ratio"] < 0.5
+        assert results["HTSCode"]["ratio"] < 1.0
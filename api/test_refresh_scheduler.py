@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the background refresh scheduler
+Runs without network access - fetchers are plain coroutines
+"""
+
+import asyncio
+import sys
+import os
+from datetime import timedelta
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import refresh_scheduler
+from correct_tariff_calculator import CorrectTariffCalculator
+from refresh_scheduler import BackgroundRefreshScheduler, DataSnapshot
+
+
+class TestBackgroundRefreshScheduler:
+    """Test cases for snapshot publication and refresh loops"""
+
+    def setup_method(self):
+        self.scheduler = BackgroundRefreshScheduler()
+
+    def test_publish_creates_immutable_versioned_snapshots(self):
+        first = self.scheduler.publish("world_bank", {"China": {"gdp_billions": 1.0}})
+        second = self.scheduler.publish("world_bank", {"China": {"gdp_billions": 2.0}})
+
+        assert isinstance(second, DataSnapshot)
+        assert (first.version, second.version) == (1, 2)
+        assert self.scheduler.get_data("world_bank")["China"]["gdp_billions"] == 2.0
+
+        with pytest.raises(TypeError):
+            second.data["China"]["gdp_billions"] = 3.0
+
+    def test_failed_refresh_keeps_last_good_snapshot(self):
+        async def good():
+            return {"value": 1}
+
+        async def empty():
+            return {}
+
+        async def broken():
+            raise RuntimeError("upstream down")
+
+        async def run():
+            self.scheduler.register("source", good, timedelta(hours=1))
+            assert await self.scheduler.refresh_now("source")
+
+            for fetcher in (empty, broken):
+                self.scheduler.register("source", fetcher, timedelta(hours=1))
+                assert not await self.scheduler.refresh_now("source")
+
+        asyncio.run(run())
+
+        assert self.scheduler.get_data("source") == {"value": 1}
+        assert self.scheduler.status()["source"]["last_error"] == "upstream down"
+
+    def test_start_and_stop_background_tasks(self):
+        calls = []
+
+        async def fetcher():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        async def run():
+            self.scheduler.register("source", fetcher, timedelta(hours=1))
+            self.scheduler.start()
+            await asyncio.sleep(0.05)
+            assert self.scheduler.is_running
+            await self.scheduler.stop()
+            assert not self.scheduler.is_running
+
+        asyncio.run(run())
+
+        # Interval is an hour, so exactly one refresh ran
+        assert calls == [1]
+        assert self.scheduler.get_snapshot("source").version == 1
+
+
+class TestLiveSnapshotConsumers:
+    """Published snapshots reach the request-path readers"""
+
+    def test_live_tariffs_drive_calculator(self, monkeypatch):
+        monkeypatch.setattr(refresh_scheduler.refresh_scheduler, "_snapshots", {})
+        refresh_scheduler.refresh_scheduler.publish(
+            "live_tariffs",
+            {
+                "tariff_data": {
+                    "China": {"All": {"tariff_rate": 12.5, "source": "WITS"}}
+                }
+            },
+            persist=False,
+        )
+
+        rate, source, _ = CorrectTariffCalculator().get_country_tariff_rate("China")
+        assert rate == 12.5
+        assert source == "Live API: WITS"
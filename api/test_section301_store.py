@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact Section 301 store
+"""
+
+import sys
+import os
+from datetime import date
+
+from openpyxl import Workbook
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from authoritative_tariff_parser import AuthoritativeTariffParser, CountryTariffRule
+from section301_store import Section301Store, build_store, main
+
+LIST_1 = """HTS Subheading,Description
+8471.30.01,Portable computers
+8517.13.00,Smartphones
+"""
+
+LIST_4A_TEXT = """Annex A
+Heading 3901.10.10 Polyethylene ........ 7208.10.00 Steel ingots
+"""
+
+EXCLUSIONS = """HTS10,Description,Start Date,End Date
+8517.13.0000,Smartphones for testing,2024-06-01,2025-05-31
+"""
+
+
+def _workbook(path, section301_rows):
+    workbook = Workbook()
+    workbook.active.title = "Country_Rates"
+    workbook.active.append(
+        ["Country", "Reciprocal_AddOn_Pct", "Rule_Type", "Chapter99_Code", "Notes"]
+    )
+    workbook.active.append(["China", 10, "FixedAddOn_China", "9903.01.25", ""])
+    workbook.create_sheet("HTS_Lines").append(["HTS10", "Description", "BaseDuty_Pct"])
+    sheet = workbook.create_sheet("Section301_China")
+    sheet.append(
+        ["HTS10", "List_No", "Adder_301_Pct", "Exclusion_Flag", "Exclusion_Ends_On"]
+    )
+    for row in section301_rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+class TestSection301Store:
+    """Test cases for list ingestion and per-HTS lookups"""
+
+    def setup_method(self):
+        self.store = Section301Store.from_entries(
+            [
+                ("8471.30.01", "List 1", 25.0),
+                ("8471.30.0150", "List 4A", 7.5),
+                ("3901.10", "List 2", 25.0),
+                ("3901.10", "List 4A", 7.5),
+            ],
+            [("8471.30.0100", "2024-01-01", "2024-12-31")],
+        )
+
+    def test_most_specific_code_wins(self):
+        assert len(self.store) == 3
+        assert self.store.lookup("8471.30.0150").list_no == "List 4A"
+        assert self.store.lookup("8471.30.0100").list_no == "List 1"
+        # Highest adder kept for a code on two lists
+        assert self.store.lookup("3901.10.1000").adder_pct == 25.0
+        assert self.store.lookup("0101.21.0010") is None
+
+    def test_exclusion_windows(self):
+        inside = self.store.lookup("8471300100", on=date(2024, 6, 1))
+        assert inside.excluded and inside.exclusion_ends_on == "2024-12-31"
+        assert inside.duty_pct == 0.0
+        assert not self.store.lookup("8471300100", on=date(2025, 1, 1)).excluded
+
+        duties = self.store.duties(
+            ["8471.30.0100", "8471.30.0150", "9999.99"], on=date(2024, 6, 1)
+        )
+        assert duties.tolist() == [0.0, 7.5, 0.0]
+
+    def test_build_save_and_load(self, tmp_path):
+        store = build_store(
+            [
+                ("1", _write(tmp_path, "list1.csv", LIST_1)),
+                ("4a", _write(tmp_path, "list4a.txt", LIST_4A_TEXT)),
+            ],
+            [_write(tmp_path, "exclusions.csv", EXCLUSIONS)],
+        )
+        assert store.list_counts() == {"List 1": 2, "List 4A": 2}
+
+        path = str(tmp_path / "section301.npz")
+        store.save(path)
+        loaded = Section301Store.load(path)
+        assert loaded.lookup("3901.10.1010").adder_pct == 7.5
+        assert loaded.lookup("8517.13.0000", on=date(2025, 1, 1)).excluded
+        assert loaded.keys.tolist() == store.keys.tolist()
+
+    def test_text_exclusions_keep_full_hts10(self, tmp_path):
+        exclusions = _write(
+            tmp_path,
+            "exclusions.txt",
+            "Heading 9903.88.69 applies to 8414.59.6590 (fans for computers)\n",
+        )
+        store = build_store(
+            [("3", _write(tmp_path, "list3.txt", "8414.59.65 Fans\n"))],
+            [exclusions],
+        )
+        assert store.lookup("8414.59.6590").excluded
+        # The rest of the subheading stays covered
+        assert not store.lookup("8414.59.6540").excluded
+        assert store.lookup("9903.88.69") is None
+
+    def test_cli(self, tmp_path, capsys):
+        output = str(tmp_path / "section301.npz")
+        list_path = _write(tmp_path, "l1.csv", LIST_1)
+        main(["build", "--list", "List 1", list_path, "--output", output])
+        main(["lookup", "8471.30.0100", "--store", output])
+        assert "List 1" in capsys.readouterr().out
+
+
+class TestParserSection301Store:
+    """The parser serves per-HTS duties from the store"""
+
+    def test_parser_uses_store(self, tmp_path):
+        path = str(tmp_path / "section301.npz")
+        Section301Store.from_entries([("8471.30.01", "List 1", 25.0)]).save(path)
+
+        parser = AuthoritativeTariffParser("missing.xlsx", section301_store_path=path)
+        parser._load_section301_store()
+        parser.country_rates["China"] = CountryTariffRule(
+            "China", 10.0, "FixedAddOn_China", "", "", "2025-08-15"
+        )
+        assert parser.section301_china == []
+        result = parser.calculate_effective_tariff(0.0, "China", "8471.30.0100")
+        assert result["section_301_duty"] == 25.0
+        matrix = parser.calculate_effective_tariff_matrix(
+            ["8471.30.0100", "8517.13.0000"], ["China"]
+        )
+        assert matrix.section_301_duty.tolist() == [[25.0, 0.0]]
+
+    def test_missing_store_falls_back_to_sample(self, tmp_path):
+        parser = AuthoritativeTariffParser(
+            "missing.xlsx", section301_store_path=str(tmp_path / "none.npz")
+        )
+        parser._load_section301_store()
+        assert parser.section301_store is None
+        assert parser.section301_count == len(parser.section301_china) > 0
+
+    def test_reload_prefers_populated_sheet_over_store(self, tmp_path):
+        store_path = str(tmp_path / "section301.npz")
+        Section301Store.from_entries([("8471.30.01", "List 1", 25.0)]).save(store_path)
+        workbook = _workbook(tmp_path / "rates.xlsx", [])
+
+        parser = AuthoritativeTariffParser(workbook, section301_store_path=store_path)
+        assert parser.load_excel_file()
+        assert parser.section301_store is not None
+
+        _workbook(workbook, [["8471.30.0100", "List 3", 7.5, False, None]])
+        parser.reload_excel_file()
+        assert parser.section301_store is None
+        result = parser.calculate_effective_tariff(0.0, "China", "8471.30.0100")
+        assert result["section_301_duty"] == 7.5
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent snapshot store
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from snapshot_store import SnapshotStore
+from refresh_scheduler import BackgroundRefreshScheduler
+
+
+class TestSnapshotStore:
+    """Test cases for persistence, versioning and retention"""
+
+    def setup_method(self):
+        self.now = datetime(2025, 8, 15, 12, 0, 0)
+
+    def test_put_and_latest_roundtrip(self, tmp_path):
+        store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+        payload = {"China": {"gdp_billions": 17734.0}, "rates": [10.0, 25.0]}
+
+        assert store.put("world_bank", "latest", payload, self.now)
+        stored = store.latest("world_bank")
+
+        assert stored.payload == payload
+        assert stored.fetched_at == self.now
+
+    def test_identical_payloads_are_not_duplicated(self, tmp_path):
+        store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+
+        assert store.put("source", "latest", {"a": 1}, self.now)
+        assert not store.put("source", "latest", {"a": 1}, self.now + timedelta(hours=1))
+        assert store.put("source", "latest", {"a": 2}, self.now + timedelta(hours=2))
+
+        assert len(store.history("source")) == 2
+
+    def test_refetch_with_new_timestamps_bumps_fetched_at(self, tmp_path):
+        store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+        later = self.now + timedelta(hours=6)
+
+        def payload(when):
+            return {
+                "China": {
+                    "Federal Policy": {
+                        "document_title": "Adjusting Imports of Steel",
+                        "last_updated": when.isoformat(),
+                    }
+                }
+            }
+
+        assert store.put("federal_register", "latest", payload(self.now), self.now)
+        assert not store.put("federal_register", "latest", payload(later), later)
+
+        assert len(store.history("federal_register")) == 1
+        assert store.latest("federal_register").fetched_at == later
+
+    def test_as_of_replays_historical_payload(self, tmp_path):
+        store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+        for day in range(3):
+            store.put("source", "key", {"day": day}, self.now + timedelta(days=day))
+
+        replayed = store.as_of("source", "key", self.now + timedelta(days=1, hours=6))
+        assert replayed.payload == {"day": 1}
+        assert store.as_of("source", "key", self.now - timedelta(days=1)) is None
+
+    def test_compact_applies_retention_but_keeps_latest(self, tmp_path):
+        store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+        old = datetime.now() - timedelta(days=100)
+        for i in range(5):
+            store.put("source", "latest", {"i": i}, old + timedelta(hours=i))
+
+        removed = store.compact(retention_days=30, keep_latest=2)
+
+        assert removed == 3
+        assert [entry["fetched_at"] for entry in store.history("source")] == [
+            (old + timedelta(hours=4)).isoformat(),
+            (old + timedelta(hours=3)).isoformat(),
+        ]
+
+    def test_scheduler_persists_and_warm_starts(self, tmp_path):
+        db_path = str(tmp_path / "snapshots.sqlite3")
+
+        async def fetcher():
+            return {"China": {"gdp_billions": 1.0}}
+
+        first = BackgroundRefreshScheduler(store=SnapshotStore(db_path))
+        first.register("world_bank", fetcher, timedelta(days=1))
+        first.publish("world_bank", {"China": {"gdp_billions": 1.0}}, self.now)
+
+        restarted = BackgroundRefreshScheduler(store=SnapshotStore(db_path))
+        restarted.register("world_bank", fetcher, timedelta(days=1))
+
+        assert restarted.warm_start() == 1
+        snapshot = restarted.get_snapshot("world_bank")
+        assert snapshot.data["China"]["gdp_billions"] == 1.0
+        assert snapshot.fetched_at == self.now
+
+        # Restoring must not write a duplicate entry
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 1
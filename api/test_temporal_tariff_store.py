@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the effective-date interval index
+"""
+
+import sys
+import os
+import asyncio
+from datetime import date
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import atlantic_council_fallback
+import comprehensive_tariff_data
+from authoritative_tariff_parser import CountryTariffRule
+from temporal_tariff_store import (
+    TemporalTariffStore,
+    as_of_day,
+    parse_effective_date,
+)
+
+
+class TestEffectiveDates:
+    """Test cases for free-form effective date parsing"""
+
+    def test_formats(self):
+        day = parse_effective_date
+        assert day("8/6/2025") == day("2025-08-06") == day(date(2025, 8, 6))
+        assert day("August 2025") == day("2025-08-01")
+        assert day("2018-2020") == day("2018") == day("2018-01-01")
+        assert day("TBD") is None
+        assert day("") is None
+        assert day(None) is None
+        assert day("13/45/2025") is None
+
+    def test_as_of_argument(self):
+        assert as_of_day("2025-04-10") == parse_effective_date("4/10/2025")
+        assert as_of_day(None) == as_of_day(date.today())
+        with pytest.raises(ValueError):
+            as_of_day("April 2025")
+
+
+class TestTemporalTariffStore:
+    """Test cases for as-of lookups"""
+
+    def setup_method(self):
+        self.store = TemporalTariffStore.from_rows(
+            [
+                ("China", "Steel", 10.0, "Active", "Section 232", "2018"),
+                ("China", "Steel", 25.0, "Active", "Section 232", "2/10/2025"),
+                ("China", "Steel", 50.0, "Active", "Section 232", "June 2025"),
+                ("China", "Tech", 25.0, "Active", "Section 301", "2018-2020"),
+                ("China", "Chips", 100.0, "Under Investigation", "Section 232", "TBD"),
+                ("Japan", "Autos", 0.0, "Exempt", "Trade Deal", "8/7/2025"),
+            ]
+        )
+
+    def test_version_intervals(self):
+        assert self.store.version("China", "Steel", "2017-12-31") is None
+        assert self.store.version("China", "Steel", "2025-02-09").tariff_rate == 10.0
+        assert self.store.version("China", "Steel", "2025-02-10").tariff_rate == 25.0
+        latest = self.store.version("China", "Steel", "2025-08-01")
+        assert latest.tariff_rate == 50.0
+        assert latest.effective_date == "June 2025"
+        assert latest.starts_on == "2025-06-01"
+        # Pending entries are never in effect
+        assert self.store.version("China", "Chips", "2030-01-01") is None
+        assert [v.tariff_rate for v in self.store.history("China", "Steel")] == [
+            10.0,
+            25.0,
+            50.0,
+        ]
+
+    def test_country_aggregates(self):
+        assert self.store.average_rate("China", "2019-01-01") == 17.5
+        assert self.store.average_rate("China", "2025-04-10") == 25.0
+        assert self.store.average_rate("China", "2010-01-01") == 0.0
+        profile = self.store.profile("Japan", "2025-08-07")
+        assert profile.exempt_count == 1 and profile.status == "Exempted"
+        assert self.store.profile("Japan", "2025-08-06").status == "No Tariffs"
+        assert self.store.change_dates("China") == [
+            "2018-01-01",
+            "2025-02-10",
+            "2025-06-01",
+        ]
+
+    def test_from_rules(self):
+        store = TemporalTariffStore.from_rules(
+            [
+                CountryTariffRule("Vietnam", 46.0, "FixedAddOn", "", "", "2025-04-09"),
+                CountryTariffRule("Vietnam", 20.0, "FixedAddOn", "", "", "2025-08-07"),
+            ]
+        )
+        assert store.version("Vietnam", "Reciprocal", "2025-05-01").tariff_rate == 46.0
+        assert store.version("Vietnam", "Reciprocal", "2025-09-01").tariff_rate == 20.0
+
+
+class TestAsOfQueries:
+    """The data modules and the summary endpoint accept as_of"""
+
+    def test_data_modules(self):
+        assert comprehensive_tariff_data.get_country_average_tariff(
+            "China", "2017-06-01"
+        ) == 0.0
+        assert comprehensive_tariff_data.get_country_average_tariff(
+            "China", date.today()
+        ) == comprehensive_tariff_data.get_country_average_tariff("China")
+        summary = comprehensive_tariff_data.get_country_summary("China", "2017-06-01")
+        assert summary["status"] == "No Tariffs" and summary["as_of"] == "2017-06-01"
+
+        current = atlantic_council_fallback.get_tariff_summary()
+        past = atlantic_council_fallback.get_tariff_summary("2019-06-01")
+        assert past["total_tariff_entries"] < current["total_tariff_entries"]
+
+    def test_summary_endpoint(self):
+        from main import get_tariff_summary_all_countries
+
+        result = asyncio.run(get_tariff_summary_all_countries(as_of="04/10/2025"))
+        assert "error" in result and result["countries"] == []
+
+    def test_country_endpoint(self):
+        from main import get_country_info
+
+        past = asyncio.run(get_country_info("China", as_of="2017-06-01"))
+        assert past.tariff_rate == 0.0 and past.affected_sectors == []
+        assert "2017-06-01" in past.data_confidence
+        invalid = asyncio.run(get_country_info("China", as_of="04/10/2025"))
+        assert invalid.data_confidence == "Error"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the Aho-Corasick text matcher
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from country_registry import COUNTRY_REGISTRY
+from live_authoritative_connector import LiveAuthoritativeConnector
+from text_matcher import AhoCorasick, DocumentScanner, extract_rates
+
+
+class TestAhoCorasick:
+    """Test cases for multi-pattern matching"""
+
+    def test_whole_word_leftmost_longest(self):
+        matcher = AhoCorasick(
+            [("sudan", "SD"), ("south sudan", "SS"), ("niger", "NE"), ("he", "x")]
+        )
+        text = "South Sudan and Sudan; Nigeria is not Niger. The end"
+        assert [value for _, _, value in matcher.finditer(text)] == [
+            "SS",
+            "SD",
+            "NE",
+        ]
+
+    def test_overlapping_suffix_patterns(self):
+        matcher = AhoCorasick([("she", 1), ("he", 2), ("hers", 3), ("his", 4)])
+        assert matcher.values("ushers his he she") == [4, 2, 1]
+        assert len(matcher) == 4
+
+    def test_uppercase_patterns_are_case_sensitive(self):
+        matcher = AhoCorasick([("UAE", "AE"), ("niger", "NE")])
+        assert matcher.values("uae NIGER, UAE") == ["NE", "AE"]
+
+
+class TestDocumentScanner:
+    """Test cases for Federal Register document parsing"""
+
+    def test_scan_countries_programs_and_rates(self):
+        scanner = DocumentScanner(COUNTRY_REGISTRY)
+        matches = scanner.scan(
+            "Section 301 action: 25% on China and the United Kingdom; "
+            "antidumping duties of 7.5 percent on Viet Nam (ignore 250%)"
+        )
+        assert matches.countries == ["China", "United Kingdom", "Vietnam"]
+        assert scanner.scan("Steel from the UAE").countries == ["UAE"]
+        assert matches.programs == ["Section 301", "Antidumping"]
+        assert matches.rates == [25.0, 7.5]
+        assert extract_rates("no rates here") == []
+
+    def test_federal_register_parsing(self):
+        connector = LiveAuthoritativeConnector()
+        policies = connector._parse_federal_register_data(
+            {
+                "results": [
+                    {
+                        "title": "Reciprocal tariffs on Malaysia",
+                        "abstract": None,
+                        "publication_date": "2025-08-01",
+                    }
+                ]
+            }
+        )
+        policy = policies["Malaysia"]["Federal Policy"]
+        assert policy["tariff_programs"] == ["Reciprocal"]
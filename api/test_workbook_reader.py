@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming workbook reader
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from real_data_connector import RealDataConnector
+from workbook_reader import (
+    count_rows,
+    iter_sheet_chunks,
+    iter_sheet_rows,
+    iter_workbook_chunks,
+    sheet_names,
+)
+
+
+def _workbook(path, sheets):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        worksheet = workbook.create_sheet(name)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+class TestWorkbookReader:
+    """Test cases for chunked read-only iteration"""
+
+    def test_chunks_follow_chunk_size(self, tmp_path):
+        rows = [["HTS10", "Rate"]] + [[8471300100 + i, i % 7] for i in range(2500)]
+        path = _workbook(tmp_path / "big.xlsx", {"HTS_Lines": rows})
+
+        chunks = list(iter_sheet_chunks(path, "HTS_Lines", chunk_size=1000))
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+        assert list(chunks[0].columns) == ["HTS10", "Rate"]
+        # Codes keep their cell values, no float conversion
+        assert chunks[2]["HTS10"].iloc[-1] == 8471300100 + 2499
+        assert count_rows(path, "HTS_Lines") == 2500
+
+    def test_header_blank_and_ragged_rows(self, tmp_path):
+        path = _workbook(
+            tmp_path / "ragged.xlsx",
+            {
+                "Orders": [
+                    [None, None],
+                    ["Country", "Product", None],
+                    ["China", "Steel nails"],
+                    [None, None, None],
+                    ["Vietnam", "Shrimp", "extra", "cells"],
+                ]
+            },
+        )
+        rows = list(iter_sheet_rows(path, "Orders"))
+        assert [row["Country"] for row in rows] == ["China", "Vietnam"]
+        assert pd.isna(rows[0]["Unnamed: 2"])
+        assert rows[1]["Unnamed: 2"] == "extra"
+
+    def test_workbook_and_missing_sheet(self, tmp_path):
+        path = _workbook(
+            tmp_path / "multi.xlsx",
+            {"First": [["A"], [1], [2]], "Empty": [], "Second": [["B"], [3]]},
+        )
+        assert sheet_names(path) == ["First", "Empty", "Second"]
+        assert [(name, len(chunk)) for name, chunk in iter_workbook_chunks(path)] == [
+            ("First", 2),
+            ("Second", 1),
+        ]
+        with pytest.raises(KeyError):
+            list(iter_sheet_chunks(path, "Missing"))
+
+    def test_csv_chunks(self, tmp_path):
+        path = tmp_path / "orders.csv"
+        path.write_text("Country,Product\n" + "China,Steel\n" * 25)
+        assert [len(c) for c in iter_sheet_chunks(path, chunk_size=10)] == [10, 10, 5]
+
+
+class TestUSITCOrdersWorkbook:
+    """The USITC connector streams a local orders workbook"""
+
+    def test_orders_workbook(self, tmp_path):
+        path = _workbook(
+            tmp_path / "orders.xlsx",
+            {
+                "Orders": [
+                    ["Case Type", "Case No.", "Country", "Product", "Margin"],
+                    ["AD", "A-570-900", "China", "Diamond sawblades", 82.05],
+                    ["CVD", "C-570-901", "China", "Steel nails", None],
+                    ["AD", "A-552-802", "Vietnam", "Frozen shrimp", 25.76],
+                ]
+            },
+        )
+        tariffs = RealDataConnector()._parse_usitc_orders_workbook(path)
+        assert set(tariffs["China"]) == {"Diamond sawblades", "Steel nails"}
+        sawblades = tariffs["China"]["Diamond sawblades"]
+        assert sawblades["tariff_rate"] == 82.05
+        assert sawblades["source"] == "USITC AD"
+        assert sawblades["notes"] == "AD case: A-570-900"
+        assert tariffs["China"]["Steel nails"]["tariff_rate"] == 0
+        assert RealDataConnector()._parse_usitc_orders_workbook("missing.xlsx") == {}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the process worker pool
+"""
+
+import sys
+import os
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import worker_pool
+from authoritative_tariff_parser import CountryTariffRule, authoritative_parser
+from dataset_diff import DatasetDiff
+from worker_pool import WorkerPool, compute_tariff_matrix, sweep_reciprocal_rates
+
+HTS_CODES = ["8471.30.0100", "5208.11.0000"]
+
+
+class TestWorkerPool:
+    """Test cases for process and thread-fallback execution"""
+
+    def test_process_pool_matches_in_process_result(self):
+        pool = WorkerPool(max_workers=1)
+        assert pool.start()
+        try:
+            result = asyncio.run(
+                pool.run(compute_tariff_matrix, HTS_CODES, ["China", "Nowhere"])
+            )
+        finally:
+            pool.stop()
+
+        assert not pool.is_running
+        assert result == compute_tariff_matrix(HTS_CODES, ["China", "Nowhere"])
+        assert result["rule_types"][1] == "Unknown"
+
+    def test_workers_do_not_fork_the_api_process(self):
+        pool = WorkerPool(max_workers=1)
+        assert pool.start()
+        try:
+            assert pool._executor._mp_context.get_start_method() != "fork"
+        finally:
+            pool.stop()
+
+    def test_workbook_diff_restarts_pool(self, monkeypatch):
+        pool = WorkerPool(max_workers=1)
+        monkeypatch.setattr(worker_pool, "worker_pool", pool)
+        assert pool.start()
+        try:
+            executor = pool._executor
+            other = DatasetDiff("world_bank", 2, (), frozenset())
+            worker_pool._restart_on_workbook_diff(other, {})
+            assert pool._executor is executor
+
+            name = authoritative_parser.tracker.name
+            workbook = DatasetDiff(name, 2, (), frozenset())
+            worker_pool._restart_on_workbook_diff(workbook, {})
+            assert pool._executor is not executor
+
+            result = asyncio.run(pool.run(compute_tariff_matrix, HTS_CODES, ["China"]))
+            assert result == compute_tariff_matrix(HTS_CODES, ["China"])
+        finally:
+            pool.stop()
+
+    def test_disabled_pool_falls_back_to_thread(self, monkeypatch):
+        monkeypatch.setitem(
+            authoritative_parser.country_rates,
+            "Japan",
+            CountryTariffRule("Japan", 15.0, "FixedAddOn", "", "", "2025-08-15"),
+        )
+        pool = WorkerPool(max_workers=0)
+        assert not pool.start()
+
+        sweep = asyncio.run(
+            pool.run(sweep_reciprocal_rates, "Japan", [0.0, 20.0], HTS_CODES)
+        )
+        assert [point["reciprocal_addon_pct"] for point in sweep] == [0.0, 20.0]
+        assert sweep[1]["average_total_duty"] - sweep[0]["average_total_duty"] == 20.0
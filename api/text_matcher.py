@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Text Matcher
+============
+
+Single-pass extraction of countries, tariff keywords and rates from
+Federal Register titles and abstracts:
+- AhoCorasick is a case-insensitive automaton over any number of
+  patterns, built once; scanning a document is one pass over its
+  characters regardless of how many patterns there are
+- Acronyms written in capitals ("UAE", "PRC") only match in capitals, so
+  they do not fire on ordinary words
+- Matches must sit on word boundaries ("Niger" does not hit "Nigeria")
+  and overlapping hits resolve leftmost-longest ("South Sudan" over
+  "Sudan")
+- Rate patterns are compiled once at import
+
+DocumentScanner combines every country name/alias of a registry with the
+tariff program keywords into one automaton.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# "25%", "7.5 %", "25 percent"
+RATE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:%|percent\b)", re.IGNORECASE)
+
+# Keyword (as written in documents) -> tariff program label
+TARIFF_KEYWORDS: Dict[str, str] = {
+    "section 301": "Section 301",
+    "section 232": "Section 232",
+    "section 201": "Section 201",
+    "section 122": "Section 122",
+    "ieepa": "IEEPA",
+    "international emergency economic powers act": "IEEPA",
+    "reciprocal tariff": "Reciprocal",
+    "reciprocal tariffs": "Reciprocal",
+    "antidumping": "Antidumping",
+    "anti-dumping": "Antidumping",
+    "countervailing": "Countervailing",
+    "safeguard": "Safeguard",
+    "exclusion": "Exclusion",
+    "exclusions": "Exclusion",
+    "de minimis": "De Minimis",
+    "tariff-rate quota": "Tariff-Rate Quota",
+    "harmonized tariff schedule": "HTS Modification",
+}
+
+
+class AhoCorasick:
+    """Case-insensitive, whole-word multi-pattern matcher
+
+    All-uppercase patterns are matched case-sensitively.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        # Trie transitions, failure links and the (length, value, exact
+        # spelling or None) of the pattern ending at each node; -1 / None
+        # where there is none
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Optional[Tuple[int, Any, Optional[str]]]] = [None]
+        for pattern, value in patterns:
+            key = pattern.lower()
+            if not key:
+                continue
+            node = 0
+            for char in key:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._output.append(None)
+                node = next_node
+            exact = pattern if pattern.isupper() else None
+            self._output[node] = (len(key), value, exact)
+
+        # Breadth-first failure links; output_link skips to the nearest
+        # suffix state that ends a pattern
+        self._fail = [0] * len(self._goto)
+        self._output_link = [-1] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                state = self._fail[node]
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                fail = self._goto[state].get(char, 0)
+                self._fail[child] = fail if fail != child else 0
+                target = self._fail[child]
+                self._output_link[child] = (
+                    target if self._output[target] else self._output_link[target]
+                )
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return sum(1 for output in self._output if output)
+
+    def finditer(self, text: str) -> List[Tuple[int, int, Any]]:
+        """(start, end, value) of whole-word matches, leftmost-longest first"""
+        original, text = text, text.lower()
+        goto, fail, output, output_link = (
+            self._goto,
+            self._fail,
+            self._output,
+            self._output_link,
+        )
+        found = []
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            state = node if output[node] else output_link[node]
+            while state > 0:
+                length, value, exact = output[state]
+                start = end - length
+                if (
+                    (start == 0 or not text[start - 1].isalnum())
+                    and (end == len(text) or not text[end].isalnum())
+                    and (exact is None or original[start:end] == exact)
+                ):
+                    found.append((start, end, value))
+                state = output_link[state]
+
+        found.sort(key=lambda match: (match[0], match[0] - match[1]))
+        matches = []
+        last_end = 0
+        for match in found:
+            if match[0] >= last_end:
+                matches.append(match)
+                last_end = match[1]
+        return matches
+
+    def values(self, text: str) -> List[Any]:
+        """Distinct matched values in order of first appearance"""
+        return list(dict.fromkeys(value for _, _, value in self.finditer(text)))
+
+
+def extract_rates(text: str, max_rate: float = 100.0) -> List[float]:
+    """Percentages mentioned in text, ignoring values above max_rate"""
+    rates = [float(match) for match in RATE_PATTERN.findall(text)]
+    return [rate for rate in rates if rate <= max_rate]
+
+
+@dataclass
+class DocumentMatches:
+    countries: List[str] = field(default_factory=list)
+    programs: List[str] = field(default_factory=list)
+    rates: List[float] = field(default_factory=list)
+
+
+class DocumentScanner:
+    """One automaton over a country registry's terms and TARIFF_KEYWORDS"""
+
+    def __init__(self, registry, keywords: Dict[str, str] = TARIFF_KEYWORDS):
+        patterns = [
+            (term, ("country", registry.records[country_id].name))
+            for term, country_id in registry.mention_terms()
+        ]
+        patterns += [
+            (keyword, ("program", label)) for keyword, label in keywords.items()
+        ]
+        self.matcher = AhoCorasick(patterns)
+
+    def scan(self, text: str) -> DocumentMatches:
+        matches = DocumentMatches(rates=extract_rates(text))
+        for kind, value in self.matcher.values(text):
+            if kind == "country":
+                matches.countries.append(value)
+            elif value not in matches.programs:
+                matches.programs.append(value)
+        return matches
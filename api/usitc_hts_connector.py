@@ -27,12 +27,16 @@ import xml.etree.ElementTree as ET
 import re
 from dataclasses import dataclass
 
+from country_resolver import resolve_country
+from records import intern_fields
+from snapshot_store import persist_snapshot, load_latest_snapshot
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HTSCode:
     """HTS Code with tariff information"""
     hts_code: str
@@ -43,8 +47,11 @@ class HTSCode:
     effective_date: str
     source: str
 
+    def __post_init__(self):
+        intern_fields(self, "effective_date", "source")
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CountryTariffData:
     """Country-specific tariff data"""
     country_name: str
@@ -55,6 +62,9 @@ class CountryTariffData:
     last_updated: str
     data_source: str
 
+    def __post_init__(self):
+        intern_fields(self, "country_name", "country_code", "data_source")
+
 
 class USITCHTSConnector:
     """Connects to live USITC HTS database for real-time tariff data"""
@@ -154,8 +164,8 @@ class USITCHTSConnector:
         """
         try:
             # Map country names to USITC country codes
-            country_mapping = self._get_country_mapping()
-            country_code = country_mapping.get(country_name.lower())
+            record = resolve_country(country_name)
+            country_code = record.iso2 if record else None
             
             if not country_code:
                 logger.warning(f"Country not found in mapping: {country_name}")
@@ -241,7 +251,7 @@ class USITCHTSConnector:
             # Get base country data
             country_data = await self.get_country_tariff_rates(country_name)
             if not country_data:
-                return {}
+                return self._load_persisted_country_data(country_name)
             
             # Get special programs affecting this country
             special_programs = await self.get_special_duty_programs()
@@ -261,7 +271,7 @@ class USITCHTSConnector:
                 if country_name.lower() in change.get("affected_countries", [])
             ]
             
-            return {
+            comprehensive_data = {
                 "country_name": country_data.country_name,
                 "country_code": country_data.country_code,
                 "average_tariff_rate": country_data.average_tariff_rate,
@@ -272,117 +282,28 @@ class USITCHTSConnector:
                 "data_source": "USITC HTS Live Database",
                 "confidence": "High - Official US Government Source"
             }
+
+            # Persist for warm starts and outage fallback
+            persist_snapshot("usitc_hts", country_name.lower(), comprehensive_data)
+
+            return comprehensive_data
             
         except Exception as e:
             logger.error(f"Error getting comprehensive country data: {e}")
-            return {}
+            return self._load_persisted_country_data(country_name)
 
-    def _get_country_mapping(self) -> Dict[str, str]:
+    def _load_persisted_country_data(self, country_name: str) -> Dict[str, Any]:
         """
-        Map country names to USITC country codes
+        Last successfully fetched country data from the snapshot store
         """
-        return {
-            "china": "CN",
-            "hong kong": "HK", 
-            "macau": "MO",
-            "russia": "RU",
-            "ukraine": "UA",
-            "turkey": "TR",
-            "india": "IN",
-            "brazil": "BR",
-            "mexico": "MX",
-            "canada": "CA",
-            "japan": "JP",
-            "south korea": "KR",
-            "germany": "DE",
-            "france": "FR",
-            "united kingdom": "GB",
-            "italy": "IT",
-            "spain": "ES",
-            "netherlands": "NL",
-            "belgium": "BE",
-            "switzerland": "CH",
-            "australia": "AU",
-            "singapore": "SG",
-            "malaysia": "MY",
-            "thailand": "TH",
-            "vietnam": "VN",
-            "indonesia": "ID",
-            "philippines": "PH",
-            "taiwan": "TW",
-            "south africa": "ZA",
-            "egypt": "EG",
-            "nigeria": "NG",
-            "kenya": "KE",
-            "morocco": "MA",
-            "tunisia": "TN",
-            "algeria": "DZ",
-            "ethiopia": "ET",
-            "ghana": "GH",
-            "uganda": "UG",
-            "tanzania": "TZ",
-            "zambia": "ZM",
-            "zimbabwe": "ZW",
-            "angola": "AO",
-            "mozambique": "MZ",
-            "madagascar": "MG",
-            "mauritius": "MU",
-            "seychelles": "SC",
-            "comoros": "KM",
-            "djibouti": "DJ",
-            "somalia": "SO",
-            "eritrea": "ER",
-            "sudan": "SD",
-            "south sudan": "SS",
-            "chad": "TD",
-            "niger": "NE",
-            "mali": "ML",
-            "burkina faso": "BF",
-            "senegal": "SN",
-            "gambia": "GM",
-            "guinea-bissau": "GW",
-            "guinea": "GN",
-            "sierra leone": "SL",
-            "liberia": "LR",
-            "ivory coast": "CI",
-            "togo": "TG",
-            "benin": "BJ",
-            "cameroon": "CM",
-            "central african republic": "CF",
-            "gabon": "GA",
-            "congo": "CG",
-            "democratic republic of congo": "CD",
-            "equatorial guinea": "GQ",
-            "sao tome and principe": "ST",
-            "cape verde": "CV",
-            "mauritania": "MR",
-            "western sahara": "EH",
-            "libya": "LY",
-            "chad": "TD",
-            "niger": "NE",
-            "mali": "ML",
-            "burkina faso": "BF",
-            "senegal": "SN",
-            "gambia": "GM",
-            "guinea-bissau": "GW",
-            "guinea": "GN",
-            "sierra leone": "SL",
-            "liberia": "LR",
-            "ivory coast": "CI",
-            "togo": "TG",
-            "benin": "BJ",
-            "cameroon": "CM",
-            "central african republic": "CF",
-            "gabon": "GA",
-            "congo": "CG",
-            "democratic republic of congo": "CD",
-            "equatorial guinea": "GQ",
-            "sao tome and principe": "ST",
-            "cape verde": "CV",
-            "mauritania": "MR",
-            "western sahara": "EH",
-            "libya": "LY"
-        }
+        stored = load_latest_snapshot("usitc_hts", country_name.lower())
+        if stored is None:
+            return {}
+
+        logger.info(
+            f"Using persisted USITC data for {country_name} from {stored.fetched_at.isoformat()}"
+        )
+        return {**stored.payload, "persisted_at": stored.fetched_at.isoformat()}
 
     def _parse_hts_search_results(self, data: str) -> List[HTSCode]:
         """
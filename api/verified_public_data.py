@@ -18,6 +18,12 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from columnar_tariff_store import (
+    ColumnarTariffStore,
+    CountryProfile,
+    build_country_profiles,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -786,32 +792,31 @@ VERIFIED_TARIFF_DATA = {
     }
 }
 
+# Flat columns over VERIFIED_TARIFF_DATA, built once at import
+TARIFF_STORE = ColumnarTariffStore.from_nested(VERIFIED_TARIFF_DATA)
+
+# Per-country status partitions and sector keyword flags
+COUNTRY_PROFILES = build_country_profiles(TARIFF_STORE)
+
+
+def get_country_profile(country_name: str) -> CountryProfile:
+    """Get the precomputed tariff profile for a country"""
+    return COUNTRY_PROFILES.get(country_name) or CountryProfile.empty(country_name)
+
+
 def get_country_tariffs(country_name: str) -> Dict[str, Dict]:
     """Get verified tariff information for a specific country"""
     return VERIFIED_TARIFF_DATA.get(country_name, {})
 
 def get_country_average_tariff(country_name: str) -> float:
     """Calculate average tariff rate for a country across all sectors"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return 0.0
-    
     # Only count active tariffs (exclude exempt and quota status)
-    active_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"]
-    if not active_tariffs:
-        return 0.0
-    
-    total_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs)
-    return total_rate / len(active_tariffs)
+    return TARIFF_STORE.average_rate(country_name, status="Active")
 
 def get_affected_sectors(country_name: str) -> List[str]:
     """Get list of sectors affected by US tariffs for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
-        return []
-    
     # Only return sectors with active tariffs
-    return [sector for sector, tariff in country_tariffs.items() if tariff["status"] == "Active"]
+    return TARIFF_STORE.sector_names(country_name, status="Active")
 
 def get_sector_analysis(country_name: str) -> List[Dict[str, Any]]:
     """Get detailed sector analysis for a country"""
@@ -853,18 +858,14 @@ def get_sector_analysis(country_name: str) -> List[Dict[str, Any]]:
 
 def get_economic_insights(country_name: str) -> List[str]:
     """Get economic insights for a country"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    profile = get_country_profile(country_name)
+    if not profile.total_sectors:
         return ["This country is not currently affected by US tariffs"]
     
     insights = []
-    active_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"]
-    exempt_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Exempt"]
-    quota_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Quota"]
-    
-    if active_tariffs:
-        avg_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs) / len(active_tariffs)
-        insights.append(f"Currently affected by US tariffs in {len(active_tariffs)} sectors")
+    if profile.active_count:
+        avg_rate = profile.active_average_rate
+        insights.append(f"Currently affected by US tariffs in {profile.active_count} sectors")
         insights.append(f"Average tariff rate: {avg_rate:.1f}%")
         
         if avg_rate >= 25:
@@ -888,26 +889,26 @@ def get_economic_insights(country_name: str) -> List[str]:
             ])
         
         # Add sector-specific insights
-        if any("Technology" in sector for sector in country_tariffs.keys()):
+        if "technology" in profile.flags:
             insights.extend([
                 "Critical for US tech supply chain",
                 "High risk of innovation disruption",
                 "Potential for increased domestic tech investment"
             ])
         
-        if any("Steel" in sector or "Aluminum" in sector for sector in country_tariffs.keys()):
+        if "steel_aluminum" in profile.flags:
             insights.extend([
                 "National security implications",
                 "Impact on US manufacturing costs",
                 "Potential for domestic steel/aluminum industry growth"
             ])
-    elif exempt_tariffs:
+    elif profile.exempt_count:
         insights.extend([
             "Currently exempted from US tariffs under trade agreements",
             "Strategic alliance or trade agreement provides protection",
             "Limited economic impact from US trade actions"
         ])
-    elif quota_tariffs:
+    elif profile.quota_count:
         insights.extend([
             "Subject to quota agreements limiting tariff impact",
             "Managed trade relationship with US",
@@ -918,19 +919,15 @@ def get_economic_insights(country_name: str) -> List[str]:
 
 def get_mitigation_strategies(country_name: str) -> List[str]:
     """Get potential mitigation strategies for affected countries"""
-    country_tariffs = get_country_tariffs(country_name)
-    if not country_tariffs:
+    profile = get_country_profile(country_name)
+    if not profile.total_sectors:
         return ["No mitigation needed - country not affected"]
     
-    active_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Active"]
-    exempt_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Exempt"]
-    quota_tariffs = [tariff for tariff in country_tariffs.values() if tariff["status"] == "Quota"]
-    
-    if exempt_tariffs:
+    if profile.exempt_count:
         return ["Maintain trade agreement compliance", "Strengthen strategic alliance", "Continue preferential trade relationship"]
-    elif quota_tariffs:
+    elif profile.quota_count:
         return ["Stay within quota limits", "Optimize quota utilization", "Maintain quota agreement compliance"]
-    elif active_tariffs:
+    elif profile.active_count:
         strategies = [
             "Diversify export markets to reduce US dependency",
             "Develop domestic supply chains for affected products",
@@ -945,32 +942,16 @@ def get_mitigation_strategies(country_name: str) -> List[str]:
 
 def get_country_summary(country_name: str) -> Dict[str, Any]:
     """Get comprehensive summary for a country"""
-    tariffs = get_country_tariffs(country_name)
-    active_tariffs = [tariff for tariff in tariffs.values() if tariff["status"] == "Active"]
-    exempt_tariffs = [tariff for tariff in tariffs.values() if tariff["status"] == "Exempt"]
-    quota_tariffs = [tariff for tariff in tariffs.values() if tariff["status"] == "Quota"]
-    
-    if active_tariffs:
-        avg_rate = sum(tariff["tariff_rate"] for tariff in active_tariffs) / len(active_tariffs)
-        status = "Active Tariffs"
-    elif exempt_tariffs:
-        status = "Exempted"
-        avg_rate = 0.0
-    elif quota_tariffs:
-        status = "Quota Agreement"
-        avg_rate = 0.0
-    else:
-        status = "No Tariffs"
-        avg_rate = 0.0
+    profile = get_country_profile(country_name)
     
     return {
         "country": country_name,
-        "total_sectors": len(tariffs),
-        "active_tariffs": len(active_tariffs),
-        "exempt_sectors": len(exempt_tariffs),
-        "quota_sectors": len(quota_tariffs),
-        "average_tariff_rate": avg_rate,
-        "status": status,
+        "total_sectors": profile.total_sectors,
+        "active_tariffs": profile.active_count,
+        "exempt_sectors": profile.exempt_count,
+        "quota_sectors": profile.quota_count,
+        "average_tariff_rate": profile.active_average_rate,
+        "status": profile.status,
         "data_source": "Verified Public Records",
         "last_updated": datetime.now().isoformat()
     }
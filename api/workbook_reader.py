@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Workbook Reader
+===============
+
+Streaming, chunked reads of large XLSX/CSV tariff files:
+- XLSX sheets are opened with openpyxl in read-only mode, which parses
+  rows lazily instead of building every cell of the sheet in memory
+- Rows are converted to DataFrames of at most chunk_size rows, so
+  callers can feed parsers and stores incrementally and peak memory
+  depends on the chunk size, not on the file size
+- The header is the first non-empty row; fully empty rows are skipped
+- Cells keep their Python values (dtype=object): codes stay ints or
+  strings instead of becoming floats next to empty cells
+- CSV files stream through pd.read_csv(chunksize=...); legacy .xls files
+  cannot be streamed and are read whole, then chunked
+
+Usage:
+    for chunk in iter_sheet_chunks("orders.xlsx", "Orders"):
+        store.add_rows(chunk)
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000
+
+PathLike = Union[str, Path]
+
+
+def _header(values: Sequence[Any]) -> List[str]:
+    """Column names for a header row; blanks become Unnamed: N like pandas"""
+    names = []
+    for i, value in enumerate(values):
+        name = str(value).strip() if value is not None else ""
+        names.append(name or f"Unnamed: {i}")
+    return names
+
+
+def _is_empty(row: Sequence[Any]) -> bool:
+    return all(value is None or value == "" for value in row)
+
+
+def sheet_names(path: PathLike) -> List[str]:
+    """Sheet names of a workbook without reading any rows"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return [path.stem]
+    if path.suffix.lower() == ".xls":
+        return list(pd.ExcelFile(path).sheet_names)
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_chunks(
+    path: PathLike,
+    sheet_name: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    DataFrames of up to chunk_size rows from one sheet (the first sheet
+    if sheet_name is None); raises KeyError if the sheet does not exist
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(path, dtype=object, chunksize=chunk_size)
+        return
+    if suffix == ".xls":
+        frame = pd.read_excel(path, sheet_name=sheet_name or 0, dtype=object)
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start : start + chunk_size]
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            worksheet = workbook.worksheets[0]
+        elif sheet_name in workbook.sheetnames:
+            worksheet = workbook[sheet_name]
+        else:
+            raise KeyError(f"Worksheet {sheet_name} does not exist in {path}")
+
+        columns: Optional[List[str]] = None
+        rows: List[Tuple[Any, ...]] = []
+        for row in worksheet.iter_rows(values_only=True):
+            if _is_empty(row):
+                continue
+            if columns is None:
+                columns = _header(row)
+                continue
+            # Read-only rows can be ragged; pad or trim to the header
+            row = tuple(row[: len(columns)]) + (None,) * (len(columns) - len(row))
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield pd.DataFrame(rows, columns=columns, dtype=object)
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_rows(
+    path: PathLike,
+    sheet_name: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[pd.Series]:
+    """Rows of one sheet as Series, read chunk by chunk"""
+    for chunk in iter_sheet_chunks(path, sheet_name, chunk_size):
+        for _, row in chunk.iterrows():
+            yield row
+
+
+def iter_workbook_chunks(
+    path: PathLike, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """(sheet name, chunk) for every sheet, one sheet at a time"""
+    for name in sheet_names(path):
+        for chunk in iter_sheet_chunks(path, name, chunk_size):
+            yield name, chunk
+
+
+def count_rows(path: PathLike, sheet_name: Optional[str] = None) -> int:
+    """Data rows in a sheet, streamed without keeping any of them"""
+    return sum(len(chunk) for chunk in iter_sheet_chunks(path, sheet_name))
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python workbook_reader.py FILE [SHEET]
+    target = sys.argv[1]
+    sheet = sys.argv[2] if len(sys.argv) > 2 else None
+    names = [sheet] if sheet else sheet_names(target)
+    for name in names:
+        print(f"📊 {name}: {count_rows(target, name)} rows")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Process Worker Pool
+===================
+
+Runs CPU-bound bulk work outside the API's event loop and GIL:
+- Effective-tariff matrices, rate scenario sweeps, workbook parsing and
+  chart rendering are submitted as tasks and awaited as futures
+- Workers start from a clean forkserver (or spawn) process rather than
+  forking the threaded API process, and load the tariff data once each
+- The pool is restarted whenever the authoritative workbook changes, so
+  workers never keep serving the data they loaded at start-up
+- Without a running pool (or on platforms without fork) tasks fall back
+  to a thread, so callers never need a separate code path
+
+The pool is started and stopped from the FastAPI lifespan in main.py.
+Set TIPM_WORKER_PROCESSES to control its size (0 disables it). The default
+is small because every uvicorn worker starts its own pool.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from dataset_diff import on_dataset_diff
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORKER_PROCESSES = int(
+    os.getenv("TIPM_WORKER_PROCESSES", str(min(2, os.cpu_count() or 1)))
+)
+
+
+def _init_worker():
+    """Worker initializer: load the tariff data and persisted upstream data"""
+    from authoritative_tariff_parser import authoritative_parser
+    from refresh_scheduler import refresh_scheduler
+
+    if not authoritative_parser.data_loaded:
+        authoritative_parser.load_excel_file()
+    refresh_scheduler.warm_start()
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """forkserver where available, so workers never fork a threaded process"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+class WorkerPool:
+    """Managed ProcessPoolExecutor for CPU-bound bulk calculations"""
+
+    def __init__(self, max_workers: int = WORKER_PROCESSES):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> bool:
+        """Create the pool; returns False if disabled"""
+        if self._executor is not None:
+            return True
+        if self.max_workers <= 0:
+            logger.info("Worker pool disabled (TIPM_WORKER_PROCESSES=0)")
+            return False
+
+        context = _pool_context()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+        )
+        logger.info(
+            f"🚀 Worker pool started: {self.max_workers} processes "
+            f"({context.get_start_method()})"
+        )
+        return True
+
+    def stop(self):
+        """Shut the pool down, cancelling queued tasks"""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        logger.info("🛑 Worker pool stopped")
+
+    def restart(self):
+        """Replace the workers so they load current data; running tasks finish"""
+        if self._executor is None:
+            return
+        previous, self._executor = self._executor, None
+        self.start()
+        previous.shutdown(wait=False)
+        logger.info("🔄 Worker pool restarted for updated tariff data")
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit a picklable top-level function; returns a concurrent Future"""
+        if self._executor is None:
+            raise RuntimeError("Worker pool is not running")
+        return self._executor.submit(fn, *args, **kwargs)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) in a worker process (or a thread if no pool)"""
+        call = functools.partial(fn, *args, **kwargs)
+        if self._executor is None:
+            return await asyncio.to_thread(call)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    def status(self) -> Dict[str, Any]:
+        return {"running": self.is_running, "max_workers": self.max_workers}
+
+
+# Tasks - top-level functions so they can be pickled to worker processes
+def compute_tariff_matrix(
+    hts_codes: Sequence[str], countries: Sequence[str]
+) -> Dict[str, Any]:
+    """Effective-tariff matrix as JSON-ready lists"""
+    from authoritative_tariff_parser import calculate_effective_tariff_matrix
+
+    matrix = calculate_effective_tariff_matrix(hts_codes, countries)
+    return {
+        "countries": matrix.countries,
+        "hts_codes": matrix.hts_codes,
+        "rule_types": matrix.rule_types,
+        "total_duty": matrix.total_duty.tolist(),
+        "average_total_duty": (
+            matrix.total_duty.mean(axis=1).tolist() if matrix.hts_codes else []
+        ),
+    }
+
+
+def sweep_reciprocal_rates(
+    country: str, addon_rates: Sequence[float], hts_codes: Sequence[str]
+) -> List[Dict[str, float]]:
+    """Average total duty for a country under alternative reciprocal addons"""
+    import copy
+    from dataclasses import replace
+
+    from authoritative_tariff_parser import authoritative_parser
+
+    results = []
+    base_rule = authoritative_parser.country_rates.get(country)
+    for addon in addon_rates:
+        # Work on a private copy so the shared parser is never mutated
+        parser = copy.copy(authoritative_parser)
+        parser.country_rates = dict(authoritative_parser.country_rates)
+        if base_rule is not None:
+            parser.country_rates[country] = replace(
+                base_rule, reciprocal_addon_pct=float(addon)
+            )
+
+        matrix = parser.calculate_effective_tariff_matrix(hts_codes, [country])
+        results.append(
+            {
+                "reciprocal_addon_pct": float(addon),
+                "average_total_duty": (
+                    float(matrix.total_duty.mean()) if len(hts_codes) else 0.0
+                ),
+            }
+        )
+    return results
+
+
+def parse_workbook(excel_file_path: str) -> Dict[str, Any]:
+    """Parse an authoritative tariff workbook into plain dicts"""
+    from dataclasses import asdict
+
+    from authoritative_tariff_parser import AuthoritativeTariffParser
+
+    parser = AuthoritativeTariffParser(excel_file_path)
+    if not parser.load_excel_file():
+        return {}
+    return {
+        "country_rates": {c: asdict(r) for c, r in parser.country_rates.items()},
+        "hts_codes": [asdict(code) for code in parser.hts_codes],
+        "section301_china": [asdict(rule) for rule in parser.section301_china],
+    }
+
+
+# Global instance
+worker_pool = WorkerPool()
+
+
+def _restart_on_workbook_diff(diff, dataset):
+    """Dataset-diff listener: workers hold a copy of the workbook data"""
+    from authoritative_tariff_parser import authoritative_parser
+
+    if diff.dataset == authoritative_parser.tracker.name:
+        worker_pool.restart()
+
+
+on_dataset_diff(_restart_on_workbook_diff)
+
+
+# Convenience functions
+async def run_in_worker(fn: Callable, *args, **kwargs) -> Any:
+    """Run a CPU-bound task in the shared worker pool"""
+    return await worker_pool.run(fn, *args, **kwargs)
+
+
+if __name__ == "__main__":
+
+    async def test():
+        print("🧪 TESTING WORKER POOL")
+        print("=" * 50)
+        worker_pool.start()
+        try:
+            result = await run_in_worker(
+                compute_tariff_matrix, ["8471.30.0100", "5208.11.0000"], ["China", "Japan"]
+            )
+            print(result)
+        finally:
+            worker_pool.stop()
+
+    asyncio.run(test())
@@ -15,12 +15,15 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
+from country_resolver import resolve_country
+from records import intern_fields
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EconomicData:
     """Real economic data from World Bank"""
 
@@ -31,6 +34,9 @@ class EconomicData:
     source: str
     last_updated: str
 
+    def __post_init__(self):
+        intern_fields(self, "indicator", "unit", "year", "source")
+
 
 class WorkingAnalytics:
     """
@@ -239,40 +245,6 @@ class WorkingAnalytics:
             return {"error": f"Calculation failed: {str(e)}"}
 
 
-# Country code mapping
-COUNTRY_CODES = {
-    "China": "CHN",
-    "Hong Kong": "HKG",
-    "Macau": "MAC",
-    "Russia": "RUS",
-    "Ukraine": "UKR",
-    "Turkey": "TUR",
-    "India": "IND",
-    "Brazil": "BRA",
-    "Mexico": "MEX",
-    "Canada": "CAN",
-    "Japan": "JPN",
-    "South Korea": "KOR",
-    "Germany": "DEU",
-    "France": "FRA",
-    "United Kingdom": "GBR",
-    "Italy": "ITA",
-    "Spain": "ESP",
-    "Netherlands": "NLD",
-    "Belgium": "BEL",
-    "Switzerland": "CHE",
-    "Australia": "AUS",
-    "Singapore": "SGP",
-    "Malaysia": "MYS",
-    "Thailand": "THA",
-    "Vietnam": "VNM",
-    "Indonesia": "IDN",
-    "Philippines": "PHL",
-    "Taiwan": "TWN",
-    "South Africa": "ZAF",
-}
-
-
 # Convenience functions
 async def get_real_economic_analysis(
     country_name: str, tariff_rate: float
@@ -281,7 +253,8 @@ async def get_real_economic_analysis(
     Get real economic analysis for a country
     """
     try:
-        country_code = COUNTRY_CODES.get(country_name, "")
+        record = resolve_country(country_name)
+        country_code = record.iso3 if record else ""
         if not country_code:
             return {"error": f"Country code not found for {country_name}"}
 
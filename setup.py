@@ -92,7 +92,7 @@ setup(
     long_description_content_type="text/markdown",
     author="TIPM Development Team",
     packages=find_packages(),
-    python_requires=">=3.9",  # Ensure compatibility with Python 3.9 and above
+    python_requires=">=3.10",  # Slotted dataclasses need Python 3.10 and above
     install_requires=read_requirements(),
     extras_require={
         "dev": read_dev_requirements(),
@@ -121,7 +121,6 @@ setup(
         "Intended Audience :: Science/Research",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
         "Topic :: Scientific/Engineering :: Artificial Intelligence",
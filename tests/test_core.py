@@ -77,6 +77,18 @@ class TestTIPMModel:
         assert "timeline" in results
         assert len(results["timeline"]) == len(shocks)
 
+    def test_empty_scenario(self, sample_trade_data):
+        """An empty scenario has no timeline and zero cumulative impact"""
+        self.model.fit({"trade_flows": sample_trade_data})
+
+        batch = self.model.predict_many([])
+        assert len(batch) == 0
+        assert batch["net_trade_change"].shape == (0,)
+
+        results = self.model.simulate_scenario([], time_horizon=6)
+        assert results["timeline"] == []
+        assert set(results["cumulative_impact"].values()) == {0.0}
+
     def test_country_exposure(self):
         """Test country exposure analysis"""
         # Train model
@@ -0,0 +1,219 @@
+"""
+Test suite for the sparse trade-flow graph
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tipm.core import TariffShock, TIPMModel
+from tipm.propagation import GRAPH_ARRAYS, TradeFlowGraph
+
+
+@pytest.fixture
+def trade_flows():
+    return pd.DataFrame(
+        {
+            "origin_country": ["CN", "CN", "JP", "DE", "CN", "US"],
+            "destination_country": ["US", "US", "US", "US", "US", "CN"],
+            "hs_code": ["851712", "851762", "851712", "852872", "851712", "8517"],
+            "trade_value": [1000.0, 500.0, 300.0, 700.0, 800.0, 400.0],
+            "year": [2022, 2023, 2023, 2023, 2023, 2023],
+        }
+    )
+
+
+class TestTradeFlowGraph:
+    """Test cases for shock targeting and propagation"""
+
+    def test_latest_year_wins(self, trade_flows):
+        graph = TradeFlowGraph.from_frames(trade_flows)
+        flows, _ = graph.target_flows("CN", "US", ["851712"])
+        assert graph.value[flows].tolist() == [800.0]
+
+    def test_prefix_and_parent_matching(self, trade_flows):
+        graph = TradeFlowGraph.from_frames(trade_flows)
+        flows, coverage = graph.target_flows("cn", "us", ["8517", "9999"])
+        assert sorted(graph.hs_codes[h] for h in graph.hs[flows]) == ["851712", "851762"]
+        assert coverage == 0.5
+
+        # More detailed than the trade data: falls back to the traded parent
+        flows, _ = graph.target_flows("US", "CN", ["85179900"])
+        assert graph.value[flows].tolist() == [400.0]
+
+    def test_diversion_stays_in_market(self, trade_flows):
+        graph = TradeFlowGraph.from_frames(trade_flows)
+        shocks, _ = graph.shock_matrix([("CN", "US", ["851712"], 0.25)])
+        result = graph.propagate(shocks, import_elasticity=2.0, diversion_rate=1.0)
+
+        assert result.direct_change.sum() == pytest.approx(-400.0)
+        # JP is the only other supplier of 851712 to the US
+        diverted = result.diverted_change.toarray().ravel()
+        jp = np.flatnonzero(graph.origin == graph.country_index["JP"])
+        assert diverted.sum() == pytest.approx(400.0)
+        assert diverted[jp].sum() == pytest.approx(400.0)
+
+    def test_batched_shocks_match_single(self, trade_flows):
+        graph = TradeFlowGraph.from_frames(trade_flows)
+        specs = [("CN", "US", ["8517"], 0.25), ("DE", "US", ["8528"], 0.1)]
+        batch = graph.propagate(graph.shock_matrix(specs)[0], 1.5, 0.5)
+        for j, spec in enumerate(specs):
+            single = graph.propagate(graph.shock_matrix([spec])[0], 1.5, 0.5)
+            assert np.allclose(batch.total_output[:, j], single.total_output[:, 0])
+
+
+class TestPropagationLayers:
+    """Test cases for layer outputs of a fitted model"""
+
+    def test_input_output_amplifies_output_loss(self, trade_flows):
+        model = TIPMModel().fit({"trade_flows": trade_flows})
+        prediction = model.predict(
+            TariffShock("T", ["8517"], 0.25, "CN", "US", "2024-01-01")
+        )
+        industry = prediction.industry_impact
+        assert industry["total_output_change"] < industry["direct_output_change"] < 0
+        assert list(industry["output_change_by_sector"]) == [
+            "Machinery and mechanical appliances; electrical equipment"
+        ]
+        assert prediction.consumer_impact["tariff_revenue"] > 0
+        assert prediction.confidence_scores["overall_confidence"] == pytest.approx(0.7)
+
+    def test_baseline_tariff_dampens_response(self, trade_flows):
+        policies = pd.DataFrame(
+            {
+                "origin_country": ["CN"],
+                "destination_country": ["US"],
+                "hs_codes": [["8517"]],
+                "tariff_rate": [0.25],
+            }
+        )
+        shock = TariffShock("T", ["8517"], 0.25, "CN", "US", "2024-01-01")
+        free = TIPMModel().fit({"trade_flows": trade_flows}).predict(shock)
+        tariffed = (
+            TIPMModel()
+            .fit({"trade_flows": trade_flows, "tariff_shocks": policies})
+            .predict(shock)
+        )
+        assert (
+            tariffed.trade_flow_impact["direct_trade_change"]
+            == pytest.approx(free.trade_flow_impact["direct_trade_change"] / 1.25)
+        )
+
+
+class TestBatchPrediction:
+    """Test cases for predict_many"""
+
+    def test_matches_single_predictions(self, trade_flows):
+        model = TIPMModel().fit({"trade_flows": trade_flows})
+        shocks = [
+            TariffShock("A", ["8517"], 0.25, "CN", "US", "2024-01-01"),
+            TariffShock("B", ["8528", "8517"], -0.05, "DE", "US", "2024-01-01"),
+            TariffShock("C", ["8517"], 0.25, "XX", "US", "2024-01-01"),
+        ]
+        batch = model.predict_many(shocks, time_horizon=4, batch_size=2)
+
+        assert len(batch) == 3
+        for j, shock in enumerate(shocks):
+            single = model.predict(shock)
+            assert batch["net_trade_change"][j] == pytest.approx(
+                single.trade_flow_impact["net_trade_change"]
+            )
+            assert batch["employment_change"][j] == pytest.approx(
+                single.firm_impact["total_employment_change"]
+            )
+            assert batch["hs_coverage"][j] == single.policy_impact["hs_coverage"]
+
+        frame = batch.to_frame()
+        assert frame.index.tolist() == ["A", "B", "C"]
+        assert frame.loc["C", "affected_flows"] == 0
+
+        path = batch.timeline("consumer_cost")
+        assert path.shape == (3, 4)
+        assert path[0, -1] < batch["consumer_cost"][0]
+
+
+class TestModelArtifacts:
+    """Test cases for saving and memory-mapped loading"""
+
+    def test_round_trip_is_memory_mapped(self, trade_flows, tmp_path):
+        model = TIPMModel().fit({"trade_flows": trade_flows})
+        model.config.trade_flow_config.diversion_rate = 0.8
+        model.save(str(tmp_path / "model"))
+        # Saving again swaps the artifact in place
+        model.save(str(tmp_path / "model"))
+
+        loaded = TIPMModel.load(str(tmp_path / "model"))
+        assert isinstance(loaded.graph.value, np.memmap)
+        assert loaded.config.trade_flow_config.diversion_rate == 0.8
+
+        shock = TariffShock("T", ["8517"], 0.25, "CN", "US", "2024-01-01")
+        expected = model.predict(shock)
+        actual = loaded.predict(shock)
+        assert actual.industry_impact == expected.industry_impact
+        assert actual.consumer_impact == expected.consumer_impact
+
+    def test_rejects_mismatched_arrays(self, trade_flows, tmp_path):
+        path = str(tmp_path / "model")
+        TIPMModel().fit({"trade_flows": trade_flows}).save(path)
+        np.save(f"{path}/arrays/value.npy", np.zeros(1))
+
+        with pytest.raises(ValueError, match="value"):
+            TIPMModel.load(path)
+
+
+class TestPartialFit:
+    """Test cases for folding new periods into a fitted model"""
+
+    def assert_same_graph(self, actual, expected):
+        assert actual.countries == expected.countries
+        assert actual.hs_codes == expected.hs_codes
+        for name in GRAPH_ARRAYS:
+            assert np.allclose(getattr(actual, name), getattr(expected, name)), name
+
+    def test_new_period_matches_full_refit(self, trade_flows):
+        update = trade_flows.head(3).assign(year=2024, trade_value=[50.0, 60.0, 70.0])
+        model = TIPMModel().fit({"trade_flows": trade_flows})
+        model.partial_fit({"trade_flows": update})
+
+        refit = TIPMModel().fit({"trade_flows": pd.concat([trade_flows, update])})
+        self.assert_same_graph(model.graph, refit.graph)
+
+    def test_new_countries_and_codes_rebuild(self, trade_flows, tmp_path):
+        policies = pd.DataFrame(
+            {
+                "origin_country": ["CN"],
+                "destination_country": ["US"],
+                "hs_codes": [["8517"]],
+                "tariff_rate": [0.1],
+            }
+        )
+        update = pd.DataFrame(
+            {
+                "origin_country": ["VN", "CN", "CN"],
+                "destination_country": ["US", "US", "US"],
+                "hs_code": ["851712", "940360", "851770"],
+                "trade_value": [900.0, 100.0, 250.0],
+                "year": [2024, 2024, 2024],
+            }
+        )
+        TIPMModel().fit(
+            {"trade_flows": trade_flows, "tariff_shocks": policies}
+        ).save(str(tmp_path / "model"))
+
+        # A memory-mapped model switches to private copies when updated
+        model = TIPMModel.load(str(tmp_path / "model"))
+        model.partial_fit({"trade_flows": update})
+
+        refit = TIPMModel().fit(
+            {
+                "trade_flows": pd.concat([trade_flows, update]),
+                "tariff_shocks": policies,
+            }
+        )
+        self.assert_same_graph(model.graph, refit.graph)
+        # A new flow under a fitted policy starts at that policy's rate
+        flows, _ = model.graph.target_flows("CN", "US", ["851770"])
+        assert model.graph.baseline_tariff[flows].tolist() == [0.1]
+        assert "VN" in model.predict(
+            TariffShock("T", ["851712"], 0.25, "CN", "US", "2024-01-01")
+        ).trade_flow_impact["diversion_beneficiaries"]
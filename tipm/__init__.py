@@ -0,0 +1,16 @@
+"""
+TIPM - Tariff Impact Propagation Model
+"""
+
+from .config import TIPMConfig
+from .core import BatchPrediction, TariffShock, TIPMModel, TIPMPrediction
+
+__version__ = "0.1.0"
+
+__all__ = [
+    "BatchPrediction",
+    "TIPMConfig",
+    "TIPMModel",
+    "TariffShock",
+    "TIPMPrediction",
+]
@@ -0,0 +1,108 @@
+"""
+TIPM Configuration
+==================
+
+Model-wide settings plus one config per propagation layer:
+- Policy: how shock HS codes are matched against traded HS codes
+- Trade flow: import demand elasticity, trade diversion, adjustment speed
+- Industry: HS chapter grouping and intermediate-input linkages
+- Firm: employment intensity and absorbed tariff cost
+- Consumer: tariff pass-through to import prices
+- Geopolitical: retaliation sensitivity
+"""
+
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Dict
+
+
+@dataclass
+class PolicyLayerConfig:
+    """Shock targeting"""
+
+    # Shock code "8517" also hits traded codes "851712", "85171200", ...
+    hs_prefix_matching: bool = True
+
+
+@dataclass
+class TradeFlowLayerConfig:
+    """Bilateral trade response"""
+
+    # % fall in imports per % rise in the tariff-inclusive price
+    import_elasticity: float = 1.5
+    # Share of lost trade that other origins pick up in the same market
+    diversion_rate: float = 0.5
+    # Fraction of the remaining gap to the new equilibrium closed per period
+    adjustment_speed: float = 0.35
+
+
+@dataclass
+class IndustryLayerConfig:
+    """Industry aggregation and input-output propagation"""
+
+    # Industries are HS chapters (first N digits of the HS code)
+    hs_chapter_digits: int = 2
+    # Share of an industry's output that is used as input by other
+    # industries of the same country; must be < 1
+    intermediate_share: float = 0.3
+
+
+@dataclass
+class FirmLayerConfig:
+    """Exporter-side firm response"""
+
+    jobs_per_million_usd: float = 5.0
+    # Share of the tariff cost absorbed by exporters (rest is passed on)
+    absorbed_share: float = 0.2
+
+
+@dataclass
+class ConsumerLayerConfig:
+    """Importer-side price response"""
+
+    pass_through_rate: float = 0.8
+
+
+@dataclass
+class GeopoliticalLayerConfig:
+    """Retaliation risk"""
+
+    # Steepness of the retaliation curve over tariff-weighted trade exposure
+    retaliation_sensitivity: float = 25.0
+    # Exposure at which retaliation becomes a coin flip
+    retaliation_threshold: float = 0.05
+
+
+@dataclass
+class TIPMConfig:
+    """Top-level TIPM model configuration"""
+
+    random_seed: int = 42
+    model_version: str = "0.1.0"
+    confidence_threshold: float = 0.5
+    max_prediction_horizon: int = 24
+
+    policy_config: PolicyLayerConfig = field(default_factory=PolicyLayerConfig)
+    trade_flow_config: TradeFlowLayerConfig = field(
+        default_factory=TradeFlowLayerConfig
+    )
+    industry_config: IndustryLayerConfig = field(default_factory=IndustryLayerConfig)
+    firm_config: FirmLayerConfig = field(default_factory=FirmLayerConfig)
+    consumer_config: ConsumerLayerConfig = field(default_factory=ConsumerLayerConfig)
+    geopolitical_config: GeopoliticalLayerConfig = field(
+        default_factory=GeopoliticalLayerConfig
+    )
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "TIPMConfig":
+        """Inverse of dataclasses.asdict; unknown keys are ignored"""
+        kwargs = {}
+        for f in fields(cls):
+            if f.name not in values:
+                continue
+            value = values[f.name]
+            if f.default_factory is not MISSING and isinstance(value, dict):
+                layer = f.default_factory
+                known = {lf.name for lf in fields(layer)}
+                value = layer(**{k: v for k, v in value.items() if k in known})
+            kwargs[f.name] = value
+        return cls(**kwargs)
@@ -0,0 +1,610 @@
+"""
+TIPM Core Model
+===============
+
+Tariff Impact Propagation Model:
+- fit() builds a sparse country x HS-code trade-flow graph from
+  historical trade flows and the tariffs already in force
+- partial_fit() folds newly reported periods into the fitted graph
+- predict() turns a TariffShock into a sparse shock vector and carries it
+  through six layers: policy -> trade flow -> industry -> firm ->
+  consumer -> geopolitical
+- simulate_scenario() adds the partial-adjustment path over time
+- save() / load() persist the fitted graph as a memory-mappable artifact
+
+Usage:
+    tipm --trade-flows flows.csv --save model_dir
+         --origin CN --destination US --hs-codes 8517 8525 --rate-change 0.25
+    tipm --model model_dir
+         --origin CN --destination US --hs-codes 8517 --rate-change 0.25
+"""
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from api.hs_concordance import HS_CONCORDANCE
+
+from .config import TIPMConfig
+from .propagation import (
+    PropagationResult,
+    TradeFlowGraph,
+    normalize_country,
+    sparse_column,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Layer confidence with full HS coverage; scaled down as coverage drops
+LAYER_CONFIDENCE = {
+    "policy": 0.9,
+    "trade_flow": 0.8,
+    "industry": 0.7,
+    "firm": 0.6,
+    "consumer": 0.7,
+    "geopolitical": 0.5,
+}
+TOP_N = 10
+# Headline metrics phased in over a scenario's time horizon
+SCENARIO_METRICS = ("net_trade_change", "consumer_cost", "employment_change")
+
+
+@dataclass
+class TariffShock:
+    """A tariff change on HS codes from one origin to one destination"""
+
+    tariff_id: str
+    hs_codes: List[str]
+    rate_change: float  # fractional, 0.25 = +25 percentage points
+    origin_country: str
+    destination_country: str
+    effective_date: str
+    policy_text: str = ""
+
+
+@dataclass
+class TIPMPrediction:
+    """Layer-by-layer impact of one tariff shock"""
+
+    tariff_shock: TariffShock
+    policy_impact: Dict[str, Any]
+    trade_flow_impact: Dict[str, Any]
+    industry_impact: Dict[str, Any]
+    firm_impact: Dict[str, Any]
+    consumer_impact: Dict[str, Any]
+    geopolitical_impact: Dict[str, Any]
+    confidence_scores: Dict[str, float]
+    prediction_timestamp: str = field(
+        default_factory=lambda: datetime.now().isoformat()
+    )
+
+
+@dataclass
+class BatchPrediction:
+    """Columnar headline metrics for many shocks, one array entry per shock"""
+
+    tariff_ids: List[str]
+    metrics: Dict[str, np.ndarray]
+    adjustment_path: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.tariff_ids)
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.metrics[metric]
+
+    def timeline(self, metric: str) -> np.ndarray:
+        """(shocks x periods) path of a metric"""
+        return np.outer(self.metrics[metric], self.adjustment_path)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.metrics, index=pd.Index(self.tariff_ids, name="tariff_id")
+        )
+
+
+def _retaliation_probability(exposure, geo) -> np.ndarray:
+    """Logistic in exposure; zero when the origin's trade is not hit"""
+    exposure = np.asarray(exposure, dtype=np.float64)
+    logistic = 1.0 / (
+        1.0
+        + np.exp(-geo.retaliation_sensitivity * (exposure - geo.retaliation_threshold))
+    )
+    return np.where(exposure > 0, logistic, 0.0)
+
+
+def _tension_index(exposure, geo) -> np.ndarray:
+    return np.minimum(1.0, np.asarray(exposure) / max(geo.retaliation_threshold, 1e-9))
+
+
+def _top(values: Dict[str, float], n: int = TOP_N) -> Dict[str, float]:
+    ranked = sorted(values.items(), key=lambda item: abs(item[1]), reverse=True)
+    return {k: round(float(v), 2) for k, v in ranked[:n] if v}
+
+
+class TIPMModel:
+    """Sparse-matrix tariff shock propagation model"""
+
+    def __init__(self, config: Optional[TIPMConfig] = None):
+        self.config = config or TIPMConfig()
+        self.graph: Optional[TradeFlowGraph] = None
+        self.is_trained = False
+
+    def fit(self, training_data: Dict[str, Any]) -> "TIPMModel":
+        """Build the trade-flow graph; all training_data keys are optional"""
+        training_data = training_data or {}
+        industry = self.config.industry_config
+        self.graph = TradeFlowGraph.from_frames(
+            training_data.get("trade_flows"),
+            training_data.get("tariff_shocks"),
+            chapter_digits=industry.hs_chapter_digits,
+            intermediate_share=industry.intermediate_share,
+        )
+        self.is_trained = True
+        logger.info(
+            f"✅ TIPM trained: {self.graph.n_flows} flows, "
+            f"{len(self.graph.countries)} countries, "
+            f"{len(self.graph.hs_codes)} HS codes"
+        )
+        return self
+
+    def partial_fit(self, training_data: Dict[str, Any]) -> "TIPMModel":
+        """Fold newly reported periods into the fitted graph
+
+        training_data takes the same keys as fit(); only the new
+        trade_flows rows (and any new tariff_shocks) need to be passed.
+        An untrained model is simply fitted.
+        """
+        if not self.is_trained or self.graph is None:
+            return self.fit(training_data)
+
+        training_data = training_data or {}
+        trade_flows = training_data.get("trade_flows")
+        started = time.perf_counter()
+        stats = {}
+        if trade_flows is not None and len(trade_flows):
+            stats = self.graph.update(trade_flows)
+        tariff_shocks = training_data.get("tariff_shocks")
+        if tariff_shocks is not None and len(tariff_shocks):
+            self.graph.apply_baseline_tariffs(tariff_shocks)
+
+        logger.info(
+            f"✅ TIPM updated in {time.perf_counter() - started:.2f}s: "
+            f"{stats.get('updated', 0)} flows updated, {stats.get('added', 0)} added"
+            f"{' (operators rebuilt)' if stats.get('rebuilt') else ''}"
+        )
+        return self
+
+    def _require_trained(self):
+        if not self.is_trained or self.graph is None:
+            raise ValueError("Model must be trained before making predictions")
+
+    # Artifacts
+    def save(self, path: str) -> Dict[str, Any]:
+        """Write the fitted model as a memory-mappable artifact directory"""
+        from .artifacts import save_model
+
+        return save_model(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "TIPMModel":
+        """Load an artifact written by save(); arrays are memory-mapped"""
+        from .artifacts import load_model
+
+        return load_model(path, mmap_mode)
+
+    # Prediction
+    def predict(self, tariff_shock: TariffShock) -> TIPMPrediction:
+        """Propagate one shock through every layer"""
+        self._require_trained()
+        graph = self.graph
+        trade = self.config.trade_flow_config
+
+        shocks, coverage = graph.shock_matrix(
+            [
+                (
+                    tariff_shock.origin_country,
+                    tariff_shock.destination_country,
+                    tariff_shock.hs_codes,
+                    tariff_shock.rate_change,
+                )
+            ],
+            self.config.policy_config.hs_prefix_matching,
+        )
+        result = graph.propagate(shocks, trade.import_elasticity, trade.diversion_rate)
+        return self._build_prediction(tariff_shock, result, 0, float(coverage[0]))
+
+    def _build_prediction(
+        self,
+        shock: TariffShock,
+        result: PropagationResult,
+        column: int,
+        coverage: float,
+    ) -> TIPMPrediction:
+        graph = self.graph
+        n_countries = len(graph.countries)
+        origin = graph.country_index.get(normalize_country(shock.origin_country))
+        destination = graph.country_index.get(
+            normalize_country(shock.destination_country)
+        )
+        origin_exports = graph.exports[origin] if origin is not None else 0.0
+        destination_imports = (
+            graph.imports[destination] if destination is not None else 0.0
+        )
+
+        hit_flows, affected = sparse_column(result.affected_value, column)
+        _, direct = sparse_column(result.direct_change, column)
+        diverted_flows, diverted = sparse_column(result.diverted_change, column)
+        _, paid = sparse_column(result.tariff_paid, column)
+        affected_value = affected.sum()
+
+        policy_impact = {
+            "rate_change": shock.rate_change,
+            "affected_hs_codes": sorted(
+                {graph.hs_codes[h] for h in graph.hs[hit_flows]}
+            ),
+            "affected_flows": int(len(hit_flows)),
+            "affected_trade_value": float(affected_value),
+            "baseline_tariff": (
+                float(np.average(graph.baseline_tariff[hit_flows], weights=affected))
+                if affected_value > 0
+                else 0.0
+            ),
+            "hs_coverage": coverage,
+        }
+
+        diverted_by_origin = np.bincount(
+            graph.origin[diverted_flows], diverted, n_countries
+        )
+        trade_flow_impact = {
+            "direct_trade_change": float(direct.sum()),
+            "diverted_trade": float(diverted.sum()),
+            "net_trade_change": float(direct.sum() + diverted.sum()),
+            "trade_change_pct": (
+                float(direct.sum() / affected_value * 100) if affected_value else 0.0
+            ),
+            "diversion_beneficiaries": _top(
+                dict(zip(graph.countries, diverted_by_origin))
+            ),
+        }
+
+        _, direct_output = sparse_column(result.direct_output, column)
+        cost_nodes, input_cost = sparse_column(result.input_cost, column)
+        total_output = result.total_output[:, column]
+        output_nodes = np.flatnonzero(total_output)
+        sectors = graph.node_sector(output_nodes)
+        by_sector = np.bincount(
+            sectors[sectors >= 0],
+            total_output[output_nodes][sectors >= 0],
+            len(HS_CONCORDANCE.sector_names),
+        )
+        industry_impact = {
+            "direct_output_change": float(direct_output.sum()),
+            "total_output_change": float(total_output.sum()),
+            "input_output_multiplier": (
+                float(total_output.sum() / direct_output.sum())
+                if direct_output.sum()
+                else 1.0
+            ),
+            "output_change_by_industry": _top(
+                {graph.node_label(n): total_output[n] for n in output_nodes}
+            ),
+            "input_cost_by_industry": _top(
+                {graph.node_label(n): v for n, v in zip(cost_nodes, input_cost)}
+            ),
+            "output_change_by_sector": _top(
+                dict(zip(HS_CONCORDANCE.sector_names, by_sector))
+            ),
+        }
+
+        firm = self.config.firm_config
+        jobs = (
+            np.bincount(
+                graph.node_country(output_nodes),
+                total_output[output_nodes],
+                n_countries,
+            )
+            * firm.jobs_per_million_usd
+            / 1e6
+        )
+        absorbed = firm.absorbed_share * paid.sum()
+        firm_impact = {
+            "employment_change": _top(dict(zip(graph.countries, jobs))),
+            "total_employment_change": float(jobs.sum()),
+            "absorbed_tariff_cost": float(absorbed),
+            "margin_pressure_pct": (
+                float(absorbed / origin_exports * 100) if origin_exports else 0.0
+            ),
+        }
+
+        passed = self.config.consumer_config.pass_through_rate * paid.sum()
+        consumer_impact = {
+            "consumer_cost": float(passed),
+            "tariff_revenue": float(paid.sum()),
+            "import_price_increase_pct": (
+                float(passed / destination_imports * 100)
+                if destination_imports
+                else 0.0
+            ),
+            "affected_products": len(policy_impact["affected_hs_codes"]),
+        }
+
+        # Exposure: origin's exports hit, weighted by the size of the change
+        geo = self.config.geopolitical_config
+        exposure = (
+            float(abs(shock.rate_change) * affected_value / origin_exports)
+            if origin_exports
+            else 0.0
+        )
+        geopolitical_impact = {
+            "tariff_weighted_exposure": exposure,
+            "retaliation_probability": float(_retaliation_probability(exposure, geo)),
+            "trade_tension_index": float(_tension_index(exposure, geo)),
+        }
+
+        confidence = {
+            layer: round(base * (0.5 + 0.5 * coverage), 3)
+            for layer, base in LAYER_CONFIDENCE.items()
+        }
+        confidence["overall_confidence"] = round(
+            float(np.mean(list(confidence.values()))), 3
+        )
+        if confidence["overall_confidence"] < self.config.confidence_threshold:
+            logger.warning(
+                f"⚠️ Low confidence for {shock.tariff_id}: "
+                f"{confidence['overall_confidence']} (HS coverage {coverage:.0%})"
+            )
+
+        return TIPMPrediction(
+            tariff_shock=shock,
+            policy_impact=policy_impact,
+            trade_flow_impact=trade_flow_impact,
+            industry_impact=industry_impact,
+            firm_impact=firm_impact,
+            consumer_impact=consumer_impact,
+            geopolitical_impact=geopolitical_impact,
+            confidence_scores=confidence,
+        )
+
+    def predict_many(
+        self,
+        tariff_shocks: Sequence[TariffShock],
+        time_horizon: Optional[int] = None,
+        batch_size: int = 4096,
+    ) -> "BatchPrediction":
+        """Propagate many shocks as stacked sparse columns
+
+        Returns per-shock headline metrics as arrays. Totals use the
+        precomputed input-output multipliers, and the time path is shared
+        by every shock, so nothing is re-solved per shock or per period.
+        """
+        self._require_trained()
+        graph = self.graph
+        trade = self.config.trade_flow_config
+        firm = self.config.firm_config
+        geo = self.config.geopolitical_config
+        pass_through = self.config.consumer_config.pass_through_rate
+        prefix_matching = self.config.policy_config.hs_prefix_matching
+
+        chunks: List[Dict[str, np.ndarray]] = []
+        # An empty batch still runs once so every metric gets a 0-length array
+        for start in range(0, max(len(tariff_shocks), 1), batch_size):
+            batch = tariff_shocks[start : start + batch_size]
+            shocks, coverage = graph.shock_matrix(
+                [
+                    (s.origin_country, s.destination_country, s.hs_codes, s.rate_change)
+                    for s in batch
+                ],
+                prefix_matching,
+            )
+            result = graph.propagate(
+                shocks, trade.import_elasticity, trade.diversion_rate, False
+            )
+
+            def column_sums(matrix) -> np.ndarray:
+                return np.asarray(matrix.sum(axis=0)).ravel()
+
+            affected = column_sums(result.affected_value)
+            direct = column_sums(result.direct_change)
+            diverted = column_sums(result.diverted_change)
+            paid = column_sums(result.tariff_paid)
+            total_output = graph.total_output_change(result)
+
+            origins = graph.country_ids([s.origin_country for s in batch])
+            destinations = graph.country_ids([s.destination_country for s in batch])
+            # Unknown countries (-1) pick up the trailing zero
+            origin_exports = np.append(graph.exports, 0.0)[origins]
+            destination_imports = np.append(graph.imports, 0.0)[destinations]
+            rates = np.array([s.rate_change for s in batch], dtype=np.float64)
+
+            def share(numerator, denominator) -> np.ndarray:
+                return np.divide(
+                    numerator,
+                    denominator,
+                    out=np.zeros(len(batch)),
+                    where=denominator != 0,
+                )
+
+            absorbed = firm.absorbed_share * paid
+            passed = pass_through * paid
+            exposure = share(np.abs(rates) * affected, origin_exports)
+            chunks.append(
+                {
+                    "rate_change": rates,
+                    "hs_coverage": coverage,
+                    "affected_flows": np.diff(result.affected_value.indptr),
+                    "affected_trade_value": affected,
+                    "direct_trade_change": direct,
+                    "diverted_trade": diverted,
+                    "net_trade_change": direct + diverted,
+                    "direct_output_change": column_sums(result.direct_output),
+                    "total_output_change": total_output,
+                    "employment_change": total_output * firm.jobs_per_million_usd / 1e6,
+                    "absorbed_tariff_cost": absorbed,
+                    "margin_pressure_pct": share(absorbed * 100, origin_exports),
+                    "tariff_revenue": paid,
+                    "consumer_cost": passed,
+                    "import_price_increase_pct": share(
+                        passed * 100, destination_imports
+                    ),
+                    "tariff_weighted_exposure": exposure,
+                    "retaliation_probability": _retaliation_probability(exposure, geo),
+                    "trade_tension_index": _tension_index(exposure, geo),
+                    "overall_confidence": np.round(
+                        np.mean(list(LAYER_CONFIDENCE.values()))
+                        * (0.5 + 0.5 * coverage),
+                        3,
+                    ),
+                }
+            )
+
+        metrics = {
+            name: np.concatenate([chunk[name] for chunk in chunks])
+            for name in chunks[0]
+        }
+        return BatchPrediction(
+            tariff_ids=[s.tariff_id for s in tariff_shocks],
+            metrics=metrics,
+            adjustment_path=self.adjustment_path(time_horizon or 0),
+        )
+
+    # Scenarios
+    def adjustment_path(self, time_horizon: int) -> np.ndarray:
+        """Share of the long-run impact reached after each period"""
+        horizon = min(int(time_horizon), self.config.max_prediction_horizon)
+        speed = self.config.trade_flow_config.adjustment_speed
+        return 1.0 - (1.0 - speed) ** np.arange(1, horizon + 1)
+
+    def simulate_scenario(
+        self, tariff_shocks: Sequence[TariffShock], time_horizon: int = 12
+    ) -> Dict[str, Any]:
+        """Predict each shock and phase its impact in over the horizon"""
+        batch = self.predict_many(tariff_shocks, time_horizon)
+        paths = {metric: batch.timeline(metric) for metric in SCENARIO_METRICS}
+
+        timeline = [
+            {
+                "tariff_id": shock.tariff_id,
+                "effective_date": shock.effective_date,
+                "confidence": float(batch["overall_confidence"][j]),
+                "periods": [
+                    {
+                        "period": t + 1,
+                        **{
+                            metric: round(float(paths[metric][j, t]), 2)
+                            for metric in SCENARIO_METRICS
+                        },
+                    }
+                    for t in range(len(batch.adjustment_path))
+                ],
+            }
+            for j, shock in enumerate(tariff_shocks)
+        ]
+        return {
+            "time_horizon": len(batch.adjustment_path),
+            "timeline": timeline,
+            "cumulative_impact": {
+                metric: round(float(paths[metric][:, -1].sum()), 2)
+                if len(batch.adjustment_path)
+                else 0.0
+                for metric in SCENARIO_METRICS
+            },
+        }
+
+    # Exposure
+    def get_country_exposure(self, country: str) -> Dict[str, Any]:
+        """Trade dependence of a country in the fitted flows"""
+        self._require_trained()
+        graph = self.graph
+        index = graph.country_index.get(normalize_country(country))
+        if index is None:
+            return {
+                "country": country,
+                "imports": 0.0,
+                "exports": 0.0,
+                "import_dependency": 0.0,
+                "export_exposure": 0.0,
+                "top_import_sources": {},
+                "top_export_markets": {},
+                "average_import_tariff": 0.0,
+            }
+
+        imports = float(graph.imports[index])
+        exports = float(graph.exports[index])
+        total = imports + exports
+        inbound = graph.destination == index
+        outbound = graph.origin == index
+        sources = np.bincount(
+            graph.origin[inbound], graph.value[inbound], len(graph.countries)
+        )
+        markets = np.bincount(
+            graph.destination[outbound], graph.value[outbound], len(graph.countries)
+        )
+        return {
+            "country": country,
+            "imports": imports,
+            "exports": exports,
+            "import_dependency": imports / total if total else 0.0,
+            "export_exposure": exports / total if total else 0.0,
+            "top_import_sources": _top(dict(zip(graph.countries, sources)), 5),
+            "top_export_markets": _top(dict(zip(graph.countries, markets)), 5),
+            "average_import_tariff": (
+                float(
+                    np.average(
+                        graph.baseline_tariff[inbound], weights=graph.value[inbound]
+                    )
+                )
+                if imports
+                else 0.0
+            ),
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Console entry point: predict one shock from a trade-flows CSV"""
+    parser = argparse.ArgumentParser(description="Tariff Impact Propagation Model")
+    parser.add_argument(
+        "--trade-flows",
+        help="CSV with origin_country, destination_country, hs_code, "
+        "trade_value[, year]",
+    )
+    parser.add_argument("--model", help="Load a saved model artifact instead")
+    parser.add_argument("--save", help="Save the fitted model artifact here")
+    parser.add_argument("--origin", required=True)
+    parser.add_argument("--destination", required=True)
+    parser.add_argument("--hs-codes", nargs="+", required=True)
+    parser.add_argument("--rate-change", type=float, required=True)
+    parser.add_argument("--effective-date", default=datetime.now().date().isoformat())
+    args = parser.parse_args(argv)
+
+    if args.model:
+        model = TIPMModel.load(args.model)
+    else:
+        flows = None
+        if args.trade_flows:
+            flows = pd.read_csv(args.trade_flows, dtype={"hs_code": str})
+        model = TIPMModel().fit({"trade_flows": flows})
+        if args.save:
+            model.save(args.save)
+    shock = TariffShock(
+        tariff_id="CLI",
+        hs_codes=args.hs_codes,
+        rate_change=args.rate_change,
+        origin_country=args.origin,
+        destination_country=args.destination,
+        effective_date=args.effective_date,
+    )
+    print(json.dumps(asdict(model.predict(shock)), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
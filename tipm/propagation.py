@@ -0,0 +1,712 @@
+"""
+Sparse Trade-Flow Graph
+=======================
+
+Country x HS-code trade flows stored as sorted columnar arrays, plus the
+sparse operators that carry a tariff shock through the model layers:
+- Flows are sorted by (origin, destination, HS code), so every shock code
+  targets a contiguous block of flows found with two binary searches, for a
+  whole batch of shocks at once
+- Shocks are sparse (flows x shocks) matrices; each layer is a sparse
+  matrix product against operators built once at fit time
+- Industry spill-overs use a Leontief (I - A) system over
+  (country, HS chapter) nodes, applied through its closed-form inverse
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from api.hs_concordance import HS_CONCORDANCE, normalize_codes
+
+FLOW_COLUMNS = ("origin_country", "destination_country", "hs_code", "trade_value")
+
+# Everything a fitted graph needs besides its meta(); flow columns first
+GRAPH_ARRAYS = (
+    "origin",
+    "destination",
+    "hs",
+    "value",
+    "baseline_tariff",
+    "year",
+    "flow_ptr",
+    "unit",
+    "flow_key",
+    "market_ids",
+    "market_order",
+    "market_ptr",
+    "origin_node",
+    "destination_node",
+    "market_value",
+    "exports",
+    "imports",
+    "node_exports",
+    "node_share",
+    "output_multipliers",
+)
+
+# (origin, destination, HS codes, tariff rate) of an applied baseline policy
+BaselinePolicy = Tuple[str, str, Tuple[str, ...], float]
+
+# Upper bound used for prefix range lookups over sorted HS code strings
+_PREFIX_END = "\uffff"
+
+
+def normalize_country(code: Any) -> str:
+    return str(code).strip().upper()
+
+
+def prepare_flows(trade_flows: pd.DataFrame) -> pd.DataFrame:
+    """Normalized (origin, destination, hs, value, year) rows, one per flow
+
+    Duplicate rows within a year are summed, then each flow keeps only its
+    latest year.
+    """
+    missing = [c for c in FLOW_COLUMNS if c not in trade_flows.columns]
+    if missing:
+        raise ValueError(f"trade_flows is missing columns: {missing}")
+
+    df = pd.DataFrame(
+        {
+            "origin": trade_flows["origin_country"].map(normalize_country),
+            "destination": trade_flows["destination_country"].map(normalize_country),
+            "hs": normalize_codes(trade_flows["hs_code"]),
+            "value": pd.to_numeric(trade_flows["trade_value"], errors="coerce"),
+            "year": pd.to_numeric(trade_flows.get("year", 0), errors="coerce"),
+        }
+    )
+    df["value"] = df["value"].fillna(0.0)
+    df["year"] = df["year"].fillna(0).astype(np.int32)
+    return (
+        df.groupby(["origin", "destination", "hs", "year"], sort=False)
+        .agg(value=("value", "sum"))
+        .reset_index()
+        .sort_values("year", kind="stable")
+        .drop_duplicates(["origin", "destination", "hs"], keep="last")
+    )
+
+
+@dataclass
+class PropagationResult:
+    """Layer outputs for a block of shocks; one column per shock"""
+
+    shocks: sp.csc_matrix  # flows x k, tariff rate change
+    affected_value: sp.csc_matrix  # flows x k, pre-shock value of hit flows
+    direct_change: sp.csc_matrix  # flows x k, trade lost on hit flows
+    diverted_change: sp.csc_matrix  # flows x k, trade picked up elsewhere
+    tariff_paid: sp.csc_matrix  # flows x k, added duty on remaining trade
+    direct_output: sp.csc_matrix  # nodes x k, first-round exporter output change
+    total_output: Optional[np.ndarray]  # nodes x k, after input-output propagation
+    input_cost: sp.csc_matrix  # nodes x k, added duty by importing industry
+
+
+class TradeFlowGraph:
+    """Columnar bilateral flows plus the sparse propagation operators"""
+
+    def __init__(
+        self,
+        countries: Sequence[str],
+        hs_codes: Sequence[str],
+        origin: np.ndarray,
+        destination: np.ndarray,
+        hs: np.ndarray,
+        value: np.ndarray,
+        baseline_tariff: Optional[np.ndarray] = None,
+        year: Optional[np.ndarray] = None,
+        chapter_digits: int = 2,
+        intermediate_share: float = 0.3,
+    ):
+        n = len(value)
+        self.countries: List[str] = list(countries)
+        self.hs_codes: List[str] = list(hs_codes)
+        self.origin = np.asarray(origin, dtype=np.int32)
+        self.destination = np.asarray(destination, dtype=np.int32)
+        self.hs = np.asarray(hs, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.baseline_tariff = (
+            np.zeros(n)
+            if baseline_tariff is None
+            else np.asarray(baseline_tariff, dtype=np.float64)
+        )
+        self.year = (
+            np.zeros(n, np.int32) if year is None else np.asarray(year, np.int32)
+        )
+        self.chapter_digits = chapter_digits
+        self.intermediate_share = intermediate_share
+        # Baseline policies applied so far, re-applied to flows added later
+        self.baseline_policies: List[BaselinePolicy] = []
+        self._build_operators()
+
+    # Construction
+    @classmethod
+    def from_frames(
+        cls,
+        trade_flows: Optional[pd.DataFrame],
+        tariff_shocks: Optional[pd.DataFrame] = None,
+        chapter_digits: int = 2,
+        intermediate_share: float = 0.3,
+    ) -> "TradeFlowGraph":
+        """Build from a trade_flows frame; the latest year of each flow wins"""
+        if trade_flows is None or len(trade_flows) == 0:
+            graph = cls.empty(chapter_digits, intermediate_share)
+        else:
+            df = prepare_flows(trade_flows)
+            countries = sorted(set(df["origin"]) | set(df["destination"]))
+            hs_codes = sorted(set(df["hs"]))
+            origin = pd.Categorical(df["origin"], categories=countries).codes
+            destination = pd.Categorical(df["destination"], categories=countries).codes
+            hs = pd.Categorical(df["hs"], categories=hs_codes).codes
+            order = np.lexsort((hs, destination, origin))
+
+            graph = cls(
+                countries,
+                hs_codes,
+                origin[order],
+                destination[order],
+                hs[order],
+                df["value"].to_numpy()[order],
+                year=df["year"].to_numpy()[order],
+                chapter_digits=chapter_digits,
+                intermediate_share=intermediate_share,
+            )
+
+        if tariff_shocks is not None and len(tariff_shocks):
+            graph.apply_baseline_tariffs(tariff_shocks)
+        return graph
+
+    @classmethod
+    def empty(
+        cls, chapter_digits: int = 2, intermediate_share: float = 0.3
+    ) -> "TradeFlowGraph":
+        none = np.zeros(0, np.int32)
+        return cls(
+            [], [], none, none, none, np.zeros(0),
+            chapter_digits=chapter_digits, intermediate_share=intermediate_share,
+        )
+
+    def _build_operators(self):
+        """Derive every operator array from the sorted flow columns"""
+        n_flows = len(self.value)
+        n_countries = len(self.countries)
+        n_hs = len(self.hs_codes)
+
+        # Industries: HS chapters; nodes are (country, industry)
+        self.industries: List[str]
+        self.industries, hs_industry = HS_CONCORDANCE.industries(
+            self.hs_codes, self.chapter_digits
+        )
+        n_industries = len(self.industries)
+        n_nodes = n_countries * n_industries
+        flow_industry = hs_industry[self.hs] if n_flows else self.hs
+
+        # Markets: (destination, HS code); diversion happens within a market
+        market_key = self.destination.astype(np.int64) * n_hs + self.hs
+        _, market_ids = np.unique(market_key, return_inverse=True)
+        n_markets = int(market_ids.max()) + 1 if n_flows else 0
+        market_ids = market_ids.ravel()
+        market_order = np.argsort(market_ids, kind="stable")
+
+        index_dtype = (
+            np.int32 if max(n_flows, n_nodes, n_markets) < 2**31 - 1 else np.int64
+        )
+        self.flow_ptr = np.arange(n_flows + 1, dtype=index_dtype)
+        self.unit = np.ones(n_flows)
+        # Flows are sorted by (origin, destination, HS index)
+        self.flow_key = (
+            self.origin.astype(np.int64) * n_countries + self.destination
+        ) * n_hs + self.hs
+        self.market_ids = market_ids.astype(index_dtype)
+        self.market_order = market_order.astype(index_dtype)
+        self.market_ptr = np.searchsorted(
+            market_ids[market_order], np.arange(n_markets + 1)
+        ).astype(index_dtype)
+        self.origin_node = (self.origin * n_industries + flow_industry).astype(
+            index_dtype
+        )
+        self.destination_node = (
+            self.destination * n_industries + flow_industry
+        ).astype(index_dtype)
+
+        self.market_value = np.bincount(market_ids, self.value, n_markets)
+        self.exports = np.bincount(self.origin, self.value, n_countries)
+        self.imports = np.bincount(self.destination, self.value, n_countries)
+        self.node_exports = np.bincount(self.origin_node, self.value, n_nodes)
+        node_country = np.arange(n_nodes) // max(n_industries, 1)
+        self.node_share = np.divide(
+            self.node_exports,
+            self.exports[node_country],
+            out=np.zeros(n_nodes),
+            where=self.node_exports > 0,
+        )
+
+        # 1' (I - A)^-1: total output change per unit of direct change at each
+        # node, so batch totals need no per-node expansion
+        s = self.intermediate_share
+        self.output_multipliers = np.where(self.node_share > 0, 1.0 / (1.0 - s), 1.0)
+
+        self._wire_operators()
+
+    def _wire_operators(self):
+        """CSC views over the operator arrays; nothing is copied
+
+        Operators are CSC so products with a (flows x k) shock block cost
+        O(k + nnz) rather than O(rows). Every flow sits in exactly one
+        market / node, so each aggregator has one unit entry per column.
+        """
+        n_flows = len(self.value)
+        n_nodes = len(self.node_exports)
+        n_countries = len(self.countries)
+
+        def aggregator(rows: np.ndarray, n_rows: int) -> sp.csc_matrix:
+            return sp.csc_matrix(
+                (self.unit, rows, self.flow_ptr), shape=(n_rows, n_flows), copy=False
+            )
+
+        self.country_index: Dict[str, int] = {
+            c: i for i, c in enumerate(self.countries)
+        }
+        self._hs_array = np.array(self.hs_codes, dtype=str)
+        # HS sector of each industry, for sector roll-ups of node results
+        self.industry_sector = (
+            HS_CONCORDANCE.sectors(self.industries)
+            if self.chapter_digits >= 2
+            else np.full(len(self.industries), -1, dtype=np.int64)
+        )
+        self.n_markets = len(self.market_value)
+        self.n_nodes = n_nodes
+        self.market = aggregator(self.market_ids, self.n_markets)
+        self.market_members = sp.csc_matrix(
+            (self.unit, self.market_order, self.market_ptr),
+            shape=(n_flows, self.n_markets),
+            copy=False,
+        )
+        self.origin_industry = aggregator(self.origin_node, n_nodes)
+        self.destination_industry = aggregator(self.destination_node, n_nodes)
+
+        # Input-output coupling: within each country, industry i supplies
+        # A[i, j] = intermediate_share * node_share[i] of every industry j's
+        # output. Each block is rank one with shares summing to 1, so
+        # (I - A)^-1 = I + s / (1 - s) * S C, with C summing active nodes
+        # per country and S spreading a country total back by node_share.
+        active = np.flatnonzero(self.node_share > 0)
+        active_country = self.node_country(active)
+        self._country_sum = sp.csr_matrix(
+            (np.ones(len(active)), (active_country, active)),
+            shape=(n_countries, n_nodes),
+        )
+        self._country_spread = sp.csr_matrix(
+            (self.node_share[active], (active, active_country)),
+            shape=(n_nodes, n_countries),
+        )
+
+    def leontief(self, direct_output: sp.spmatrix) -> np.ndarray:
+        """Total (direct + supply-chain) output change, nodes x k"""
+        s = self.intermediate_share
+        spill = self._country_spread @ (self._country_sum @ direct_output)
+        return np.asarray((direct_output + spill * (s / (1.0 - s))).todense())
+
+    @classmethod
+    def from_arrays(
+        cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> "TradeFlowGraph":
+        """Rebuild from saved arrays (possibly memory-mapped) without copying"""
+        graph = cls.__new__(cls)
+        graph.countries = list(meta["countries"])
+        graph.hs_codes = list(meta["hs_codes"])
+        graph.industries = list(meta["industries"])
+        graph.chapter_digits = meta["chapter_digits"]
+        graph.intermediate_share = meta["intermediate_share"]
+        graph.baseline_policies = [
+            (origin, destination, tuple(codes), rate)
+            for origin, destination, codes, rate in meta.get("baseline_policies", [])
+        ]
+        for name in GRAPH_ARRAYS:
+            setattr(graph, name, arrays[name])
+        graph._wire_operators()
+        return graph
+
+    def meta(self) -> Dict[str, Any]:
+        """JSON-serializable part of the graph; the rest is GRAPH_ARRAYS"""
+        return {
+            "countries": self.countries,
+            "hs_codes": self.hs_codes,
+            "industries": self.industries,
+            "chapter_digits": self.chapter_digits,
+            "intermediate_share": self.intermediate_share,
+            "baseline_policies": [list(policy) for policy in self.baseline_policies],
+        }
+
+    # Targeting
+    @property
+    def n_flows(self) -> int:
+        return len(self.value)
+
+    def _hs_ranges(
+        self, codes: Sequence[str], prefix_matching: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Index ranges of traded HS codes matched by each shock code"""
+        keys = normalize_codes(codes)
+        lo = np.searchsorted(self._hs_array, keys, "left")
+        if prefix_matching:
+            hi = np.searchsorted(self._hs_array, np.char.add(keys, _PREFIX_END), "left")
+        else:
+            hi = np.searchsorted(self._hs_array, keys, "right")
+
+        # Shock more detailed than the trade data: fall back to a parent code
+        for i in np.flatnonzero(hi == lo):
+            code = str(keys[i])
+            for length in range(len(code) - 1, self.chapter_digits - 1, -1):
+                parent = bisect_left(self.hs_codes, code[:length])
+                if self.hs_codes[parent : parent + 1] == [code[:length]]:
+                    lo[i], hi[i] = parent, parent + 1
+                    break
+        return lo, hi
+
+    def _match(
+        self,
+        origins: Sequence[str],
+        destinations: Sequence[str],
+        code_lists: Sequence[Sequence[str]],
+        prefix_matching: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(flow ids, shock ids, HS coverage) for a batch of shocks at once"""
+        n_shocks = len(code_lists)
+        counts = np.array([len(codes) for codes in code_lists], dtype=np.int64)
+        owner = np.repeat(np.arange(n_shocks), counts)
+        hs_lo, hs_hi = self._hs_ranges(
+            [code for codes in code_lists for code in codes], prefix_matching
+        )
+        coverage = np.divide(
+            np.bincount(owner, hs_hi > hs_lo, n_shocks),
+            counts,
+            out=np.zeros(n_shocks),
+            where=counts > 0,
+        )
+
+        # flow_key orders flows by (pair, HS index), so each shock code is
+        # one contiguous block found with two binary searches
+        o = self.country_ids(origins)
+        d = self.country_ids(destinations)
+        pair = (o * len(self.countries) + d)[owner]
+        known = ((o >= 0) & (d >= 0))[owner]
+        n_hs = len(self.hs_codes)
+        starts = np.searchsorted(self.flow_key, pair * n_hs + hs_lo, "left")
+        ends = np.searchsorted(self.flow_key, pair * n_hs + hs_hi, "left")
+        lengths = np.where(known, ends - starts, 0)
+
+        offsets = np.cumsum(lengths) - lengths
+        flows = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        shock_ids = np.repeat(owner, lengths)
+
+        # Overlapping codes ("8517" and "851712") hit a flow only once
+        keys = np.unique(shock_ids * max(self.n_flows, 1) + flows)
+        return keys % max(self.n_flows, 1), keys // max(self.n_flows, 1), coverage
+
+    def target_flows(
+        self,
+        origin: str,
+        destination: str,
+        hs_codes: Sequence[str],
+        prefix_matching: bool = True,
+    ) -> Tuple[np.ndarray, float]:
+        """Flow ids hit by a shock, and the share of its HS codes that are traded"""
+        flows, _, coverage = self._match(
+            [origin], [destination], [list(hs_codes)], prefix_matching
+        )
+        return flows, float(coverage[0])
+
+    def shock_matrix(
+        self,
+        shocks: Sequence[Tuple[str, str, Sequence[str], float]],
+        prefix_matching: bool = True,
+    ) -> Tuple[sp.csc_matrix, np.ndarray]:
+        """Stack (origin, destination, hs_codes, rate_change) shocks as columns"""
+        origins, destinations, code_lists, rates = (
+            zip(*shocks) if len(shocks) else ((), (), (), ())
+        )
+        flows, shock_ids, coverage = self._match(
+            origins, destinations, code_lists, prefix_matching
+        )
+        # Matches come back sorted by shock, then flow: already CSC order
+        indptr = np.searchsorted(shock_ids, np.arange(len(shocks) + 1), "left")
+        matrix = sp.csc_matrix(
+            (np.asarray(rates, dtype=np.float64)[shock_ids], flows, indptr),
+            shape=(self.n_flows, len(shocks)),
+        )
+        return matrix, coverage
+
+    def apply_baseline_tariffs(self, policies: pd.DataFrame):
+        """Record tariffs already in force; later effective dates win"""
+        self._make_writable()
+        if "effective_date" in policies.columns:
+            policies = policies.sort_values("effective_date", kind="stable")
+        added = []
+        for row in policies.itertuples(index=False):
+            codes = row.hs_codes
+            if isinstance(codes, str):
+                codes = [codes]
+            added.append(
+                (
+                    str(row.origin_country),
+                    str(row.destination_country),
+                    tuple(str(code) for code in codes or ()),
+                    float(row.tariff_rate),
+                )
+            )
+        self.baseline_policies.extend(added)
+        self._apply_policies(added)
+
+    def _apply_policies(
+        self, policies: Sequence[BaselinePolicy], only: Optional[np.ndarray] = None
+    ):
+        """Set baseline tariffs in order, optionally only on flows where only"""
+        for origin, destination, codes, rate in policies:
+            flows, _ = self.target_flows(origin, destination, list(codes))
+            if only is not None:
+                flows = flows[only[flows]]
+            self.baseline_tariff[flows] = rate
+
+    # Incremental updates
+    def _make_writable(self):
+        """Swap read-only (memory-mapped) arrays for private copies"""
+        for name in GRAPH_ARRAYS:
+            array = getattr(self, name)
+            if not array.flags.writeable:
+                setattr(self, name, np.array(array))
+
+    def update(self, trade_flows: pd.DataFrame) -> Dict[str, Any]:
+        """Fold newly reported flows into the graph; newer years win
+
+        Updates to flows already in the graph only adjust the market,
+        country and node totals they feed, plus the industry shares of
+        the exporting countries. New countries, HS codes or bilateral
+        flows need a re-sort, so the operator arrays are rebuilt.
+        """
+        df = prepare_flows(trade_flows)
+        stats = {"rows": len(df), "updated": 0, "added": 0, "rebuilt": False}
+        if not len(df):
+            return stats
+
+        self._make_writable()
+        origins = self.country_ids(df["origin"])
+        destinations = self.country_ids(df["destination"])
+        codes = df["hs"].to_numpy(dtype=str)
+        hs_pos = np.searchsorted(self._hs_array, codes)
+        hs_known = hs_pos < len(self.hs_codes)
+        hs_known[hs_known] = self._hs_array[hs_pos[hs_known]] == codes[hs_known]
+        known = (origins >= 0) & (destinations >= 0) & hs_known
+
+        key = (origins * len(self.countries) + destinations) * len(
+            self.hs_codes
+        ) + hs_pos
+        pos = np.searchsorted(self.flow_key, key)
+        found = known & (pos < self.n_flows)
+        found[found] = self.flow_key[pos[found]] == key[found]
+
+        if not found.all():
+            stats.update(self._merge(df), rebuilt=True)
+            return stats
+
+        years = df["year"].to_numpy(dtype=np.int32)
+        newer = years >= self.year[pos]
+        flows = pos[newer]
+        self._update_values(flows, df["value"].to_numpy()[newer], years[newer])
+        stats["updated"] = int(len(flows))
+        return stats
+
+    def _update_values(self, flows: np.ndarray, values: np.ndarray, years: np.ndarray):
+        """Set values of existing flows and patch only what they feed"""
+        delta = values - self.value[flows]
+        self.value[flows] = values
+        self.year[flows] = years
+        np.add.at(self.market_value, self.market_ids[flows], delta)
+        np.add.at(self.exports, self.origin[flows], delta)
+        np.add.at(self.imports, self.destination[flows], delta)
+        np.add.at(self.node_exports, self.origin_node[flows], delta)
+
+        # Industry shares only move within the exporting countries
+        n_industries = len(self.industries)
+        countries = np.unique(self.origin[flows])
+        nodes = (countries[:, None] * n_industries + np.arange(n_industries)).ravel()
+        self.node_share[nodes] = np.divide(
+            self.node_exports[nodes],
+            self.exports[self.node_country(nodes)],
+            out=np.zeros(len(nodes)),
+            where=self.node_exports[nodes] > 0,
+        )
+        self.output_multipliers[nodes] = np.where(
+            self.node_share[nodes] > 0, 1.0 / (1.0 - self.intermediate_share), 1.0
+        )
+        self._wire_operators()
+
+    def _merge(self, df: pd.DataFrame) -> Dict[str, int]:
+        """Merge prepared flow rows that add countries, HS codes or flows"""
+        countries = sorted(set(self.countries).union(df["origin"], df["destination"]))
+        hs_codes = sorted(set(self.hs_codes).union(df["hs"]))
+
+        # Both code lists stay sorted, so remapping keeps the old flow order
+        country_map = np.searchsorted(np.array(countries), self.countries)
+        hs_map = np.searchsorted(np.array(hs_codes, dtype=str), self._hs_array)
+        n_old = self.n_flows
+
+        origin = np.concatenate(
+            [
+                country_map[self.origin] if n_old else self.origin,
+                pd.Categorical(df["origin"], categories=countries).codes,
+            ]
+        ).astype(np.int64)
+        destination = np.concatenate(
+            [
+                country_map[self.destination] if n_old else self.destination,
+                pd.Categorical(df["destination"], categories=countries).codes,
+            ]
+        ).astype(np.int64)
+        hs = np.concatenate(
+            [
+                hs_map[self.hs] if n_old else self.hs,
+                pd.Categorical(df["hs"], categories=hs_codes).codes,
+            ]
+        ).astype(np.int64)
+        value = np.concatenate([self.value, df["value"].to_numpy()])
+        year = np.concatenate([self.year, df["year"].to_numpy(dtype=np.int32)])
+        baseline = self.baseline_tariff
+
+        # Latest year per flow; on a tie the new row (appended last) wins
+        key = (origin * len(countries) + destination) * len(hs_codes) + hs
+        order = np.lexsort((year, key))
+        last = np.r_[key[order][1:] != key[order][:-1], True]
+        keep = order[last]
+
+        self.countries = countries
+        self.hs_codes = hs_codes
+        self.origin = origin[keep].astype(np.int32)
+        self.destination = destination[keep].astype(np.int32)
+        self.hs = hs[keep].astype(np.int32)
+        self.value = value[keep]
+        self.year = year[keep]
+
+        # A flow keeps its baseline tariff when a newer row replaces it
+        old_key = key[:n_old]
+        old_pos = np.minimum(np.searchsorted(old_key, key[keep]), max(n_old - 1, 0))
+        had_old = old_key[old_pos] == key[keep] if n_old else np.zeros(len(keep), bool)
+        self.baseline_tariff = np.where(had_old, baseline[old_pos], 0.0)
+
+        self._build_operators()
+        # New flows get the baseline policies the graph was fitted with
+        self._apply_policies(self.baseline_policies, only=~had_old)
+        replaced = keep >= n_old
+        return {
+            "added": int(np.count_nonzero(replaced & ~had_old)),
+            "updated": int(np.count_nonzero(replaced & had_old)),
+        }
+
+    # Propagation
+    def propagate(
+        self,
+        shocks: sp.spmatrix,
+        import_elasticity: float,
+        diversion_rate: float,
+        solve_output: bool = True,
+    ) -> PropagationResult:
+        """Carry a (flows x k) block of tariff changes through every layer
+
+        With solve_output=False the per-node input-output expansion is
+        skipped; use total_output_change() for per-shock totals instead.
+        """
+        shocks = sp.csc_matrix(shocks)
+
+        # Trade flow: demand falls with the tariff-inclusive price, at most to 0
+        loss_share = shocks.copy()
+        loss_share.data = np.minimum(
+            loss_share.data
+            * import_elasticity
+            / (1.0 + self.baseline_tariff[loss_share.indices]),
+            1.0,
+        )
+        direct = _scale_rows(loss_share, -self.value)
+        hit = shocks.copy()
+        hit.data = np.ones_like(hit.data)
+        affected_value = _scale_rows(hit, self.value)
+
+        # Diversion: other origins in the same market pick up lost trade
+        # in proportion to their current value there
+        lost = (self.market @ -direct).tocoo()
+        blocked = (self.market @ affected_value).tocoo()
+        blocked_at = _lookup(blocked, lost, self.n_markets)
+        open_value = self.market_value[lost.row] - blocked_at
+        ratio = np.divide(
+            lost.data, open_value, out=np.zeros_like(lost.data), where=open_value > 0
+        )
+        market_ratio = sp.csc_matrix((ratio, (lost.row, lost.col)), shape=lost.shape)
+        diverted = _scale_rows(
+            self.market_members @ market_ratio, self.value * diversion_rate
+        )
+        diverted = (diverted - diverted.multiply(hit)).tocsc()
+        diverted.eliminate_zeros()
+
+        tariff_paid = _scale_rows(shocks, self.value) + shocks.multiply(direct)
+        tariff_paid = tariff_paid.tocsc()
+
+        # Industry: first-round output change, then input-output spill-over
+        direct_output = (self.origin_industry @ (direct + diverted)).tocsc()
+        total_output = self.leontief(direct_output) if solve_output else None
+
+        return PropagationResult(
+            shocks=shocks,
+            affected_value=affected_value,
+            direct_change=direct,
+            diverted_change=diverted,
+            tariff_paid=tariff_paid,
+            direct_output=direct_output,
+            total_output=total_output,
+            input_cost=(self.destination_industry @ tariff_paid).tocsc(),
+        )
+
+    def total_output_change(self, result: PropagationResult) -> np.ndarray:
+        """Economy-wide output change per shock, via the shared multipliers"""
+        return result.direct_output.T @ self.output_multipliers
+
+    # Lookups
+    def node_label(self, node: int) -> str:
+        country, industry = divmod(int(node), len(self.industries))
+        return f"{self.countries[country]}:{self.industries[industry]}"
+
+    def country_ids(self, codes: Sequence[str]) -> np.ndarray:
+        """Country indices for codes; -1 where the country has no trade"""
+        index = self.country_index
+        return np.array(
+            [index.get(normalize_country(code), -1) for code in codes], dtype=np.int64
+        )
+
+    def node_country(self, nodes: np.ndarray) -> np.ndarray:
+        return np.asarray(nodes) // max(len(self.industries), 1)
+
+    def node_sector(self, nodes: np.ndarray) -> np.ndarray:
+        """HS sector ids of nodes; -1 where the industry has no sector"""
+        return self.industry_sector[np.asarray(nodes) % max(len(self.industries), 1)]
+
+
+def _scale_rows(matrix: sp.csc_matrix, weights: np.ndarray) -> sp.csc_matrix:
+    """diag(weights) @ matrix, touching only the stored entries"""
+    out = matrix.copy()
+    out.data = out.data * weights[out.indices]
+    return out
+
+
+def _lookup(source: sp.coo_matrix, at: sp.coo_matrix, n_rows: int) -> np.ndarray:
+    """Values of source at the stored positions of at (a subset of source's)"""
+    source_keys = source.col.astype(np.int64) * n_rows + source.row
+    keys = at.col.astype(np.int64) * n_rows + at.row
+    order = np.argsort(source_keys, kind="stable")
+    found = order[np.searchsorted(source_keys, keys, sorter=order)]
+    return source.data[found]
+
+
+def sparse_column(matrix: sp.csc_matrix, j: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(row ids, values) stored in column j of a CSC matrix"""
+    start, end = matrix.indptr[j], matrix.indptr[j + 1]
+    return matrix.indices[start:end], matrix.data[start:end]